@@ -1,14 +1,124 @@
+import base64
+import os
 import random
-from typing import Mapping, Optional
+import struct
+from collections import Counter, deque
+from typing import Iterable, Mapping, Optional
 from uuid import UUID
 
+from app.bag import Bag
 from app.card import CardRow, build_deck, deal_initial_rows
 from app.Ingredient import Ingredient
 from app.PlayerState import Cup, PlayerState
 from app.user import User
+from app.zobrist import INGREDIENT_KEYS, mix, salt, sequence_hash, string_key, uuid_key
 
 OPEN_DISPLAY_SIZE = 5
 
+_BAG_SALT = salt("bag_contents")
+_DISPLAY_SALT = salt("open_display")
+_ROW_SALT = salt("card_rows")
+_DECK_SALT = salt("deck")
+_DISCARD_SALT = salt("discard")
+_TURN_SALT = salt("turn")
+_TURN_ORDER_SALT = salt("turn_order")
+_DRUNK_SALT = salt("drunk_ingredients_this_turn")
+_PENDING_SALT = salt("bag_draw_pending")
+_RECORDS_SALT = salt("taken_records_this_turn")
+_FREE_USED_SALT = salt("free_actions_used_this_turn")
+_MODES_SALT = salt("game_modes")
+
+# Mersenne Twister state: 624 words plus the position within them.
+_RNG_STATE_WORDS = 625
+
+_random = random.Random.random
+_getrandbits = random.Random.getrandbits
+
+
+class GameRandom(random.Random):
+    """A game's random stream: a Mersenne Twister that counts what it has used.
+
+    Every value it produces costs whole 32-bit words of the generator's output
+    (``random()`` two, ``getrandbits(k)`` one per 32 bits), so the stream's
+    position is just its seed and the number of words used so far. That pair
+    is what a stored state keeps (encode_rng), not the generator's 2.5 KB of
+    internal state.
+    """
+
+    def seed(self, a: int | None = None, version: int = 2) -> None:
+        if a is None:
+            a = int.from_bytes(os.urandom(8))
+        super().seed(a, version)
+        self.initial_seed = int(a)
+        self.words = 0
+
+    def random(self) -> float:
+        self.words += 2
+        return _random(self)
+
+    def getrandbits(self, k: int) -> int:
+        self.words += (k + 31) >> 5
+        return _getrandbits(self, k)
+
+    def advance(self, words: int) -> None:
+        """Skip ``words`` words of output, as if they had been drawn."""
+        while words > 0:
+            chunk = min(words, 1 << 16)
+            self.getrandbits(chunk << 5)
+            words -= chunk
+
+    def copy(self) -> "GameRandom":
+        """An independent stream positioned exactly where this one is."""
+        copy = GameRandom.__new__(GameRandom)
+        copy.setstate(self.getstate())
+        copy.initial_seed = self.initial_seed
+        copy.words = self.words
+        return copy
+
+    def __reduce__(self):
+        return GameRandom.copy, (self,)
+
+
+def copy_rng(rng: GameRandom) -> GameRandom:
+    """Return an independent stream positioned exactly where ``rng`` is."""
+    return rng.copy()
+
+
+def encode_rng(rng: GameRandom) -> str:
+    """The stream's position for storage: ``"<seed in hex>:<words used>"``."""
+    return f"{rng.initial_seed:x}:{rng.words}"
+
+
+def decode_rng(encoded: str) -> GameRandom:
+    """Inverse of encode_rng.
+
+    States saved before streams were stored this way carry the generator's
+    packed internal state (base64). Those continue on a stream seeded from
+    the old one, so loading the same state always gives the same draws.
+    """
+    if ":" in encoded:
+        seed, words = encoded.split(":")
+        rng = GameRandom(int(seed, 16))
+        rng.advance(int(words))
+        return rng
+    version, *internal = struct.unpack(
+        f"<B{_RNG_STATE_WORDS}I", base64.b64decode(encoded)
+    )
+    old = random.Random.__new__(random.Random)
+    old.setstate((version, tuple(internal), None))
+    return GameRandom(old.getrandbits(64))
+
+
+def advance_encoded_rng(encoded: str, words: int) -> str | None:
+    """The encoded stream ``words`` words further on, without running it.
+
+    None for streams stored as generator state, whose position is not known.
+    """
+    if ":" not in encoded:
+        return None
+    seed, used = encoded.split(":")
+    return f"{seed}:{int(used) + words}"
+
 
 def create_initial_bag(num_players: int) -> list[Ingredient]:
     multiplier = num_players + 3
@@ -27,10 +137,36 @@ def create_initial_bag(num_players: int) -> list[Ingredient]:
 
 
 class GameState:
+    __slots__ = (
+        "winner",
+        "_bag_contents",
+        "player_states",
+        "player_turn",
+        "open_display",
+        "card_rows",
+        "_deck_dicts",
+        "turn_order",
+        "turn_number",
+        "ingredients_taken_this_turn",
+        "drunk_ingredients_this_turn",
+        "bag_draw_pending",
+        "taken_records_this_turn",
+        "discard",
+        "last_round",
+        "main_action_taken_this_turn",
+        "free_actions_used_this_turn",
+        "game_modes",
+        "rng",
+        "outcomes",
+        "outcome_script",
+        "_shared",
+        "_shared_players",
+    )
+
     def __init__(
         self,
         winner: Optional[UUID],
-        bag_contents: list[Ingredient],
+        bag_contents: Iterable[Ingredient],
         player_states: Mapping[UUID, PlayerState],
         player_turn: Optional[UUID],
         open_display: list[Ingredient] | None = None,
@@ -47,9 +183,10 @@ class GameState:
         main_action_taken_this_turn: bool = False,
         free_actions_used_this_turn: list[str] | None = None,
         game_modes: list[str] | None = None,
+        rng: GameRandom | None = None,
     ):
         self.winner: Optional[UUID] = winner
-        self.bag_contents: list[Ingredient] = bag_contents
+        self.bag_contents = bag_contents
         self.player_states: Mapping[UUID, PlayerState] = player_states
         self.player_turn: Optional[UUID] = player_turn
         self.open_display: list[Ingredient] = (
@@ -98,6 +235,33 @@ class GameState:
         # Optional rule variations selected in the lobby (immutable after start).
         # See app/game_modes.py for valid values.
         self.game_modes: list[str] = list(game_modes) if game_modes else []
+        # The game's own random stream: every bag draw, deck draw, shuffle and
+        # special roll comes from here, so a game is reproducible from its
+        # seed and independent of any other game running in the process.
+        self.rng: GameRandom = rng if rng is not None else GameRandom()
+        # Random outcomes consumed by the action that produced this state, as
+        # [kind, value] pairs (see actions._draw_ingredient and friends); the
+        # move record stores them. Not part of the position: never serialised
+        # or hashed, and only set on states made by copy_on_write.
+        self.outcomes: list[list] | None = None
+        # Replay only: outcomes recorded by the original move, consumed in
+        # order instead of whatever the random stream would produce.
+        self.outcome_script: deque[list] | None = None
+        # Copy-on-write bookkeeping (see copy_on_write): container fields and
+        # player states that are still shared with another GameState and must
+        # be copied via the own_* accessors before being mutated.
+        self._shared: set[str] = set()
+        self._shared_players: set[UUID] = set()
+
+    @property
+    def bag_contents(self) -> Bag:
+        return self._bag_contents
+
+    @bag_contents.setter
+    def bag_contents(self, ingredients: Iterable[Ingredient]) -> None:
+        self._bag_contents = (
+            ingredients if isinstance(ingredients, Bag) else Bag(ingredients)
+        )
 
     def has_mode(self, mode: str) -> bool:
         """Return True if the given optional rule variation is enabled."""
@@ -109,16 +273,22 @@ class GameState:
 
     @classmethod
     def start_game(
-        cls, players: list[UUID], game_modes: list[str] | None = None
+        cls,
+        players: list[UUID],
+        game_modes: list[str] | None = None,
+        seed: int | None = None,
     ) -> "GameState":
-        """Build the initial game state when a game is started."""
-        bag = list(create_initial_bag(len(players)))
-        random.shuffle(bag)
+        """Build the initial game state when a game is started.
+
+        ``seed`` fixes the game's random stream (see ``rng``); by default it is
+        seeded from the OS.
+        """
+        rng = GameRandom(seed)
+        bag = Bag(create_initial_bag(len(players)))
 
         # Draw 5 ingredients to the open display
         display_count = min(OPEN_DISPLAY_SIZE, len(bag))
-        open_display = bag[:display_count]
-        bag = bag[display_count:]
+        open_display = [bag.draw(rng) for _ in range(display_count)]
 
         player_states: dict[UUID, PlayerState] = {
             pid: PlayerState.new_player(pid) for pid in players
@@ -126,12 +296,12 @@ class GameState:
 
         # Randomise turn order; persist it for the duration of the game
         turn_order = list(players)
-        random.shuffle(turn_order)
+        rng.shuffle(turn_order)
         first_player = turn_order[0]
 
         # Build card deck and deal 3 rows of 3 cards
         deck = build_deck(game_modes)
-        card_rows, remaining_deck = deal_initial_rows(deck)
+        card_rows, remaining_deck = deal_initial_rows(deck, rng)
 
         return cls(
             winner=None,
@@ -145,10 +315,201 @@ class GameState:
             turn_number=0,
             discard=[],
             game_modes=list(game_modes) if game_modes else [],
+            rng=rng,
         )
 
-    def to_dict(self) -> dict:
-        return {
+    def clone(self) -> "GameState":
+        """Return an independent copy of the state.
+
+        Equivalent to ``GameState.from_dict(copy.deepcopy(gs.to_dict()))`` but
+        copies the typed objects directly instead of re-parsing every enum name
+        and card dict. Deck and discard card dicts are shared: they are only
+        ever appended/popped as whole entries, never edited in place.
+        """
+        return GameState(
+            winner=self.winner,
+            bag_contents=self.bag_contents.copy(),
+            player_states={pid: ps.clone() for pid, ps in self.player_states.items()},
+            player_turn=self.player_turn,
+            open_display=list(self.open_display),
+            card_rows=[row.clone() for row in self.card_rows],
+            deck=list(self._deck_dicts),
+            turn_order=list(self.turn_order),
+            turn_number=self.turn_number,
+            ingredients_taken_this_turn=self.ingredients_taken_this_turn,
+            drunk_ingredients_this_turn=list(self.drunk_ingredients_this_turn),
+            bag_draw_pending=list(self.bag_draw_pending),
+            taken_records_this_turn=[dict(r) for r in self.taken_records_this_turn],
+            discard=list(self.discard),
+            last_round=self.last_round,
+            main_action_taken_this_turn=self.main_action_taken_this_turn,
+            free_actions_used_this_turn=list(self.free_actions_used_this_turn),
+            game_modes=self.game_modes,
+            rng=copy_rng(self.rng),
+        )
+
+    # Container fields that copy_on_write shares between the two states.
+    _COW_FIELDS = (
+        "bag_contents",
+        "open_display",
+        "card_rows",
+        "_deck_dicts",
+        "discard",
+        "rng",
+    )
+
+    def copy_on_write(self) -> "GameState":
+        """Return a copy that shares player states, cups, card rows, bag and deck with self.
+
+        Shared parts are copied lazily, the first time they are obtained via
+        ``own_player`` / ``own_bag`` / ``own_display`` / ``own_card_rows`` /
+        ``own_deck`` / ``own_discard``, so the cost of an action is
+        proportional to what it changes rather than to the whole board. Both
+        states are marked as sharing, so neither may mutate a shared container
+        in place without going through those accessors. Scalars and the small
+        per-turn scratch lists are copied eagerly.
+        """
+        gs = GameState(
+            winner=self.winner,
+            bag_contents=self.bag_contents,
+            player_states=dict(self.player_states),
+            player_turn=self.player_turn,
+            open_display=self.open_display,
+            card_rows=self.card_rows,
+            deck=self._deck_dicts,
+            turn_order=list(self.turn_order),
+            turn_number=self.turn_number,
+            ingredients_taken_this_turn=self.ingredients_taken_this_turn,
+            drunk_ingredients_this_turn=list(self.drunk_ingredients_this_turn),
+            bag_draw_pending=list(self.bag_draw_pending),
+            taken_records_this_turn=[dict(r) for r in self.taken_records_this_turn],
+            discard=self.discard,
+            last_round=self.last_round,
+            main_action_taken_this_turn=self.main_action_taken_this_turn,
+            free_actions_used_this_turn=list(self.free_actions_used_this_turn),
+            game_modes=self.game_modes,
+            rng=self.rng,
+        )
+        gs.outcomes = []
+        gs.outcome_script = self.outcome_script
+        self._shared.update(self._COW_FIELDS)
+        self._shared_players.update(self.player_states)
+        gs._shared.update(self._COW_FIELDS)
+        gs._shared_players.update(self.player_states)
+        return gs
+
+    def own_player(self, player_id: UUID) -> PlayerState:
+        """Return the player's state, copying it first if it is shared."""
+        if player_id in self._shared_players:
+            self._shared_players.discard(player_id)
+            self.player_states[player_id] = self.player_states[player_id].clone()
+        return self.player_states[player_id]
+
+    def _own(self, field: str, copier):
+        if field in self._shared:
+            self._shared.discard(field)
+            setattr(self, field, copier(getattr(self, field)))
+        return getattr(self, field)
+
+    def own_bag(self) -> Bag:
+        return self._own("bag_contents", Bag.copy)
+
+    def own_display(self) -> list[Ingredient]:
+        return self._own("open_display", list)
+
+    def own_card_rows(self) -> list[CardRow]:
+        return self._own("card_rows", lambda rows: [r.clone() for r in rows])
+
+    def own_deck(self) -> list[dict]:
+        return self._own("_deck_dicts", list)
+
+    def own_discard(self) -> list[dict]:
+        return self._own("discard", list)
+
+    def own_rng(self) -> GameRandom:
+        """Return the game's random stream for drawing, copying it first if shared."""
+        return self._own("rng", copy_rng)
+
+    def reseed(self, seed: int | None = None) -> None:
+        """Replace the random stream with a fresh one.
+
+        Search code calls this on each sampled copy (determinization) so the
+        samples differ from one another and never follow the real game's
+        future draws.
+        """
+        self._shared.discard("rng")
+        self.rng = GameRandom(seed)
+
+    @property
+    def state_hash(self) -> int:
+        """64-bit Zobrist hash of the position.
+
+        Two states with equal ``to_dict()`` have equal hashes, in any process.
+        The random stream is not part of the position and is not hashed. The
+        bag (the only large container) and each player's card holdings keep
+        their part up to date as they change.
+        A player state still shared by copy_on_write cannot change, so its
+        part is computed once and reused by every state sharing it. The
+        remaining fields are small and are folded in on each read.
+        """
+        return self._hash(recompute=False)
+
+    def recompute_state_hash(self) -> int:
+        """``state_hash`` computed from scratch, for checking the incremental parts."""
+        return self._hash(recompute=True)
+
+    def _hash(self, recompute: bool) -> int:
+        bag = self.bag_contents
+        h = mix((bag.recompute_zobrist() if recompute else bag.zobrist) ^ _BAG_SALT)
+        h ^= sequence_hash(
+            _DISPLAY_SALT, (INGREDIENT_KEYS[i.code] for i in self.open_display)
+        )
+        shared = self._shared_players
+        for pid, ps in self.player_states.items():
+            h ^= ps.state_hash(recompute, frozen=pid in shared)
+        for row in self.card_rows:
+            h ^= sequence_hash(
+                _ROW_SALT + row.position, (string_key(c.id) for c in row.cards)
+            )
+        h ^= sequence_hash(_DECK_SALT, (string_key(d["id"]) for d in self._deck_dicts))
+        h ^= sequence_hash(_DISCARD_SALT, (string_key(d["id"]) for d in self.discard))
+        h ^= sequence_hash(_TURN_ORDER_SALT, map(uuid_key, self.turn_order))
+        h ^= sequence_hash(
+            _TURN_SALT,
+            (
+                uuid_key(self.winner),
+                uuid_key(self.player_turn),
+                self.turn_number,
+                self.ingredients_taken_this_turn,
+                self.last_round,
+                self.main_action_taken_this_turn,
+            ),
+        )
+        h ^= sequence_hash(
+            _DRUNK_SALT,
+            (INGREDIENT_KEYS[i.code] for i in self.drunk_ingredients_this_turn),
+        )
+        h ^= sequence_hash(
+            _PENDING_SALT, (INGREDIENT_KEYS[i.code] for i in self.bag_draw_pending)
+        )
+        h ^= sequence_hash(
+            _RECORDS_SALT,
+            (string_key(repr(sorted(r.items()))) for r in self.taken_records_this_turn),
+        )
+        h ^= sequence_hash(
+            _FREE_USED_SALT, map(string_key, self.free_actions_used_this_turn)
+        )
+        h ^= sequence_hash(_MODES_SALT, map(string_key, self.game_modes))
+        return h
+
+    def to_dict(self, include_rng: bool = False) -> dict:
+        """Serialise for storage; API responses use to_view.
+
+        ``include_rng`` adds the encoded random stream. Storage needs it; API
+        responses must not carry it, since it would let a client predict every
+        future draw.
+        """
+        data = {
             "winner": str(self.winner) if self.winner else None,
             "bag_contents": [ingredient.name for ingredient in self.bag_contents],
             "player_states": {
@@ -174,6 +535,13 @@ class GameState:
             "free_actions_used_this_turn": list(self.free_actions_used_this_turn),
             "game_modes": list(self.game_modes),
         }
+        if include_rng:
+            data["rng"] = encode_rng(self.rng)
+        return data
+
+    def to_view(self, viewer_id: Optional[UUID] = None) -> dict:
+        """Serialise for API responses to ``viewer_id``; see state_view."""
+        return state_view(self.to_dict(), viewer_id)
 
     @classmethod
     def from_dict(cls, state_data: dict) -> "GameState":
@@ -208,7 +576,7 @@ class GameState:
 
         return cls(
             winner=UUID(state_data["winner"]) if state_data.get("winner") else None,
-            bag_contents=[Ingredient[i] for i in state_data.get("bag_contents", [])],
+            bag_contents=Bag(Ingredient[i] for i in state_data.get("bag_contents", [])),
             player_states=player_states,
             player_turn=UUID(state_data["player_turn"])
             if state_data.get("player_turn")
@@ -237,4 +605,35 @@ class GameState:
                 "free_actions_used_this_turn", []
             ),
             game_modes=state_data.get("game_modes", []),
+            rng=decode_rng(state_data["rng"]) if state_data.get("rng") else None,
         )
+
+
+# Per-turn scratch the UI has no use for; only the player whose turn it is
+# gets them.
+_TURN_SCRATCH = ("taken_records_this_turn", "drunk_ingredients_this_turn")
+
+
+def state_view(state: dict, viewer_id: Optional[UUID] = None) -> dict:
+    """What ``viewer_id`` (None: someone not playing) may see of a stored state.
+
+    ``state`` is a GameState dict, as from to_dict or a stored snapshot. The
+    bag becomes counts per ingredient, the deck just its size and the discard
+    pile a count per card type (``discard_summary``): no client needs their
+    order, and knowing it would give away future draws. The stored random
+    stream is dropped too.
+    """
+    hidden = {"bag_contents", "deck", "discard", "rng"}
+    if viewer_id is None or state.get("player_turn") != str(viewer_id):
+        hidden.update(_TURN_SCRATCH)
+    view = {k: v for k, v in state.items() if k not in hidden}
+    bag = state.get("bag_contents", [])
+    view["bag_size"] = len(bag)
+    view["bag_counts"] = dict(sorted(Counter(bag).items()))
+    view["deck_size"] = len(state.get("deck", []))
+    discard = state.get("discard", [])
+    view["discard_summary"] = {
+        "size": len(discard),
+        "by_type": dict(sorted(Counter(c["card_type"] for c in discard).items())),
+    }
+    return view
@@ -22,6 +22,15 @@ class Ingredient(Enum):
     CRANBERRY = IngredientProps("Cranberry", False, False)
     SPECIAL = IngredientProps("Special Mixer", False, True)
 
+    # Small-int code (declaration order), set below. Count-array containers
+    # such as app.bag.Bag index by it; it avoids hashing the Enum member.
+    code: int
+
+
+for _code, _ingredient in enumerate(Ingredient):
+    _ingredient.code = _code
+del _code, _ingredient
+
 
 class SpecialType(Enum):
     """Resolved special ingredient types — rolled when a SPECIAL token is drawn."""
@@ -34,15 +43,18 @@ class SpecialType(Enum):
     NOTHING = "nothing"  # token returned to bag immediately
 
     @classmethod
-    def roll(cls) -> "SpecialType":
-        """Simulate rolling the special die — equal probability for each face."""
-        return random.choice(
-            [
-                cls.BITTERS,
-                cls.COINTREAU,
-                cls.LEMON,
-                cls.SUGAR,
-                cls.VERMOUTH,
-                cls.NOTHING,
-            ]
-        )
+    def roll(cls, rng: random.Random) -> "SpecialType":
+        """Simulate rolling the special die — equal probability for each face.
+
+        Uses one ``rng.random()``, like every recorded outcome (see
+        actions.OUTCOME_WORDS).
+        """
+        faces = [
+            cls.BITTERS,
+            cls.COINTREAU,
+            cls.LEMON,
+            cls.SUGAR,
+            cls.VERMOUTH,
+            cls.NOTHING,
+        ]
+        return faces[int(rng.random() * len(faces))]
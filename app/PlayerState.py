@@ -1,6 +1,9 @@
+from typing import Iterable
 from uuid import UUID
 
+from app.card import Card, CardHoldings
 from app.Ingredient import Ingredient
+from app.zobrist import INGREDIENT_KEYS, mix, salt, sequence_hash, string_key, uuid_key
 
 INITIAL_BLADDER_CAPACITY = 8
 INITIAL_TOILET_TOKENS = 4
@@ -8,8 +11,14 @@ BASE_TAKE_COUNT = 3
 MAX_CUP_INGREDIENTS = 5
 MIN_BLADDER_CAPACITY = 4
 
+_CUPS_SALT = salt("cups")
+_BLADDER_SALT = salt("bladder")
+_SPECIALS_SALT = salt("special_ingredients")
+
 
 class Cup:
+    __slots__ = ("ingredients", "has_cup_doubler")
+
     def __init__(
         self,
         ingredients: list[Ingredient] | None = None,
@@ -32,6 +41,15 @@ class Cup:
     def is_empty(self) -> bool:
         return len(self.ingredients) == 0
 
+    def clone(self) -> "Cup":
+        return Cup(list(self.ingredients), self.has_cup_doubler)
+
+    def state_hash(self, seed: int) -> int:
+        return sequence_hash(
+            seed ^ self.has_cup_doubler,
+            (INGREDIENT_KEYS[i.code] for i in self.ingredients),
+        )
+
     def to_dict(self) -> dict:
         return {
             "ingredients": [i.name for i in self.ingredients],
@@ -50,6 +68,21 @@ class Cup:
 
 
 class PlayerState:
+    __slots__ = (
+        "player_id",
+        "points",
+        "drunk_level",
+        "cups",
+        "bladder",
+        "bladder_capacity",
+        "toilet_tokens",
+        "special_ingredients",
+        "karaoke_cards_claimed",
+        "status",
+        "_cards",
+        "_frozen_hash",
+    )
+
     def __init__(
         self,
         player_id: UUID,
@@ -62,7 +95,7 @@ class PlayerState:
         special_ingredients: list[str] | None = None,
         karaoke_cards_claimed: int = 0,
         status: str = "active",
-        cards: list[dict] | None = None,
+        cards: Iterable[Card | dict] | None = None,
     ):
         self.player_id: UUID = player_id
         self.points: int = points
@@ -77,8 +110,18 @@ class PlayerState:
         )
         self.karaoke_cards_claimed: int = karaoke_cards_claimed
         self.status: str = status
-        # Claimed ability cards (serialised dicts)
-        self.cards: list[dict] = cards if cards is not None else []
+        # Claimed ability cards, indexed by what the engine looks up each turn
+        self.cards = cards if cards is not None else ()
+        # state_hash memo, only kept while the state is frozen (see state_hash)
+        self._frozen_hash: int | None = None
+
+    @property
+    def cards(self) -> CardHoldings:
+        return self._cards
+
+    @cards.setter
+    def cards(self, cards: Iterable[Card | dict]) -> None:
+        self._cards = cards if isinstance(cards, CardHoldings) else CardHoldings(cards)
 
     @property
     def take_count(self) -> int:
@@ -93,6 +136,66 @@ class PlayerState:
     def new_player(cls, player_id: UUID) -> "PlayerState":
         return cls(player_id, 0, 0, cups=[Cup(), Cup()])
 
+    def clone(self) -> "PlayerState":
+        """Return an independent copy without going through to_dict/from_dict.
+
+        Store cards get their own ``stored_spirits`` list because they are
+        mutated in place; other cards are shared (see CardHoldings.clone).
+        """
+        return PlayerState(
+            player_id=self.player_id,
+            points=self.points,
+            drunk_level=self.drunk_level,
+            cups=[cup.clone() for cup in self.cups],
+            bladder=list(self.bladder),
+            bladder_capacity=self.bladder_capacity,
+            toilet_tokens=self.toilet_tokens,
+            special_ingredients=list(self.special_ingredients),
+            karaoke_cards_claimed=self.karaoke_cards_claimed,
+            status=self.status,
+            cards=self.cards.clone(),
+        )
+
+    def state_hash(self, recompute: bool = False, frozen: bool = False) -> int:
+        """Hash of everything ``to_dict`` records (see GameState.state_hash).
+
+        ``recompute`` rebuilds the card hashes from scratch instead of using
+        the incrementally maintained ones. ``frozen`` promises this
+        object will never be mutated again — true of a player state shared
+        by copy_on_write — so the result is memoised.
+        """
+        if recompute:
+            return self._compute_hash(True)
+        if not frozen:
+            return self._compute_hash(False)
+        if self._frozen_hash is None:
+            self._frozen_hash = self._compute_hash(False)
+        return self._frozen_hash
+
+    def _compute_hash(self, recompute: bool) -> int:
+        seed = uuid_key(self.player_id)
+        h = sequence_hash(
+            seed,
+            (
+                self.points,
+                self.drunk_level,
+                self.bladder_capacity,
+                self.toilet_tokens,
+                self.karaoke_cards_claimed,
+                string_key(self.status),
+            ),
+        )
+        h ^= sequence_hash(
+            seed ^ _BLADDER_SALT, (INGREDIENT_KEYS[i.code] for i in self.bladder)
+        )
+        h ^= mix(seed ^ self.cards.state_hash(recompute))
+        h ^= sequence_hash(
+            seed ^ _SPECIALS_SALT, map(string_key, self.special_ingredients)
+        )
+        for index, cup in enumerate(self.cups):
+            h ^= cup.state_hash(seed ^ (_CUPS_SALT + 2 * index))
+        return h
+
     def to_dict(self) -> dict:
         return {
             "player_id": str(self.player_id),
@@ -106,5 +209,5 @@ class PlayerState:
             "special_ingredients": self.special_ingredients,
             "karaoke_cards_claimed": self.karaoke_cards_claimed,
             "status": self.status,
-            "cards": [dict(c) for c in self.cards],
+            "cards": self.cards.to_dict(),
         }
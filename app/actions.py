@@ -5,17 +5,24 @@ Each action validates preconditions, applies state changes, and returns
 
 Turn advancement: after every action the turn advances to the next active
 (non-eliminated) player in turn_order.
+
+State copying: actions work on ``gs.copy_on_write()``; player states, the bag,
+display, card rows, deck and discard are shared with the input until an
+action mutates them through the ``GameState.own_*`` accessors. Never mutate a
+container reached through ``gs.<field>`` directly inside an action.
+
+Randomness: every draw, shuffle and roll uses the game's own stream,
+``gs.own_rng()``, never the global ``random`` module.
 """
 
-import random
 from uuid import UUID
 
 from app.card import Card, CardRow
-from app.cocktails import drink_points, is_cocktail
+from app.cocktails import drink_score
 from app.game import GameException
 from app.GameState import OPEN_DISPLAY_SIZE, GameState
 from app.Ingredient import Ingredient, SpecialType
-from app.PlayerState import MAX_CUP_INGREDIENTS, MIN_BLADDER_CAPACITY, PlayerState
+from app.PlayerState import MAX_CUP_INGREDIENTS, MIN_BLADDER_CAPACITY, Cup, PlayerState
 
 _SPIRITS = {
     Ingredient.WHISKEY,
@@ -31,6 +38,17 @@ KARAOKE_CARDS_TO_WIN = 3
 MAX_DRUNK_LEVEL = 5
 MIN_DRUNK_TO_REFRESH = 3
 
+# Matching bladder ingredients needed to claim each card type. The cost is a
+# threshold check only; nothing is spent.
+CLAIM_THRESHOLDS: dict[str, int] = {
+    "karaoke": 3,
+    "store": 1,
+    "refresher": 2,
+    "cup_doubler": 3,
+    "specialist": 2,
+    "free_action": 3,
+}
+
 
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
@@ -66,7 +84,7 @@ def _mixer_ingredient(mixer_type: str) -> Ingredient:
 def _available_spirits(ps: "PlayerState", spirit_type: str) -> int:
     """Count spirits available from bladder."""
     spirit_ing = _spirit_ingredient(spirit_type)
-    count = sum(1 for i in ps.bladder if i == spirit_ing)
+    count = ps.bladder.count(spirit_ing)
     return count
 
 
@@ -87,14 +105,11 @@ def _consume_spirits(ps: "PlayerState", spirit_type: str, count: int) -> None:
     remaining -= removed
     # Then from store cards
     if remaining > 0:
-        for card_dict in ps.cards:
-            if (
-                card_dict.get("card_type") == "store"
-                and card_dict.get("spirit_type") == spirit_type.upper()
-            ):
-                stored = card_dict.get("stored_spirits", [])
+        for card in ps.cards.store_cards():
+            if card.spirit_type == spirit_type.upper():
+                stored = card.stored_spirits
                 to_remove = min(remaining, len(stored))
-                card_dict["stored_spirits"] = stored[to_remove:]
+                card.stored_spirits = stored[to_remove:]
                 remaining -= to_remove
                 if remaining == 0:
                     break
@@ -102,10 +117,17 @@ def _consume_spirits(ps: "PlayerState", spirit_type: str, count: int) -> None:
 
 def _deep_copy_state(gs: GameState) -> GameState:
     """Return a deep copy of the game state so actions are free of side effects."""
-    import copy
+    return gs.clone()
 
-    d = copy.deepcopy(gs.to_dict())
-    return GameState.from_dict(d)
+
+def _begin_action(gs: GameState) -> GameState:
+    """Return the working state for an action.
+
+    A copy-on-write view of ``gs``: every mutation below must go through the
+    ``own_*`` accessors so the caller's state is never touched and only the
+    parts an action changes are copied.
+    """
+    return gs.copy_on_write()
 
 
 def _require_turn(gs: GameState, player_id: UUID):
@@ -160,13 +182,6 @@ def _advance_turn(gs: GameState) -> GameState:
 
 # ─── Free action card helpers ────────────────────────────────────────────────
 
-_FREE_ACTION_TYPE_MAP: dict[str, str] = {
-    "RUM": "take_ingredients",
-    "WHISKEY": "reroll_specials",
-    "VODKA": "sell_cup",
-    "GIN": "go_for_a_wee",
-}
-
 # Game modes that turn a specific action type into a free additional action,
 # regardless of whether the player holds the matching FreeActionCard. Each
 # such free action remains once-per-turn, mirroring FreeActionCard semantics.
@@ -180,13 +195,7 @@ def _available_free_actions(
     gs: GameState, ps: "PlayerState", used: list[str]
 ) -> set[str]:
     """Return the set of free action types available to the player this turn."""
-    actions = set()
-    for card_dict in ps.cards:
-        if card_dict.get("card_type") == "free_action":
-            spirit = card_dict.get("spirit_type")
-            action_type = _FREE_ACTION_TYPE_MAP.get(spirit) if spirit else None
-            if action_type and action_type not in used:
-                actions.add(action_type)
+    actions = set(ps.cards.free_action_types.difference(used))
     for mode, action_type in _MODE_FREE_ACTION_MAP.items():
         if gs.has_mode(mode) and action_type not in used:
             actions.add(action_type)
@@ -264,15 +273,78 @@ def _require_no_take_in_progress(gs: GameState):
         )
 
 
+# ─── Random outcomes ──────────────────────────────────────────────────────────
+#
+# Every random event goes through one of these helpers, which log the outcome
+# on ``gs.outcomes`` for the move record. When replaying a recorded move
+# (app.replay), ``gs.outcome_script`` holds the original outcomes: the helpers
+# still consume the random stream exactly as live play does, then use the
+# recorded outcome in place of the one drawn.
+#
+# Each helper draws exactly one ``rng.random()``, whatever it draws, so a
+# move moves the stream on by OUTCOME_WORDS words per recorded outcome. The
+# move history relies on that to leave the stream out of its deltas (see
+# state_delta.move_delta).
+OUTCOME_WORDS = 2
+
+
+def _scripted(gs: GameState, kind: str) -> str | None:
+    """Next recorded outcome of ``kind`` when replaying, else None."""
+    script = gs.outcome_script
+    if script is None:
+        return None
+    if not script or script[0][0] != kind:
+        found = script[0][0] if script else "nothing"
+        raise GameException(
+            f"Replay diverged: expected a {kind} outcome, recorded {found}",
+            status_code=500,
+        )
+    return script.popleft()[1]
+
+
+def _draw_ingredient(gs: GameState) -> Ingredient:
+    """Remove and return a random token from the bag (which must be non-empty)."""
+    bag = gs.own_bag()
+    drawn = bag.draw(gs.own_rng())
+    recorded = _scripted(gs, "ingredient")
+    if recorded is not None and recorded != drawn.name:
+        bag.append(drawn)
+        drawn = Ingredient[recorded]
+        bag.remove(drawn)
+    if gs.outcomes is not None:
+        gs.outcomes.append(["ingredient", drawn.name])
+    return drawn
+
+
+def _roll_special(gs: GameState) -> SpecialType:
+    """Roll the special die."""
+    rolled = SpecialType.roll(gs.own_rng())
+    recorded = _scripted(gs, "special")
+    if recorded is not None:
+        rolled = SpecialType(recorded)
+    if gs.outcomes is not None:
+        gs.outcomes.append(["special", rolled.value])
+    return rolled
+
+
+def _draw_card_index(gs: GameState, deck: list[dict]) -> int:
+    """Index of a random card in ``deck`` (which must be non-empty)."""
+    index = int(gs.own_rng().random() * len(deck))
+    recorded = _scripted(gs, "card")
+    if recorded is not None and deck[index]["id"] != recorded:
+        index = next(i for i, card in enumerate(deck) if card["id"] == recorded)
+    if gs.outcomes is not None:
+        gs.outcomes.append(["card", deck[index]["id"]])
+    return index
+
+
 def _replenish_display(gs: GameState):
     """Randomly draw from the bag to fill the open display up to OPEN_DISPLAY_SIZE."""
     deficit = OPEN_DISPLAY_SIZE - len(gs.open_display)
     if deficit > 0 and gs.bag_contents:
         fill = min(deficit, len(gs.bag_contents))
-        chosen = random.sample(gs.bag_contents, fill)
-        for item in chosen:
-            gs.bag_contents.remove(item)
-        gs.open_display.extend(chosen)
+        chosen = [_draw_ingredient(gs) for _ in range(fill)]
+        gs.own_display().extend(chosen)
 
 
 def _return_player_ingredients_to_bag(gs: GameState, ps: PlayerState) -> None:
@@ -281,30 +353,30 @@ def _return_player_ingredients_to_bag(gs: GameState, ps: PlayerState) -> None:
     Covers drunk ingredients (bladder), ingredients sitting in the player's
     cups, and spirits currently stored on any of the player's Store cards.
     Each source is cleared after being added to the bag. Called when a
-    player is eliminated so their ingredients re-enter play.
+    player is eliminated so their ingredients re-enter play. ``ps`` must be
+    owned by ``gs`` (see GameState.own_player).
     """
+    bag = gs.own_bag()
     # Bladder — ingredients the player has drunk
     if ps.bladder:
-        gs.bag_contents.extend(ps.bladder)
+        bag.extend(ps.bladder)
         ps.bladder = []
 
     # Cups — ingredients sitting in the player's cups
     for cup in ps.cups:
         if cup.ingredients:
-            gs.bag_contents.extend(cup.ingredients)
+            bag.extend(cup.ingredients)
             cup.ingredients = []
 
     # Store cards — spirits stashed on ability cards
-    for card_dict in ps.cards:
-        if card_dict.get("card_type") == "store":
-            stored = card_dict.get("stored_spirits", [])
-            for spirit_name in stored:
-                gs.bag_contents.append(_spirit_ingredient(spirit_name))
-            card_dict["stored_spirits"] = []
+    for card in ps.cards.store_cards():
+        for spirit_name in card.stored_spirits:
+            bag.append(_spirit_ingredient(spirit_name))
+        card.stored_spirits = []
 
 
 def _check_elimination(gs: GameState, player_id: UUID):
-    ps = gs.player_states[player_id]
+    ps = gs.own_player(player_id)
     was_active = ps.status == "active"
     if ps.drunk_level > MAX_DRUNK_LEVEL:
         ps.status = "hospitalised"
@@ -387,16 +459,11 @@ def _apply_drunk_modifier(
     Refresher cards make their mixer type always contribute -1 (hot mixers),
     even when spirits are consumed. Plain mixers only sober when no spirits.
     """
-    ps = gs.player_states[player_id]
+    ps = gs.own_player(player_id)
     spirits = [i for i in ingredients if i in _SPIRITS]
 
-    # Collect mixer types covered by player's refresher cards
-    refresher_mixer_types: set[str] = set()
-    for card_dict in ps.cards:
-        if card_dict.get("card_type") == "refresher":
-            mt = card_dict.get("mixer_type")
-            if mt:
-                refresher_mixer_types.add(mt.upper())
+    # Mixer types covered by player's refresher cards
+    refresher_mixer_types = ps.cards.refresher_mixers
 
     hot_mixers = [
         i for i in ingredients if i in _MIXERS and i.name in refresher_mixer_types
@@ -419,19 +486,18 @@ def _drink_ingredient(gs: GameState, player_id: UUID, ingredient: Ingredient):
 
     Callers must call _apply_drunk_modifier after processing the full batch.
     """
-    ps = gs.player_states[player_id]
+    ps = gs.own_player(player_id)
     ps.bladder.append(ingredient)
 
 
 def _replace_card(gs: GameState, row: CardRow):
-    """Draw one random card from the deck into the row, if deck has cards."""
-    if gs._deck_dicts:
-        import random
-
-        from app.card import Card
+    """Draw one random card from the deck into the row, if deck has cards.
 
-        index = random.randrange(len(gs._deck_dicts))
-        card_dict = gs._deck_dicts.pop(index)
+    ``row`` must come from ``gs.own_card_rows()``.
+    """
+    if gs._deck_dicts:
+        deck = gs.own_deck()
+        card_dict = deck.pop(_draw_card_index(gs, deck))
         row.cards.append(Card.from_dict(card_dict))
 
 
@@ -450,9 +516,9 @@ def draw_from_bag(
     source='pending' assignments to assign each drawn ingredient to a cup or drink.
     No other action is permitted while bag_draw_pending is non-empty.
     """
-    gs = _deep_copy_state(gs)
+    gs = _begin_action(gs)
     _require_turn(gs, player_id)
-    ps = gs.player_states[player_id]
+    ps = gs.own_player(player_id)
     _require_active(ps)
 
     if gs.bag_draw_pending:
@@ -490,11 +556,7 @@ def draw_from_bag(
             status_code=409,
         )
 
-    drawn: list[Ingredient] = []
-    for _ in range(count):
-        ingredient = random.choice(gs.bag_contents)
-        gs.bag_contents.remove(ingredient)
-        drawn.append(ingredient)
+    drawn: list[Ingredient] = [_draw_ingredient(gs) for _ in range(count)]
 
     gs.bag_draw_pending = drawn
     payload = {"drawn": [i.name for i in drawn]}
@@ -524,9 +586,9 @@ def take_ingredients(
     Returns (new_game_state, move_payload) where move_payload includes
     "turn_complete": bool indicating whether the turn has ended.
     """
-    gs = _deep_copy_state(gs)
+    gs = _begin_action(gs)
     _require_turn(gs, player_id)
-    ps = gs.player_states[player_id]
+    ps = gs.own_player(player_id)
     _require_active(ps)
 
     # First batch of a take must pass the same eligibility check that other
@@ -586,7 +648,7 @@ def take_ingredients(
                 raise GameException(
                     f"{raw_name} is not in the open display", status_code=400
                 )
-            gs.open_display.remove(ingredient)
+            gs.own_display().remove(ingredient)
         elif source == "pending":
             # Use the next ingredient from the pending draw (already removed from bag)
             if not gs.bag_draw_pending:
@@ -604,22 +666,21 @@ def take_ingredients(
                 )
             if not gs.bag_contents:
                 raise GameException("The bag is empty", status_code=400)
-            ingredient = random.choice(gs.bag_contents)
-            gs.bag_contents.remove(ingredient)
+            ingredient = _draw_ingredient(gs)
             raw_name = ingredient.name
 
         record: dict = {"ingredient": raw_name, "source": source}
 
         if ingredient.value.special:
             # Special token: roll the die
-            rolled = SpecialType.roll()
+            rolled = _roll_special(gs)
             record["disposition"] = "special"
             record["special_type"] = rolled.value
             if rolled != SpecialType.NOTHING:
                 ps.special_ingredients.append(rolled.value)
             else:
                 # Token returned to bag
-                gs.bag_contents.append(ingredient)
+                gs.own_bag().append(ingredient)
         elif disposition == "cup":
             if cup_index not in (0, 1):
                 raise GameException("cup_index must be 0 or 1", status_code=400)
@@ -676,6 +737,27 @@ def take_ingredients(
     return gs, payload
 
 
+def _sale_points(ps: PlayerState, cup: Cup, declared_specials: list[str]) -> int | None:
+    """Points for selling ``cup`` with ``declared_specials``, or None if unsellable.
+
+    Includes the CupDoubler and Specialist bonuses. Shared with app.moves.
+    """
+    pts, cocktail = drink_score(cup.ingredients, declared_specials)
+    if pts is None or cocktail:
+        return pts
+
+    # CupDoubler doubling: non-cocktail drinks from a bendy-straw cup score double
+    if cup.has_cup_doubler:
+        pts *= 2
+
+    # Specialist bonus: +2 per matching spirit type, non-cocktails only, after doubling
+    specialist_spirit_types = ps.cards.specialist_spirits
+    if specialist_spirit_types:
+        cup_spirit_types = {i.name for i in cup.ingredients if i in _SPIRITS}
+        pts += len(specialist_spirit_types & cup_spirit_types) * 2
+    return pts
+
+
 def _sell_one_cup(
     ps: PlayerState,
     gs: GameState,
@@ -688,7 +770,8 @@ def _sell_one_cup(
     ``mat_remaining`` is mutated to reflect specials consumed by this sale —
     callers selling multiple cups in one action share the same list so the
     same special token cannot be declared twice.
-    Mutates ``ps`` (cup, points, specials) and ``gs.bag_contents``.
+    Mutates ``ps`` (cup, points, specials) and ``gs.bag_contents``; ``ps``
+    must be owned by ``gs``.
     Raises GameException on validation failure.
     """
     if cup_index not in (0, 1):
@@ -706,32 +789,17 @@ def _sell_one_cup(
             )
         mat_remaining.remove(s)
 
-    pts = drink_points(cup.ingredients, declared_specials)
+    pts = _sale_points(ps, cup, declared_specials)
     if pts is None:
         raise GameException(
             "This combination of ingredients cannot be sold", status_code=400
         )
 
-    # CupDoubler doubling: non-cocktail drinks from a bendy-straw cup score double
-    cocktail = is_cocktail(cup.ingredients, declared_specials)
-    if cup.has_cup_doubler and not cocktail:
-        pts *= 2
-
-    # Specialist bonus: +2 per matching spirit type, non-cocktails only, after doubling
-    if not cocktail:
-        specialist_spirit_types = {
-            cd.get("spirit_type")
-            for cd in ps.cards
-            if cd.get("card_type") == "specialist" and cd.get("spirit_type")
-        }
-        cup_spirit_types = {i.name for i in cup.ingredients if i in _SPIRITS}
-        matching = specialist_spirit_types & cup_spirit_types
-        pts += len(matching) * 2
-
     sold_ingredients = list(cup.ingredients)
-    gs.bag_contents.extend(sold_ingredients)
+    bag = gs.own_bag()
+    bag.extend(sold_ingredients)
     for s in declared_specials:
-        gs.bag_contents.append(Ingredient.SPECIAL)
+        bag.append(Ingredient.SPECIAL)
         ps.special_ingredients.remove(s)
 
     cup.ingredients = []
@@ -759,9 +827,9 @@ def sell_cup(
     game mode is active. Each cup is validated and scored independently;
     points stack and a single ``_finish_turn_action`` call advances the turn.
     """
-    gs = _deep_copy_state(gs)
+    gs = _begin_action(gs)
     _require_turn(gs, player_id)
-    ps = gs.player_states[player_id]
+    ps = gs.own_player(player_id)
     _require_active(ps)
     _require_no_take_in_progress(gs)
 
@@ -823,9 +891,9 @@ def drink_cup(
     cup_index: int,
 ) -> tuple[GameState, dict]:
     """DrinkCup action."""
-    gs = _deep_copy_state(gs)
+    gs = _begin_action(gs)
     _require_turn(gs, player_id)
-    ps = gs.player_states[player_id]
+    ps = gs.own_player(player_id)
     _require_active(ps)
     _require_no_take_in_progress(gs)
 
@@ -862,9 +930,9 @@ def go_for_a_wee(
     player_id: UUID,
 ) -> tuple[GameState, dict]:
     """GoForAWee action."""
-    gs = _deep_copy_state(gs)
+    gs = _begin_action(gs)
     _require_turn(gs, player_id)
-    ps = gs.player_states[player_id]
+    ps = gs.own_player(player_id)
     _require_active(ps)
     _require_no_take_in_progress(gs)
 
@@ -875,7 +943,7 @@ def go_for_a_wee(
 
     excreted = list(ps.bladder)
     # Return bladder contents to the bag
-    gs.bag_contents.extend(excreted)
+    gs.own_bag().extend(excreted)
     ps.bladder = []
     # Sober up 1 level
     ps.drunk_level = max(0, ps.drunk_level - 1)
@@ -902,16 +970,16 @@ def claim_card(
     cup_index: required for cup_doubler cards (0 or 1).
     spirit_type: required for cup_doubler cards (declares which spirit type was used to pay).
     """
-    gs = _deep_copy_state(gs)
+    gs = _begin_action(gs)
     _require_turn(gs, player_id)
-    ps = gs.player_states[player_id]
+    ps = gs.own_player(player_id)
     _require_active(ps)
     _require_no_take_in_progress(gs)
 
     # Find the card in a row
     target_card: Card | None = None
     target_row: CardRow | None = None
-    for row in gs.card_rows:
+    for row in gs.own_card_rows():
         for card in row.cards:
             if card.id == card_id:
                 target_card = card
@@ -930,9 +998,10 @@ def claim_card(
         if target_card.spirit_type is None:
             raise GameException("Karaoke card has no spirit type", status_code=500)
         available = _available_spirits(ps, target_card.spirit_type)
-        if available < 3:
+        need = CLAIM_THRESHOLDS[card_type]
+        if available < need:
             raise GameException(
-                f"Need 3 {target_card.spirit_type} spirits available; have {available}",
+                f"Need {need} {target_card.spirit_type} spirits available; have {available}",
                 status_code=400,
             )
 
@@ -940,10 +1009,11 @@ def claim_card(
         if target_card.spirit_type is None:
             raise GameException("Store card has no spirit type", status_code=500)
         spirit_ing = _spirit_ingredient(target_card.spirit_type)
-        bladder_count = sum(1 for i in ps.bladder if i == spirit_ing)
-        if bladder_count < 1:
+        bladder_count = ps.bladder.count(spirit_ing)
+        need = CLAIM_THRESHOLDS[card_type]
+        if bladder_count < need:
             raise GameException(
-                f"Need at least 1 {target_card.spirit_type} spirit in bladder; have {bladder_count}",
+                f"Need at least {need} {target_card.spirit_type} spirit in bladder; have {bladder_count}",
                 status_code=400,
             )
 
@@ -951,10 +1021,11 @@ def claim_card(
         if target_card.mixer_type is None:
             raise GameException("Refresher card has no mixer type", status_code=500)
         mixer_ing = _mixer_ingredient(target_card.mixer_type)
-        bladder_mixer_count = sum(1 for i in ps.bladder if i == mixer_ing)
-        if bladder_mixer_count < 2:
+        bladder_mixer_count = ps.bladder.count(mixer_ing)
+        need = CLAIM_THRESHOLDS[card_type]
+        if bladder_mixer_count < need:
             raise GameException(
-                f"Need 2 {target_card.mixer_type} mixers in bladder; have {bladder_mixer_count}",
+                f"Need {need} {target_card.mixer_type} mixers in bladder; have {bladder_mixer_count}",
                 status_code=400,
             )
 
@@ -971,10 +1042,11 @@ def claim_card(
             )
         # Spec: bladder only (cannot spend from store cards)
         spirit_ing = _spirit_ingredient(spirit_type)
-        bladder_count = sum(1 for i in ps.bladder if i == spirit_ing)
-        if bladder_count < 3:
+        bladder_count = ps.bladder.count(spirit_ing)
+        need = CLAIM_THRESHOLDS[card_type]
+        if bladder_count < need:
             raise GameException(
-                f"Need 3 {spirit_type} spirits in bladder; have {bladder_count}",
+                f"Need {need} {spirit_type} spirits in bladder; have {bladder_count}",
                 status_code=400,
             )
 
@@ -983,10 +1055,11 @@ def claim_card(
             raise GameException("Specialist card has no spirit type", status_code=500)
         # Spec: bladder only, threshold check, requires 2 matching spirits
         spirit_ing = _spirit_ingredient(target_card.spirit_type)
-        bladder_count = sum(1 for i in ps.bladder if i == spirit_ing)
-        if bladder_count < 2:
+        bladder_count = ps.bladder.count(spirit_ing)
+        need = CLAIM_THRESHOLDS[card_type]
+        if bladder_count < need:
             raise GameException(
-                f"Need 2 {target_card.spirit_type} spirits in bladder; have {bladder_count}",
+                f"Need {need} {target_card.spirit_type} spirits in bladder; have {bladder_count}",
                 status_code=400,
             )
 
@@ -995,10 +1068,11 @@ def claim_card(
             raise GameException("Free action card has no spirit type", status_code=500)
         # Spec: 3 bladder spirits of the matching type (threshold check only)
         spirit_ing = _spirit_ingredient(target_card.spirit_type)
-        bladder_count = sum(1 for i in ps.bladder if i == spirit_ing)
-        if bladder_count < 3:
+        bladder_count = ps.bladder.count(spirit_ing)
+        need = CLAIM_THRESHOLDS[card_type]
+        if bladder_count < need:
             raise GameException(
-                f"Need 3 {target_card.spirit_type} spirits in bladder; have {bladder_count}",
+                f"Need {need} {target_card.spirit_type} spirits in bladder; have {bladder_count}",
                 status_code=400,
             )
 
@@ -1009,34 +1083,35 @@ def claim_card(
     if card_type == "karaoke":
         ps.points += 5
         ps.karaoke_cards_claimed += 1
-        ps.cards.append(target_card.to_dict())
+        ps.cards.append(target_card)
 
     elif card_type == "store":
         # Effect: transfer ALL matching spirits from bladder to stored_spirits on the card
         spirit_ing = _spirit_ingredient(target_card.spirit_type)
         transferred = [i for i in ps.bladder if i == spirit_ing]
         ps.bladder = [i for i in ps.bladder if i != spirit_ing]
-        card_dict = target_card.to_dict()
-        card_dict["stored_spirits"] = [i.name for i in transferred]
-        ps.cards.append(card_dict)
+        # The row's Card may be shared with earlier states, so store a copy
+        store_card = target_card.copy()
+        store_card.stored_spirits = [i.name for i in transferred]
+        ps.cards.append(store_card)
         ps.points += 1
 
     elif card_type == "refresher":
-        ps.cards.append(target_card.to_dict())
+        ps.cards.append(target_card)
         ps.points += 1
 
     elif card_type == "cup_doubler":
         cup = ps.cups[cup_index]
         cup.has_cup_doubler = True
-        ps.cards.append(target_card.to_dict())
+        ps.cards.append(target_card)
         ps.points += 2
 
     elif card_type == "specialist":
-        ps.cards.append(target_card.to_dict())
+        ps.cards.append(target_card)
         ps.points += 2
 
     elif card_type == "free_action":
-        ps.cards.append(target_card.to_dict())
+        ps.cards.append(target_card)
         ps.points += 2
 
     # Replace the claimed card's slot from the deck (if any cards remain)
@@ -1068,9 +1143,9 @@ def drink_stored_spirit(
     Players can use this at any time during their turn to increase drunk level
     (e.g. to qualify for RefreshCardRow).
     """
-    gs = _deep_copy_state(gs)
+    gs = _begin_action(gs)
     _require_turn(gs, player_id)
-    ps = gs.player_states[player_id]
+    ps = gs.own_player(player_id)
     _require_active(ps)
     _require_no_take_in_progress(gs)
 
@@ -1080,11 +1155,11 @@ def drink_stored_spirit(
     if store_card_index < 0 or store_card_index >= len(ps.cards):
         raise GameException("Invalid store card index", status_code=400)
 
-    card_dict = ps.cards[store_card_index]
-    if card_dict.get("card_type") != "store":
+    card = ps.cards[store_card_index]
+    if card.card_type != "store":
         raise GameException("Card at that index is not a store card", status_code=400)
 
-    stored = card_dict.get("stored_spirits", [])
+    stored = card.stored_spirits
     if len(stored) < count:
         raise GameException(
             f"Store card only has {len(stored)} spirit(s); requested {count}",
@@ -1093,10 +1168,10 @@ def drink_stored_spirit(
 
     # Remove spirits from store card and add to bladder
     drunk_ingredients: list[Ingredient] = []
-    spirit_type = card_dict.get("spirit_type", "")
+    spirit_type = card.spirit_type or ""
     spirit_ing = _spirit_ingredient(spirit_type)
     for _ in range(count):
-        card_dict["stored_spirits"] = card_dict["stored_spirits"][:-1]
+        card.stored_spirits = card.stored_spirits[:-1]
         _drink_ingredient(gs, player_id, spirit_ing)
         drunk_ingredients.append(spirit_ing)
 
@@ -1131,20 +1206,20 @@ def use_stored_spirit(
 
     Moves one spirit from a store card into a cup for selling.
     """
-    gs = _deep_copy_state(gs)
+    gs = _begin_action(gs)
     _require_turn(gs, player_id)
-    ps = gs.player_states[player_id]
+    ps = gs.own_player(player_id)
     _require_active(ps)
     _require_no_take_in_progress(gs)
 
     if store_card_index < 0 or store_card_index >= len(ps.cards):
         raise GameException("Invalid store card index", status_code=400)
 
-    card_dict = ps.cards[store_card_index]
-    if card_dict.get("card_type") != "store":
+    card = ps.cards[store_card_index]
+    if card.card_type != "store":
         raise GameException("Card at that index is not a store card", status_code=400)
 
-    stored = card_dict.get("stored_spirits", [])
+    stored = card.stored_spirits
     if len(stored) < 1:
         raise GameException("Store card has no spirits remaining", status_code=400)
 
@@ -1159,7 +1234,7 @@ def use_stored_spirit(
         )
 
     # Pop one spirit from store card and add to cup
-    spirit_name = card_dict["stored_spirits"].pop()
+    spirit_name = card.stored_spirits.pop()
     spirit_ing = _spirit_ingredient(spirit_name)
     cup.ingredients.append(spirit_ing)
 
@@ -1183,9 +1258,9 @@ def reroll_specials(
     added.  If the roll is "nothing", the special is simply lost (nothing is
     returned to the bag).  This consumes the player's turn action.
     """
-    gs = _deep_copy_state(gs)
+    gs = _begin_action(gs)
     _require_turn(gs, player_id)
-    ps = gs.player_states[player_id]
+    ps = gs.own_player(player_id)
     _require_active(ps)
     _require_no_take_in_progress(gs)
 
@@ -1210,7 +1285,7 @@ def reroll_specials(
     # Roll once per chosen special
     results: list[str | None] = []
     for _ in chosen_specials:
-        rolled = SpecialType.roll()
+        rolled = _roll_special(gs)
         if rolled != SpecialType.NOTHING:
             ps.special_ingredients.append(rolled.value)
             results.append(rolled.value)
@@ -1237,7 +1312,7 @@ def refresh_card_row(
     Row 1 (karaoke row) cannot be refreshed.
     All cards in the target row are removed to the discard pile and replaced from deck.
     """
-    gs = _deep_copy_state(gs)
+    gs = _begin_action(gs)
     _require_turn(gs, player_id)
     ps = gs.player_states[player_id]
     _require_active(ps)
@@ -1257,7 +1332,7 @@ def refresh_card_row(
         )
 
     target_row: CardRow | None = None
-    for row in gs.card_rows:
+    for row in gs.own_card_rows():
         if row.position == row_position:
             target_row = row
             break
@@ -1267,7 +1342,7 @@ def refresh_card_row(
 
     # Remove ALL cards → discard pile (never reshuffled)
     removed = list(target_row.cards)
-    gs.discard.extend(c.to_dict() for c in removed)
+    gs.own_discard().extend(c.to_dict() for c in removed)
     target_row.cards = []
 
     # Replace removed slots from deck
@@ -1294,10 +1369,10 @@ def quit_game(
     that player wins by last-player-standing. If it was the quitting player's
     turn, the turn advances to the next active player.
     """
-    gs = _deep_copy_state(gs)
-    ps = gs.player_states.get(player_id)
-    if ps is None:
+    gs = _begin_action(gs)
+    if player_id not in gs.player_states:
         raise GameException("Player not found in this game", status_code=404)
+    ps = gs.own_player(player_id)
     _require_active(ps)
 
     ps.status = "quit"
@@ -1326,7 +1401,7 @@ def end_turn(
 
     Only available after the main action has been taken but free actions remain.
     """
-    gs = _deep_copy_state(gs)
+    gs = _begin_action(gs)
     _require_turn(gs, player_id)
     ps = gs.player_states[player_id]
     _require_active(ps)
@@ -1351,16 +1426,30 @@ def end_turn(
     return gs, payload
 
 
+def skip_turn(gs: GameState) -> tuple[GameState, dict]:
+    """SkipTurn — the current player's turn passes without an action.
+
+    Used by the bot runner when a bot has no valid action to take.
+    """
+    gs = _begin_action(gs)
+    gs.turn_number += 1
+    _advance_turn(gs)
+    _check_last_round_complete(gs)
+
+    payload = {"reason": "no_valid_actions"}
+    return gs, payload
+
+
 def cancel_game(
     gs: GameState,
 ) -> tuple[GameState, dict]:
     """CancelGame — the host cancels the game. No winner is declared."""
-    gs = _deep_copy_state(gs)
+    gs = _begin_action(gs)
 
     # Mark all active players as quit
-    for ps in gs.player_states.values():
+    for pid, ps in list(gs.player_states.items()):
         if not ps.is_eliminated:
-            ps.status = "quit"
+            gs.own_player(pid).status = "quit"
 
     payload = {"cancelled": True}
     return gs, payload
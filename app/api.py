@@ -1,30 +1,51 @@
+import asyncio
+import base64
+import json
 import os
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from uuid import UUID
 from fastapi import FastAPI, Query, Request
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from app.bot_jobs import bot_jobs
 from app.gameManager import GameManager
+from app.game_events import game_events
 from app.game import GameException, Status
+from app.GameState import GameState, state_view
+from app.state_patch import view_patch
 from app.UserManager import UserManager, UserManagerPermissionError
 from app.JWTHandler import JWTHandler
 from app.logging_config import setup_logging, CanonicalLogMiddleware
+from app.async_db import adb
 from app.db import db
 from app import push
+from app.moves import legal_moves
 from starlette.middleware.base import BaseHTTPMiddleware
 from pydantic import BaseModel
 import traceback
 
 from app.user import TokenUser, UserValidationError
-from typing import Optional, List
+from typing import Any, Optional, List
 
 _VALID_STATUSES = {"NEW", "STARTED", "ENDED"}
+# How long shutdown waits for queued bot turns.
+BOT_DRAIN_SECONDS = 30
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Bot turns run outside any request (app.bot_jobs); let those under way
+    # finish, as uvicorn lets in-flight requests finish.
+    await asyncio.to_thread(bot_jobs.drain, BOT_DRAIN_SECONDS)
+
+
+app = FastAPI(lifespan=lifespan)
 gameManager = GameManager()
 userManager = UserManager()
 jwt_handler = JWTHandler()
@@ -55,10 +76,10 @@ async def manifest():
 
 @app.post("/refresh-token")
 async def refresh_token(request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
-    user = userManager.get_user(token_user.id)
+    user = await adb.run(userManager.get_user, token_user.id)
     if not user:
         return JSONResponse(status_code=401, content={"error": "User not found"})
     token = jwt_handler.sign(user)
@@ -112,7 +133,9 @@ def _verify_token(request: Request) -> TokenUser | None:
     return jwt_handler.verify(token)
 
 
-def _require_auth(request: Request) -> tuple[TokenUser | None, JSONResponse | None]:
+async def _require_auth(
+    request: Request,
+) -> tuple[TokenUser | None, JSONResponse | None]:
     """Return (token_user, None) on success or (None, error_response) on failure.
 
     Performs both cryptographic JWT verification and server-side invalidation check:
@@ -128,7 +151,7 @@ def _require_auth(request: Request) -> tuple[TokenUser | None, JSONResponse | No
     # last logout. iat_us in the JWT is a float with microsecond precision so that
     # tokens issued after a logout are distinguishable even within the same second.
     if token_user.iat is not None:
-        user = userManager.get_user(token_user.id)
+        user = await adb.run(userManager.get_user, token_user.id)
         if user and user.logged_out_at:
             try:
                 logged_out_dt = datetime.fromisoformat(user.logged_out_at)
@@ -239,10 +262,10 @@ class PushSubscriptionRequest(BaseModel):
 
 @app.post("/v1/push-subscriptions")
 async def save_push_subscription(body: PushSubscriptionRequest, request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
-    db.save_push_subscription(
+    await adb.save_push_subscription(
         user_id=token_user.id,
         endpoint=body.endpoint,
         p256dh=body.keys.p256dh,
@@ -254,25 +277,49 @@ async def save_push_subscription(body: PushSubscriptionRequest, request: Request
 
 @app.delete("/v1/push-subscriptions")
 async def delete_push_subscription(request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
     data = await request.json()
     endpoint = data.get("endpoint")
     if not endpoint:
         return JSONResponse(status_code=400, content={"error": "endpoint required"})
-    db.delete_push_subscription(endpoint)
+    await adb.delete_push_subscription(endpoint)
     logger.info("Push subscription deleted for user %s", token_user.username)
     return JSONResponse(content={"ok": True})
 
 
+def _encode_cursor(game) -> str:
+    """Opaque list cursor for the page after ``game``: its (created_at, id)."""
+    raw = json.dumps([str(game.created), str(game.id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str] | None:
+    """The cursor's (created_at, id), re-formatted as they are built into filters."""
+    try:
+        created_at, game_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at).isoformat(), str(UUID(game_id))
+    except (ValueError, TypeError):
+        return None
+
+
 @app.get("/v1/games")
 async def list_games(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
     status: Optional[str] = Query(default=None),
     player_id: Optional[str] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
 ):
+    """List games, newest first, as lightweight summaries.
+
+    Each game's ``game_state`` is its summary (turn_number, player_turn,
+    winner, points, game_modes), not the full state. Pages are numbered
+    (``page``, with a ``total``), or follow ``cursor`` — the ``next_cursor``
+    of the previous page — which stays fast however deep the list goes and
+    skips the count (``total`` is null).
+    """
     status_list: Optional[List[str]] = None
     if status:
         status_list = [s.strip().upper() for s in status.split(",") if s.strip()]
@@ -291,8 +338,19 @@ async def list_games(
         except ValueError:
             return JSONResponse(status_code=400, content={"error": "Invalid player_id"})
 
-    games, total = gameManager.list_games(
-        page=page, page_size=page_size, status=status_list, player_id=player_uuid
+    after: Optional[tuple[str, str]] = None
+    if cursor:
+        after = _decode_cursor(cursor)
+        if after is None:
+            return JSONResponse(status_code=400, content={"error": "Invalid cursor"})
+
+    games, total, has_more = await adb.run(
+        gameManager.list_games,
+        page=page,
+        page_size=page_size,
+        status=status_list,
+        player_id=player_uuid,
+        after=after,
     )
 
     # Resolve usernames in a single batch query
@@ -300,9 +358,8 @@ async def list_games(
     for game in games:
         all_ids.add(game.host)
         all_ids.update(game.players)
-    user_lookup: dict[UUID, str] = {
-        u.id: (u.username or "Unknown") for u in userManager.get_users_by_ids(all_ids)
-    }
+    users = await adb.run(userManager.get_users_by_ids, all_ids)
+    user_lookup: dict[UUID, str] = {u.id: (u.username or "Unknown") for u in users}
 
     def enrich(game) -> dict:
         d = game.to_dict()
@@ -312,49 +369,85 @@ async def list_games(
         ]
         return d
 
-    logger.info("Listing %d games (page %d, total %d)", len(games), page, total)
+    logger.info("Listing %d games (page %d, total %s)", len(games), page, total)
     return JSONResponse(
         content={
             "games": [enrich(game) for game in games],
             "page": page,
             "page_size": page_size,
             "total": total,
+            "next_cursor": _encode_cursor(games[-1]) if has_more else None,
         }
     )
 
 
 @app.get("/v1/games/{game_id}")
 async def get_game(game_id: str, request: Request):
-    token_user, err = _require_auth(request)
+    # Non-members may view a game that has not yet started so they can join
+    # from the lobby. Once started or ended, only members may view it.
+    token_user, header, err = await _game_header_precheck(game_id, request, lobby=True)
     if err:
         return err
     try:
-        game = gameManager.get_game_by_id(UUID(game_id))
+        pending_undo = await adb.run(gameManager.get_pending_undo, UUID(game_id))
+        # The state is projected for each viewer (GameState.to_view).
+        etag = _etag(
+            "game", header["state_version"], token_user.id, _undo_tag(pending_undo)
+        )
+        # A poll may be all that notices a game stuck on an eliminated
+        # player's turn (see GameManager.get_game_by_id), so check first.
+        if _etag_matches(request, etag) and not (
+            header["status"] == Status.STARTED.name
+            and await adb.run(
+                gameManager.heal_stuck_turn, UUID(game_id), header["state_version"]
+            )
+        ):
+            return _not_modified(etag)
+        game = await adb.run(gameManager.get_game_by_id, UUID(game_id))
         if game is None:
             return JSONResponse(status_code=404, content={"error": "Game not found"})
-        # Non-members may view a game that has not yet started so they can join
-        # from the lobby. Once started or ended, only members may view it.
-        if token_user.id not in game.players and game.status != Status.NEW:
-            return JSONResponse(
-                status_code=403,
-                content={"error": "User is not a member of this game"},
-            )
         logger.info(f"{token_user.username} get game info for ID {game_id}")
-        result = game.to_dict()
-        result["pending_undo"] = gameManager.get_pending_undo(game.id)
-        return JSONResponse(content=result)
+        result = game.to_view(token_user.id)
+        result["pending_undo"] = pending_undo
+        etag = _etag("game", game.state_version, token_user.id, _undo_tag(pending_undo))
+        return JSONResponse(content=result, headers=_cache_headers(etag))
     except Exception:
         logger.exception("Failed to validate user on get game")
         return JSONResponse(status_code=500, content={"error": "Failed to get game"})
 
 
+@app.get("/v1/games/{game_id}/events")
+async def game_event_stream(game_id: str, request: Request):
+    """Server-sent events announcing each change to a game; see app.game_events."""
+    try:
+        game_uuid = UUID(game_id)
+    except ValueError:
+        return JSONResponse(status_code=400, content={"error": "Invalid game ID"})
+    # Subscribe before reading the game's version, so a change committed in
+    # between is either in the version we start from or queued after it.
+    subscription = game_events.subscribe(game_uuid)
+    try:
+        _, header, err = await _game_header_precheck(game_id, request, lobby=True)
+    except Exception:
+        game_events.unsubscribe(subscription)
+        raise
+    if err:
+        game_events.unsubscribe(subscription)
+        return err
+    return StreamingResponse(
+        game_events.stream(subscription, header["state_version"]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/v1/games")
 async def new_game(request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
     try:
-        game_id = gameManager.new_game(token_user.id)
+        game_id = await adb.run(gameManager.new_game, token_user.id)
         logger.info(f"{token_user.username} created new game with ID {game_id}")
         return JSONResponse(content={"id": str(game_id)})
     except Exception:
@@ -364,11 +457,11 @@ async def new_game(request: Request):
 
 @app.post("/v1/games/{game_id}/join")
 async def join_game(game_id: str, request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
     try:
-        gameManager.add_player(token_user.id, UUID(game_id))
+        await adb.run(gameManager.add_player, token_user.id, UUID(game_id))
         logger.info(f"{token_user.username} joined game with ID {game_id}")
         return JSONResponse(content={"message": "Joined game successfully"})
     except GameException as e:
@@ -386,11 +479,13 @@ class AddBotRequest(BaseModel):
 
 @app.post("/v1/games/{game_id}/add-bot")
 async def add_bot(game_id: str, body: AddBotRequest, request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
     try:
-        bot_id = gameManager.add_bot(token_user.id, UUID(game_id), body.strategy)
+        bot_id = await adb.run(
+            gameManager.add_bot, token_user.id, UUID(game_id), body.strategy
+        )
         logger.info(
             "%s added bot (%s) to game %s", token_user.username, body.strategy, game_id
         )
@@ -425,12 +520,12 @@ class SetGameModesRequest(BaseModel):
 
 @app.patch("/v1/games/{game_id}/modes")
 async def set_game_modes(game_id: str, body: SetGameModesRequest, request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
     try:
-        modes = gameManager.set_game_modes(
-            token_user.id, UUID(game_id), body.game_modes
+        modes = await adb.run(
+            gameManager.set_game_modes, token_user.id, UUID(game_id), body.game_modes
         )
         logger.info(
             "%s set game modes %s on game %s",
@@ -452,11 +547,11 @@ async def set_game_modes(game_id: str, body: SetGameModesRequest, request: Reque
 
 @app.post("/v1/games/{game_id}/start")
 async def start_game(game_id: str, request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
     try:
-        gameManager.start_game(token_user.id, UUID(game_id))
+        await adb.run(gameManager.start_game, token_user.id, UUID(game_id))
         logger.info(f"{token_user.username} started game {game_id}")
         return JSONResponse(content={"message": "Game started"})
     except GameException as e:
@@ -468,11 +563,13 @@ async def start_game(game_id: str, request: Request):
 
 @app.delete("/v1/games/{game_id}/players/{player_id}")
 async def remove_player(game_id: str, player_id: str, request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
     try:
-        gameManager.remove_player(token_user.id, UUID(game_id), UUID(player_id))
+        await adb.run(
+            gameManager.remove_player, token_user.id, UUID(game_id), UUID(player_id)
+        )
         logger.info(
             f"{token_user.username} removed player {player_id} from game {game_id}"
         )
@@ -488,20 +585,20 @@ async def remove_player(game_id: str, player_id: str, request: Request):
 
 @app.get("/v1/users")
 async def list_users(request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
-    users = userManager.list_users()
+    users = await adb.run(userManager.list_users)
     logger.info("Listing %d users", len(users))
     return JSONResponse(content={"users": [user.to_dict() for user in users]})
 
 
 @app.get("/v1/users/{user_id}")
 async def get_user(user_id: str, request: Request):
-    _, err = _require_auth(request)
+    _, err = await _require_auth(request)
     if err:
         return err
-    user = userManager.get_user(UUID(user_id))
+    user = await adb.run(userManager.get_user, UUID(user_id))
     if not user:
         return JSONResponse(status_code=404, content={"error": "User not found"})
     return JSONResponse(content=user.to_dict())
@@ -516,7 +613,9 @@ class UserCreate(BaseModel):
 @app.post("/v1/users")
 async def new_user(user: UserCreate):
     try:
-        created = userManager.new_user(user.username, user.email, user.password)
+        created = await adb.run(
+            userManager.new_user, user.username, user.email, user.password
+        )
         logger.info("Created new user with ID %s", getattr(created, "id", "<unknown>"))
         return JSONResponse(content=created.to_dict(), status_code=201)
     except Exception as e:
@@ -527,7 +626,9 @@ async def new_user(user: UserCreate):
 @app.post("/register")
 async def register(user: UserCreate):
     try:
-        created = userManager.new_user(user.username, user.email, user.password)
+        created = await adb.run(
+            userManager.new_user, user.username, user.email, user.password
+        )
         logger.info(
             "Registered new user with ID %s", getattr(created, "id", "<unknown>")
         )
@@ -559,7 +660,7 @@ async def logout(request: Request):
     token_user = _verify_token(request)
     if token_user:
         try:
-            userManager.logout_user(token_user.id)
+            await adb.run(userManager.logout_user, token_user.id)
         except Exception:
             logger.exception("Error recording logout for user %s", token_user.username)
     response = JSONResponse(content={"message": "Logged out"}, status_code=200)
@@ -571,7 +672,9 @@ async def logout(request: Request):
 @app.post("/login")
 async def login(userLogin: UserLogin):
     try:
-        user = userManager.authenticate_user(userLogin.username, userLogin.password)
+        user = await adb.run(
+            userManager.authenticate_user, userLogin.username, userLogin.password
+        )
         if user:
             token = jwt_handler.sign(user)
             logger.info("User %s logged in successfully", user)
@@ -600,10 +703,10 @@ async def login(userLogin: UserLogin):
 @app.get("/userDetails")
 async def user_details(request: Request):
     try:
-        token_user, err = _require_auth(request)
+        token_user, err = await _require_auth(request)
         if err:
             return err
-        user = userManager.get_user(token_user.id)
+        user = await adb.run(userManager.get_user, token_user.id)
         if not user:
             response = JSONResponse(
                 content={"error": "User not found"}, status_code=404
@@ -629,11 +732,16 @@ class ChangePasswordRequest(BaseModel):
 
 @app.patch("/v1/users/me/password")
 async def change_password(body: ChangePasswordRequest, request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
     try:
-        userManager.change_password(token_user.id, body.old_password, body.new_password)
+        await adb.run(
+            userManager.change_password,
+            token_user.id,
+            body.old_password,
+            body.new_password,
+        )
         logger.info("Password changed for user %s", token_user.username)
         return JSONResponse(content={"message": "Password changed successfully"})
     except UserValidationError as e:
@@ -651,11 +759,11 @@ class ChangeEmailRequest(BaseModel):
 
 @app.patch("/v1/users/me/email")
 async def change_email(body: ChangeEmailRequest, request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
     try:
-        userManager.change_email(token_user.id, body.new_email)
+        await adb.run(userManager.change_email, token_user.id, body.new_email)
         logger.info("Email changed for user %s", token_user.username)
         return JSONResponse(content={"message": "Email updated successfully"})
     except UserValidationError as e:
@@ -673,11 +781,11 @@ class ChangeThemeRequest(BaseModel):
 
 @app.patch("/v1/users/me/theme")
 async def change_theme(body: ChangeThemeRequest, request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
     try:
-        userManager.change_theme(token_user.id, body.theme)
+        await adb.run(userManager.change_theme, token_user.id, body.theme)
         logger.info("Theme changed for user %s to %s", token_user.username, body.theme)
         return JSONResponse(
             content={"message": "Theme updated successfully", "theme": body.theme}
@@ -693,11 +801,11 @@ async def change_theme(body: ChangeThemeRequest, request: Request):
 
 @app.delete("/v1/users/me")
 async def delete_account(request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
     try:
-        userManager.delete_user(token_user.id)
+        await adb.run(userManager.delete_user, token_user.id)
         logger.info("Account deleted for user %s", token_user.username)
         response = JSONResponse(content={"message": "Account deleted"})
         response.delete_cookie(key="userjwt")
@@ -713,11 +821,11 @@ async def delete_account(request: Request):
 
 @app.post("/v1/users/{user_id}/deactivate")
 async def deactivate_user(user_id: str, request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
     try:
-        userManager.deactivate_user(token_user.id, UUID(user_id))
+        await adb.run(userManager.deactivate_user, token_user.id, UUID(user_id))
         logger.info("User %s deactivated by admin %s", user_id, token_user.username)
         return JSONResponse(content={"message": "User deactivated"})
     except UserManagerPermissionError as e:
@@ -733,11 +841,11 @@ async def deactivate_user(user_id: str, request: Request):
 
 @app.post("/v1/users/{user_id}/reactivate")
 async def reactivate_user(user_id: str, request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
     try:
-        userManager.reactivate_user(token_user.id, UUID(user_id))
+        await adb.run(userManager.reactivate_user, token_user.id, UUID(user_id))
         logger.info("User %s reactivated by admin %s", user_id, token_user.username)
         return JSONResponse(content={"message": "User reactivated"})
     except UserManagerPermissionError as e:
@@ -753,33 +861,45 @@ async def reactivate_user(user_id: str, request: Request):
 
 @app.get("/v1/admin/users")
 async def admin_list_users(request: Request):
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return err
-    admin = userManager.get_user(token_user.id)
+    admin = await adb.run(userManager.get_user, token_user.id)
     if not admin or not admin.is_admin:
         return JSONResponse(status_code=403, content={"error": "Admin access required"})
-    users = userManager.list_users()
+    users = await adb.run(userManager.list_users)
     logger.info("Admin %s listing %d users", token_user.username, len(users))
     return JSONResponse(
         content={"users": [u.to_dict(include_sensitive=True) for u in users]}
     )
 
 
+@app.get("/v1/admin/bot-jobs")
+async def admin_bot_jobs(request: Request):
+    """The bot turn queue's depth and latencies; see app.bot_jobs."""
+    token_user, err = await _require_auth(request)
+    if err:
+        return err
+    admin = await adb.run(userManager.get_user, token_user.id)
+    if not admin or not admin.is_admin:
+        return JSONResponse(status_code=403, content={"error": "Admin access required"})
+    return JSONResponse(content=bot_jobs.stats())
+
+
 # ─── Game action endpoints ────────────────────────────────────────────────────
 
 
-def _game_action_precheck(
+async def _game_action_precheck(
     game_id: str, request: Request
 ) -> tuple[any, any, any] | tuple[None, None, any]:
     """Auth + membership check shared by all game action endpoints.
     Returns (token_user, game, None) on success or (None, None, error_response).
     """
-    token_user, err = _require_auth(request)
+    token_user, err = await _require_auth(request)
     if err:
         return None, None, err
     try:
-        game = gameManager.get_game_by_id(UUID(game_id))
+        game = await adb.run(gameManager.get_game_by_id, UUID(game_id))
     except ValueError:
         return (
             None,
@@ -803,6 +923,130 @@ def _game_action_precheck(
     return token_user, game, None
 
 
+async def _game_header_precheck(
+    game_id: str, request: Request, lobby: bool = False
+) -> tuple[Any, dict | None, JSONResponse | None]:
+    """Like _game_action_precheck, from the game's header rather than the game.
+
+    Returns (token_user, header, None) or (None, None, error_response); the
+    header is Storage.get_game_header's. ``lobby`` also admits non-members to
+    games that haven't started.
+    """
+    token_user, err = await _require_auth(request)
+    if err:
+        return None, None, err
+    try:
+        header = await adb.get_game_header(UUID(game_id))
+    except ValueError:
+        return (
+            None,
+            None,
+            JSONResponse(status_code=400, content={"error": "Invalid game ID"}),
+        )
+    if header is None:
+        return (
+            None,
+            None,
+            JSONResponse(status_code=404, content={"error": "Game not found"}),
+        )
+    if str(token_user.id) not in header["players"] and not (
+        lobby and header["status"] == Status.NEW.name
+    ):
+        return (
+            None,
+            None,
+            JSONResponse(
+                status_code=403, content={"error": "Not a member of this game"}
+            ),
+        )
+    return token_user, header, None
+
+
+# ─── Conditional GETs ─────────────────────────────────────────────────────────
+#
+# The game page re-reads the game, its valid actions and its history after
+# every change and (without the event stream) every few seconds, and most of
+# those reads find nothing new. Their responses carry a strong ETag built
+# from the game's state_version, read from the game's header before anything
+# else; a request whose If-None-Match names the current tag gets an empty 304
+# without latest_state being fetched or deserialised.
+#
+# A tag is always computed from a version read no later than the data in the
+# body, so a change racing the read can only cost a needless 200, never a
+# wrong 304.
+
+
+def _etag(*parts) -> str:
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def _undo_tag(pending_undo: dict | None) -> str:
+    """The part of a game's tag for its pending undo, which has no version."""
+    if pending_undo is None:
+        return "none"
+    # While pending, an undo request only ever gains votes.
+    return f"{pending_undo['id']}.{len(pending_undo.get('votes') or {})}"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match names ``etag`` (or is ``*``)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in tags or "*" in tags
+
+
+def _cache_headers(etag: str) -> dict:
+    # The page keeps the bodies itself, so browsers and proxies needn't.
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=_cache_headers(etag))
+
+
+# ─── Action responses ────────────────────────────────────────────────────────
+#
+# An action's response carries the state it produced, as the player sees it.
+# A page that passes ``?since=<state_version>`` naming the version the action
+# was applied to (the one it is showing) gets a JSON patch from that view
+# instead (app.state_patch), with the game's new ETag and pending undo so the
+# patched game can stand in for the body of its next conditional GET. Any
+# other ``since``, or none, gets the whole view.
+
+
+def _since(request: Request) -> int | None:
+    try:
+        return int(request.query_params["since"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def _action_state(
+    request: Request,
+    viewer_id: UUID,
+    game,
+    base: tuple[GameState, int],
+    new_state: GameState,
+) -> dict:
+    """The state part of an action's response; ``base`` is (state, version) before it."""
+    base_state, base_version = base
+    content: dict = {"state_version": game.state_version}
+    if _since(request) != base_version:
+        content["game_state"] = new_state.to_view(viewer_id)
+        return content
+    content["game_state_patch"] = view_patch(base_state, new_state, viewer_id)
+    # A winner also ends the game, which the page can't patch in; it refetches.
+    if new_state.winner is None:
+        pending_undo = await adb.run(gameManager.get_pending_undo, game.id)
+        content["pending_undo"] = pending_undo
+        content["game_etag"] = _etag(
+            "game", game.state_version, viewer_id, _undo_tag(pending_undo)
+        )
+    return content
+
+
 def _fire_turn_push(old_turn, new_state, game) -> None:
     """Send a push notification to the next player if the turn just changed."""
     if new_state is None or new_state.player_turn is None:
@@ -869,16 +1113,22 @@ class DrawFromBagRequest(BaseModel):
 async def action_draw_from_bag(
     game_id: str, body: DrawFromBagRequest, request: Request
 ):
-    token_user, game, err = _game_action_precheck(game_id, request)
+    token_user, game, err = await _game_action_precheck(game_id, request)
     if err:
         return err
     try:
-        new_state, payload = gameManager.draw_from_bag(game, token_user.id, body.count)
+        base = game.game_state, game.state_version
+        new_state, payload = await adb.run(
+            gameManager.draw_from_bag, game, token_user.id, body.count
+        )
         logger.info(
             "%s drew %d from bag in game %s", token_user.username, body.count, game_id
         )
         return JSONResponse(
-            content={"game_state": new_state.to_dict(), "drawn": payload["drawn"]}
+            content={
+                **await _action_state(request, token_user.id, game, base, new_state),
+                "drawn": payload["drawn"],
+            }
         )
     except GameException as e:
         return JSONResponse(status_code=e.status_code, content={"error": str(e)})
@@ -895,16 +1145,20 @@ class TakeIngredientsRequest(BaseModel):
 async def action_take_ingredients(
     game_id: str, body: TakeIngredientsRequest, request: Request
 ):
-    token_user, game, err = _game_action_precheck(game_id, request)
+    token_user, game, err = await _game_action_precheck(game_id, request)
     if err:
         return err
     try:
-        new_state, payload = gameManager.take_ingredients(
-            game, token_user.id, body.assignments
+        base = game.game_state, game.state_version
+        new_state, payload = await adb.run(
+            gameManager.take_ingredients, game, token_user.id, body.assignments
         )
         logger.info("%s took ingredients in game %s", token_user.username, game_id)
         return JSONResponse(
-            content={"game_state": new_state.to_dict(), "move": payload}
+            content={
+                **await _action_state(request, token_user.id, game, base, new_state),
+                "move": payload,
+            }
         )
     except GameException as e:
         return JSONResponse(status_code=e.status_code, content={"error": str(e)})
@@ -923,23 +1177,28 @@ class SellCupRequest(BaseModel):
 
 @app.post("/v1/games/{game_id}/actions/sell-cup")
 async def action_sell_cup(game_id: str, body: SellCupRequest, request: Request):
-    token_user, game, err = _game_action_precheck(game_id, request)
+    token_user, game, err = await _game_action_precheck(game_id, request)
     if err:
         return err
     try:
+        base = game.game_state, game.state_version
         old_turn = game.game_state.player_turn if game.game_state else None
-        new_state, payload = gameManager.sell_cup(
+        new_state, payload = await adb.run(
+            gameManager.sell_cup,
             game,
             token_user.id,
             body.cup_index,
             body.declared_specials,
             additional_cups=body.additional_cups,
         )
-        _fire_turn_push(old_turn, new_state, game)
-        _fire_game_end_push(game, new_state)
+        await adb.run(_fire_turn_push, old_turn, new_state, game)
+        await adb.run(_fire_game_end_push, game, new_state)
         logger.info("%s sold cup in game %s", token_user.username, game_id)
         return JSONResponse(
-            content={"game_state": new_state.to_dict(), "move": payload}
+            content={
+                **await _action_state(request, token_user.id, game, base, new_state),
+                "move": payload,
+            }
         )
     except GameException as e:
         return JSONResponse(status_code=e.status_code, content={"error": str(e)})
@@ -954,17 +1213,23 @@ class DrinkCupRequest(BaseModel):
 
 @app.post("/v1/games/{game_id}/actions/drink-cup")
 async def action_drink_cup(game_id: str, body: DrinkCupRequest, request: Request):
-    token_user, game, err = _game_action_precheck(game_id, request)
+    token_user, game, err = await _game_action_precheck(game_id, request)
     if err:
         return err
     try:
+        base = game.game_state, game.state_version
         old_turn = game.game_state.player_turn if game.game_state else None
-        new_state, payload = gameManager.drink_cup(game, token_user.id, body.cup_index)
-        _fire_turn_push(old_turn, new_state, game)
-        _fire_game_end_push(game, new_state)
+        new_state, payload = await adb.run(
+            gameManager.drink_cup, game, token_user.id, body.cup_index
+        )
+        await adb.run(_fire_turn_push, old_turn, new_state, game)
+        await adb.run(_fire_game_end_push, game, new_state)
         logger.info("%s drank cup in game %s", token_user.username, game_id)
         return JSONResponse(
-            content={"game_state": new_state.to_dict(), "move": payload}
+            content={
+                **await _action_state(request, token_user.id, game, base, new_state),
+                "move": payload,
+            }
         )
     except GameException as e:
         return JSONResponse(status_code=e.status_code, content={"error": str(e)})
@@ -975,17 +1240,23 @@ async def action_drink_cup(game_id: str, body: DrinkCupRequest, request: Request
 
 @app.post("/v1/games/{game_id}/actions/go-for-a-wee")
 async def action_go_for_a_wee(game_id: str, request: Request):
-    token_user, game, err = _game_action_precheck(game_id, request)
+    token_user, game, err = await _game_action_precheck(game_id, request)
     if err:
         return err
     try:
+        base = game.game_state, game.state_version
         old_turn = game.game_state.player_turn if game.game_state else None
-        new_state, payload = gameManager.go_for_a_wee(game, token_user.id)
-        _fire_turn_push(old_turn, new_state, game)
-        _fire_game_end_push(game, new_state)
+        new_state, payload = await adb.run(
+            gameManager.go_for_a_wee, game, token_user.id
+        )
+        await adb.run(_fire_turn_push, old_turn, new_state, game)
+        await adb.run(_fire_game_end_push, game, new_state)
         logger.info("%s went for a wee in game %s", token_user.username, game_id)
         return JSONResponse(
-            content={"game_state": new_state.to_dict(), "move": payload}
+            content={
+                **await _action_state(request, token_user.id, game, base, new_state),
+                "move": payload,
+            }
         )
     except GameException as e:
         return JSONResponse(status_code=e.status_code, content={"error": str(e)})
@@ -1002,11 +1273,13 @@ class ClaimCardRequest(BaseModel):
 
 @app.post("/v1/games/{game_id}/actions/claim-card")
 async def action_claim_card(game_id: str, body: ClaimCardRequest, request: Request):
-    token_user, game, err = _game_action_precheck(game_id, request)
+    token_user, game, err = await _game_action_precheck(game_id, request)
     if err:
         return err
     try:
-        new_state, payload = gameManager.claim_card(
+        base = game.game_state, game.state_version
+        new_state, payload = await adb.run(
+            gameManager.claim_card,
             game,
             token_user.id,
             body.card_id,
@@ -1015,7 +1288,10 @@ async def action_claim_card(game_id: str, body: ClaimCardRequest, request: Reque
         )
         logger.info("%s claimed card in game %s", token_user.username, game_id)
         return JSONResponse(
-            content={"game_state": new_state.to_dict(), "move": payload}
+            content={
+                **await _action_state(request, token_user.id, game, base, new_state),
+                "move": payload,
+            }
         )
     except GameException as e:
         return JSONResponse(status_code=e.status_code, content={"error": str(e)})
@@ -1033,16 +1309,24 @@ class DrinkStoredSpiritRequest(BaseModel):
 async def action_drink_stored_spirit(
     game_id: str, body: DrinkStoredSpiritRequest, request: Request
 ):
-    token_user, game, err = _game_action_precheck(game_id, request)
+    token_user, game, err = await _game_action_precheck(game_id, request)
     if err:
         return err
     try:
-        new_state, payload = gameManager.drink_stored_spirit(
-            game, token_user.id, body.store_card_index, body.count
+        base = game.game_state, game.state_version
+        new_state, payload = await adb.run(
+            gameManager.drink_stored_spirit,
+            game,
+            token_user.id,
+            body.store_card_index,
+            body.count,
         )
         logger.info("%s drank stored spirit in game %s", token_user.username, game_id)
         return JSONResponse(
-            content={"game_state": new_state.to_dict(), "move": payload}
+            content={
+                **await _action_state(request, token_user.id, game, base, new_state),
+                "move": payload,
+            }
         )
     except GameException as e:
         return JSONResponse(status_code=e.status_code, content={"error": str(e)})
@@ -1060,16 +1344,24 @@ class UseStoredSpiritRequest(BaseModel):
 async def action_use_stored_spirit(
     game_id: str, body: UseStoredSpiritRequest, request: Request
 ):
-    token_user, game, err = _game_action_precheck(game_id, request)
+    token_user, game, err = await _game_action_precheck(game_id, request)
     if err:
         return err
     try:
-        new_state, payload = gameManager.use_stored_spirit(
-            game, token_user.id, body.store_card_index, body.cup_index
+        base = game.game_state, game.state_version
+        new_state, payload = await adb.run(
+            gameManager.use_stored_spirit,
+            game,
+            token_user.id,
+            body.store_card_index,
+            body.cup_index,
         )
         logger.info("%s used stored spirit in game %s", token_user.username, game_id)
         return JSONResponse(
-            content={"game_state": new_state.to_dict(), "move": payload}
+            content={
+                **await _action_state(request, token_user.id, game, base, new_state),
+                "move": payload,
+            }
         )
     except GameException as e:
         return JSONResponse(status_code=e.status_code, content={"error": str(e)})
@@ -1090,16 +1382,20 @@ class RerollSpecialsRequest(BaseModel):
 async def action_reroll_specials(
     game_id: str, body: RerollSpecialsRequest, request: Request
 ):
-    token_user, game, err = _game_action_precheck(game_id, request)
+    token_user, game, err = await _game_action_precheck(game_id, request)
     if err:
         return err
     try:
-        new_state, payload = gameManager.reroll_specials(
-            game, token_user.id, body.chosen_specials
+        base = game.game_state, game.state_version
+        new_state, payload = await adb.run(
+            gameManager.reroll_specials, game, token_user.id, body.chosen_specials
         )
         logger.info("%s rerolled specials in game %s", token_user.username, game_id)
         return JSONResponse(
-            content={"game_state": new_state.to_dict(), "move": payload}
+            content={
+                **await _action_state(request, token_user.id, game, base, new_state),
+                "move": payload,
+            }
         )
     except GameException as e:
         return JSONResponse(status_code=e.status_code, content={"error": str(e)})
@@ -1112,16 +1408,20 @@ async def action_reroll_specials(
 async def action_refresh_card_row(
     game_id: str, body: RefreshRowRequest, request: Request
 ):
-    token_user, game, err = _game_action_precheck(game_id, request)
+    token_user, game, err = await _game_action_precheck(game_id, request)
     if err:
         return err
     try:
-        new_state, payload = gameManager.refresh_card_row(
-            game, token_user.id, body.row_position
+        base = game.game_state, game.state_version
+        new_state, payload = await adb.run(
+            gameManager.refresh_card_row, game, token_user.id, body.row_position
         )
         logger.info("%s refreshed card row in game %s", token_user.username, game_id)
         return JSONResponse(
-            content={"game_state": new_state.to_dict(), "move": payload}
+            content={
+                **await _action_state(request, token_user.id, game, base, new_state),
+                "move": payload,
+            }
         )
     except GameException as e:
         return JSONResponse(status_code=e.status_code, content={"error": str(e)})
@@ -1132,17 +1432,21 @@ async def action_refresh_card_row(
 
 @app.post("/v1/games/{game_id}/actions/end-turn")
 async def action_end_turn(game_id: str, request: Request):
-    token_user, game, err = _game_action_precheck(game_id, request)
+    token_user, game, err = await _game_action_precheck(game_id, request)
     if err:
         return err
     try:
+        base = game.game_state, game.state_version
         old_turn = game.game_state.player_turn if game.game_state else None
-        new_state, payload = gameManager.end_turn(game, token_user.id)
-        _fire_turn_push(old_turn, new_state, game)
-        _fire_game_end_push(game, new_state)
+        new_state, payload = await adb.run(gameManager.end_turn, game, token_user.id)
+        await adb.run(_fire_turn_push, old_turn, new_state, game)
+        await adb.run(_fire_game_end_push, game, new_state)
         logger.info("%s ended turn in game %s", token_user.username, game_id)
         return JSONResponse(
-            content={"game_state": new_state.to_dict(), "move": payload}
+            content={
+                **await _action_state(request, token_user.id, game, base, new_state),
+                "move": payload,
+            }
         )
     except GameException as e:
         return JSONResponse(status_code=e.status_code, content={"error": str(e)})
@@ -1153,17 +1457,21 @@ async def action_end_turn(game_id: str, request: Request):
 
 @app.post("/v1/games/{game_id}/actions/quit")
 async def action_quit_game(game_id: str, request: Request):
-    token_user, game, err = _game_action_precheck(game_id, request)
+    token_user, game, err = await _game_action_precheck(game_id, request)
     if err:
         return err
     try:
+        base = game.game_state, game.state_version
         old_turn = game.game_state.player_turn if game.game_state else None
-        new_state, payload = gameManager.quit_game(game, token_user.id)
-        _fire_turn_push(old_turn, new_state, game)
-        _fire_game_end_push(game, new_state)
+        new_state, payload = await adb.run(gameManager.quit_game, game, token_user.id)
+        await adb.run(_fire_turn_push, old_turn, new_state, game)
+        await adb.run(_fire_game_end_push, game, new_state)
         logger.info("%s quit game %s", token_user.username, game_id)
         return JSONResponse(
-            content={"game_state": new_state.to_dict(), "move": payload}
+            content={
+                **await _action_state(request, token_user.id, game, base, new_state),
+                "move": payload,
+            }
         )
     except GameException as e:
         return JSONResponse(status_code=e.status_code, content={"error": str(e)})
@@ -1174,15 +1482,15 @@ async def action_quit_game(game_id: str, request: Request):
 
 @app.post("/v1/games/{game_id}/cancel")
 async def action_cancel_game(game_id: str, request: Request):
-    token_user, game, err = _game_action_precheck(game_id, request)
+    token_user, game, err = await _game_action_precheck(game_id, request)
     if err:
         return err
     try:
-        new_state, payload = gameManager.cancel_game(game, token_user.id)
-        _fire_game_end_push(game, new_state, cancelled=True)
+        new_state, payload = await adb.run(gameManager.cancel_game, game, token_user.id)
+        await adb.run(_fire_game_end_push, game, new_state, cancelled=True)
         logger.info("%s cancelled game %s", token_user.username, game_id)
         return JSONResponse(
-            content={"game_state": new_state.to_dict(), "move": payload}
+            content={"game_state": new_state.to_view(token_user.id), "move": payload}
         )
     except GameException as e:
         return JSONResponse(status_code=e.status_code, content={"error": str(e)})
@@ -1199,12 +1507,20 @@ async def get_valid_actions(game_id: str, request: Request):
     """Return the set of actions the requesting player can legally take right now.
 
     The UI uses this to mark only available action buttons as enabled, with
-    everything else greyed out. Mirrors the legality logic the bots already use.
+    everything else greyed out. Uses the same move generator as the bots.
     Returns an empty `actions` list when it isn't the requester's turn.
     """
-    token_user, game, err = _game_action_precheck(game_id, request)
+    token_user, header, err = await _game_header_precheck(game_id, request)
     if err:
         return err
+    # Every player sees different actions for the same state.
+    etag = _etag("actions", header["state_version"], token_user.id)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    game = await adb.run(gameManager.get_game_by_id, UUID(game_id))
+    if game is None:
+        return JSONResponse(status_code=404, content={"error": "Game not found"})
+    etag = _etag("actions", game.state_version, token_user.id)
 
     actions: list[dict] = []
     can_end_turn = False
@@ -1212,12 +1528,10 @@ async def get_valid_actions(game_id: str, request: Request):
 
     try:
         if game.status == Status.STARTED and game.game_state is not None:
-            # Imported here so api module load doesn't pull in playtesting eagerly.
-            from playtesting.valid_actions import get_valid_actions as _vactions
             from app.actions import _available_free_actions
 
             gs = game.game_state
-            raw = _vactions(gs, token_user.id)
+            raw = legal_moves(gs, token_user.id)
             for a in raw:
                 actions.append(
                     {
@@ -1259,7 +1573,8 @@ async def get_valid_actions(game_id: str, request: Request):
                 "actions": actions,
                 "available_types": available_types,
                 "can_end_turn": can_end_turn,
-            }
+            },
+            headers=_cache_headers(etag),
         )
     except Exception:
         logger.exception("Failed to compute valid actions for game %s", game_id)
@@ -1269,14 +1584,21 @@ async def get_valid_actions(game_id: str, request: Request):
 
 
 @app.get("/v1/games/{game_id}/history")
-async def get_game_history(game_id: str):
+async def get_game_history(game_id: str, request: Request):
     try:
         game_uuid = UUID(game_id)
     except ValueError:
         return JSONResponse(status_code=400, content={"error": "Invalid game ID"})
     try:
-        moves = gameManager.get_history(game_uuid)
-        return JSONResponse(content={"moves": moves})
+        # Every move bumps the version, so it tags the move list too.
+        version = await adb.get_game_version(game_uuid)
+        etag = _etag("history", version)
+        if version is not None and _etag_matches(request, etag):
+            return _not_modified(etag)
+        moves = await adb.run(gameManager.get_history, game_uuid)
+        if version is None:
+            return JSONResponse(content={"moves": moves})
+        return JSONResponse(content={"moves": moves}, headers=_cache_headers(etag))
     except Exception:
         logger.exception("Error fetching history for game %s", game_id)
         return JSONResponse(
@@ -1291,10 +1613,12 @@ async def get_state_at_turn(game_id: str, turn_number: int):
     except ValueError:
         return JSONResponse(status_code=400, content={"error": "Invalid game ID"})
     try:
-        state = gameManager.get_state_at_turn(game_uuid, turn_number)
+        state = await adb.run(gameManager.get_state_at_turn, game_uuid, turn_number)
         if state is None:
             return JSONResponse(status_code=404, content={"error": "Turn not found"})
-        return JSONResponse(content={"game_state": state})
+        # Stored snapshots carry the game's RNG, deck order and so on; clients
+        # only get what state_view lets through.
+        return JSONResponse(content={"game_state": state_view(state)})
     except Exception:
         logger.exception(
             "Error fetching state at turn %d for game %s", turn_number, game_id
@@ -1307,11 +1631,11 @@ async def get_state_at_turn(game_id: str, turn_number: int):
 
 @app.post("/v1/games/{game_id}/undo")
 async def propose_undo(game_id: str, request: Request):
-    token_user, game, err = _game_action_precheck(game_id, request)
+    token_user, game, err = await _game_action_precheck(game_id, request)
     if err:
         return err
     try:
-        undo_req = gameManager.propose_undo(game, token_user.id)
+        undo_req = await adb.run(gameManager.propose_undo, game, token_user.id)
         logger.info("%s proposed undo in game %s", token_user.username, game_id)
         return JSONResponse(content={"undo_request": undo_req})
     except GameException as e:
@@ -1330,7 +1654,7 @@ class UndoVoteRequest(BaseModel):
 
 @app.post("/v1/games/{game_id}/undo/vote")
 async def vote_undo(game_id: str, body: UndoVoteRequest, request: Request):
-    token_user, game, err = _game_action_precheck(game_id, request)
+    token_user, game, err = await _game_action_precheck(game_id, request)
     if err:
         return err
     if body.vote not in ("agree", "disagree"):
@@ -1338,7 +1662,9 @@ async def vote_undo(game_id: str, body: UndoVoteRequest, request: Request):
             status_code=400, content={"error": "vote must be 'agree' or 'disagree'"}
         )
     try:
-        result = gameManager.vote_undo(game, token_user.id, body.request_id, body.vote)
+        result = await adb.run(
+            gameManager.vote_undo, game, token_user.id, body.request_id, body.vote
+        )
         logger.info(
             "%s voted '%s' on undo in game %s", token_user.username, body.vote, game_id
         )
@@ -0,0 +1,119 @@
+"""Cold storage for the move history of finished games.
+
+A game's history lives in the hot tables while it can still change: a
+game_moves row per move (with a state_before keyframe every KEYFRAME_EVERY
+moves) and the games row's initial_state. Once a game has been ENDED for
+ARCHIVE_AFTER, ``Storage.archive_game`` packs all of that into one
+zlib-compressed blob in game_archives and deletes the rows, so the hot
+tables only grow with the games being played. The games row itself stays,
+with latest_state and summary, so the game still lists and opens as before.
+
+ArchivedHistory answers the history queries from a blob the same way the
+backends answer them from game_moves, so /history, /history/{turn} and
+replays read archived games transparently.
+
+    python -m scripts.archive_games        # the archival job
+"""
+
+import json
+import os
+import zlib
+from datetime import timedelta
+
+from app.state_delta import rebuild_state
+
+ARCHIVE_AFTER = timedelta(days=int(os.environ.get("ARCHIVE_AFTER_DAYS", "30")))
+
+# game_moves columns kept in an archive, in this order.
+MOVE_COLUMNS = (
+    "id",
+    "turn_number",
+    "move_number",
+    "seq",
+    "player_id",
+    "action",
+    "params",
+    "outcomes",
+    "state_before",
+    "state_delta",
+    "created_at",
+)
+
+_FORMAT = 1
+
+
+def pack_history(initial_state: dict | None, moves: list[dict]) -> bytes:
+    """One blob of a game's initial_state and its game_moves rows (seq order)."""
+    data = {
+        "format": _FORMAT,
+        "initial_state": initial_state,
+        # Rows as lists rather than dicts, so column names aren't repeated.
+        "moves": [[move[c] for c in MOVE_COLUMNS] for move in moves],
+    }
+    return zlib.compress(json.dumps(data, separators=(",", ":")).encode(), 9)
+
+
+class ArchivedHistory:
+    def __init__(self, blob: bytes):
+        data = json.loads(zlib.decompress(blob))
+        if data.get("format") != _FORMAT:
+            raise ValueError(f"Unknown archive format {data.get('format')!r}")
+        self.initial_state: dict | None = data["initial_state"]
+        self.moves: list[dict] = [dict(zip(MOVE_COLUMNS, m)) for m in data["moves"]]
+
+    def game_moves(self) -> list[dict]:
+        """As Storage.get_game_moves."""
+        columns = (
+            "id",
+            "turn_number",
+            "move_number",
+            "player_id",
+            "action",
+            "created_at",
+        )
+        moves = sorted(self.moves, key=lambda m: (m["turn_number"], m["move_number"]))
+        return [{c: m[c] for c in columns} for m in moves]
+
+    def replay_data(self, latest_state: dict) -> dict:
+        """As Storage.get_replay_data."""
+        columns = (
+            "seq",
+            "turn_number",
+            "player_id",
+            "action",
+            "params",
+            "outcomes",
+            "state_delta",
+        )
+        return {
+            "initial_state": self.initial_state,
+            "latest_state": latest_state,
+            "moves": [{c: m[c] for c in columns} for m in self.moves],
+        }
+
+    def state_before_turn(self, turn_number: int) -> dict | None:
+        """As Storage.get_state_before_turn."""
+        # Moves are in seq order, so a turn's first move is the first found.
+        index = next(
+            (i for i, m in enumerate(self.moves) if m["turn_number"] == turn_number),
+            None,
+        )
+        if index is None:
+            return None
+        start = index
+        while start >= 0 and self.moves[start]["state_before"] is None:
+            start -= 1
+        if start < 0:
+            return None
+        return rebuild_state(self.moves[start]["state_before"], self.moves[start:index])
+
+    def state_at_turn(self, turn_number: int, latest_state: dict) -> dict | None:
+        """As Storage.get_state_at_turn."""
+        if turn_number == 0:
+            return self.initial_state
+        state = self.state_before_turn(turn_number)
+        if state is not None:
+            return state
+        if turn_number > latest_state.get("turn_number", 0):
+            return None
+        return latest_state
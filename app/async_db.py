@@ -0,0 +1,53 @@
+"""Awaitable database access for the API's async handlers.
+
+Db talks to Supabase through the synchronous client, and so does everything
+built on it (GameManager, UserManager, the bot runner). Calling any of them
+straight from an ``async def`` handler blocks the event loop for every round
+trip, so one slow query, or one long run of bot turns, stalls every other
+request.
+
+AsyncDb runs that work on a pool of DB_POOL_SIZE threads, one per pooled
+keep-alive connection of Db's HTTP client, and hands the handler an
+awaitable:
+
+    game = await adb.get_game(game_id)                 # any Db method
+    state, payload = await adb.run(gameManager.sell_cup, game, player_id, 0)
+
+``run`` takes any callable, so a manager call that makes several queries
+costs one hop to the pool rather than one per query. The synchronous Db is
+unchanged and still what scripts, bots and tests use.
+"""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.db import DB_POOL_SIZE, db
+from app.storage import Storage
+
+
+class AsyncDb:
+    def __init__(self, sync_db: Storage, workers: int = DB_POOL_SIZE):
+        self.sync = sync_db
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="db"
+        )
+
+    async def run(self, fn: Callable[..., Any], /, *args, **kwargs) -> Any:
+        """Call ``fn(*args, **kwargs)`` on a database thread and return its result."""
+        call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        method = getattr(self.sync, name)
+
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            return await self.run(method, *args, **kwargs)
+
+        return call
+
+
+adb = AsyncDb(db)
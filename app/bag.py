@@ -0,0 +1,121 @@
+"""Counted multiset of ingredient tokens.
+
+Used for the bag, the open display and each player's bladder. None of them
+cares about token order, only how many of each ingredient they hold, so they
+are stored as one count per ``Ingredient.code`` (ten slots) instead of a list
+of up to 70 Enum members. A random draw picks a token position uniformly
+from the total and walks the ten counts to find it — the same probabilities
+as ``random.choice`` on the equivalent list, without the O(n) ``list.remove``
+afterwards.
+
+``Bag`` keeps the list-like surface the engine, bots and tests already use
+(``len``, iteration, ``count``, ``in``, ``append``, ``extend``, ``remove``).
+Iteration yields tokens grouped in ``Ingredient`` declaration order.
+
+Each bag also keeps its Zobrist hash (``zobrist``, see app.zobrist) up to date
+as tokens come and go, so GameState.state_hash never rescans a bag.
+"""
+
+import random
+from typing import Iterable, Iterator
+
+from app.Ingredient import Ingredient
+from app.zobrist import COUNT_KEYS, counts_hash
+
+# Indexed by Ingredient.code.
+_INGREDIENTS: tuple[Ingredient, ...] = tuple(Ingredient)
+
+
+class Bag:
+    __slots__ = ("_counts", "_total", "zobrist")
+
+    def __init__(self, ingredients: Iterable[Ingredient] = ()):
+        self._counts: list[int] = [0] * len(_INGREDIENTS)
+        self._total: int = 0
+        self.zobrist: int = 0
+        self.extend(ingredients)
+
+    def copy(self) -> "Bag":
+        bag = Bag.__new__(Bag)
+        bag._counts = list(self._counts)
+        bag._total = self._total
+        bag.zobrist = self.zobrist
+        return bag
+
+    def recompute_zobrist(self) -> int:
+        """The Zobrist hash computed from the counts, for checking ``zobrist``."""
+        return counts_hash(self._counts)
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __iter__(self) -> Iterator[Ingredient]:
+        for ingredient, n in zip(_INGREDIENTS, self._counts):
+            for _ in range(n):
+                yield ingredient
+
+    def __contains__(self, ingredient: object) -> bool:
+        return isinstance(ingredient, Ingredient) and self._counts[ingredient.code] > 0
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Bag):
+            return self._counts == other._counts
+        if isinstance(other, (list, tuple)):
+            return self == Bag(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        counts = ", ".join(
+            f"{ing.name}={n}" for ing, n in zip(_INGREDIENTS, self._counts) if n
+        )
+        return f"Bag({counts})"
+
+    def count(self, ingredient: Ingredient) -> int:
+        return self._counts[ingredient.code]
+
+    def append(self, ingredient: Ingredient) -> None:
+        code = ingredient.code
+        n = self._counts[code]
+        self._counts[code] = n + 1
+        self._total += 1
+        keys = COUNT_KEYS[code]
+        self.zobrist ^= keys[n] ^ keys[n + 1]
+
+    def extend(self, ingredients: Iterable[Ingredient]) -> None:
+        for ingredient in ingredients:
+            self.append(ingredient)
+
+    def clear(self) -> None:
+        self._counts = [0] * len(_INGREDIENTS)
+        self._total = 0
+        self.zobrist = 0
+
+    def remove(self, ingredient: Ingredient) -> None:
+        """Remove one token; raises ValueError if none is present (like list.remove)."""
+        if ingredient not in self:
+            raise ValueError(f"{ingredient!r} not in bag")
+        code = ingredient.code
+        n = self._counts[code]
+        self._counts[code] = n - 1
+        self._total -= 1
+        keys = COUNT_KEYS[code]
+        self.zobrist ^= keys[n] ^ keys[n - 1]
+
+    def draw(self, rng: random.Random) -> Ingredient:
+        """Remove and return a uniformly random token. The bag must not be empty."""
+        total = self._total
+        if not total:
+            raise IndexError("draw from an empty bag")
+        r = int(rng.random() * total)
+        counts = self._counts
+        for index, n in enumerate(counts):
+            if r < n:
+                counts[index] = n - 1
+                self._total = total - 1
+                keys = COUNT_KEYS[index]
+                self.zobrist ^= keys[n] ^ keys[n - 1]
+                return _INGREDIENTS[index]
+            r -= n
+        raise AssertionError("bag counts out of sync with total")
@@ -0,0 +1,268 @@
+"""Play bot turns in the background, one game at a time.
+
+When a move handed the turn to a bot, GameManager used to play the bots'
+turns there and then, inside the request that made the move, so a human's
+POST waited for every bot after them: up to MAX_BOT_TURNS turns, each
+possibly a lookahead or MCTS search of several seconds. Now GameManager
+submits the game here and returns once the human's move is committed; the
+bots' moves reach the page like anyone else's, through app.game_events.
+
+    bot_jobs.submit(game_id, job)   # job() plays the game's bot turns
+
+A game's jobs run one at a time. Submitting a game whose job is waiting
+changes nothing; submitting one whose job is running runs it once more
+afterwards (a job re-reads the game, so once is enough). The moves a job
+makes itself submit the game again, and those are ignored.
+
+BOT_JOBS picks the backend:
+
+    threads  a pool of BOT_WORKERS threads in the server process (default)
+    inline   the job runs in the submitting thread, as it used to; for tests
+             and scripts that expect the bots to have moved when a call returns
+
+At most BOT_QUEUE_DEPTH games wait for a worker. Past that, ``submit`` logs
+and drops the job rather than play the bots inside the request, and
+remembers the game: ``was_dropped`` tells GameManager.get_game_by_id to
+submit it again the next time the game is read, as it does for a game stuck
+on an eliminated player's turn. ``stats()`` reports how long games waited
+for a worker, how long bot turns took and how many jobs were dropped
+(/v1/admin/bot-jobs).
+"""
+
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+BOT_WORKERS = int(os.environ.get("BOT_WORKERS", "4"))
+BOT_QUEUE_DEPTH = int(os.environ.get("BOT_QUEUE_DEPTH", "256"))
+# Latency percentiles are over this many recent samples.
+_SAMPLES = 1000
+
+
+class Latencies:
+    """Recent durations of one kind, summarised for stats()."""
+
+    def __init__(self, samples: int = _SAMPLES):
+        self._recent: deque[float] = deque(maxlen=samples)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._recent.append(seconds)
+            self.count += 1
+
+    def summary(self) -> dict:
+        """Count so far, and p50/p95/max in ms over the recent samples."""
+        with self._lock:
+            recent = sorted(self._recent)
+            count = self.count
+        if not recent:
+            return {"count": count, "p50_ms": None, "p95_ms": None, "max_ms": None}
+
+        def ms(fraction: float) -> float:
+            index = min(len(recent) - 1, int(fraction * len(recent)))
+            return round(recent[index] * 1000, 1)
+
+        return {
+            "count": count,
+            "p50_ms": ms(0.5),
+            "p95_ms": ms(0.95),
+            "max_ms": round(recent[-1] * 1000, 1),
+        }
+
+
+class BotJobs(ABC):
+    """Where GameManager sends a game's bot turns; see the module docstring."""
+
+    name = ""
+
+    def __init__(self):
+        # From submit until a worker picks the game up.
+        self.waits = Latencies()
+        # Each bot turn, as timed by app.bot_player.process_bot_turns.
+        self.turns = Latencies()
+
+    @abstractmethod
+    def submit(self, game_id: UUID, job: Callable[[], None]) -> None:
+        """Have ``job`` play the game's bot turns."""
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Wait until no job is waiting or running; False if ``timeout`` passed first."""
+        return True
+
+    def was_dropped(self, game_id: UUID) -> bool:
+        """Whether the game's last job was dropped, so its bots have yet to move."""
+        return False
+
+    def record_turn(self, seconds: float) -> None:
+        self.turns.add(seconds)
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.name,
+            "wait": self.waits.summary(),
+            "turn": self.turns.summary(),
+        }
+
+
+def _run_job(game_id: UUID, job: Callable[[], None]) -> None:
+    try:
+        job()
+    except Exception:
+        logger.exception("Error processing bot turns for game %s", game_id)
+
+
+class InlineBotJobs(BotJobs):
+    """Runs each job in the thread that submits it."""
+
+    name = "inline"
+
+    def __init__(self):
+        super().__init__()
+        self._running: set[UUID] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, game_id: UUID, job: Callable[[], None]) -> None:
+        with self._lock:
+            if game_id in self._running:
+                return  # the running job will see the change
+            self._running.add(game_id)
+        try:
+            _run_job(game_id, job)
+        finally:
+            with self._lock:
+                self._running.discard(game_id)
+
+
+class _Entry:
+    """A game's job, from submit until it has run for the last time."""
+
+    __slots__ = ("again", "job", "running", "submitted")
+
+    def __init__(self, job: Callable[[], None]):
+        self.job = job
+        self.submitted = time.monotonic()
+        self.running = False
+        # Submitted again while running: run once more when done.
+        self.again = False
+
+
+class ThreadBotJobs(BotJobs):
+    """A bounded queue of games served by a pool of worker threads."""
+
+    name = "threads"
+
+    def __init__(self, workers: int = BOT_WORKERS, depth: int = BOT_QUEUE_DEPTH):
+        super().__init__()
+        self.workers = workers
+        self.depth = depth
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._queued = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._queue: deque[UUID] = deque()
+        self._entries: dict[UUID, _Entry] = {}
+        # Games whose job was dropped and not submitted again since.
+        self._dropped: set[UUID] = set()
+        self._threads: list[threading.Thread] = []
+        # The game whose job this thread is running, if any.
+        self._local = threading.local()
+
+    def submit(self, game_id: UUID, job: Callable[[], None]) -> None:
+        if getattr(self._local, "game_id", None) == game_id:
+            return  # a move made by the job itself
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if entry is not None:
+                entry.job = job
+                entry.again = entry.running
+                return
+            if len(self._queue) >= self.depth:
+                self._dropped.add(game_id)
+                self.dropped += 1
+            else:
+                self._dropped.discard(game_id)
+                self._entries[game_id] = _Entry(job)
+                self._queue.append(game_id)
+                self._start_workers()
+                self._queued.notify()
+                return
+        logger.warning(
+            "Bot queue full (%d games); dropped game %s's bot turns until it is read",
+            self.depth,
+            game_id,
+        )
+
+    def was_dropped(self, game_id: UUID) -> bool:
+        with self._lock:
+            return game_id in self._dropped
+
+    def drain(self, timeout: float | None = None) -> bool:
+        with self._lock:
+            return self._idle.wait_for(lambda: not self._entries, timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            queued = len(self._queue)
+            running = len(self._entries) - queued
+        return {
+            **super().stats(),
+            "workers": self.workers,
+            "queued": queued,
+            "running": running,
+            "max_queued": self.depth,
+            "dropped": self.dropped,
+        }
+
+    def _start_workers(self) -> None:
+        """Start the pool on first use. Called with the lock held."""
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._work, name=f"bots-{len(self._threads)}", daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _work(self) -> None:
+        while True:
+            with self._lock:
+                self._queued.wait_for(lambda: self._queue)
+                game_id = self._queue.popleft()
+                entry = self._entries[game_id]
+                entry.running = True
+            self.waits.add(time.monotonic() - entry.submitted)
+            self._run(game_id, entry)
+
+    def _run(self, game_id: UUID, entry: _Entry) -> None:
+        self._local.game_id = game_id
+        try:
+            while True:
+                _run_job(game_id, entry.job)
+                with self._lock:
+                    if not entry.again:
+                        del self._entries[game_id]
+                        self._idle.notify_all()
+                        return
+                    entry.again = False
+        finally:
+            self._local.game_id = None
+
+
+def _bot_jobs_from_env() -> BotJobs:
+    backend = os.environ.get("BOT_JOBS", "threads").lower()
+    if backend == "threads":
+        return ThreadBotJobs()
+    if backend == "inline":
+        return InlineBotJobs()
+    raise ValueError(f"Unknown BOT_JOBS {backend!r}")
+
+
+bot_jobs: BotJobs = _bot_jobs_from_env()
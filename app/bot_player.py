@@ -6,8 +6,10 @@ picks a strategy, computes valid actions, and executes them via GameManager
 """
 
 import logging
+import time
 from uuid import UUID
 
+from app.bot_jobs import bot_jobs
 from app.db import db
 from app.game import Game, GameException
 
@@ -19,7 +21,7 @@ from app.game import Game, GameException
 # bot_player), so a broken deploy surfaces immediately.
 import ml  # noqa: F401
 from playtesting.strategy import STRATEGY_CLASSES, Strategy
-from playtesting.valid_actions import Action, get_valid_actions
+from app.moves import Action, legal_moves
 
 logger = logging.getLogger(__name__)
 
@@ -56,9 +58,12 @@ def process_bot_turns(game_manager, game_id: UUID) -> None:
     """Check if the current player is a bot and execute their turns.
 
     Loops to handle consecutive bot players. Stops when a human player's
-    turn arrives, the game ends, or a safety limit is hit.
+    turn arrives, the game ends, or a safety limit is hit. GameManager runs
+    it as the game's job in app.bot_jobs, which is told how long each turn took.
     """
     for _ in range(MAX_BOT_TURNS):
+        # Checked against the database once per bot turn; the re-fetches
+        # within a turn trust the game cache (see Db.get_game).
         game = db.get_game(game_id)
         if game is None or game.status.name != "STARTED":
             return
@@ -98,8 +103,10 @@ def process_bot_turns(game_manager, game_id: UUID) -> None:
             game_id,
         )
 
+        started = time.perf_counter()
         try:
             _execute_bot_turn(game_manager, game, current_player, strategy)
+            bot_jobs.record_turn(time.perf_counter() - started)
         except Exception:
             logger.exception(
                 "Bot %s failed to take turn in game %s, skipping",
@@ -119,12 +126,12 @@ def _execute_bot_turn(
     # Free actions phase
     for _ in range(MAX_FREE_ACTIONS_PER_TURN):
         # Re-fetch game state since actions modify it
-        game = db.get_game(game.id)
+        game = db.get_game(game.id, validate=False)
         gs = game.game_state
         if gs.winner is not None:
             return
 
-        all_actions = get_valid_actions(gs, player_id)
+        all_actions = legal_moves(gs, player_id)
         free_actions = [a for a in all_actions if a.is_free]
         if not free_actions:
             break
@@ -144,7 +151,7 @@ def _execute_bot_turn(
     # this turn (turn didn't advance because free actions remained, then this
     # invocation's free phase took none), end the turn cleanly via end_turn so
     # last-round/last-player-standing checks fire correctly.
-    game = db.get_game(game.id)
+    game = db.get_game(game.id, validate=False)
     gs = game.game_state
     if gs.winner is not None:
         return
@@ -157,12 +164,12 @@ def _execute_bot_turn(
 
     # Main action phase
     for attempt in range(MAX_RETRIES):
-        game = db.get_game(game.id)
+        game = db.get_game(game.id, validate=False)
         gs = game.game_state
         if gs.winner is not None:
             return
 
-        all_actions = get_valid_actions(gs, player_id)
+        all_actions = legal_moves(gs, player_id)
         turn_actions = [a for a in all_actions if not a.is_free]
 
         if not turn_actions:
@@ -182,7 +189,7 @@ def _execute_bot_turn(
 
     # All retries exhausted
     logger.warning("Bot %s exhausted retries, skipping turn", player_id)
-    game = db.get_game(game.id)
+    game = db.get_game(game.id, validate=False)
     _force_advance_turn(game_manager, game, player_id)
 
 
@@ -245,7 +252,7 @@ def _execute_take(
     outer_limit = 5
     while outer_limit > 0:
         outer_limit -= 1
-        game = db.get_game(game.id)
+        game = db.get_game(game.id, validate=False)
         gs = game.game_state
         ps = gs.player_states[player_id]
         remaining = ps.take_count - gs.ingredients_taken_this_turn
@@ -263,13 +270,13 @@ def _execute_take(
             )
             if payload.get("turn_complete", False):
                 return
-            game = db.get_game(game.id)
+            game = db.get_game(game.id, validate=False)
 
         # Phase 2: draw from bag in batches
         batch_limit = 10
         while batch_limit > 0:
             batch_limit -= 1
-            game = db.get_game(game.id)
+            game = db.get_game(game.id, validate=False)
             gs = game.game_state
             ps = gs.player_states[player_id]
             remaining = ps.take_count - gs.ingredients_taken_this_turn
@@ -283,7 +290,7 @@ def _execute_take(
             new_state, draw_payload = game_manager.draw_from_bag(
                 game, player_id, bag_count
             )
-            game = db.get_game(game.id)
+            game = db.get_game(game.id, validate=False)
             gs = game.game_state
 
             drawn = gs.bag_draw_pending[:]
@@ -295,13 +302,13 @@ def _execute_take(
             )
             if payload.get("turn_complete", False):
                 return
-            game = db.get_game(game.id)
+            game = db.get_game(game.id, validate=False)
 
         # If we reach here the bag is empty but the take isn't done —
         # outer loop will re-poll the strategy for any remaining display
         # picks. If display is also empty the next iteration will return
         # via the remaining<=0 / no-display guards.
-        game = db.get_game(game.id)
+        game = db.get_game(game.id, validate=False)
         gs = game.game_state
         if not gs.open_display:
             return
@@ -309,16 +316,7 @@ def _execute_take(
 
 def _force_advance_turn(game_manager, game: Game, player_id: UUID) -> None:
     """Force-advance the turn when a bot can't act."""
-    from app.actions import (
-        _advance_turn,
-        _check_last_round_complete,
-        _deep_copy_state,
-    )
-
-    gs = _deep_copy_state(game.game_state)
-    gs.turn_number += 1
-    _advance_turn(gs)
-    _check_last_round_complete(gs)
-    game_manager._apply_action(
-        game, player_id, "skip_turn", gs, {"reason": "no_valid_actions"}
-    )
+    from app.actions import skip_turn
+
+    gs, payload = skip_turn(game.game_state)
+    game_manager._apply_action(game, player_id, "skip_turn", gs, payload, {})
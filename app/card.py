@@ -5,8 +5,14 @@ Card effects are applied per cards.allium spec.
 
 import random
 from dataclasses import dataclass, field
+from typing import Iterable, Iterator
 from uuid import uuid4
 
+from app.zobrist import salt, sequence_hash, sequence_term, string_key
+
+_HOLDINGS_SALT = salt("cards")
+_STORED_SALT = salt("stored_spirits")
+
 
 @dataclass
 class IngredientRequirement:
@@ -79,6 +85,17 @@ class Card:
             d["free_action_type"] = self.free_action_type
         return d
 
+    def copy(self) -> "Card":
+        """Copy with its own ``stored_spirits`` list (the only mutable part)."""
+        return Card(
+            self.id,
+            self.card_type,
+            self.name,
+            self.spirit_type,
+            self.mixer_type,
+            list(self.stored_spirits),
+        )
+
     @classmethod
     def from_dict(cls, d: dict) -> "Card":
         # Backward compatibility: infer card_type from is_karaoke if card_type missing
@@ -101,6 +118,10 @@ class CardRow:
     position: int  # 1, 2, or 3
     cards: list[Card] = field(default_factory=list)
 
+    def clone(self) -> "CardRow":
+        """Copy the row. Card objects are never mutated while in a row, so they are shared."""
+        return CardRow(position=self.position, cards=list(self.cards))
+
     def to_dict(self) -> dict:
         return {"position": self.position, "cards": [c.to_dict() for c in self.cards]}
 
@@ -112,6 +133,112 @@ class CardRow:
         )
 
 
+class CardHoldings:
+    """A player's claimed cards, with indexes for the engine's per-turn lookups.
+
+    Claims are permanent, so cards are only ever appended and the indexes are
+    updated in ``append``. The card tuple and each index are immutable values
+    that ``append`` replaces rather than mutates, which lets ``clone`` share
+    them; the only per-clone copying is each store card, whose
+    ``stored_spirits`` list is mutated in place.
+
+    Iteration, ``len`` and indexing behave like the list of card dicts this
+    replaces, but yield ``Card`` objects. ``append`` also accepts a card dict.
+
+    ``zobrist`` hashes which card sits at which index and is updated on
+    append; ``state_hash`` adds the store cards' spirits on top.
+    """
+
+    __slots__ = (
+        "_cards",
+        "refresher_mixers",
+        "specialist_spirits",
+        "free_action_types",
+        "store_positions",
+        "zobrist",
+    )
+
+    def __init__(self, cards: Iterable[Card | dict] = ()):
+        self._cards: tuple[Card, ...] = ()
+        # Upper-case mixer names covered by refresher cards
+        self.refresher_mixers: frozenset[str] = frozenset()
+        # Spirit names with a specialist card
+        self.specialist_spirits: frozenset[str] = frozenset()
+        # Action types granted by free-action cards
+        self.free_action_types: frozenset[str] = frozenset()
+        # Indexes of store cards, in claim order
+        self.store_positions: tuple[int, ...] = ()
+        self.zobrist: int = 0
+        for card in cards:
+            self.append(card)
+
+    def append(self, card: Card | dict) -> None:
+        if isinstance(card, dict):
+            card = Card.from_dict(card)
+        card_type = card.card_type
+        if card_type == "refresher" and card.mixer_type:
+            self.refresher_mixers = self.refresher_mixers | {card.mixer_type.upper()}
+        elif card_type == "specialist" and card.spirit_type:
+            self.specialist_spirits = self.specialist_spirits | {card.spirit_type}
+        elif card_type == "free_action" and card.free_action_type:
+            self.free_action_types = self.free_action_types | {card.free_action_type}
+        elif card_type == "store":
+            self.store_positions = self.store_positions + (len(self._cards),)
+        self.zobrist ^= sequence_term(
+            _HOLDINGS_SALT, string_key(card.id), len(self._cards)
+        )
+        self._cards = self._cards + (card,)
+
+    def store_cards(self) -> Iterator[Card]:
+        cards = self._cards
+        for index in self.store_positions:
+            yield cards[index]
+
+    def clone(self) -> "CardHoldings":
+        holdings = CardHoldings.__new__(CardHoldings)
+        cards = self._cards
+        if self.store_positions:
+            copied = list(cards)
+            for index in self.store_positions:
+                copied[index] = copied[index].copy()
+            cards = tuple(copied)
+        holdings._cards = cards
+        holdings.refresher_mixers = self.refresher_mixers
+        holdings.specialist_spirits = self.specialist_spirits
+        holdings.free_action_types = self.free_action_types
+        holdings.store_positions = self.store_positions
+        holdings.zobrist = self.zobrist
+        return holdings
+
+    def state_hash(self, recompute: bool = False) -> int:
+        """Hash of the holdings; ``recompute`` ignores the maintained ``zobrist``."""
+        if recompute:
+            h = sequence_hash(_HOLDINGS_SALT, (string_key(c.id) for c in self._cards))
+        else:
+            h = self.zobrist
+        for index in self.store_positions:
+            h ^= sequence_hash(
+                _STORED_SALT + index,
+                map(string_key, self._cards[index].stored_spirits),
+            )
+        return h
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(self._cards)
+
+    def __getitem__(self, index: int) -> Card:
+        return self._cards[index]
+
+    def __repr__(self) -> str:
+        return f"CardHoldings({self._cards!r})"
+
+    def to_dict(self) -> list[dict]:
+        return [c.to_dict() for c in self._cards]
+
+
 def build_deck(game_modes: list[str] | None = None) -> list[Card]:
     """Build the 25-card deck per cards.allium spec (unshuffled).
 
@@ -198,7 +325,9 @@ def build_deck(game_modes: list[str] | None = None) -> list[Card]:
     return cards
 
 
-def deal_initial_rows(deck: list[Card]) -> tuple[list[CardRow], list[Card]]:
+def deal_initial_rows(
+    deck: list[Card], rng: random.Random
+) -> tuple[list[CardRow], list[Card]]:
     """Deal cards into 3 rows per cards.allium spec.
 
     Row 1: 3 random karaoke cards (never refreshable).
@@ -208,12 +337,12 @@ def deal_initial_rows(deck: list[Card]) -> tuple[list[CardRow], list[Card]]:
     non_karaoke = [c for c in deck if c.card_type != "karaoke"]
 
     # Pick 3 random karaoke cards for row 1
-    row1_cards = random.sample(karaoke_cards, 3)
+    row1_cards = rng.sample(karaoke_cards, 3)
     remaining_karaoke = [c for c in karaoke_cards if c not in row1_cards]
 
     # Shuffle remaining (2 karaoke + non-karaoke others)
     remaining_all = remaining_karaoke + non_karaoke
-    random.shuffle(remaining_all)
+    rng.shuffle(remaining_all)
 
     row2_cards = remaining_all[:3]
     row3_cards = remaining_all[3:6]
@@ -1,6 +1,14 @@
 """Cocktail recipe validation and drink scoring.
 
 Implements the drink_points() function per the scoring rules in game.allium.
+
+The rules live in the uncached ``_reference_*`` functions at the bottom of the
+module. ``drink_points``, ``is_cocktail`` and ``drink_score`` answer from a
+memo table instead: a cup and its declared specials reduce to one integer key
+(4 bits per ingredient count, 4 bits per special count), so a repeat query is
+one dict lookup. Misses fall through to the reference functions and are
+stored. A cup holds at most five ingredients and only five special types
+count, so the table stays small.
 """
 
 from collections import Counter
@@ -99,8 +107,80 @@ _RECIPES: list[tuple[Counter, Counter, Counter, int, str]] = [
 ]
 
 
+# ─── Memoised scoring ────────────────────────────────────────────────────────
+
+_COUNT_BITS = 4
+_COUNT_LIMIT = 1 << _COUNT_BITS
+
+# Key weight per Ingredient.code. SPECIAL tokens never affect scoring, so they
+# weigh nothing.
+_INGREDIENT_WEIGHT: list[int] = [
+    0 if ingredient is Ingredient.SPECIAL else 1 << (_COUNT_BITS * ingredient.code)
+    for ingredient in Ingredient
+]
+_SPECIALS_SHIFT = _COUNT_BITS * len(Ingredient)
+# Key weight per declared special string; "nothing" is ignored, like the rules.
+_SPECIAL_WEIGHT: dict[str, int] = {
+    st.value: 0
+    if st is SpecialType.NOTHING
+    else 1 << (_SPECIALS_SHIFT + _COUNT_BITS * i)
+    for i, st in enumerate(SpecialType)
+}
+
+# key → (points or None, is a cocktail)
+_SCORE_TABLE: dict[int, tuple[int | None, bool]] = {}
+_UNSELLABLE: tuple[int | None, bool] = (None, False)
+
+
+def drink_score(
+    cup_ingredients: list[Ingredient], declared_specials: list[str]
+) -> tuple[int | None, bool]:
+    """Return ``(drink_points(...), is_cocktail(...))`` with one table lookup."""
+    if len(cup_ingredients) >= _COUNT_LIMIT or len(declared_specials) >= _COUNT_LIMIT:
+        # Counts could overflow their key bits; too rare to be worth caching.
+        return (
+            _reference_drink_points(cup_ingredients, declared_specials),
+            _reference_is_cocktail(cup_ingredients, declared_specials),
+        )
+    key = 0
+    for ingredient in cup_ingredients:
+        key += _INGREDIENT_WEIGHT[ingredient.code]
+    for special in declared_specials:
+        weight = _SPECIAL_WEIGHT.get(special)
+        if weight is None:
+            return _UNSELLABLE  # unknown special type
+        key += weight
+    score = _SCORE_TABLE.get(key)
+    if score is None:
+        score = _SCORE_TABLE[key] = (
+            _reference_drink_points(cup_ingredients, declared_specials),
+            _reference_is_cocktail(cup_ingredients, declared_specials),
+        )
+    return score
+
+
+def drink_points(
+    cup_ingredients: list[Ingredient], declared_specials: list[str]
+) -> int | None:
+    """Return points for selling the cup, or None if the cup is not sellable.
+
+    See ``_reference_drink_points`` for the scoring rules.
+    """
+    return drink_score(cup_ingredients, declared_specials)[0]
+
+
 def is_cocktail(
     cup_ingredients: list[Ingredient], declared_specials: list[str]
+) -> bool:
+    """Return True if the cup+specials combo matches a named cocktail recipe."""
+    return drink_score(cup_ingredients, declared_specials)[1]
+
+
+# ─── Reference rules (uncached) ──────────────────────────────────────────────
+
+
+def _reference_is_cocktail(
+    cup_ingredients: list[Ingredient], declared_specials: list[str]
 ) -> bool:
     """Return True if the cup+specials combo matches a named cocktail recipe."""
     cup_spirits = [i for i in cup_ingredients if i in _SPIRITS]
@@ -133,7 +213,7 @@ def is_cocktail(
     return False
 
 
-def drink_points(
+def _reference_drink_points(
     cup_ingredients: list[Ingredient], declared_specials: list[str]
 ) -> int | None:
     """Return points for selling the cup, or None if the cup is not sellable.
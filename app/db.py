@@ -2,17 +2,39 @@ import os
 import logging
 from datetime import datetime, timezone
 from uuid import UUID, uuid4
-from supabase import create_client, Client
-from app.game import Game, Status
+import httpx
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_TIMEOUT
+from supabase import create_client, Client, ClientOptions
+from app.archive import MOVE_COLUMNS
+from app.game import Game, GameSummary
+from app.game_cache import GameCache
 from app.GameState import GameState
+from app.state_delta import KEYFRAME_EVERY, move_delta, rebuild_state
+from app.storage import Storage
 from app.user import User
 from app.utils import bytesToHexString, hexStringToBytes
 
+# Connections kept open to PostgREST. app.async_db runs Db calls on the same
+# number of threads, so a call never waits for a connection.
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "32"))
+
+
+def _http_client() -> httpx.Client:
+    """One pooled, keep-alive HTTP client for every request Db makes."""
+    return httpx.Client(
+        http2=True,
+        follow_redirects=True,
+        timeout=DEFAULT_POSTGREST_CLIENT_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=DB_POOL_SIZE,
+            max_keepalive_connections=DB_POOL_SIZE,
+        ),
+    )
+
 
-class Db:
+class Db(Storage):
     url: str = os.environ.get("SUPABASE_URL")
     key: str = os.environ.get("SUPABASE_KEY")
-    supabase: Client = create_client(url, key)
 
     _USER_COLUMNS = (
         "id",
@@ -32,28 +54,11 @@ class Db:
         "bot_strategy",
     )
 
-    @staticmethod
-    def _row_to_user(row: dict) -> User:
-        password_bytes = hexStringToBytes(row.get("password")) or None
-        return User.from_dict(
-            {
-                "id": row.get("id"),
-                "username": row.get("username"),
-                "email": row.get("email"),
-                "password_hash": password_bytes,
-                "status": row.get("status", "active"),
-                "is_admin": row.get("is_admin", False),
-                "created_at": row.get("created_at"),
-                "password_changed_at": row.get("password_changed_at"),
-                "deactivated_at": row.get("deactivated_at"),
-                "deactivated_by": row.get("deactivated_by"),
-                "deleted_at": row.get("deleted_at"),
-                "logged_out_at": row.get("logged_out_at"),
-                "theme": row.get("theme", "taverna"),
-                "is_bot": row.get("is_bot", False),
-                "bot_strategy": row.get("bot_strategy"),
-            }
+    def __init__(self):
+        self.supabase: Client = create_client(
+            self.url, self.key, options=ClientOptions(httpx_client=_http_client())
         )
+        self.game_cache = GameCache()
 
     def add_user(self, user: User) -> bool:
         if user.is_bot:
@@ -144,10 +149,6 @@ class Db:
         )
         return [self._row_to_user(row) for row in response.data]
 
-    @staticmethod
-    def _now() -> str:
-        return datetime.now(timezone.utc).isoformat()
-
     def delete_user(self, user_id: UUID) -> bool:
         response = (
             self.supabase.table("users")
@@ -267,36 +268,50 @@ class Db:
                     "host": str(game.host),
                     "players": [str(id) for id in game.players],
                     "status": game.status.name,
-                    "latest_state": game.game_state.to_dict(),
+                    "latest_state": game.game_state.to_dict(include_rng=True),
                 }
             )
             .execute()
         )
 
-    @staticmethod
-    def game_response_to_game(game_data) -> Game:
-        game_state = GameState.from_dict(game_data["latest_state"])
-        return Game(
-            id=UUID(game_data["id"]),
-            host=UUID(game_data["host"]),
-            players=set(UUID(p) for p in game_data["players"]),
-            status=Status[game_data["status"]],
-            game_state=game_state,
-            created=game_data["created_at"],
+    def get_game_version(self, game_id: UUID) -> int | None:
+        """The game's current state_version, or None if there is no such game."""
+        response = (
+            self.supabase.table("games")
+            .select("state_version")
+            .eq("id", str(game_id))
+            .execute()
         )
+        return response.data[0]["state_version"] if response.data else None
 
-    def get_game(self, game_id: UUID) -> Game | None:
-        """Get a single game by ID"""
+    def get_game_header(self, game_id: UUID) -> dict | None:
         response = (
             self.supabase.table("games")
-            .select("id", "host", "players", "status", "latest_state", "created_at")
+            .select("host", "players", "status", "state_version")
+            .eq("id", str(game_id))
+            .execute()
+        )
+        return response.data[0] if response.data else None
+
+    def _load_game(self, game_id: UUID) -> Game | None:
+        response = (
+            self.supabase.table("games")
+            .select(
+                "id",
+                "host",
+                "players",
+                "status",
+                "latest_state",
+                "created_at",
+                "state_version",
+            )
             .eq("id", str(game_id))
             .execute()
         )
 
         if len(response.data) == 1:
             game_data = response.data[0]
-            return Db.game_response_to_game(game_data)
+            return self.game_response_to_game(game_data)
 
         return None
 
@@ -306,16 +321,23 @@ class Db:
         page_size: int = 20,
         status: list[str] | str | None = None,
         player_id: UUID | None = None,
-    ) -> tuple[list[Game], int]:
-        """Get paginated games with optional filters. Returns (games, total_count)."""
-        offset = (page - 1) * page_size
+        after: tuple[str, str] | None = None,
+    ) -> tuple[list[GameSummary], int | None, bool]:
+        """Get a page of game summaries, newest first, with optional filters.
+
+        Returns (games, total_count, has_more). Pages are either numbered
+        (``page``, counted with an OFFSET) or, when ``after`` is given, the
+        games following that (created_at, id) in list order; keyset pages are
+        not counted and total_count is None.
+        """
         query = (
             self.supabase.table("games")
             .select(
-                "id, host, players, status, latest_state, created_at",
-                count="exact",
+                "id, host, players, status, summary, created_at",
+                count="exact" if after is None else None,
             )
             .order("created_at", desc=True)
+            .order("id", desc=True)
         )
         if status:
             if isinstance(status, list):
@@ -324,15 +346,26 @@ class Db:
                 query = query.eq("status", status)
         if player_id:
             query = query.contains("players", [str(player_id)])
-        response = query.range(offset, offset + page_size - 1).execute()
-        games = [Db.game_response_to_game(g) for g in response.data]
-        total = response.count or 0
-        return games, total
+        if after is None:
+            offset = (page - 1) * page_size
+        else:
+            created_at, game_id = after
+            query = query.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt.{game_id})'
+            )
+            offset = 0
+        # One extra row tells us whether there is a next page.
+        response = query.range(offset, offset + page_size).execute()
+        rows = response.data[:page_size]
+        games = [self.game_response_to_summary(g) for g in rows]
+        total = response.count if after is None else None
+        return games, total, len(response.data) > page_size
 
     def start_game(self, game_id: UUID, game_state: GameState) -> str:
         """Start a game: atomically set status=STARTED, save initial_state and latest_state.
         Returns 'ok' | 'not_found' | 'not_new'"""
-        state_dict = game_state.to_dict()
+        state_dict = game_state.to_dict(include_rng=True)
         response = (
             self.supabase.table("games")
             .update(
@@ -347,6 +380,7 @@ class Db:
             .execute()
         )
         if len(response.data) == 1:
+            self._cache_write(game_id, game_state, response.data[0])
             return "ok"
         check = (
             self.supabase.table("games").select("id").eq("id", str(game_id)).execute()
@@ -355,70 +389,99 @@ class Db:
             return "not_found"
         return "not_new"
 
-    def update_game_state(self, game_id: UUID, game_state: GameState) -> bool:
-        """Overwrite latest_state after a game action. Also sets status=ENDED if there is a winner."""
-        update_data: dict = {"latest_state": game_state.to_dict()}
+    def update_game_state(
+        self,
+        game_id: UUID,
+        game_state: GameState,
+        expected_version: int | None = None,
+    ) -> bool:
+        """Overwrite latest_state after a game action. Also sets status=ENDED if there is a winner.
+
+        With expected_version, only writes while the row's state_version still
+        matches; returns False if another write got there first.
+        """
+        update_data: dict = {"latest_state": game_state.to_dict(include_rng=True)}
         if game_state.winner is not None:
             update_data["status"] = "ENDED"
-        response = (
-            self.supabase.table("games")
-            .update(update_data)
-            .eq("id", str(game_id))
-            .execute()
-        )
-        return len(response.data) == 1
+        query = self.supabase.table("games").update(update_data).eq("id", str(game_id))
+        if expected_version is not None:
+            query = query.eq("state_version", expected_version)
+        response = query.execute()
+        if len(response.data) != 1:
+            self.game_cache.discard(game_id)
+            return False
+        self._cache_write(game_id, game_state, response.data[0])
+        return True
 
     def end_game(self, game_id: UUID, game_state: GameState) -> bool:
         """End a game (cancel or quit): save state and set status=ENDED."""
         response = (
             self.supabase.table("games")
-            .update({"latest_state": game_state.to_dict(), "status": "ENDED"})
+            .update(
+                {
+                    "latest_state": game_state.to_dict(include_rng=True),
+                    "status": "ENDED",
+                }
+            )
             .eq("id", str(game_id))
             .execute()
         )
-        return len(response.data) == 1
-
-    def get_next_move_number(self, game_id: UUID, turn_number: int) -> int:
-        """Return the next move_number for (game_id, turn_number), starting at 1."""
-        resp = (
-            self.supabase.table("game_moves")
-            .select("move_number")
-            .eq("game_id", str(game_id))
-            .eq("turn_number", turn_number)
-            .order("move_number", desc=True)
-            .limit(1)
-            .execute()
-        )
-        return (resp.data[0]["move_number"] + 1) if resp.data else 1
+        if len(response.data) != 1:
+            self.game_cache.discard(game_id)
+            return False
+        self._cache_write(game_id, game_state, response.data[0])
+        return True
 
-    def add_game_move(
+    def commit_game_move(
         self,
         game_id: UUID,
         turn_number: int,
-        move_number: int,
         player_id: UUID,
         action_type: str,
+        action_params: dict,
         action_payload: dict,
         state_before: dict,
-    ) -> bool:
-        """Append a MoveRecord to game_moves."""
-        action = {"type": action_type, **action_payload}
-        response = (
-            self.supabase.table("game_moves")
-            .insert(
-                {
-                    "id": str(uuid4()),
-                    "game_id": str(game_id),
-                    "turn_number": turn_number,
-                    "move_number": move_number,
-                    "player_id": str(player_id),
-                    "action": action,
-                    "state_before": state_before,
-                }
-            )
-            .execute()
-        )
-        return len(response.data) == 1
+        game_state: GameState,
+        expected_version: int,
+    ) -> dict | None:
+        """Record a move and save the resulting state in one transaction.
+
+        Allocates the next move_number for (game_id, turn_number), appends the
+        MoveRecord and overwrites latest_state, setting status=ENDED if there is
+        a winner. Returns the committed move record including the new
+        state_version, or None if the game does not exist.
+
+        The record stores the move's state delta; state_before is only kept on
+        every KEYFRAME_EVERY-th move of the game, and on the first move after
+        anything else wrote the game (see app.state_delta). It also stores the
+        action's params and the random outcomes it consumed, which is
+        everything app.replay needs to re-run it.
+
+        Nothing is written unless the game is still at expected_version; on a
+        mismatch returns {"conflict": True, "state_version": <current>}.
+        """
+        latest_state = game_state.to_dict(include_rng=True)
+        outcomes = game_state.outcomes or []
+        response = self.supabase.rpc(
+            "commit_game_move",
+            {
+                "game_id": str(game_id),
+                "turn_number": turn_number,
+                "player_id": str(player_id),
+                "action": {"type": action_type, **action_payload},
+                "params": action_params,
+                "outcomes": outcomes,
+                "state_before": state_before,
+                "state_delta": move_delta(state_before, latest_state, outcomes),
+                "latest_state": latest_state,
+                "ended": game_state.winner is not None,
+                "expected_version": expected_version,
+                "keyframe_every": KEYFRAME_EVERY,
+            },
+        ).execute()
+        move = response.data
+        self._cache_move(game_id, game_state, move)
+        return move
 
     def get_game_moves(self, game_id: UUID) -> list[dict]:
         """Return all MoveRecords for a game, ordered by (turn_number, move_number) ascending."""
@@ -430,7 +493,44 @@ class Db:
             .order("move_number", desc=False)
             .execute()
         )
-        return response.data or []
+        if response.data:
+            return response.data
+        archive = self._archived(game_id)
+        return archive.game_moves() if archive else []
+
+    def get_replay_data(self, game_id: UUID) -> dict | None:
+        """Return what app.replay needs to re-run a game, or None if no such game.
+
+        {"initial_state", "latest_state", "moves"}; each move has seq,
+        turn_number, player_id, action (for its type), params, outcomes and
+        state_delta, in seq order. params is None for moves recorded before
+        replay data was kept.
+        """
+        game = (
+            self.supabase.table("games")
+            .select("initial_state, latest_state, archived_at")
+            .eq("id", str(game_id))
+            .execute()
+        )
+        if not game.data:
+            return None
+        row = game.data[0]
+        if row["archived_at"] is not None:
+            return self._archived(game_id).replay_data(row["latest_state"])
+        moves = (
+            self.supabase.table("game_moves")
+            .select(
+                "seq, turn_number, player_id, action, params, outcomes, state_delta"
+            )
+            .eq("game_id", str(game_id))
+            .order("seq", desc=False)
+            .execute()
+        )
+        return {
+            "initial_state": row["initial_state"],
+            "latest_state": row["latest_state"],
+            "moves": moves.data or [],
+        }
 
     def get_state_at_turn(self, game_id: UUID, turn_number: int) -> dict | None:
         """Return the reconstructed game state immediately after turn_number completed.
@@ -439,37 +539,33 @@ class Db:
         turn_number=N  → state_before from the first move of internal turn_number N
                          (each move stores the pre-action turn_number, so move N's
                          state_before is the state after the previous turn completed)
+
+        Archived games are answered from their archive (see app.archive).
         """
         if turn_number == 0:
             # Return the initial state snapshot
             resp = (
                 self.supabase.table("games")
-                .select("initial_state")
+                .select("initial_state, archived_at")
                 .eq("id", str(game_id))
                 .execute()
             )
             if not resp.data:
                 return None
+            if resp.data[0]["archived_at"] is not None:
+                return self._archived(game_id).initial_state
             return resp.data[0].get("initial_state")
 
         # State after the N-th completed turn = state_before of the first move
         # that uses internal turn_number N (the next turn's opening state).
-        next_move = (
-            self.supabase.table("game_moves")
-            .select("state_before")
-            .eq("game_id", str(game_id))
-            .eq("turn_number", turn_number)
-            .order("move_number", desc=False)
-            .limit(1)
-            .execute()
-        )
-        if next_move.data:
-            return next_move.data[0]["state_before"]
+        state = self.get_state_before_turn(game_id, turn_number)
+        if state is not None:
+            return state
 
         # N is the last turn — only valid if N ≤ current turn_number
         resp = (
             self.supabase.table("games")
-            .select("latest_state")
+            .select("latest_state, archived_at")
             .eq("id", str(game_id))
             .execute()
         )
@@ -478,10 +574,72 @@ class Db:
         latest = resp.data[0].get("latest_state")
         if latest is None:
             return None
+        if resp.data[0]["archived_at"] is not None:
+            return self._archived(game_id).state_at_turn(turn_number, latest)
         if turn_number > latest.get("turn_number", 0):
             return None
         return latest
 
+    # ─── Archive ──────────────────────────────────────────────────────────────
+
+    def get_archivable_games(self, ended_before: str, limit: int = 100) -> list[UUID]:
+        """ENDED games not yet archived that ended before ``ended_before``, oldest first."""
+        response = (
+            self.supabase.table("games")
+            .select("id")
+            .eq("status", "ENDED")
+            .is_("archived_at", "null")
+            .lt("ended_at", ended_before)
+            .order("ended_at", desc=False)
+            .limit(limit)
+            .execute()
+        )
+        return [UUID(row["id"]) for row in response.data]
+
+    def _history_for_archive(
+        self, game_id: UUID
+    ) -> tuple[dict | None, list[dict]] | None:
+        game = (
+            self.supabase.table("games")
+            .select("initial_state")
+            .eq("id", str(game_id))
+            .eq("status", "ENDED")
+            .is_("archived_at", "null")
+            .execute()
+        )
+        if not game.data:
+            return None
+        moves = (
+            self.supabase.table("game_moves")
+            .select(", ".join(MOVE_COLUMNS))
+            .eq("game_id", str(game_id))
+            .order("seq", desc=False)
+            .execute()
+        )
+        return game.data[0]["initial_state"], moves.data or []
+
+    def _store_archive(self, game_id: UUID, history: bytes, move_count: int) -> bool:
+        response = self.supabase.rpc(
+            "archive_game",
+            {
+                "game_id": str(game_id),
+                "history": bytesToHexString(history),
+                "move_count": move_count,
+            },
+        ).execute()
+        return response.data is True
+
+    def get_archived_history(self, game_id: UUID) -> bytes | None:
+        response = (
+            self.supabase.table("game_archives")
+            .select("history")
+            .eq("game_id", str(game_id))
+            .execute()
+        )
+        if not response.data:
+            return None
+        return hexStringToBytes(response.data[0]["history"])
+
     # ─── Undo requests ────────────────────────────────────────────────────────
 
     def get_pending_undo(self, game_id: UUID) -> dict | None:
@@ -555,14 +713,45 @@ class Db:
         """Return the state_before from the first move of the given turn_number."""
         resp = (
             self.supabase.table("game_moves")
-            .select("state_before")
+            .select("seq, state_before")
             .eq("game_id", str(game_id))
             .eq("turn_number", turn_number)
             .order("move_number", desc=False)
             .limit(1)
             .execute()
         )
-        return resp.data[0]["state_before"] if resp.data else None
+        if not resp.data:
+            return None
+        move = resp.data[0]
+        if move["state_before"] is not None:
+            return move["state_before"]
+        return self._rebuild_state_before(game_id, move["seq"])
+
+    def _rebuild_state_before(self, game_id: UUID, seq: int) -> dict | None:
+        """Rebuild the state before move ``seq`` from its nearest keyframe."""
+        keyframe = (
+            self.supabase.table("game_moves")
+            .select("seq, state_before")
+            .eq("game_id", str(game_id))
+            .lte("seq", seq)
+            .not_.is_("state_before", "null")
+            .order("seq", desc=True)
+            .limit(1)
+            .execute()
+        )
+        if not keyframe.data:
+            return None
+        start = keyframe.data[0]
+        deltas = (
+            self.supabase.table("game_moves")
+            .select("state_delta, outcomes")
+            .eq("game_id", str(game_id))
+            .gte("seq", start["seq"])
+            .lt("seq", seq)
+            .order("seq", desc=False)
+            .execute()
+        )
+        return rebuild_state(start["state_before"], deltas.data)
 
     def get_max_turn_number(self, game_id: UUID) -> int:
         """Return the highest turn_number recorded in game_moves for this game, or 0."""
@@ -622,6 +811,7 @@ class Db:
         response = self.supabase.rpc(
             "add_player_to_game", {"game_id": str(game_id), "player_id": str(player_id)}
         ).execute()
+        self.game_cache.discard(game_id)
         return response.data
 
     def remove_player_from_game(
@@ -636,9 +826,9 @@ class Db:
                 "player_id": str(player_id),
             },
         ).execute()
+        self.game_cache.discard(game_id)
         return response.data
 
-
     # --- Bot policy persistence ---
 
     def get_bot_policy(self, key: str = "mcts_policy") -> dict | None:
@@ -671,4 +861,22 @@ class Db:
             return False
 
 
-db = Db()
+def _storage_from_env() -> Storage:
+    """The backend named by STORAGE_BACKEND: supabase (default), sqlite or memory.
+
+    sqlite keeps its data in SQLITE_PATH (default bartenders.db); memory keeps
+    it for the life of the process.
+    """
+    backend = os.environ.get("STORAGE_BACKEND", "supabase").lower()
+    if backend == "supabase":
+        return Db()
+    from app.sqlite_db import SqliteDb
+
+    if backend == "sqlite":
+        return SqliteDb(os.environ.get("SQLITE_PATH", "bartenders.db"))
+    if backend == "memory":
+        return SqliteDb(":memory:")
+    raise ValueError(f"Unknown STORAGE_BACKEND {backend!r}")
+
+
+db: Storage = _storage_from_env()
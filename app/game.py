@@ -30,6 +30,7 @@ class Game:
         status: Status,
         game_state: GameState,
         created: datetime,
+        state_version: int = 0,
     ):
         self.id: UUID = id
         self.host: UUID = host
@@ -37,6 +38,9 @@ class Game:
         self.status: Status = status
         self.game_state: GameState = game_state
         self.created: datetime = created
+        # Bumped by the database on every write of game_state; writes are
+        # conditional on the version the new state was computed from.
+        self.state_version: int = state_version
 
     @classmethod
     def new_game(cls, host: UUID) -> "Game":
@@ -56,10 +60,65 @@ class Game:
 
     def to_dict(self):
         """Returns a dictionary representation of the game"""
+        return self._with_state(self.game_state.to_dict())
+
+    def to_view(self, viewer_id: UUID | None = None) -> dict:
+        """Like to_dict, with the state as ``viewer_id`` may see it."""
+        return self._with_state(self.game_state.to_view(viewer_id))
+
+    def _with_state(self, game_state: dict) -> dict:
+        return {
+            "id": str(self.id),
+            "host": str(self.host),
+            "status": self.status.name,
+            "players": [str(player) for player in self.players],
+            "game_state": game_state,
+            "state_version": self.state_version,
+        }
+
+
+def game_summary(state: dict) -> dict:
+    """The few fields of a serialised game state that the lobby lists show.
+
+    Python twin of the database's ``game_summary`` function, which keeps
+    ``games.summary`` in step with ``latest_state``. Keys match the state's.
+    """
+    return {
+        "turn_number": state.get("turn_number"),
+        "player_turn": state.get("player_turn"),
+        "winner": state.get("winner"),
+        "points": {
+            pid: ps.get("points") for pid, ps in state.get("player_states", {}).items()
+        },
+        "game_modes": state.get("game_modes", []),
+    }
+
+
+class GameSummary:
+    """A game as listed in the lobby: its membership and a state summary."""
+
+    def __init__(
+        self,
+        id: UUID,
+        host: UUID,
+        players: list[UUID],
+        status: Status,
+        created: datetime,
+        summary: dict,
+    ):
+        self.id: UUID = id
+        self.host: UUID = host
+        self.players: list[UUID] = players
+        self.status: Status = status
+        self.created: datetime = created
+        self.summary: dict = summary
+
+    def to_dict(self):
+        """Like Game.to_dict, with the summary in place of the full game_state."""
         return {
             "id": str(self.id),
             "host": str(self.host),
             "status": self.status.name,
             "players": [str(player) for player in self.players],
-            "game_state": self.game_state.to_dict(),
+            "game_state": self.summary,
         }
@@ -2,17 +2,20 @@ import logging
 from uuid import UUID
 
 from app import actions
+from app.bot_jobs import bot_jobs
 from app.bot_player import process_bot_turns
 from app.db import db
-from app.game import Game, GameException, Status
+from app.game import Game, GameException, GameSummary, Status
+from app.game_events import game_events
 from app.game_modes import normalise_modes
 from app.GameState import GameState
+from app.replay import GameReplay
 
+# Another request wrote the game between our read and our write.
+_STALE_STATE = "The game has changed since this action was made; reload and try again"
 
-class GameManager:
-    # Track games currently processing bot turns to prevent re-entrancy
-    _bot_processing: set[UUID] = set()
 
+class GameManager:
     def new_game(self, host_id: UUID) -> UUID:
         """Create a new game for the host user and return the game ID."""
         game = Game.new_game(host_id)
@@ -35,6 +38,7 @@ class GameManager:
             case "full":
                 raise GameException("Game is full", status_code=409)
             case "ok":
+                game_events.publish(game_id)
                 return
             case _:
                 raise GameException("Failed to join game", status_code=500)
@@ -78,6 +82,7 @@ class GameManager:
             case "is_host":
                 raise GameException("Host cannot remove themselves", status_code=400)
             case "ok":
+                game_events.publish(game_id)
                 return
             case _:
                 raise GameException("Failed to remove player", status_code=500)
@@ -105,6 +110,7 @@ class GameManager:
             case "not_new":
                 raise GameException("Game has already been started", status_code=409)
             case "ok":
+                game_events.publish(game_id)
                 self._schedule_bot_turns(game_id)
                 return
             case _:
@@ -132,9 +138,11 @@ class GameManager:
         except ValueError as e:
             raise GameException(str(e), status_code=400)
 
-        gs = game.game_state
+        gs = game.game_state.copy_on_write()
         gs.game_modes = normalised
-        db.update_game_state(game_id, gs)
+        if not db.update_game_state(game_id, gs, expected_version=game.state_version):
+            raise GameException(_STALE_STATE, status_code=409)
+        game_events.publish(game_id, game.state_version + 1)
         return normalised
 
     def get_game_by_id(self, id: UUID) -> Game | None:
@@ -143,21 +151,43 @@ class GameManager:
         Self-heals games that are stuck on an eliminated bot's turn — that
         situation should never occur after the relevant turn-advance fixes,
         but this acts as a recovery path for games that entered the stuck
-        state before those fixes shipped.
+        state before those fixes shipped. Also resubmits games whose bot
+        turns were dropped from a full queue (see app.bot_jobs).
         """
         game = db.get_game(id)
+        if game is not None and self._heal_stuck_turn(game):
+            # Already advanced if the bots ran inline; else shortly.
+            game = db.get_game(id) or game
+        return game
+
+    def heal_stuck_turn(self, id: UUID, state_version: int) -> bool:
+        """get_game_by_id's self-heal, for reads that answer without the game.
+
+        The game is taken from the cache when it is cached at
+        ``state_version``, and loaded otherwise. True if its turn was stuck
+        and the bots have been scheduled to move it on.
+        """
+        game = db.get_game(id, validate=False)
+        if game is not None and game.state_version != state_version:
+            game = db.get_game(id)
+        return game is not None and self._heal_stuck_turn(game)
+
+    def _heal_stuck_turn(self, game: Game) -> bool:
+        if bot_jobs.was_dropped(game.id):
+            self._schedule_bot_turns(game.id)
+            return True
         if (
-            game is not None
-            and game.status == Status.STARTED
-            and game.game_state is not None
-            and game.game_state.winner is None
-            and game.game_state.player_turn is not None
+            game.status != Status.STARTED
+            or game.game_state is None
+            or game.game_state.winner is not None
+            or game.game_state.player_turn is None
         ):
-            ps = game.game_state.player_states.get(game.game_state.player_turn)
-            if ps is not None and ps.is_eliminated:
-                self._schedule_bot_turns(id)
-                game = db.get_game(id) or game
-        return game
+            return False
+        ps = game.game_state.player_states.get(game.game_state.player_turn)
+        if ps is None or not ps.is_eliminated:
+            return False
+        self._schedule_bot_turns(game.id)
+        return True
 
     def list_games(
         self,
@@ -165,10 +195,19 @@ class GameManager:
         page_size: int = 20,
         status: list[str] | str | None = None,
         player_id: UUID | None = None,
-    ) -> tuple[list[Game], int]:
-        """Returns (games, total_count) with optional pagination and filters."""
+        after: tuple[str, str] | None = None,
+    ) -> tuple[list[GameSummary], int | None, bool]:
+        """Returns (games, total_count, has_more) with optional pagination and filters.
+
+        ``after`` is the (created_at, id) of the last game on the previous
+        page; see Db.get_games.
+        """
         return db.get_games(
-            page=page, page_size=page_size, status=status, player_id=player_id
+            page=page,
+            page_size=page_size,
+            status=status,
+            player_id=player_id,
+            after=after,
         )
 
     # ─── Game actions ─────────────────────────────────────────────────────────
@@ -184,50 +223,62 @@ class GameManager:
         action_type: str,
         new_state: GameState,
         payload: dict,
+        params: dict,
     ) -> GameState:
         """Persist the move record and updated game state.
 
         Uses the pre-action turn_number so all moves within a logical turn share
-        the same turn_number. move_number is the next sequence within that turn.
+        the same turn_number. move_number is the next sequence within that turn,
+        allocated by the database in the same transaction that saves the state.
+
+        ``params`` are the arguments the action was called with (after the state
+        and player); with the random outcomes on ``new_state`` they let
+        app.replay re-run the move.
         """
-        state_before = game.game_state.to_dict()
+        state_before = game.game_state.to_dict(include_rng=True)
         turn_number = game.game_state.turn_number  # pre-action, shared across the turn
-        move_number = db.get_next_move_number(game.id, turn_number)
-        db.add_game_move(
+        move = db.commit_game_move(
             game.id,
             turn_number,
-            move_number,
             player_id,
             action_type,
+            params,
             payload,
             state_before,
+            new_state,
+            game.state_version,
         )
-        db.update_game_state(game.id, new_state)
+        self._check_committed(move)
+        game_events.publish(game.id, move["state_version"])
         # If the turn changed, check if the next player is a bot
         old_turn = game.game_state.player_turn
+        game.game_state = new_state
+        game.state_version = move["state_version"]
         new_turn = new_state.player_turn
         if new_turn != old_turn and new_state.winner is None:
             self._schedule_bot_turns(game.id)
         return new_state
 
+    @staticmethod
+    def _check_committed(move: dict | None) -> None:
+        """Raise for a commit_game_move result that wrote nothing."""
+        if move is None:
+            raise GameException("Game not found", status_code=404)
+        if move.get("conflict"):
+            raise GameException(_STALE_STATE, status_code=409)
+
     def _schedule_bot_turns(self, game_id: UUID) -> None:
-        """Process bot turns if the current player is a bot."""
-        if game_id in self._bot_processing:
-            return  # already processing bots for this game
-        self._bot_processing.add(game_id)
-        try:
-            process_bot_turns(self, game_id)
-        except Exception:
-            logging.exception("Error processing bot turns for game %s", game_id)
-        finally:
-            self._bot_processing.discard(game_id)
+        """Have the bots play if it is a bot's turn, in the background (app.bot_jobs)."""
+        bot_jobs.submit(game_id, lambda: process_bot_turns(self, game_id))
 
     def draw_from_bag(
         self, game: Game, player_id: UUID, count: int
     ) -> tuple[GameState, dict]:
         self._require_started(game)
         new_state, payload = actions.draw_from_bag(game.game_state, player_id, count)
-        self._apply_action(game, player_id, "draw_from_bag", new_state, payload)
+        self._apply_action(
+            game, player_id, "draw_from_bag", new_state, payload, {"count": count}
+        )
         return new_state, payload
 
     def take_ingredients(
@@ -237,7 +288,14 @@ class GameManager:
         new_state, payload = actions.take_ingredients(
             game.game_state, player_id, assignments
         )
-        self._apply_action(game, player_id, "take_ingredients", new_state, payload)
+        self._apply_action(
+            game,
+            player_id,
+            "take_ingredients",
+            new_state,
+            payload,
+            {"assignments": assignments},
+        )
         return new_state, payload
 
     def sell_cup(
@@ -256,7 +314,18 @@ class GameManager:
             declared_specials,
             additional_cups=additional_cups,
         )
-        self._apply_action(game, player_id, "sell_cup", new_state, payload)
+        self._apply_action(
+            game,
+            player_id,
+            "sell_cup",
+            new_state,
+            payload,
+            {
+                "cup_index": cup_index,
+                "declared_specials": declared_specials,
+                "additional_cups": additional_cups,
+            },
+        )
         return new_state, payload
 
     def drink_cup(
@@ -264,13 +333,15 @@ class GameManager:
     ) -> tuple[GameState, dict]:
         self._require_started(game)
         new_state, payload = actions.drink_cup(game.game_state, player_id, cup_index)
-        self._apply_action(game, player_id, "drink_cup", new_state, payload)
+        self._apply_action(
+            game, player_id, "drink_cup", new_state, payload, {"cup_index": cup_index}
+        )
         return new_state, payload
 
     def go_for_a_wee(self, game: Game, player_id: UUID) -> tuple[GameState, dict]:
         self._require_started(game)
         new_state, payload = actions.go_for_a_wee(game.game_state, player_id)
-        self._apply_action(game, player_id, "go_for_a_wee", new_state, payload)
+        self._apply_action(game, player_id, "go_for_a_wee", new_state, payload, {})
         return new_state, payload
 
     def claim_card(
@@ -289,7 +360,14 @@ class GameManager:
             cup_index=cup_index,
             spirit_type=spirit_type,
         )
-        self._apply_action(game, player_id, "claim_card", new_state, payload)
+        self._apply_action(
+            game,
+            player_id,
+            "claim_card",
+            new_state,
+            payload,
+            {"card_id": card_id, "cup_index": cup_index, "spirit_type": spirit_type},
+        )
         return new_state, payload
 
     def drink_stored_spirit(
@@ -299,7 +377,14 @@ class GameManager:
         new_state, payload = actions.drink_stored_spirit(
             game.game_state, player_id, store_card_index, count
         )
-        self._apply_action(game, player_id, "drink_stored_spirit", new_state, payload)
+        self._apply_action(
+            game,
+            player_id,
+            "drink_stored_spirit",
+            new_state,
+            payload,
+            {"store_card_index": store_card_index, "count": count},
+        )
         return new_state, payload
 
     def use_stored_spirit(
@@ -309,7 +394,14 @@ class GameManager:
         new_state, payload = actions.use_stored_spirit(
             game.game_state, player_id, store_card_index, cup_index
         )
-        self._apply_action(game, player_id, "use_stored_spirit", new_state, payload)
+        self._apply_action(
+            game,
+            player_id,
+            "use_stored_spirit",
+            new_state,
+            payload,
+            {"store_card_index": store_card_index, "cup_index": cup_index},
+        )
         return new_state, payload
 
     def reroll_specials(
@@ -319,7 +411,14 @@ class GameManager:
         new_state, payload = actions.reroll_specials(
             game.game_state, player_id, chosen_specials
         )
-        self._apply_action(game, player_id, "reroll_specials", new_state, payload)
+        self._apply_action(
+            game,
+            player_id,
+            "reroll_specials",
+            new_state,
+            payload,
+            {"chosen_specials": chosen_specials},
+        )
         return new_state, payload
 
     def refresh_card_row(
@@ -329,14 +428,21 @@ class GameManager:
         new_state, payload = actions.refresh_card_row(
             game.game_state, player_id, row_position
         )
-        self._apply_action(game, player_id, "refresh_card_row", new_state, payload)
+        self._apply_action(
+            game,
+            player_id,
+            "refresh_card_row",
+            new_state,
+            payload,
+            {"row_position": row_position},
+        )
         return new_state, payload
 
     def end_turn(self, game: Game, player_id: UUID) -> tuple[GameState, dict]:
         """Player explicitly ends their turn, forfeiting unused free actions."""
         self._require_started(game)
         new_state, payload = actions.end_turn(game.game_state, player_id)
-        self._apply_action(game, player_id, "end_turn", new_state, payload)
+        self._apply_action(game, player_id, "end_turn", new_state, payload, {})
         return new_state, payload
 
     def quit_game(self, game: Game, player_id: UUID) -> tuple[GameState, dict]:
@@ -345,7 +451,7 @@ class GameManager:
         if player_id not in game.players:
             raise GameException("Not a member of this game", status_code=403)
         new_state, payload = actions.quit_game(game.game_state, player_id)
-        self._apply_action(game, player_id, "quit_game", new_state, payload)
+        self._apply_action(game, player_id, "quit_game", new_state, payload, {})
         # If no winner was set (game continues), update_game_state handles it.
         # If last-player-standing triggered, update_game_state sets ENDED via winner.
         # Either way, _apply_action already persisted.
@@ -357,9 +463,10 @@ class GameManager:
         if game.host != requester_id:
             raise GameException("Only the host can cancel the game", status_code=403)
         new_state, payload = actions.cancel_game(game.game_state)
-        self._apply_action(game, requester_id, "cancel_game", new_state, payload)
+        self._apply_action(game, requester_id, "cancel_game", new_state, payload, {})
         # Force ENDED status since there's no winner to trigger it automatically
         db.end_game(game.id, new_state)
+        game_events.publish(game.id)
         return new_state, payload
 
     # ─── History & replay ─────────────────────────────────────────────────────
@@ -370,6 +477,21 @@ class GameManager:
     def get_state_at_turn(self, game_id: UUID, turn_number: int) -> dict | None:
         return db.get_state_at_turn(game_id, turn_number)
 
+    def get_replay(self, game_id: UUID) -> tuple[GameReplay, dict]:
+        """The game's replayable history and its stored latest_state."""
+        data = db.get_replay_data(game_id)
+        if data is None:
+            raise GameException("Game not found", status_code=404)
+        if data["initial_state"] is None:
+            raise GameException("Game has not started", status_code=409)
+        replay = GameReplay(game_id, data["initial_state"], data["moves"])
+        return replay, data["latest_state"]
+
+    def verify_history(self, game_id: UUID) -> list[dict]:
+        """Replay the game and report where it differs from the stored history."""
+        replay, latest_state = self.get_replay(game_id)
+        return replay.verify(latest_state)
+
     # ─── Undo ─────────────────────────────────────────────────────────────────
 
     def get_pending_undo(self, game_id: UUID) -> dict | None:
@@ -412,6 +534,7 @@ class GameManager:
                 except GameException:
                     pass  # already voted or other issue
 
+        game_events.publish(game.id)
         return undo_req
 
     def vote_undo(
@@ -452,6 +575,7 @@ class GameManager:
                 )
                 return {"status": "approved", "message": "Undo applied"}
 
+        game_events.publish(game.id)
         return {"status": updated["status"], "votes": updated.get("votes")}
 
     def _execute_undo(self, game: Game, target_turn_number: int, proposed_by: UUID):
@@ -467,18 +591,23 @@ class GameManager:
             raise GameException(
                 "Cannot restore state: snapshot not found", status_code=500
             )
-        # Record the undo as its own move before restoring
+        # Record the undo as its own move, together with the restore
         current_max = db.get_max_turn_number(game.id)
         undo_turn_number = current_max + 1
-        db.add_game_move(
+        restored_state = GameState.from_dict(state_dict)
+        restored_state.turn_number = undo_turn_number + 1
+        move = db.commit_game_move(
             game.id,
             undo_turn_number,
-            1,
             proposed_by,
             "undo",
             {"target_turn_number": target_turn_number},
-            state_dict,
+            {"target_turn_number": target_turn_number},
+            game.game_state.to_dict(include_rng=True),
+            restored_state,
+            game.state_version,
         )
-        restored_state = GameState.from_dict(state_dict)
-        restored_state.turn_number = undo_turn_number + 1
-        db.update_game_state(game.id, restored_state)
+        self._check_committed(move)
+        game.game_state = restored_state
+        game.state_version = move["state_version"]
+        game_events.publish(game.id, move["state_version"])
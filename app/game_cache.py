@@ -0,0 +1,98 @@
+"""In-process cache of deserialised games, keyed by id and state version.
+
+Loading a game means fetching its whole latest_state and rebuilding the
+GameState with ``from_dict``; a single bot turn used to do that a dozen
+times. Db keeps the games it has loaded or written here, least recently
+used first out.
+
+The cache is write-through: every Db write of a game's state updates (or,
+when the new state is unknown, drops) its entry, so reads in this process
+see their own writes. Other processes and instances write the same rows, so
+an entry is only as good as its state_version: Db.get_game checks it against
+the database's before trusting the entry, and a write that loses a version
+race drops it.
+
+Games are handed out as copies sharing the cached GameState, which is safe
+because states are never mutated in place (actions are copy-on-write).
+Requests (on the AsyncDb pool) and bot workers use the cache at the same
+time, so each method holds the cache's lock throughout.
+"""
+
+import threading
+from collections import OrderedDict
+from uuid import UUID
+
+from app.game import Game, Status
+from app.GameState import GameState
+
+
+def _copy(game: Game) -> Game:
+    return Game(
+        id=game.id,
+        host=game.host,
+        players=set(game.players),
+        status=game.status,
+        game_state=game.game_state,
+        created=game.created,
+        state_version=game.state_version,
+    )
+
+
+class GameCache:
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._games: OrderedDict[UUID, Game] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def get(self, game_id: UUID) -> Game | None:
+        """A copy of the cached game, or None."""
+        with self._lock:
+            game = self._games.get(game_id)
+            if game is None:
+                return None
+            self._games.move_to_end(game_id)
+            return _copy(game)
+
+    def version(self, game_id: UUID) -> int | None:
+        """The cached game's state_version, or None if it isn't cached."""
+        with self._lock:
+            game = self._games.get(game_id)
+            return game.state_version if game is not None else None
+
+    def put(self, game: Game) -> None:
+        if self.maxsize <= 0:
+            return
+        game = _copy(game)
+        with self._lock:
+            self._games[game.id] = game
+            self._games.move_to_end(game.id)
+            while len(self._games) > self.maxsize:
+                self._games.popitem(last=False)
+
+    def update(
+        self,
+        game_id: UUID,
+        game_state: GameState,
+        state_version: int,
+        status: Status | None = None,
+    ) -> None:
+        """Record a write of the game's state, if the game is cached."""
+        with self._lock:
+            game = self._games.get(game_id)
+            if game is None:
+                return
+            game.game_state = game_state
+            game.state_version = state_version
+            if status is not None:
+                game.status = status
+
+    def discard(self, game_id: UUID) -> None:
+        with self._lock:
+            self._games.pop(game_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._games.clear()
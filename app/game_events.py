@@ -0,0 +1,118 @@
+"""Push notice of game changes to the browsers watching a game.
+
+Every open game page used to poll ``/v1/games/{id}`` and ``/valid-actions``
+every few seconds, changed or not. Instead, GameManager publishes here each
+time it writes a game (a move, an undo, a join, a start...) and the
+``/v1/games/{id}/events`` endpoint streams those notices to the page as
+server-sent events; the page only fetches the game when told it changed.
+
+    subscription = game_events.subscribe(game_id)      # on the event loop
+    game_events.publish(game_id, state_version)        # from any thread
+    async for chunk in game_events.stream(subscription, state_version): ...
+
+The hub lives in the server process, which is all there is (see Dockerfile);
+a change written by another process is only seen when the page next
+reconnects, which it does at least every STREAM_SECONDS. Pages fall back to
+polling while they have no stream.
+"""
+
+import asyncio
+import json
+import threading
+from uuid import UUID
+
+# Comment line sent on an idle stream so proxies don't time it out.
+KEEPALIVE_SECONDS = 15.0
+# Streams end after this long; the browser reconnects (re-authenticating).
+STREAM_SECONDS = 600.0
+# How long the browser waits before reconnecting a dropped stream.
+RETRY_MS = 3000
+
+
+class Subscription:
+    """One stream's interest in one game: its queue and the loop that owns it."""
+
+    def __init__(self, game_id: UUID, loop: asyncio.AbstractEventLoop):
+        self.game_id = game_id
+        self.loop = loop
+        # Only the newest notice matters: each one makes the page fetch the
+        # whole game, so a burst of bot moves collapses into one.
+        self.queue: asyncio.Queue[int | None] = asyncio.Queue(maxsize=1)
+
+    def offer(self, state_version: int | None) -> None:
+        """Queue a notice, replacing any not yet sent. Runs on ``loop``."""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(state_version)
+
+
+class GameEvents:
+    def __init__(self):
+        self._subscriptions: dict[UUID, set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, game_id: UUID) -> Subscription:
+        """Start collecting notices for ``game_id``; call on the event loop."""
+        subscription = Subscription(game_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.setdefault(game_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.game_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.game_id]
+
+    def watchers(self, game_id: UUID) -> int:
+        with self._lock:
+            return len(self._subscriptions.get(game_id, ()))
+
+    def publish(self, game_id: UUID, state_version: int | None = None) -> None:
+        """Tell every stream on ``game_id`` that the game changed.
+
+        ``state_version`` is the game's version after the change, or None for
+        changes that don't bump it (undo votes). Safe to call from any thread.
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(game_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(
+                    subscription.offer, state_version
+                )
+            except RuntimeError:  # the loop has closed
+                self.unsubscribe(subscription)
+
+    async def stream(self, subscription: Subscription, state_version: int):
+        """Server-sent events for a subscription, starting with the current version.
+
+        Yields a ``game`` event per notice, carrying ``{"state_version": n}``,
+        and keep-alive comments in between. Ends after STREAM_SECONDS, and
+        unsubscribes however it ends.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + STREAM_SECONDS
+        try:
+            yield f"retry: {RETRY_MS}\n" + _event(state_version)
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    version = await asyncio.wait_for(
+                        subscription.queue.get(), min(KEEPALIVE_SECONDS, remaining)
+                    )
+                except TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _event(version)
+        finally:
+            self.unsubscribe(subscription)
+
+
+def _event(state_version: int | None) -> str:
+    return f"event: game\ndata: {json.dumps({'state_version': state_version})}\n\n"
+
+
+game_events = GameEvents()
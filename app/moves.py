@@ -0,0 +1,342 @@
+"""Legal-move generation for the engine.
+
+``legal_moves(gs, player_id)`` lists every action the player may take right
+now, as ``Action`` records whose ``action_type`` and ``params`` map directly
+onto the functions in app.actions. Bots, search and the ``/valid-actions``
+endpoint all use it.
+
+Legality comes from the same helpers the actions validate with — claim
+thresholds, sale scoring, free-action eligibility — so the two cannot drift
+apart. ``playtesting.valid_actions.get_valid_actions`` is the older
+standalone copy of these rules; it is kept as the reference the tests compare
+against.
+
+Sell options (every sellable set of declared specials per cup, with points)
+are the expensive part: each subset of the player's mat specials is scored.
+They are memoised by what they depend on — the cup's contents and doubler,
+the specials on the mat and the player's specialist cards — so a move only
+causes them to be recomputed for a cup or mat it actually changed. Bladder
+counts need no cache: the counted ``Bag`` answers them in O(1).
+"""
+
+from dataclasses import dataclass, field
+from itertools import combinations
+from uuid import UUID
+
+from app.actions import (
+    CLAIM_THRESHOLDS,
+    MIN_DRUNK_TO_REFRESH,
+    _available_free_actions,
+    _sale_points,
+)
+from app.game_modes import GameMode
+from app.GameState import GameState
+from app.Ingredient import Ingredient
+from app.PlayerState import PlayerState
+
+_SPIRITS_BY_NAME: dict[str, Ingredient] = {
+    i.name: i
+    for i in (
+        Ingredient.WHISKEY,
+        Ingredient.GIN,
+        Ingredient.RUM,
+        Ingredient.TEQUILA,
+        Ingredient.VODKA,
+    )
+}
+_MIXERS_BY_NAME: dict[str, Ingredient] = {
+    i.name: i
+    for i in (Ingredient.COLA, Ingredient.SODA, Ingredient.TONIC, Ingredient.CRANBERRY)
+}
+
+
+@dataclass
+class Action:
+    """Represents a legal action a player can take."""
+
+    action_type: str
+    params: dict = field(default_factory=dict)
+    is_free: bool = False
+    description: str = ""
+
+
+# (cup contents, has_cup_doubler, mat specials, specialist spirits) →
+# ((declared_specials, points), ...). Cleared wholesale when full.
+_SELL_OPTIONS: dict[tuple, tuple[tuple[tuple[str, ...], int], ...]] = {}
+_SELL_OPTIONS_LIMIT = 1 << 14
+
+
+def cup_sell_options(
+    ps: PlayerState, cup_index: int
+) -> tuple[tuple[tuple[str, ...], int], ...]:
+    """Every sellable ``(declared_specials, points)`` for one cup.
+
+    Declaring nothing comes first, then each distinct subset of the mat's
+    specials in ``combinations`` order. Empty when the cup is empty or
+    nothing is sellable.
+    """
+    cup = ps.cups[cup_index]
+    if not cup.ingredients:
+        return ()
+    specials = tuple(ps.special_ingredients)
+    key = (
+        tuple(i.code for i in cup.ingredients),
+        cup.has_cup_doubler,
+        specials,
+        ps.cards.specialist_spirits,
+    )
+    options = _SELL_OPTIONS.get(key)
+    if options is None:
+        found = []
+        pts = _sale_points(ps, cup, [])
+        if pts is not None:
+            found.append(((), pts))
+        seen: set[tuple[str, ...]] = set()
+        for r in range(1, len(specials) + 1):
+            for combo in combinations(specials, r):
+                canonical = tuple(sorted(combo))
+                if canonical in seen:
+                    continue
+                seen.add(canonical)
+                pts = _sale_points(ps, cup, list(combo))
+                if pts is not None:
+                    found.append((combo, pts))
+        if len(_SELL_OPTIONS) >= _SELL_OPTIONS_LIMIT:
+            _SELL_OPTIONS.clear()
+        options = _SELL_OPTIONS[key] = tuple(found)
+    return options
+
+
+def legal_moves(gs: GameState, player_id: UUID) -> list[Action]:
+    """Return all legal actions for the given player."""
+    if gs.player_turn != player_id:
+        return []
+
+    ps = gs.player_states.get(player_id)
+    if ps is None or ps.is_eliminated:
+        return []
+
+    result: list[Action] = []
+    take_in_progress = gs.ingredients_taken_this_turn > 0 or bool(gs.bag_draw_pending)
+
+    if take_in_progress:
+        # Mid-take: only finishing the take is legal
+        _add_take_ingredients(gs, ps, result, mid_batch=True)
+    else:
+        _add_stored_spirit_actions(ps, result)
+        _add_take_ingredients(gs, ps, result, mid_batch=False)
+        _add_sell_cup(ps, result)
+        if gs.has_mode(GameMode.SELL_BOTH_CUPS.value):
+            _add_sell_both_cups(ps, result)
+        _add_drink_cup(ps, result)
+        if ps.bladder:
+            result.append(Action("go_for_a_wee", {}, description="Go for a wee"))
+        _add_claim_card(gs, ps, result)
+        _add_refresh_card_row(gs, ps, result)
+        if ps.special_ingredients:
+            chosen = list(ps.special_ingredients)
+            result.append(
+                Action(
+                    "reroll_specials",
+                    {"chosen_specials": chosen},
+                    description=f"Re-roll all {len(chosen)} special(s)",
+                )
+            )
+
+    free_types = _available_free_actions(gs, ps, gs.free_actions_used_this_turn)
+    if free_types:
+        for a in result:
+            if a.action_type in free_types:
+                a.is_free = True
+
+    # Once the main action has been taken only free actions remain legal;
+    # finishing a take never re-consumes it.
+    if gs.main_action_taken_this_turn and not take_in_progress:
+        result = [a for a in result if a.is_free]
+    return result
+
+
+def _add_stored_spirit_actions(ps: PlayerState, result: list[Action]):
+    stores = [
+        (idx, ps.cards[idx])
+        for idx in ps.cards.store_positions
+        if ps.cards[idx].stored_spirits
+    ]
+    for idx, card in stores:
+        spirit_type = card.spirit_type or ""
+        for count in range(1, len(card.stored_spirits) + 1):
+            result.append(
+                Action(
+                    "drink_stored_spirit",
+                    {"store_card_index": idx, "count": count},
+                    is_free=True,
+                    description=f"Drink {count} {spirit_type} from store card {idx}",
+                )
+            )
+    for idx, card in stores:
+        spirit_type = card.spirit_type or ""
+        for cup_idx in (0, 1):
+            if not ps.cups[cup_idx].is_full:
+                result.append(
+                    Action(
+                        "use_stored_spirit",
+                        {"store_card_index": idx, "cup_index": cup_idx},
+                        is_free=True,
+                        description=f"Move {spirit_type} from store {idx} to cup {cup_idx}",
+                    )
+                )
+
+
+def _add_take_ingredients(
+    gs: GameState, ps: PlayerState, result: list[Action], mid_batch: bool
+):
+    take_count = ps.take_count
+    remaining = take_count - gs.ingredients_taken_this_turn
+    if remaining <= 0:
+        return
+    if not mid_batch and len(gs.bag_contents) + len(gs.open_display) < take_count:
+        return
+    result.append(
+        Action(
+            "take_ingredients",
+            {"remaining": remaining},
+            description=f"Take {remaining} ingredient(s)",
+        )
+    )
+
+
+def _add_sell_cup(ps: PlayerState, result: list[Action]):
+    for cup_idx in (0, 1):
+        for declared, pts in cup_sell_options(ps, cup_idx):
+            if declared:
+                description = f"Sell cup {cup_idx} for {pts}pts with {list(declared)}"
+            else:
+                description = f"Sell cup {cup_idx} for {pts}pts (no specials)"
+            result.append(
+                Action(
+                    "sell_cup",
+                    {
+                        "cup_index": cup_idx,
+                        "declared_specials": list(declared),
+                        "points": pts,
+                    },
+                    description=description,
+                )
+            )
+
+
+def _specials_fit_mat(mat: list[str], used_a: tuple, used_b: tuple) -> bool:
+    """Return True if combined specials usage is a sub-multiset of the mat."""
+    remaining = list(mat)
+    for s in (*used_a, *used_b):
+        if s not in remaining:
+            return False
+        remaining.remove(s)
+    return True
+
+
+def _add_sell_both_cups(ps: PlayerState, result: list[Action]):
+    cup0_opts = cup_sell_options(ps, 0)
+    cup1_opts = cup_sell_options(ps, 1)
+    if not cup0_opts or not cup1_opts:
+        return
+
+    mat = ps.special_ingredients
+    for ds0, pts0 in cup0_opts:
+        for ds1, pts1 in cup1_opts:
+            if (ds0 or ds1) and not _specials_fit_mat(mat, ds0, ds1):
+                continue
+            total = pts0 + pts1
+            result.append(
+                Action(
+                    "sell_cup",
+                    {
+                        "cup_index": 0,
+                        "declared_specials": list(ds0),
+                        "additional_cups": [
+                            {"cup_index": 1, "declared_specials": list(ds1)}
+                        ],
+                        "points": total,
+                    },
+                    description=(
+                        f"Sell both cups for {total}pts "
+                        f"(cup 0 {pts0}pts, cup 1 {pts1}pts)"
+                    ),
+                )
+            )
+
+
+def _add_drink_cup(ps: PlayerState, result: list[Action]):
+    for cup_idx in (0, 1):
+        if ps.cups[cup_idx].ingredients:
+            result.append(
+                Action(
+                    "drink_cup",
+                    {"cup_index": cup_idx},
+                    description=f"Drink cup {cup_idx}",
+                )
+            )
+
+
+def _add_claim_card(gs: GameState, ps: PlayerState, result: list[Action]):
+    # Free-action cards are never offered: get_valid_actions has not listed
+    # them either, and bots are tuned around that.
+    if not ps.bladder:
+        return
+    count = ps.bladder.count
+    doubler_spirits = [
+        name
+        for name, spirit in _SPIRITS_BY_NAME.items()
+        if count(spirit) >= CLAIM_THRESHOLDS["cup_doubler"]
+    ]
+    for row in gs.card_rows:
+        for card in row.cards:
+            card_type = card.card_type
+            if card_type == "cup_doubler":
+                for spirit_name in doubler_spirits:
+                    for cup_idx in (0, 1):
+                        result.append(
+                            Action(
+                                "claim_card",
+                                {
+                                    "card_id": card.id,
+                                    "cup_index": cup_idx,
+                                    "spirit_type": spirit_name,
+                                },
+                                description=f"Claim cup doubler '{card.name}' with {spirit_name} on cup {cup_idx}",
+                            )
+                        )
+                continue
+            if card_type == "refresher":
+                paid_with, by_name = card.mixer_type, _MIXERS_BY_NAME
+            elif card_type in ("karaoke", "store", "specialist"):
+                paid_with, by_name = card.spirit_type, _SPIRITS_BY_NAME
+            else:
+                continue
+            ingredient = by_name.get(paid_with.upper()) if paid_with else None
+            if (
+                ingredient is not None
+                and count(ingredient) >= CLAIM_THRESHOLDS[card_type]
+            ):
+                result.append(
+                    Action(
+                        "claim_card",
+                        {"card_id": card.id},
+                        description=f"Claim {card_type} '{card.name}' ({paid_with})",
+                    )
+                )
+
+
+def _add_refresh_card_row(gs: GameState, ps: PlayerState, result: list[Action]):
+    if ps.drunk_level < MIN_DRUNK_TO_REFRESH:
+        return
+    for row in gs.card_rows:
+        # Row 1 (karaoke) is never refreshable
+        if row.position != 1 and row.cards:
+            result.append(
+                Action(
+                    "refresh_card_row",
+                    {"row_position": row.position},
+                    description=f"Refresh card row {row.position}",
+                )
+            )
@@ -0,0 +1,205 @@
+"""Rebuild a game's states by re-running its recorded moves.
+
+Every move record carries the arguments its action was called with
+(``params``) and the random outcomes it consumed (``outcomes``: drawn
+ingredients, replacement card ids and special rolls, in order). Starting from
+the game's ``initial_state``, applying each move through app.actions with its
+outcomes scripted (see ``GameState.outcome_script``) reproduces the state the
+server saved after it, so any point in a game's history can be recomputed.
+
+Moves recorded before params and outcomes were kept have ``params`` None;
+they are applied from their stored state delta instead, so older games still
+replay end to end.
+
+Replayed states are kept in a bounded in-process cache, so walking through a
+game's history replays each move once rather than from the start every time.
+"""
+
+import threading
+from collections import OrderedDict, deque
+from uuid import UUID
+
+from app import actions
+from app.game import GameException
+from app.GameState import GameState
+from app.state_delta import apply_move_delta, diff_states
+
+# Actions called as fn(gs, player_id, **params); see GameManager.
+_PLAYER_ACTIONS = frozenset(
+    {
+        "draw_from_bag",
+        "take_ingredients",
+        "sell_cup",
+        "drink_cup",
+        "go_for_a_wee",
+        "claim_card",
+        "drink_stored_spirit",
+        "use_stored_spirit",
+        "reroll_specials",
+        "refresh_card_row",
+        "end_turn",
+        "quit_game",
+    }
+)
+
+# A snapshot is cached after every SNAPSHOT_EVERY-th move of a game (and at
+# whichever move was asked for); the states of at most CACHED_GAMES games
+# are kept, least recently used first out.
+SNAPSHOT_EVERY = 10
+CACHED_GAMES = 64
+
+_snapshots: "OrderedDict[UUID, dict[int, GameState]]" = OrderedDict()
+# Replays run on several threads at once (the AsyncDb pool, bot workers). The
+# lock guards _snapshots, the dicts in it and the cached states themselves:
+# a cached state is only ever copied (copy_on_write marks it as sharing), and
+# only with the lock held. Moves are applied outside it, to private copies.
+_lock = threading.Lock()
+
+
+def clear_cache() -> None:
+    with _lock:
+        _snapshots.clear()
+
+
+def _game_snapshots(game_id: UUID) -> dict[int, GameState]:
+    """The game's cached snapshots. Called with _lock held."""
+    snaps = _snapshots.get(game_id)
+    if snaps is None:
+        snaps = _snapshots[game_id] = {}
+        if len(_snapshots) > CACHED_GAMES:
+            _snapshots.popitem(last=False)
+    else:
+        _snapshots.move_to_end(game_id)
+    return snaps
+
+
+class GameReplay:
+    """A game's recorded moves, replayable from its initial state.
+
+    ``moves`` are the game's move rows in seq order (see
+    ``Db.get_replay_data``). States returned are copy-on-write copies of the
+    cached ones, private to the caller.
+    """
+
+    def __init__(self, game_id: UUID, initial_state: dict, moves: list[dict]):
+        if [m["seq"] for m in moves] != list(range(1, len(moves) + 1)):
+            raise GameException("Move history has gaps", status_code=500)
+        self.game_id = game_id
+        self.initial_state = initial_state
+        self.moves = moves
+        self._first_seq_of_turn: dict[int, int] = {}
+        for move in moves:
+            self._first_seq_of_turn.setdefault(move["turn_number"], move["seq"])
+
+    def state_after(self, seq: int) -> GameState:
+        """The state after the first ``seq`` moves (0 for the initial state)."""
+        if not 0 <= seq <= len(self.moves):
+            raise GameException("Move not found", status_code=404)
+        with _lock:
+            snaps = _game_snapshots(self.game_id)
+            start = max((s for s in snaps if s <= seq), default=None)
+            gs = snaps[start].copy_on_write() if start is not None else None
+        if gs is None:
+            start, gs = 0, GameState.from_dict(self.initial_state)
+        # Every state below is this thread's own until it is cached.
+        replayed = {}
+        for move in self.moves[start:seq]:
+            gs = self._apply(gs, move)
+            if move["seq"] % SNAPSHOT_EVERY == 0:
+                replayed[move["seq"]] = gs
+        replayed[seq] = gs
+        with _lock:
+            # The game may have been evicted meanwhile; then this re-adds it.
+            _game_snapshots(self.game_id).update(replayed)
+            return gs.copy_on_write()
+
+    def state_before_turn(self, turn_number: int) -> GameState | None:
+        """The state before the first move of ``turn_number``, if it has one."""
+        seq = self._first_seq_of_turn.get(turn_number)
+        if seq is None:
+            return None
+        return self.state_after(seq - 1)
+
+    def verify(self, latest_state: dict) -> list[dict]:
+        """Replay every move and compare each result with the stored history.
+
+        The stored state after a move is the previous one with its delta
+        applied; the final state must also match the game's ``latest_state``.
+        Returns one ``{"seq": n, "keys": [...]}`` entry per move whose replayed
+        state differs (``keys`` being the top-level fields that differ; seq
+        None for latest_state), so an empty list means the history replays
+        exactly. After a mismatch the replay carries on from the stored state,
+        so each divergence is reported once.
+        """
+        mismatches = []
+        stored = self.initial_state
+        gs = GameState.from_dict(stored)
+        for move in self.moves:
+            gs = self._apply(gs, move)
+            stored = apply_move_delta(stored, move["state_delta"], move["outcomes"])
+            if move["params"] is None:
+                continue
+            replayed = gs.to_dict(include_rng=True)
+            if replayed != stored:
+                mismatches.append(
+                    {"seq": move["seq"], "keys": _changed(stored, replayed)}
+                )
+                gs = GameState.from_dict(stored)
+        replayed = gs.to_dict(include_rng=True)
+        if replayed != latest_state:
+            mismatches.append({"seq": None, "keys": _changed(latest_state, replayed)})
+        return mismatches
+
+    def _apply(self, gs: GameState, move: dict) -> GameState:
+        action_type = move["action"]["type"]
+        params = move["params"]
+        if params is None:
+            after = apply_move_delta(
+                gs.to_dict(include_rng=True), move["state_delta"], move["outcomes"]
+            )
+            return GameState.from_dict(after)
+
+        if action_type == "undo":
+            # As GameManager._execute_undo: back to the start of the target
+            # turn, numbered after the undo move itself.
+            restored = self.state_before_turn(params["target_turn_number"])
+            if restored is None:
+                raise GameException(
+                    f"Replay diverged: move {move['seq']} undoes an unknown turn",
+                    status_code=500,
+                )
+            restored.turn_number = move["turn_number"] + 1
+            return restored
+
+        # gs is never a cached state (see state_after), so no other replay
+        # sees this script.
+        script = deque(move["outcomes"] or ())
+        gs.outcome_script = script
+        try:
+            if action_type in _PLAYER_ACTIONS:
+                fn = getattr(actions, action_type)
+                new_gs, _ = fn(gs, UUID(move["player_id"]), **params)
+            elif action_type == "skip_turn":
+                new_gs, _ = actions.skip_turn(gs)
+            elif action_type == "cancel_game":
+                new_gs, _ = actions.cancel_game(gs)
+            else:
+                raise GameException(
+                    f"Cannot replay move {move['seq']}: unknown action {action_type!r}",
+                    status_code=500,
+                )
+        finally:
+            gs.outcome_script = None
+        new_gs.outcome_script = None
+        if script:
+            raise GameException(
+                f"Replay diverged: move {move['seq']} left {len(script)} "
+                "recorded outcomes unused",
+                status_code=500,
+            )
+        return new_gs
+
+
+def _changed(expected: dict, actual: dict) -> list[str]:
+    delta = diff_states(expected, actual)
+    return sorted({*delta.get("set", ()), *delta.get("del", ()), *delta.get("sub", ())})
@@ -0,0 +1,933 @@
+"""Storage in SQLite: a file for single-node deployments, or memory for tests.
+
+SqliteDb implements the same interface and semantics as the Supabase-backed
+Db (see app.storage): the schema mirrors the Supabase tables, with JSON
+columns stored as text, and the triggers that bump games.state_version and
+maintain games.summary are recreated here. The database functions behind
+Db's RPCs (commit_game_move, add/remove_player_to/from_game) are methods
+that run in one transaction.
+
+One connection serves every thread, one transaction at a time.
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from uuid import UUID, uuid4
+
+from app.archive import MOVE_COLUMNS
+from app.game import Game, GameSummary, game_summary
+from app.game_cache import GameCache
+from app.GameState import GameState
+from app.state_delta import is_keyframe, move_delta, rebuild_state
+from app.storage import Storage
+from app.user import User
+from app.utils import bytesToHexString, hexStringToBytes
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+  id                  TEXT PRIMARY KEY,
+  username            TEXT UNIQUE,
+  email               TEXT UNIQUE,
+  password            TEXT,
+  status              TEXT NOT NULL DEFAULT 'active',
+  is_admin            INTEGER NOT NULL DEFAULT 0,
+  created_at          TEXT,
+  password_changed_at TEXT,
+  deactivated_at      TEXT,
+  deactivated_by      TEXT REFERENCES users(id),
+  deleted_at          TEXT,
+  logged_out_at       TEXT,
+  theme               TEXT NOT NULL DEFAULT 'taverna',
+  is_bot              INTEGER NOT NULL DEFAULT 0,
+  bot_strategy        TEXT
+);
+
+CREATE TABLE IF NOT EXISTS public_keys (
+  kid        TEXT PRIMARY KEY,
+  public_key TEXT,
+  created_at TEXT,
+  valid      INTEGER NOT NULL DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS games (
+  id            TEXT PRIMARY KEY,
+  host          TEXT REFERENCES users(id),
+  players       TEXT NOT NULL DEFAULT '[]',
+  status        TEXT NOT NULL DEFAULT 'NEW',
+  latest_state  TEXT NOT NULL DEFAULT '{}',
+  initial_state TEXT,
+  summary       TEXT,
+  state_version INTEGER NOT NULL DEFAULT 0,
+  created_at    TEXT,
+  ended_at      TEXT,
+  archived_at   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_games_created_at_id ON games (created_at DESC, id DESC);
+
+CREATE TRIGGER IF NOT EXISTS games_bump_state_version
+  AFTER UPDATE OF latest_state, players, status ON games
+BEGIN
+  UPDATE games SET state_version = state_version + 1 WHERE id = NEW.id;
+END;
+CREATE TRIGGER IF NOT EXISTS games_set_summary_on_insert
+  AFTER INSERT ON games
+BEGIN
+  UPDATE games SET summary = game_summary(NEW.latest_state) WHERE id = NEW.id;
+END;
+CREATE TRIGGER IF NOT EXISTS games_set_summary
+  AFTER UPDATE OF latest_state ON games
+BEGIN
+  UPDATE games SET summary = game_summary(NEW.latest_state) WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS games_set_ended_at
+  AFTER UPDATE OF status ON games
+  WHEN NEW.status = 'ENDED' AND OLD.status != 'ENDED'
+BEGIN
+  UPDATE games SET ended_at = strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')
+  WHERE id = NEW.id;
+END;
+CREATE INDEX IF NOT EXISTS idx_games_archivable
+  ON games (ended_at) WHERE status = 'ENDED' AND archived_at IS NULL;
+
+CREATE TABLE IF NOT EXISTS game_archives (
+  game_id     TEXT PRIMARY KEY REFERENCES games(id) ON DELETE CASCADE,
+  history     BLOB NOT NULL,
+  move_count  INTEGER NOT NULL,
+  archived_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS game_moves (
+  id            TEXT PRIMARY KEY,
+  game_id       TEXT NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+  turn_number   INTEGER NOT NULL,
+  move_number   INTEGER NOT NULL,
+  seq           INTEGER NOT NULL,
+  player_id     TEXT NOT NULL,
+  action        TEXT NOT NULL,
+  params        TEXT,
+  outcomes      TEXT,
+  state_before  TEXT,
+  state_delta   TEXT,
+  state_version INTEGER,
+  created_at    TEXT,
+  UNIQUE (game_id, turn_number, move_number),
+  UNIQUE (game_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_game_moves_keyframes
+  ON game_moves (game_id, seq) WHERE state_before IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS undo_requests (
+  id                 TEXT PRIMARY KEY,
+  game_id            TEXT NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+  target_turn_number INTEGER NOT NULL,
+  proposed_by        TEXT NOT NULL,
+  proposed_at        TEXT,
+  votes              TEXT NOT NULL DEFAULT '{}',
+  status             TEXT NOT NULL DEFAULT 'pending'
+    CHECK (status IN ('pending', 'approved', 'rejected'))
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_undo_requests_one_pending
+  ON undo_requests (game_id) WHERE status = 'pending';
+
+CREATE TABLE IF NOT EXISTS push_subscriptions (
+  id         TEXT PRIMARY KEY,
+  user_id    TEXT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  endpoint   TEXT NOT NULL UNIQUE,
+  p256dh     TEXT NOT NULL,
+  auth       TEXT NOT NULL,
+  created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_push_subscriptions_user_id
+  ON push_subscriptions (user_id);
+
+CREATE TABLE IF NOT EXISTS bot_policy (
+  key        TEXT PRIMARY KEY,
+  value      TEXT NOT NULL DEFAULT '{}',
+  updated_at TEXT
+);
+INSERT OR IGNORE INTO bot_policy (key, value)
+  VALUES ('mcts_policy', '{"values": {}, "counts": {}, "games_played": 0}');
+"""
+
+_JSON_COLUMNS = {
+    "players",
+    "latest_state",
+    "initial_state",
+    "summary",
+    "action",
+    "params",
+    "outcomes",
+    "state_before",
+    "state_delta",
+    "votes",
+    "value",
+}
+_BOOL_COLUMNS = {"is_admin", "is_bot", "valid"}
+
+_USER_COLUMNS = (
+    "id, username, email, password, status, is_admin, created_at, "
+    "password_changed_at, deactivated_at, deactivated_by, deleted_at, "
+    "logged_out_at, theme, is_bot, bot_strategy"
+)
+_GAME_COLUMNS = "id, host, players, status, latest_state, created_at, state_version"
+
+
+def _summary_sql(latest_state: str) -> str:
+    return json.dumps(game_summary(json.loads(latest_state)))
+
+
+def _row(row: sqlite3.Row | None) -> dict | None:
+    """A row as Supabase would return it: JSON decoded, booleans as bools."""
+    if row is None:
+        return None
+    result = {}
+    for column, value in dict(row).items():
+        if column in _JSON_COLUMNS and value is not None:
+            value = json.loads(value)
+        elif column in _BOOL_COLUMNS:
+            value = bool(value)
+        result[column] = value
+    return result
+
+
+class SqliteDb(Storage):
+    def __init__(self, path: str = ":memory:"):
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.create_function("game_summary", 1, _summary_sql, deterministic=True)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+        with self._tx() as conn:
+            conn.executescript(_SCHEMA)
+        self.game_cache = GameCache()
+
+    @contextmanager
+    def _tx(self):
+        """The connection, inside a transaction that commits unless it raises."""
+        with self._lock, self._conn:
+            yield self._conn
+
+    def _one(self, sql: str, *params) -> dict | None:
+        with self._tx() as conn:
+            return _row(conn.execute(sql, params).fetchone())
+
+    def _all(self, sql: str, *params) -> list[dict]:
+        with self._tx() as conn:
+            return [_row(r) for r in conn.execute(sql, params).fetchall()]
+
+    def _update(self, table: str, key: str, key_value, values: dict) -> bool:
+        """UPDATE one row by key; True if it existed."""
+        columns = ", ".join(f"{c} = ?" for c in values)
+        with self._tx() as conn:
+            cursor = conn.execute(
+                f"UPDATE {table} SET {columns} WHERE {key} = ?",
+                (*values.values(), key_value),
+            )
+            return cursor.rowcount == 1
+
+    # ─── Users ────────────────────────────────────────────────────────────────
+
+    def add_user(self, user: User) -> bool:
+        if user.is_bot:
+            password_value = None
+        else:
+            password_value = bytesToHexString(user._password_hash)
+        now = self._now()
+        try:
+            with self._tx() as conn:
+                conn.execute(
+                    "INSERT INTO users (id, username, email, password, status,"
+                    " is_admin, is_bot, bot_strategy, created_at,"
+                    " password_changed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        str(user.id),
+                        user.username,
+                        user.email,
+                        password_value,
+                        user.status,
+                        user.is_admin,
+                        user.is_bot,
+                        user.bot_strategy,
+                        now,
+                        now,
+                    ),
+                )
+        except sqlite3.IntegrityError as e:
+            # Same wording as Postgres, which UserManager looks for.
+            raise ValueError(
+                f"duplicate key value violates unique constraint: {e}"
+            ) from e
+        return True
+
+    def _user_where(self, where: str, *params) -> list[User]:
+        rows = self._all(f"SELECT {_USER_COLUMNS} FROM users WHERE {where}", *params)
+        return [self._row_to_user(row) for row in rows]
+
+    def get_user_by_username(self, username: str) -> User | None:
+        users = self._user_where("username = ?", username)
+        return users[0] if len(users) == 1 else None
+
+    def get_user_by_id(self, id: UUID) -> User | None:
+        users = self._user_where("id = ?", str(id))
+        return users[0] if len(users) == 1 else None
+
+    def get_users_by_ids(self, ids: set[UUID]) -> list[User]:
+        ids = [str(i) for i in ids]
+        return self._user_where(f"id IN ({', '.join('?' * len(ids))})", *ids)
+
+    def get_users(self) -> list[User]:
+        return self._user_where(
+            "status != 'deleted' ORDER BY created_at DESC LIMIT 1000"
+        )
+
+    def get_bot_by_strategy(self, strategy: str) -> User | None:
+        """Find an existing active bot user for the given strategy."""
+        users = self._user_where(
+            "is_bot AND bot_strategy = ? AND status = 'active' LIMIT 1", strategy
+        )
+        return users[0] if users else None
+
+    def get_bot_users_by_ids(self, ids: set[UUID]) -> list[User]:
+        """Return only bot users from the given IDs."""
+        if not ids:
+            return []
+        return [u for u in self.get_users_by_ids(ids) if u.is_bot]
+
+    def delete_user(self, user_id: UUID) -> bool:
+        return self._update(
+            "users",
+            "id",
+            str(user_id),
+            {
+                "status": "deleted",
+                "username": None,
+                "email": None,
+                "password": None,
+                "deleted_at": self._now(),
+            },
+        )
+
+    def deactivate_user(self, target_id: UUID, admin_id: UUID) -> bool:
+        return self._update(
+            "users",
+            "id",
+            str(target_id),
+            {
+                "status": "deactivated",
+                "deactivated_at": self._now(),
+                "deactivated_by": str(admin_id),
+            },
+        )
+
+    def reactivate_user(self, target_id: UUID) -> bool:
+        return self._update(
+            "users",
+            "id",
+            str(target_id),
+            {"status": "active", "deactivated_at": None, "deactivated_by": None},
+        )
+
+    def logout_user(self, user_id: UUID) -> bool:
+        return self._update("users", "id", str(user_id), {"logged_out_at": self._now()})
+
+    def update_email(self, user_id: UUID, new_email: str) -> bool:
+        return self._update("users", "id", str(user_id), {"email": new_email})
+
+    def update_password(self, user_id: UUID, new_hash: bytes) -> bool:
+        return self._update(
+            "users",
+            "id",
+            str(user_id),
+            {
+                "password": bytesToHexString(new_hash),
+                "password_changed_at": self._now(),
+            },
+        )
+
+    def update_theme(self, user_id: UUID, theme: str) -> bool:
+        return self._update("users", "id", str(user_id), {"theme": theme})
+
+    def get_public_key(self, kid: str) -> bytes | None:
+        row = self._one(
+            "SELECT public_key FROM public_keys WHERE kid = ? AND valid", str(kid)
+        )
+        return hexStringToBytes(row["public_key"]) if row else None
+
+    def add_public_key(self, kid: UUID, public_key: bytes) -> bool:
+        with self._tx() as conn:
+            conn.execute(
+                "INSERT INTO public_keys (kid, public_key, created_at)"
+                " VALUES (?, ?, ?)",
+                (str(kid), bytesToHexString(public_key), self._now()),
+            )
+        return True
+
+    # ─── Games ────────────────────────────────────────────────────────────────
+
+    def create_game(self, game: Game):
+        """Create a game in the database"""
+        with self._tx() as conn:
+            conn.execute(
+                "INSERT INTO games (id, host, players, status, latest_state,"
+                " created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    str(game.id),
+                    str(game.host),
+                    json.dumps([str(id) for id in game.players]),
+                    game.status.name,
+                    json.dumps(game.game_state.to_dict(include_rng=True)),
+                    self._now(),
+                ),
+            )
+
+    def get_game_version(self, game_id: UUID) -> int | None:
+        """The game's current state_version, or None if there is no such game."""
+        row = self._one("SELECT state_version FROM games WHERE id = ?", str(game_id))
+        return row["state_version"] if row else None
+
+    def get_game_header(self, game_id: UUID) -> dict | None:
+        return self._one(
+            "SELECT host, players, status, state_version FROM games WHERE id = ?",
+            str(game_id),
+        )
+
+    def _load_game(self, game_id: UUID) -> Game | None:
+        row = self._one(f"SELECT {_GAME_COLUMNS} FROM games WHERE id = ?", str(game_id))
+        return self.game_response_to_game(row) if row else None
+
+    def get_games(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        status: list[str] | str | None = None,
+        player_id: UUID | None = None,
+        after: tuple[str, str] | None = None,
+    ) -> tuple[list[GameSummary], int | None, bool]:
+        """Get a page of game summaries, newest first, with optional filters.
+
+        Returns (games, total_count, has_more), paged as Db.get_games.
+        """
+        where, params = ["1"], []
+        if status:
+            statuses = status if isinstance(status, list) else [status]
+            where.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if player_id:
+            where.append(
+                "EXISTS (SELECT 1 FROM json_each(games.players) WHERE value = ?)"
+            )
+            params.append(str(player_id))
+        total = None
+        if after is None:
+            offset = (page - 1) * page_size
+            total = self._one(
+                f"SELECT COUNT(*) AS n FROM games WHERE {' AND '.join(where)}", *params
+            )["n"]
+        else:
+            created_at, game_id = after
+            where.append("(created_at < ? OR (created_at = ? AND id < ?))")
+            params.extend([created_at, created_at, game_id])
+            offset = 0
+        # One extra row tells us whether there is a next page.
+        rows = self._all(
+            "SELECT id, host, players, status, summary, created_at FROM games"
+            f" WHERE {' AND '.join(where)}"
+            " ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+            *params,
+            page_size + 1,
+            offset,
+        )
+        games = [self.game_response_to_summary(g) for g in rows[:page_size]]
+        return games, total, len(rows) > page_size
+
+    def _write_game(
+        self, game_id: UUID, game_state: GameState, values: dict, where: str = ""
+    ) -> bool:
+        """UPDATE the game with ``values`` (plus ``where``); refresh the cache."""
+        columns = ", ".join(f"{c} = ?" for c in values)
+        with self._tx() as conn:
+            cursor = conn.execute(
+                f"UPDATE games SET {columns} WHERE id = ? {where}",
+                (*values.values(), str(game_id)),
+            )
+            row = conn.execute(
+                "SELECT state_version, status FROM games WHERE id = ?", (str(game_id),)
+            ).fetchone()
+        if cursor.rowcount != 1:
+            self.game_cache.discard(game_id)
+            return False
+        self._cache_write(game_id, game_state, dict(row))
+        return True
+
+    def start_game(self, game_id: UUID, game_state: GameState) -> str:
+        """Start a game: atomically set status=STARTED, save initial_state and latest_state.
+        Returns 'ok' | 'not_found' | 'not_new'"""
+        state_json = json.dumps(game_state.to_dict(include_rng=True))
+        values = {
+            "status": "STARTED",
+            "latest_state": state_json,
+            "initial_state": state_json,
+        }
+        if self._write_game(game_id, game_state, values, "AND status = 'NEW'"):
+            return "ok"
+        if self.get_game_version(game_id) is None:
+            return "not_found"
+        return "not_new"
+
+    def update_game_state(
+        self,
+        game_id: UUID,
+        game_state: GameState,
+        expected_version: int | None = None,
+    ) -> bool:
+        """Overwrite latest_state after a game action. Also sets status=ENDED if there is a winner.
+
+        With expected_version, only writes while the row's state_version still
+        matches; returns False if another write got there first.
+        """
+        values = {"latest_state": json.dumps(game_state.to_dict(include_rng=True))}
+        if game_state.winner is not None:
+            values["status"] = "ENDED"
+        where = ""
+        if expected_version is not None:
+            where = f"AND state_version = {int(expected_version)}"
+        return self._write_game(game_id, game_state, values, where)
+
+    def end_game(self, game_id: UUID, game_state: GameState) -> bool:
+        """End a game (cancel or quit): save state and set status=ENDED."""
+        values = {
+            "latest_state": json.dumps(game_state.to_dict(include_rng=True)),
+            "status": "ENDED",
+        }
+        return self._write_game(game_id, game_state, values)
+
+    def add_player_to_game(self, game_id: UUID, player_id: UUID) -> str:
+        """Add a player to an existing game. Returns a text code: 'ok' | 'not_found' | 'not_new' | 'duplicate' | 'full'"""
+        with self._tx() as conn:
+            game = _row(
+                conn.execute(
+                    "SELECT players, status FROM games WHERE id = ?", (str(game_id),)
+                ).fetchone()
+            )
+            if game is None:
+                result = "not_found"
+            elif game["status"] != "NEW":
+                result = "not_new"
+            elif str(player_id) in game["players"]:
+                result = "duplicate"
+            elif len(game["players"]) >= 4:
+                result = "full"
+            else:
+                conn.execute(
+                    "UPDATE games SET players = ? WHERE id = ?",
+                    (json.dumps([*game["players"], str(player_id)]), str(game_id)),
+                )
+                result = "ok"
+        self.game_cache.discard(game_id)
+        return result
+
+    def remove_player_from_game(
+        self, game_id: UUID, requester_id: UUID, player_id: UUID
+    ) -> str:
+        """Remove a player from an existing game. Returns a text code: 'ok' | 'not_found' | 'not_host' | 'not_in_game' | 'is_host'"""
+        with self._tx() as conn:
+            game = _row(
+                conn.execute(
+                    "SELECT players, host, latest_state FROM games WHERE id = ?",
+                    (str(game_id),),
+                ).fetchone()
+            )
+            if game is None:
+                result = "not_found"
+            elif str(requester_id) != game["host"]:
+                result = "not_host"
+            elif str(player_id) not in game["players"]:
+                result = "not_in_game"
+            elif str(player_id) == game["host"]:
+                result = "is_host"
+            else:
+                state = game["latest_state"]
+                state.get("player_states", {}).pop(str(player_id), None)
+                players = [p for p in game["players"] if p != str(player_id)]
+                conn.execute(
+                    "UPDATE games SET players = ?, latest_state = ? WHERE id = ?",
+                    (json.dumps(players), json.dumps(state), str(game_id)),
+                )
+                result = "ok"
+        self.game_cache.discard(game_id)
+        return result
+
+    # ─── Moves ────────────────────────────────────────────────────────────────
+
+    def commit_game_move(
+        self,
+        game_id: UUID,
+        turn_number: int,
+        player_id: UUID,
+        action_type: str,
+        action_params: dict,
+        action_payload: dict,
+        state_before: dict,
+        game_state: GameState,
+        expected_version: int,
+    ) -> dict | None:
+        """Record a move and save the resulting state in one transaction.
+
+        Same contract as Db.commit_game_move: returns the move record with the
+        new state_version, None if there is no such game, or
+        {"conflict": True, "state_version": <current>} if the game has moved
+        on from expected_version.
+        """
+        latest_state = game_state.to_dict(include_rng=True)
+        outcomes = game_state.outcomes or []
+        action = {"type": action_type, **action_payload}
+        with self._tx() as conn:
+            game = conn.execute(
+                "SELECT state_version FROM games WHERE id = ?", (str(game_id),)
+            ).fetchone()
+            if game is None:
+                move = None
+            elif game["state_version"] != expected_version:
+                move = {"conflict": True, "state_version": game["state_version"]}
+            else:
+                (last_move,) = conn.execute(
+                    "SELECT COALESCE(MAX(move_number), 0) FROM game_moves"
+                    " WHERE game_id = ? AND turn_number = ?",
+                    (str(game_id), turn_number),
+                ).fetchone()
+                last = conn.execute(
+                    "SELECT seq, state_version FROM game_moves WHERE game_id = ?"
+                    " ORDER BY seq DESC LIMIT 1",
+                    (str(game_id),),
+                ).fetchone()
+                seq = last["seq"] + 1 if last else 1
+                # As in Postgres: also a keyframe when something other than a
+                # move has written the game since the last one.
+                keyframe = (
+                    is_keyframe(seq) or last["state_version"] != game["state_version"]
+                )
+                conn.execute(
+                    "UPDATE games SET latest_state = ?,"
+                    " status = CASE WHEN ? THEN 'ENDED' ELSE status END"
+                    " WHERE id = ?",
+                    (
+                        json.dumps(latest_state),
+                        game_state.winner is not None,
+                        str(game_id),
+                    ),
+                )
+                (state_version,) = conn.execute(
+                    "SELECT state_version FROM games WHERE id = ?", (str(game_id),)
+                ).fetchone()
+                move = {
+                    "id": str(uuid4()),
+                    "turn_number": turn_number,
+                    "move_number": last_move + 1,
+                    "seq": seq,
+                    "player_id": str(player_id),
+                    "action": action,
+                    "created_at": self._now(),
+                    "state_version": state_version,
+                }
+                conn.execute(
+                    "INSERT INTO game_moves (id, game_id, turn_number, move_number,"
+                    " seq, player_id, action, params, outcomes, state_before,"
+                    " state_delta, state_version, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        move["id"],
+                        str(game_id),
+                        turn_number,
+                        move["move_number"],
+                        seq,
+                        move["player_id"],
+                        json.dumps(action),
+                        json.dumps(action_params),
+                        json.dumps(outcomes),
+                        json.dumps(state_before) if keyframe else None,
+                        json.dumps(move_delta(state_before, latest_state, outcomes)),
+                        state_version,
+                        move["created_at"],
+                    ),
+                )
+        self._cache_move(game_id, game_state, move)
+        return move
+
+    def get_game_moves(self, game_id: UUID) -> list[dict]:
+        """Return all MoveRecords for a game, ordered by (turn_number, move_number) ascending."""
+        moves = self._all(
+            "SELECT id, turn_number, move_number, player_id, action, created_at"
+            " FROM game_moves WHERE game_id = ? ORDER BY turn_number, move_number",
+            str(game_id),
+        )
+        if moves:
+            return moves
+        archive = self._archived(game_id)
+        return archive.game_moves() if archive else []
+
+    def get_replay_data(self, game_id: UUID) -> dict | None:
+        """Return what app.replay needs to re-run a game, as Db.get_replay_data."""
+        game = self._one(
+            "SELECT initial_state, latest_state, archived_at FROM games WHERE id = ?",
+            str(game_id),
+        )
+        if game is None:
+            return None
+        if game["archived_at"] is not None:
+            return self._archived(game_id).replay_data(game["latest_state"])
+        moves = self._all(
+            "SELECT seq, turn_number, player_id, action, params, outcomes,"
+            " state_delta FROM game_moves WHERE game_id = ? ORDER BY seq",
+            str(game_id),
+        )
+        return {
+            "initial_state": game["initial_state"],
+            "latest_state": game["latest_state"],
+            "moves": moves,
+        }
+
+    def get_state_at_turn(self, game_id: UUID, turn_number: int) -> dict | None:
+        """Return the reconstructed game state immediately after turn_number completed.
+
+        See Db.get_state_at_turn.
+        """
+        game = self._one(
+            "SELECT initial_state, latest_state, archived_at FROM games WHERE id = ?",
+            str(game_id),
+        )
+        if game is None:
+            return None
+        if game["archived_at"] is not None:
+            archive = self._archived(game_id)
+            return archive.state_at_turn(turn_number, game["latest_state"])
+        if turn_number == 0:
+            return game["initial_state"]
+        state = self.get_state_before_turn(game_id, turn_number)
+        if state is not None:
+            return state
+        latest = game["latest_state"]
+        if turn_number > latest.get("turn_number", 0):
+            return None
+        return latest
+
+    def get_state_before_turn(self, game_id: UUID, turn_number: int) -> dict | None:
+        """Return the state_before from the first move of the given turn_number."""
+        move = self._one(
+            "SELECT seq, state_before FROM game_moves"
+            " WHERE game_id = ? AND turn_number = ? ORDER BY move_number LIMIT 1",
+            str(game_id),
+            turn_number,
+        )
+        if move is None:
+            return None
+        if move["state_before"] is not None:
+            return move["state_before"]
+        keyframe = self._one(
+            "SELECT seq, state_before FROM game_moves WHERE game_id = ? AND seq <= ?"
+            " AND state_before IS NOT NULL ORDER BY seq DESC LIMIT 1",
+            str(game_id),
+            move["seq"],
+        )
+        if keyframe is None:
+            return None
+        deltas = self._all(
+            "SELECT state_delta, outcomes FROM game_moves"
+            " WHERE game_id = ? AND seq >= ? AND seq < ? ORDER BY seq",
+            str(game_id),
+            keyframe["seq"],
+            move["seq"],
+        )
+        return rebuild_state(keyframe["state_before"], deltas)
+
+    def get_max_turn_number(self, game_id: UUID) -> int:
+        """Return the highest turn_number recorded in game_moves for this game, or 0."""
+        row = self._one(
+            "SELECT COALESCE(MAX(turn_number), 0) AS n FROM game_moves"
+            " WHERE game_id = ?",
+            str(game_id),
+        )
+        return row["n"]
+
+    # ─── Archive ──────────────────────────────────────────────────────────────
+
+    def get_archivable_games(self, ended_before: str, limit: int = 100) -> list[UUID]:
+        """ENDED games not yet archived that ended before ``ended_before``, oldest first."""
+        rows = self._all(
+            "SELECT id FROM games WHERE status = 'ENDED' AND archived_at IS NULL"
+            " AND ended_at < ? ORDER BY ended_at LIMIT ?",
+            ended_before,
+            limit,
+        )
+        return [UUID(row["id"]) for row in rows]
+
+    def _history_for_archive(
+        self, game_id: UUID
+    ) -> tuple[dict | None, list[dict]] | None:
+        with self._tx():
+            game = self._one(
+                "SELECT initial_state FROM games WHERE id = ? AND status = 'ENDED'"
+                " AND archived_at IS NULL",
+                str(game_id),
+            )
+            if game is None:
+                return None
+            moves = self._all(
+                f"SELECT {', '.join(MOVE_COLUMNS)} FROM game_moves"
+                " WHERE game_id = ? ORDER BY seq",
+                str(game_id),
+            )
+        return game["initial_state"], moves
+
+    def _store_archive(self, game_id: UUID, history: bytes, move_count: int) -> bool:
+        with self._tx() as conn:
+            game = conn.execute(
+                "SELECT status, archived_at,"
+                " (SELECT COUNT(*) FROM game_moves WHERE game_id = games.id)"
+                " FROM games WHERE id = ?",
+                (str(game_id),),
+            ).fetchone()
+            if game is None or tuple(game) != ("ENDED", None, move_count):
+                return False
+            now = self._now()
+            conn.execute(
+                "INSERT INTO game_archives (game_id, history, move_count, archived_at)"
+                " VALUES (?, ?, ?, ?)",
+                (str(game_id), history, move_count, now),
+            )
+            conn.execute("DELETE FROM game_moves WHERE game_id = ?", (str(game_id),))
+            conn.execute("DELETE FROM undo_requests WHERE game_id = ?", (str(game_id),))
+            conn.execute(
+                "UPDATE games SET initial_state = NULL, archived_at = ? WHERE id = ?",
+                (now, str(game_id)),
+            )
+        return True
+
+    def get_archived_history(self, game_id: UUID) -> bytes | None:
+        row = self._one(
+            "SELECT history FROM game_archives WHERE game_id = ?", str(game_id)
+        )
+        return row["history"] if row else None
+
+    # ─── Undo requests ────────────────────────────────────────────────────────
+
+    def get_pending_undo(self, game_id: UUID) -> dict | None:
+        """Return the pending UndoRequest for a game, or None."""
+        return self._one(
+            "SELECT * FROM undo_requests WHERE game_id = ? AND status = 'pending'",
+            str(game_id),
+        )
+
+    def create_undo_request(
+        self,
+        game_id: UUID,
+        target_turn_number: int,
+        proposed_by: UUID,
+    ) -> dict:
+        """Create a new pending UndoRequest. Proposer implicitly votes agree."""
+        record = {
+            "id": str(uuid4()),
+            "game_id": str(game_id),
+            "target_turn_number": target_turn_number,
+            "proposed_by": str(proposed_by),
+            "votes": {str(proposed_by): "agree"},
+            "status": "pending",
+        }
+        with self._tx() as conn:
+            conn.execute(
+                "INSERT INTO undo_requests (id, game_id, target_turn_number,"
+                " proposed_by, proposed_at, votes, status)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record["id"],
+                    record["game_id"],
+                    target_turn_number,
+                    record["proposed_by"],
+                    self._now(),
+                    json.dumps(record["votes"]),
+                    record["status"],
+                ),
+            )
+        return record
+
+    def vote_on_undo(self, request_id: str, player_id: UUID, vote: str) -> dict | None:
+        """Record a player's vote on an undo request. Returns updated request or None."""
+        with self._tx() as conn:
+            request = _row(
+                conn.execute(
+                    "SELECT * FROM undo_requests WHERE id = ? AND status = 'pending'",
+                    (request_id,),
+                ).fetchone()
+            )
+            if request is None:
+                return None
+            votes = {**(request["votes"] or {}), str(player_id): vote}
+            status = "rejected" if vote == "disagree" else "pending"
+            conn.execute(
+                "UPDATE undo_requests SET votes = ?, status = ? WHERE id = ?",
+                (json.dumps(votes), status, request_id),
+            )
+        return {**request, "votes": votes, "status": status}
+
+    def approve_undo(self, request_id: str, votes: dict) -> bool:
+        """Mark an undo request as approved."""
+        return self._update(
+            "undo_requests",
+            "id",
+            request_id,
+            {"votes": json.dumps(votes), "status": "approved"},
+        )
+
+    # ─── Push subscriptions ───────────────────────────────────────────────────
+
+    def save_push_subscription(
+        self, user_id: UUID, endpoint: str, p256dh: str, auth: str
+    ) -> bool:
+        """Upsert a push subscription for a user. Returns True on success."""
+        with self._tx() as conn:
+            conn.execute(
+                "INSERT INTO push_subscriptions"
+                " (id, user_id, endpoint, p256dh, auth, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (endpoint) DO UPDATE SET user_id = excluded.user_id,"
+                " p256dh = excluded.p256dh, auth = excluded.auth",
+                (str(uuid4()), str(user_id), endpoint, p256dh, auth, self._now()),
+            )
+        return True
+
+    def get_push_subscriptions(self, user_id: UUID) -> list[dict]:
+        """Return all push subscriptions for a user."""
+        return self._all(
+            "SELECT endpoint, p256dh, auth FROM push_subscriptions WHERE user_id = ?",
+            str(user_id),
+        )
+
+    def delete_push_subscription(self, endpoint: str) -> bool:
+        """Delete a push subscription by endpoint (e.g. after a 404/410 response)."""
+        with self._tx() as conn:
+            cursor = conn.execute(
+                "DELETE FROM push_subscriptions WHERE endpoint = ?", (endpoint,)
+            )
+            return cursor.rowcount >= 1
+
+    # ─── Bot policy ───────────────────────────────────────────────────────────
+
+    def get_bot_policy(self, key: str = "mcts_policy") -> dict | None:
+        """Load bot policy data from database."""
+        row = self._one("SELECT value FROM bot_policy WHERE key = ?", key)
+        return row["value"] if row else None
+
+    def save_bot_policy(self, data: dict, key: str = "mcts_policy") -> bool:
+        """Save bot policy data to database."""
+        with self._tx() as conn:
+            conn.execute(
+                "INSERT INTO bot_policy (key, value, updated_at) VALUES (?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET value = excluded.value,"
+                " updated_at = excluded.updated_at",
+                (key, json.dumps(data), self._now()),
+            )
+        return True
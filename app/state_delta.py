@@ -0,0 +1,116 @@
+"""Compact diffs between serialised game states, for the move history.
+
+Consecutive states in a game differ in a handful of fields — a cup, a bag, a
+score — so ``game_moves`` stores each move's effect as a delta from its
+``state_before`` to the state it produced, plus a full ``state_before``
+keyframe every ``KEYFRAME_EVERY`` moves and on the first move after anything
+else wrote the game. The state before any move is its nearest earlier
+keyframe with the deltas in between applied.
+
+A delta is a dict with up to three keys:
+
+    {"set": {key: value}, "del": [key, ...], "sub": {key: nested delta}}
+
+Nested objects that changed are diffed recursively (``sub``); anything else
+that changed, lists included, is replaced whole (``set``). The migration
+that converted existing history implements the same format in SQL
+(``jsonb_state_diff``).
+
+A move's delta leaves out the random stream (``rng``) when the stream moved
+on by exactly what the move's recorded outcomes drew (actions.OUTCOME_WORDS
+each); rebuilding works the position out again from the outcomes. Anything
+else that moved the stream, an undo say, stores it in the delta as usual.
+"""
+
+from typing import Iterable
+
+from app.actions import OUTCOME_WORDS
+from app.GameState import advance_encoded_rng
+
+# A move whose per-game sequence number is 1 more than a multiple of this
+# stores its full state_before. Reconstruction applies at most this many
+# deltas.
+KEYFRAME_EVERY = 20
+
+
+def diff_states(old: dict, new: dict) -> dict:
+    """Return the delta that turns ``old`` into ``new`` ({} if equal)."""
+    sets: dict = {}
+    subs: dict = {}
+    for key, value in new.items():
+        if key not in old:
+            sets[key] = value
+            continue
+        before = old[key]
+        if before == value:
+            continue
+        if isinstance(before, dict) and isinstance(value, dict):
+            subs[key] = diff_states(before, value)
+        else:
+            sets[key] = value
+    dels = [key for key in old if key not in new]
+
+    delta: dict = {}
+    if sets:
+        delta["set"] = sets
+    if dels:
+        delta["del"] = dels
+    if subs:
+        delta["sub"] = subs
+    return delta
+
+
+def apply_delta(state: dict, delta: dict) -> dict:
+    """Return ``state`` with ``delta`` applied. ``state`` is not modified.
+
+    Unchanged values are shared with ``state`` and set values with ``delta``.
+    """
+    out = dict(state)
+    for key in delta.get("del", ()):
+        out.pop(key, None)
+    out.update(delta.get("set", {}))
+    for key, sub in delta.get("sub", {}).items():
+        out[key] = apply_delta(out[key], sub)
+    return out
+
+
+def _advanced_rng(state: dict, outcomes: list | None) -> str | None:
+    """``state``'s stream after drawing ``outcomes``, if that can be known."""
+    if not state.get("rng"):
+        return None
+    return advance_encoded_rng(state["rng"], OUTCOME_WORDS * len(outcomes or ()))
+
+
+def move_delta(before: dict, after: dict, outcomes: list | None) -> dict:
+    """The delta stored for a move from ``before`` to ``after``.
+
+    Like diff_states, less the stream when ``outcomes`` account for it.
+    """
+    if "rng" in after and after["rng"] == _advanced_rng(before, outcomes):
+        before = {k: v for k, v in before.items() if k != "rng"}
+        after = {k: v for k, v in after.items() if k != "rng"}
+    return diff_states(before, after)
+
+
+def apply_move_delta(state: dict, delta: dict, outcomes: list | None) -> dict:
+    """Inverse of move_delta: the state after a move from ``state``."""
+    out = apply_delta(state, delta)
+    if "rng" not in delta.get("set", {}):
+        rng = _advanced_rng(state, outcomes)
+        if rng is not None:
+            out["rng"] = rng
+    return out
+
+
+def is_keyframe(seq: int, every: int = KEYFRAME_EVERY) -> bool:
+    """Whether the move with per-game sequence number ``seq`` (from 1) is a keyframe."""
+    return (seq - 1) % every == 0
+
+
+def rebuild_state(keyframe: dict, moves: Iterable[dict]) -> dict:
+    """Apply the ``moves`` (``state_delta`` and ``outcomes``), in order, to
+    the ``keyframe`` state."""
+    state = keyframe
+    for move in moves:
+        state = apply_move_delta(state, move["state_delta"], move.get("outcomes"))
+    return state
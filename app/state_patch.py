@@ -0,0 +1,274 @@
+"""JSON patches (RFC 6902) between two players' views of a game state.
+
+An action changes a handful of fields — a cup, a bag count, whose turn it
+is — but its response used to carry the whole of ``GameState.to_view``. A
+client that says which state_version it holds can instead be sent the patch
+that turns its view of that version into its view of the new one:
+
+    view_patch(before, after, viewer_id)  # [{"op": "replace", "path": ..., ...}]
+
+The patch is built from the two typed states, not by serialising both and
+diffing the dicts. ``after`` comes from ``before.copy_on_write()`` (see
+app.actions), so any player state, bag, card row, deck or discard pile that
+is still the same object is unchanged and is skipped without a look; only
+the parts an action took ownership of are compared, and only what differs
+is serialised.
+
+Paths point into ``to_view``'s dict, so the patch for a viewer covers what
+state_view shows them: bag counts rather than the bag, the deck's size, a
+discard summary, and the per-turn scratch fields only while it is their
+turn. ``apply_patch`` applies the add/remove/replace operations produced
+here, as static/game.js does in the browser.
+"""
+
+from collections import Counter
+from typing import Any
+from uuid import UUID
+
+from app.bag import Bag
+from app.card import CardHoldings, CardRow
+from app.GameState import _TURN_SCRATCH, GameState
+from app.PlayerState import Cup, PlayerState
+
+
+def view_patch(
+    before: GameState, after: GameState, viewer_id: UUID | None = None
+) -> list[dict]:
+    """Operations turning ``before.to_view(viewer_id)`` into ``after.to_view(viewer_id)``."""
+    ops: list[dict] = []
+
+    def replace(path: str, value: Any) -> None:
+        ops.append({"op": "replace", "path": path, "value": value})
+
+    if before.winner != after.winner:
+        replace("/winner", _uuid(after.winner))
+    if before.bag_contents is not after.bag_contents:
+        _bag_ops(ops, before.bag_contents, after.bag_contents)
+    _players_ops(ops, before.player_states, after.player_states)
+    if before.player_turn != after.player_turn:
+        replace("/player_turn", _uuid(after.player_turn))
+    if before.open_display is not after.open_display and (
+        before.open_display != after.open_display
+    ):
+        replace("/open_display", _names(after.open_display))
+    if before.card_rows is not after.card_rows:
+        _rows_ops(ops, before.card_rows, after.card_rows)
+    if len(before._deck_dicts) != len(after._deck_dicts):
+        replace("/deck_size", len(after._deck_dicts))
+    if before.turn_order != after.turn_order:
+        replace("/turn_order", [str(pid) for pid in after.turn_order])
+    for name in (
+        "turn_number",
+        "ingredients_taken_this_turn",
+        "last_round",
+        "main_action_taken_this_turn",
+    ):
+        if getattr(before, name) != getattr(after, name):
+            replace(f"/{name}", getattr(after, name))
+    if before.bag_draw_pending != after.bag_draw_pending:
+        replace("/bag_draw_pending", _names(after.bag_draw_pending))
+    if before.free_actions_used_this_turn != after.free_actions_used_this_turn:
+        replace("/free_actions_used_this_turn", list(after.free_actions_used_this_turn))
+    if before.game_modes != after.game_modes:
+        replace("/game_modes", list(after.game_modes))
+    if before.discard is not after.discard and before.discard != after.discard:
+        replace("/discard_summary", _discard_summary(after.discard))
+    _scratch_ops(ops, before, after, viewer_id)
+    return ops
+
+
+def apply_patch(doc: dict, patch: list[dict]) -> dict:
+    """Return ``doc`` with ``patch`` applied. ``doc`` is not modified.
+
+    Supports the operations view_patch produces: add, remove and replace, on
+    object members and on list indexes (``-`` appends).
+    """
+    doc = _copy(doc)
+    for op in patch:
+        *parents, last = _parse(op["path"])
+        target = doc
+        for token in parents:
+            target = target[_index(target, token)]
+        if op["op"] == "remove":
+            del target[_index(target, last)]
+        elif op["op"] == "add" and isinstance(target, list):
+            value = _copy(op["value"])
+            if last == "-":
+                target.append(value)
+            else:
+                target.insert(_index(target, last), value)
+        elif op["op"] in ("add", "replace"):
+            target[_index(target, last)] = _copy(op["value"])
+        else:
+            raise ValueError(f"Unsupported patch operation {op['op']!r}")
+    return doc
+
+
+def _bag_ops(ops: list[dict], before: Bag, after: Bag) -> None:
+    if len(before) != len(after):
+        ops.append({"op": "replace", "path": "/bag_size", "value": len(after)})
+    old, new = Counter(_names(before)), Counter(_names(after))
+    for name in sorted(old.keys() | new.keys()):
+        path = _pointer("bag_counts", name)
+        if name not in new:
+            ops.append({"op": "remove", "path": path})
+        elif name not in old:
+            ops.append({"op": "add", "path": path, "value": new[name]})
+        elif old[name] != new[name]:
+            ops.append({"op": "replace", "path": path, "value": new[name]})
+
+
+def _players_ops(ops: list[dict], before: dict, after: dict) -> None:
+    for pid, ps in after.items():
+        old = before.get(pid)
+        if old is ps:
+            continue  # still shared with ``before``: untouched
+        if old is None:
+            path = _pointer("player_states", str(pid))
+            ops.append({"op": "add", "path": path, "value": ps.to_dict()})
+        else:
+            _player_ops(ops, str(pid), old, ps)
+    for pid in before.keys() - after.keys():
+        ops.append({"op": "remove", "path": _pointer("player_states", str(pid))})
+
+
+def _player_ops(ops: list[dict], key: str, old: PlayerState, new: PlayerState) -> None:
+    def replace(*field: str, value: Any) -> None:
+        path = _pointer("player_states", key, *field)
+        ops.append({"op": "replace", "path": path, "value": value})
+
+    for name in (
+        "points",
+        "bladder_capacity",
+        "toilet_tokens",
+        "karaoke_cards_claimed",
+        "status",
+    ):
+        if getattr(old, name) != getattr(new, name):
+            replace(name, value=getattr(new, name))
+    if old.drunk_level != new.drunk_level:
+        replace("drunk_level", value=new.drunk_level)
+        replace("take_count", value=new.take_count)
+    if old.bladder is not new.bladder and old.bladder != new.bladder:
+        replace("bladder", value=_names(new.bladder))
+    if old.special_ingredients != new.special_ingredients:
+        replace("special_ingredients", value=list(new.special_ingredients))
+    if len(old.cups) != len(new.cups):
+        replace("cups", value=[cup.to_dict() for cup in new.cups])
+    else:
+        for index, (was, cup) in enumerate(zip(old.cups, new.cups)):
+            if not _same_cup(was, cup):
+                replace("cups", str(index), value=cup.to_dict())
+    _cards_ops(ops, _pointer("player_states", key, "cards"), old.cards, new.cards)
+
+
+def _same_cup(old: Cup, new: Cup) -> bool:
+    return (
+        old.has_cup_doubler == new.has_cup_doubler
+        and old.ingredients == new.ingredients
+    )
+
+
+def _cards_ops(
+    ops: list[dict], path: str, old: CardHoldings, new: CardHoldings
+) -> None:
+    """Claimed cards are only appended; store cards' spirits change in place."""
+    if len(new) < len(old):
+        ops.append({"op": "replace", "path": path, "value": new.to_dict()})
+        return
+    for index in old.store_positions:
+        if old[index].stored_spirits != new[index].stored_spirits:
+            value = list(new[index].stored_spirits)
+            ops.append(
+                {
+                    "op": "replace",
+                    "path": f"{path}/{index}/stored_spirits",
+                    "value": value,
+                }
+            )
+    for index in range(len(old), len(new)):
+        ops.append({"op": "add", "path": f"{path}/-", "value": new[index].to_dict()})
+
+
+def _rows_ops(ops: list[dict], before: list[CardRow], after: list[CardRow]) -> None:
+    if len(before) != len(after):
+        value = [row.to_dict() for row in after]
+        ops.append({"op": "replace", "path": "/card_rows", "value": value})
+        return
+    for index, (old, new) in enumerate(zip(before, after)):
+        if old is new or (
+            old.position == new.position
+            and [c.id for c in old.cards] == [c.id for c in new.cards]
+        ):
+            continue  # Cards in a row are never edited in place.
+        ops.append(
+            {"op": "replace", "path": f"/card_rows/{index}", "value": new.to_dict()}
+        )
+
+
+def _scratch_ops(
+    ops: list[dict], before: GameState, after: GameState, viewer_id: UUID | None
+) -> None:
+    """The per-turn scratch fields, which state_view shows only to the player to move."""
+    saw = viewer_id is not None and before.player_turn == viewer_id
+    sees = viewer_id is not None and after.player_turn == viewer_id
+    if not (saw or sees):
+        return
+    for name in _TURN_SCRATCH:
+        value = _scratch(after, name)
+        if not sees:
+            ops.append({"op": "remove", "path": f"/{name}"})
+        elif not saw:
+            ops.append({"op": "add", "path": f"/{name}", "value": value})
+        elif getattr(before, name) != getattr(after, name):
+            ops.append({"op": "replace", "path": f"/{name}", "value": value})
+
+
+def _scratch(gs: GameState, name: str) -> list:
+    if name == "drunk_ingredients_this_turn":
+        return _names(gs.drunk_ingredients_this_turn)
+    return [dict(record) for record in getattr(gs, name)]
+
+
+def _discard_summary(discard: list[dict]) -> dict:
+    """state_view's ``discard_summary``."""
+    return {
+        "size": len(discard),
+        "by_type": dict(sorted(Counter(c["card_type"] for c in discard).items())),
+    }
+
+
+def _names(ingredients) -> list[str]:
+    return [ingredient.name for ingredient in ingredients]
+
+
+def _uuid(value: UUID | None) -> str | None:
+    return str(value) if value else None
+
+
+def _pointer(*tokens: str) -> str:
+    """A JSON Pointer (RFC 6901) to the member at ``tokens``."""
+    return "".join(
+        "/" + token.replace("~", "~0").replace("/", "~1") for token in tokens
+    )
+
+
+def _parse(path: str) -> list[str]:
+    if not path.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer {path!r}")
+    return [
+        token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/")
+    ]
+
+
+def _index(target, token: str):
+    return int(token) if isinstance(target, list) else token
+
+
+def _copy(value):
+    """A copy of a JSON value whose containers the patch may then modify."""
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
@@ -0,0 +1,348 @@
+"""The storage interface every database backend implements.
+
+Db (app.db) keeps everything in Supabase. SqliteDb (app.sqlite_db) keeps it
+in a SQLite file, or in memory, so single-node deployments, tests and load
+tests can run without a Supabase stack. STORAGE_BACKEND chooses which one
+``app.db.db`` is.
+
+Backends agree on more than signatures: rows come back as dicts shaped like
+the Supabase tables' (JSON columns decoded, ids and timestamps as strings),
+writes of a game's state bump its state_version, and the game cache in front
+of get_game (app.game_cache) and the archiving of finished games
+(app.archive) are shared code.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import UTC, datetime
+from uuid import UUID
+
+from app.archive import ArchivedHistory, pack_history
+from app.game import Game, GameSummary, Status
+from app.game_cache import GameCache
+from app.GameState import GameState
+from app.user import User
+from app.utils import hexStringToBytes
+
+
+class Storage(ABC):
+    # Games loaded or written by this process; see app.game_cache.
+    game_cache: GameCache
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(UTC).isoformat()
+
+    @staticmethod
+    def _row_to_user(row: dict) -> User:
+        password_bytes = hexStringToBytes(row.get("password")) or None
+        return User.from_dict(
+            {
+                "id": row.get("id"),
+                "username": row.get("username"),
+                "email": row.get("email"),
+                "password_hash": password_bytes,
+                "status": row.get("status", "active"),
+                "is_admin": row.get("is_admin", False),
+                "created_at": row.get("created_at"),
+                "password_changed_at": row.get("password_changed_at"),
+                "deactivated_at": row.get("deactivated_at"),
+                "deactivated_by": row.get("deactivated_by"),
+                "deleted_at": row.get("deleted_at"),
+                "logged_out_at": row.get("logged_out_at"),
+                "theme": row.get("theme", "taverna"),
+                "is_bot": row.get("is_bot", False),
+                "bot_strategy": row.get("bot_strategy"),
+            }
+        )
+
+    @staticmethod
+    def game_response_to_game(game_data) -> Game:
+        game_state = GameState.from_dict(game_data["latest_state"])
+        return Game(
+            id=UUID(game_data["id"]),
+            host=UUID(game_data["host"]),
+            players={UUID(p) for p in game_data["players"]},
+            status=Status[game_data["status"]],
+            game_state=game_state,
+            created=game_data["created_at"],
+            state_version=game_data.get("state_version", 0),
+        )
+
+    @staticmethod
+    def game_response_to_summary(game_data) -> GameSummary:
+        return GameSummary(
+            id=UUID(game_data["id"]),
+            host=UUID(game_data["host"]),
+            players=[UUID(p) for p in game_data["players"]],
+            status=Status[game_data["status"]],
+            created=game_data["created_at"],
+            summary=game_data["summary"],
+        )
+
+    # ─── Users ────────────────────────────────────────────────────────────────
+
+    @abstractmethod
+    def add_user(self, user: User) -> bool:
+        """Insert a user; raises with "duplicate key" in the message on a clash."""
+
+    @abstractmethod
+    def get_user_by_username(self, username: str) -> User | None: ...
+
+    @abstractmethod
+    def get_user_by_id(self, id: UUID) -> User | None: ...
+
+    @abstractmethod
+    def get_users_by_ids(self, ids: set[UUID]) -> list[User]: ...
+
+    @abstractmethod
+    def get_users(self) -> list[User]:
+        """Up to 1000 users that are not deleted, newest first."""
+
+    @abstractmethod
+    def get_bot_by_strategy(self, strategy: str) -> User | None: ...
+
+    @abstractmethod
+    def get_bot_users_by_ids(self, ids: set[UUID]) -> list[User]: ...
+
+    @abstractmethod
+    def delete_user(self, user_id: UUID) -> bool: ...
+
+    @abstractmethod
+    def deactivate_user(self, target_id: UUID, admin_id: UUID) -> bool: ...
+
+    @abstractmethod
+    def reactivate_user(self, target_id: UUID) -> bool: ...
+
+    @abstractmethod
+    def logout_user(self, user_id: UUID) -> bool: ...
+
+    @abstractmethod
+    def update_email(self, user_id: UUID, new_email: str) -> bool: ...
+
+    @abstractmethod
+    def update_password(self, user_id: UUID, new_hash: bytes) -> bool: ...
+
+    @abstractmethod
+    def update_theme(self, user_id: UUID, theme: str) -> bool: ...
+
+    @abstractmethod
+    def get_public_key(self, kid: str) -> bytes | None: ...
+
+    @abstractmethod
+    def add_public_key(self, kid: UUID, public_key: bytes) -> bool: ...
+
+    # ─── Games ────────────────────────────────────────────────────────────────
+
+    @abstractmethod
+    def create_game(self, game: Game): ...
+
+    def get_game(self, game_id: UUID, validate: bool = True) -> Game | None:
+        """Get a single game by ID.
+
+        Served from the game cache when the cached copy is still at the
+        database's state_version, which costs a one-column lookup instead of
+        fetching and deserialising latest_state. ``validate=False`` skips that
+        lookup and trusts the cache outright; only for callers whose every
+        write is version-checked (a lost race drops the entry, so the retry
+        reloads), such as the bot runner.
+        """
+        cached = self.game_cache.get(game_id)
+        if cached is not None:
+            if not validate:
+                return cached
+            current = self.get_game_version(game_id)
+            if current is None:
+                self.game_cache.discard(game_id)
+                return None
+            if current == cached.state_version:
+                return cached
+        game = self._load_game(game_id)
+        if game is None:
+            self.game_cache.discard(game_id)
+        else:
+            self.game_cache.put(game)
+        return game
+
+    @abstractmethod
+    def get_game_version(self, game_id: UUID) -> int | None:
+        """The game's current state_version, or None if there is no such game."""
+
+    @abstractmethod
+    def get_game_header(self, game_id: UUID) -> dict | None:
+        """The game's host, players, status and state_version, as stored.
+
+        Everything needed to authorise a read and tag the response, without
+        fetching latest_state; see the conditional GETs in app.api.
+        """
+
+    @abstractmethod
+    def _load_game(self, game_id: UUID) -> Game | None: ...
+
+    @abstractmethod
+    def get_games(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        status: list[str] | str | None = None,
+        player_id: UUID | None = None,
+        after: tuple[str, str] | None = None,
+    ) -> tuple[list[GameSummary], int | None, bool]:
+        """A page of game summaries, newest first: (games, total, has_more)."""
+
+    @abstractmethod
+    def start_game(self, game_id: UUID, game_state: GameState) -> str:
+        """'ok' | 'not_found' | 'not_new'"""
+
+    @abstractmethod
+    def update_game_state(
+        self,
+        game_id: UUID,
+        game_state: GameState,
+        expected_version: int | None = None,
+    ) -> bool: ...
+
+    @abstractmethod
+    def end_game(self, game_id: UUID, game_state: GameState) -> bool: ...
+
+    def _cache_write(self, game_id: UUID, game_state: GameState, row: dict) -> None:
+        """Update the cached game after writing ``game_state`` as ``row``."""
+        self.game_cache.update(
+            game_id, game_state, row["state_version"], Status[row["status"]]
+        )
+
+    def _cache_move(
+        self, game_id: UUID, game_state: GameState, move: dict | None
+    ) -> None:
+        """Update the cached game after a commit_game_move that returned ``move``."""
+        if move is None or move.get("conflict"):
+            self.game_cache.discard(game_id)
+        else:
+            status = Status.ENDED if game_state.winner is not None else None
+            self.game_cache.update(game_id, game_state, move["state_version"], status)
+
+    @abstractmethod
+    def add_player_to_game(self, game_id: UUID, player_id: UUID) -> str:
+        """'ok' | 'not_found' | 'not_new' | 'duplicate' | 'full'"""
+
+    @abstractmethod
+    def remove_player_from_game(
+        self, game_id: UUID, requester_id: UUID, player_id: UUID
+    ) -> str:
+        """'ok' | 'not_found' | 'not_host' | 'not_in_game' | 'is_host'"""
+
+    # ─── Moves ────────────────────────────────────────────────────────────────
+
+    @abstractmethod
+    def commit_game_move(
+        self,
+        game_id: UUID,
+        turn_number: int,
+        player_id: UUID,
+        action_type: str,
+        action_params: dict,
+        action_payload: dict,
+        state_before: dict,
+        game_state: GameState,
+        expected_version: int,
+    ) -> dict | None:
+        """Record a move and save the resulting state in one transaction."""
+
+    @abstractmethod
+    def get_game_moves(self, game_id: UUID) -> list[dict]: ...
+
+    @abstractmethod
+    def get_replay_data(self, game_id: UUID) -> dict | None: ...
+
+    @abstractmethod
+    def get_state_at_turn(self, game_id: UUID, turn_number: int) -> dict | None: ...
+
+    @abstractmethod
+    def get_state_before_turn(self, game_id: UUID, turn_number: int) -> dict | None:
+        """The state before the first move of turn_number."""
+
+    @abstractmethod
+    def get_max_turn_number(self, game_id: UUID) -> int: ...
+
+    # ─── Archive ──────────────────────────────────────────────────────────────
+
+    @abstractmethod
+    def get_archivable_games(self, ended_before: str, limit: int = 100) -> list[UUID]:
+        """ENDED games not yet archived that ended before ``ended_before``, oldest first."""
+
+    @abstractmethod
+    def _history_for_archive(
+        self, game_id: UUID
+    ) -> tuple[dict | None, list[dict]] | None:
+        """(initial_state, game_moves rows in seq order) of an ENDED, unarchived game.
+
+        Rows have every column in app.archive.MOVE_COLUMNS. None if the game
+        doesn't exist, isn't ENDED or is already archived.
+        """
+
+    @abstractmethod
+    def _store_archive(self, game_id: UUID, history: bytes, move_count: int) -> bool:
+        """Swap the game's hot history for ``history``, in one transaction.
+
+        Saves the blob, deletes the game's moves and undo requests, clears
+        initial_state and sets archived_at. Does nothing and returns False
+        unless the game is still ENDED, unarchived and has move_count moves.
+        """
+
+    @abstractmethod
+    def get_archived_history(self, game_id: UUID) -> bytes | None:
+        """The game's archived history blob, or None if it isn't archived."""
+
+    def archive_game(self, game_id: UUID) -> bool:
+        """Move an ENDED game's history into the archive; see app.archive."""
+        history = self._history_for_archive(game_id)
+        if history is None:
+            return False
+        initial_state, moves = history
+        blob = pack_history(initial_state, moves)
+        return self._store_archive(game_id, blob, len(moves))
+
+    def _archived(self, game_id: UUID) -> ArchivedHistory | None:
+        blob = self.get_archived_history(game_id)
+        return ArchivedHistory(blob) if blob is not None else None
+
+    # ─── Undo requests ────────────────────────────────────────────────────────
+
+    @abstractmethod
+    def get_pending_undo(self, game_id: UUID) -> dict | None: ...
+
+    @abstractmethod
+    def create_undo_request(
+        self,
+        game_id: UUID,
+        target_turn_number: int,
+        proposed_by: UUID,
+    ) -> dict: ...
+
+    @abstractmethod
+    def vote_on_undo(
+        self, request_id: str, player_id: UUID, vote: str
+    ) -> dict | None: ...
+
+    @abstractmethod
+    def approve_undo(self, request_id: str, votes: dict) -> bool: ...
+
+    # ─── Push subscriptions ───────────────────────────────────────────────────
+
+    @abstractmethod
+    def save_push_subscription(
+        self, user_id: UUID, endpoint: str, p256dh: str, auth: str
+    ) -> bool: ...
+
+    @abstractmethod
+    def get_push_subscriptions(self, user_id: UUID) -> list[dict]: ...
+
+    @abstractmethod
+    def delete_push_subscription(self, endpoint: str) -> bool: ...
+
+    # ─── Bot policy ───────────────────────────────────────────────────────────
+
+    @abstractmethod
+    def get_bot_policy(self, key: str = "mcts_policy") -> dict | None: ...
+
+    @abstractmethod
+    def save_bot_policy(self, data: dict, key: str = "mcts_policy") -> bool: ...
@@ -0,0 +1,90 @@
+"""Zobrist keys for GameState.state_hash.
+
+A position hashes to the XOR of one 64-bit key per feature (an ingredient
+count in a bag, a card in a slot, a player's points, ...), so a move that
+changes a few features changes the hash by XORing a few keys in and out.
+
+Keys must be the same in every process — the hash is used for cache keys and
+ETags — so they come from a fixed-seed ``random.Random`` and from blake2b of
+strings, never from Python's salted ``hash()``.
+"""
+
+import hashlib
+import random
+from functools import lru_cache
+from typing import Iterable
+from uuid import UUID
+
+from app.Ingredient import Ingredient
+
+_MASK = (1 << 64) - 1
+
+# Counts of one ingredient in a Bag are below this (the full game bag holds
+# players + 3 of each).
+MAX_COUNT = 256
+
+_rng = random.Random(0x0BA27E4D)
+
+# COUNT_KEYS[code][n]: key for "n tokens of the ingredient with this code".
+# A zero count contributes nothing, so an empty Bag hashes to 0.
+COUNT_KEYS: list[tuple[int, ...]] = [
+    (0,) + tuple(_rng.getrandbits(64) for _ in range(MAX_COUNT - 1)) for _ in Ingredient
+]
+
+# Per-ingredient keys for ingredients held in order (cups, pending draws).
+INGREDIENT_KEYS: tuple[int, ...] = tuple(_rng.getrandbits(64) for _ in Ingredient)
+
+# Odd multipliers that make a key position-dependent (see sequence_hash).
+POSITION_KEYS: tuple[int, ...] = tuple(_rng.getrandbits(64) | 1 for _ in range(256))
+
+
+def mix(x: int) -> int:
+    """splitmix64 finaliser: spreads ``x`` over all 64 bits (a bijection)."""
+    x &= _MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+@lru_cache(maxsize=1 << 16)
+def string_key(s: str) -> int:
+    """Stable key for a string (card id, status, mode name, ...)."""
+    digest = hashlib.blake2b(s.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+@lru_cache(maxsize=1 << 12)
+def uuid_key(player_id: UUID | None) -> int:
+    """Stable key for a player id (0 for None)."""
+    return 0 if player_id is None else string_key(str(player_id))
+
+
+def salt(name: str) -> int:
+    """Fixed key for a named field or location, to tell features apart."""
+    return string_key("salt:" + name)
+
+
+def counts_hash(counts: list[int]) -> int:
+    """Hash of a count-per-Ingredient.code vector (what Bag keeps incrementally)."""
+    h = 0
+    for keys, n in zip(COUNT_KEYS, counts):
+        h ^= keys[n]
+    return h
+
+
+def sequence_term(seed: int, key: int, position: int) -> int:
+    """One entry's contribution to ``sequence_hash``, for incremental updates."""
+    return ((key ^ seed) * POSITION_KEYS[position]) & _MASK
+
+
+def sequence_hash(seed: int, keys: Iterable[int]) -> int:
+    """Order-sensitive hash of a short sequence of keys.
+
+    The feature "``key`` at position i of the sequence named by ``seed``" gets
+    the key ``(key ^ seed) * POSITION_KEYS[i]``; only the first
+    ``len(POSITION_KEYS)`` entries are hashed.
+    """
+    h = 0
+    for position_key, key in zip(POSITION_KEYS, keys):
+        h ^= ((key ^ seed) * position_key) & _MASK
+    return h
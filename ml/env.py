@@ -24,7 +24,7 @@ from app.PlayerState import (
 from app.actions import MAX_DRUNK_LEVEL, SCORE_TO_WIN
 
 from playtesting.strategy import Mastermind, Strategy
-from playtesting.valid_actions import Action, get_valid_actions
+from app.moves import Action, legal_moves
 
 # Indices for encoding ingredients
 _INGREDIENT_INDEX: dict[Ingredient, int] = {
@@ -103,8 +103,8 @@ def _encode_state(gs: GameState, player_id: UUID) -> np.ndarray:
         "specialist": 0,
         "free_action": 0,
     }
-    for cd in ps.cards:
-        ct = cd.get("card_type", "")
+    for card in ps.cards:
+        ct = card.card_type
         if ct in card_type_counts:
             card_type_counts[ct] += 1
     obs.extend([card_type_counts[k] / 3.0 for k in card_type_counts])
@@ -226,7 +226,7 @@ class BartendersEnv(gym.Env):
         self.opponent_ids = player_ids[1:]
 
         # Start game
-        self.gs = GameState.start_game(player_ids)
+        self.gs = GameState.start_game(player_ids, seed=self._seed)
 
         # Set up opponent strategies
         self.opponent_strategies = {
@@ -237,7 +237,7 @@ class BartendersEnv(gym.Env):
         self._run_opponents()
 
         self._prev_points = 0
-        self._valid_actions = get_valid_actions(self.gs, self.agent_id)
+        self._valid_actions = legal_moves(self.gs, self.agent_id)
 
         return self._get_obs(), {}
 
@@ -307,7 +307,7 @@ class BartendersEnv(gym.Env):
         # Truncation check (game too long)
         truncated = self.gs.turn_number >= 500
 
-        self._valid_actions = get_valid_actions(self.gs, self.agent_id)
+        self._valid_actions = legal_moves(self.gs, self.agent_id)
 
         return self._get_obs(), reward, False, truncated, {}
 
@@ -423,7 +423,7 @@ class BartendersEnv(gym.Env):
 
     def _run_opponents(self):
         """Run opponent turns until it's the agent's turn again."""
-        from app.actions import _advance_turn, _deep_copy_state
+        from app.actions import _advance_turn
 
         max_opp_turns = 50  # safety limit
         for _ in range(max_opp_turns):
@@ -439,7 +439,7 @@ class BartendersEnv(gym.Env):
             ps = self.gs.player_states.get(current)
             if ps is None or ps.is_eliminated:
                 # Skip eliminated player
-                self.gs = _deep_copy_state(self.gs)
+                self.gs = self.gs.copy_on_write()
                 self.gs.turn_number += 1
                 _advance_turn(self.gs)
                 continue
@@ -453,20 +453,20 @@ class BartendersEnv(gym.Env):
                 self.gs = self._execute_opponent_turn(current, strategy)
             except Exception:
                 # Force advance on error
-                self.gs = _deep_copy_state(self.gs)
+                self.gs = self.gs.copy_on_write()
                 self.gs.turn_number += 1
                 _advance_turn(self.gs)
 
     def _execute_opponent_turn(self, player_id: UUID, strategy: Strategy) -> GameState:
         """Execute a full opponent turn (free actions + main)."""
-        from app.actions import _advance_turn, _deep_copy_state
+        from app.actions import _advance_turn
         from app.game import GameException
 
         gs = self.gs
 
         # Free actions
         for _ in range(20):
-            all_acts = get_valid_actions(gs, player_id)
+            all_acts = legal_moves(gs, player_id)
             free_acts = [a for a in all_acts if a.is_free]
             if not free_acts:
                 break
@@ -482,7 +482,7 @@ class BartendersEnv(gym.Env):
 
         # Check if main already taken
         if gs.main_action_taken_this_turn:
-            gs = _deep_copy_state(gs)
+            gs = gs.copy_on_write()
             gs.turn_number += 1
             _advance_turn(gs)
             gs.main_action_taken_this_turn = False
@@ -495,10 +495,10 @@ class BartendersEnv(gym.Env):
 
         # Main action
         for _ in range(3):
-            all_acts = get_valid_actions(gs, player_id)
+            all_acts = legal_moves(gs, player_id)
             turn_acts = [a for a in all_acts if not a.is_free]
             if not turn_acts:
-                gs = _deep_copy_state(gs)
+                gs = gs.copy_on_write()
                 gs.turn_number += 1
                 _advance_turn(gs)
                 return gs
@@ -510,7 +510,7 @@ class BartendersEnv(gym.Env):
                 continue
 
         # Exhausted retries
-        gs = _deep_copy_state(gs)
+        gs = gs.copy_on_write()
         gs.turn_number += 1
         _advance_turn(gs)
         return gs
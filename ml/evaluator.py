@@ -127,11 +127,7 @@ def _best_cup_sale(ps: PlayerState, cup) -> int:
         pts = base
         if cup.has_cup_doubler:
             pts *= 2
-        specialist_types = {
-            cd.get("spirit_type")
-            for cd in ps.cards
-            if cd.get("card_type") == "specialist" and cd.get("spirit_type")
-        }
+        specialist_types = ps.cards.specialist_spirits
         cup_spirit_types = {i.name for i in ingredients if i in _SPIRITS}
         pts += len(specialist_types & cup_spirit_types) * 2
         best = max(best, pts)
@@ -283,8 +279,8 @@ def _safety_penalty(ps: PlayerState, w: EvalWeights = DEFAULT_WEIGHTS) -> float:
 
 def _card_engine_value(ps: PlayerState, w: EvalWeights = DEFAULT_WEIGHTS) -> float:
     value = 0.0
-    for cd in ps.cards:
-        ct = cd.get("card_type")
+    for card in ps.cards:
+        ct = card.card_type
         if ct == "specialist":
             value += w.specialist
         elif ct == "cup_doubler":
@@ -292,7 +288,7 @@ def _card_engine_value(ps: PlayerState, w: EvalWeights = DEFAULT_WEIGHTS) -> flo
         elif ct == "store":
             value += w.store
             # Stored spirits are bankable future cup fillers / claim fodder.
-            value += 0.5 * len(cd.get("stored_spirits", []))
+            value += 0.5 * len(card.stored_spirits)
         elif ct == "refresher":
             value += w.refresher
     return value
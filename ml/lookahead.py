@@ -18,14 +18,15 @@ only governs *which main action* to take, which is where the strategic depth
 lives. Opponents are modelled with Mastermind via the shared RolloutExecutor.
 """
 
+import random
 from uuid import UUID
 
 from app.GameState import GameState
 from app.Ingredient import Ingredient
-from app.actions import _advance_turn, _deep_copy_state
+from app.actions import _advance_turn
+from app.moves import Action, legal_moves
 
 from playtesting.strategy import Mastermind, Strategy
-from playtesting.valid_actions import Action, get_valid_actions
 
 from ml.evaluator import DEFAULT_WEIGHTS, EvalWeights, evaluate
 from ml.mcts import RolloutExecutor
@@ -83,7 +84,9 @@ class LookaheadStrategy(Strategy):
         """Average value of taking ``action`` now, searched to ``depth``."""
         total = 0.0
         for _ in range(self.samples):
-            sim = _deep_copy_state(gs)
+            sim = gs.copy_on_write()
+            # Determinize: each sample gets its own draws, not the real game's.
+            sim.reseed(random.getrandbits(64))
             try:
                 sim = self._executor._exec(sim, player_id, action, self._fallback)
             except Exception:
@@ -109,7 +112,7 @@ class LookaheadStrategy(Strategy):
         if gs.winner is not None:
             return evaluate(gs, player_id, self.weights)
 
-        all_acts = get_valid_actions(gs, player_id)
+        all_acts = legal_moves(gs, player_id)
         main_acts = [a for a in all_acts if not a.is_free]
         if not main_acts:
             return evaluate(gs, player_id, self.weights)
@@ -128,7 +131,7 @@ class LookaheadStrategy(Strategy):
                 break
             ps = gs.player_states.get(current)
             if ps is None or ps.is_eliminated:
-                gs = _deep_copy_state(gs)
+                gs = gs.copy_on_write()
                 gs.turn_number += 1
                 _advance_turn(gs)
                 continue
@@ -139,7 +142,7 @@ class LookaheadStrategy(Strategy):
         from app.game import GameException
 
         for _ in range(10):
-            all_acts = get_valid_actions(gs, player_id)
+            all_acts = legal_moves(gs, player_id)
             free_acts = [a for a in all_acts if a.is_free]
             if not free_acts:
                 break
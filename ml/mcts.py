@@ -21,11 +21,11 @@ from uuid import UUID
 
 from app.GameState import GameState
 from app.Ingredient import Ingredient
-from app.actions import _advance_turn, _deep_copy_state
+from app.actions import _advance_turn
 from app.game import GameException
 
 from playtesting.strategy import Mastermind, Strategy
-from playtesting.valid_actions import Action, get_valid_actions
+from app.moves import Action, legal_moves
 
 
 # ---------------------------------------------------------------------------
@@ -81,7 +81,7 @@ class RolloutExecutor:
 
         Value in [0, 1]: 1.0 = win, 0.0 = loss, intermediate = score-based.
         """
-        gs = _deep_copy_state(gs)
+        gs = gs.copy_on_write()
 
         for _ in range(max_turns):
             if gs.winner is not None:
@@ -108,7 +108,7 @@ class RolloutExecutor:
 
         # Free actions (limited)
         for _ in range(5):
-            all_acts = get_valid_actions(gs, player_id)
+            all_acts = legal_moves(gs, player_id)
             free_acts = [a for a in all_acts if a.is_free]
             if not free_acts:
                 break
@@ -124,10 +124,10 @@ class RolloutExecutor:
 
         # Main action
         for _ in range(3):
-            all_acts = get_valid_actions(gs, player_id)
+            all_acts = legal_moves(gs, player_id)
             turn_acts = [a for a in all_acts if not a.is_free]
             if not turn_acts:
-                gs = _deep_copy_state(gs)
+                gs = gs.copy_on_write()
                 gs.turn_number += 1
                 _advance_turn(gs)
                 return gs
@@ -140,7 +140,7 @@ class RolloutExecutor:
                 continue
 
         # Fallback: advance turn
-        gs = _deep_copy_state(gs)
+        gs = gs.copy_on_write()
         gs.turn_number += 1
         _advance_turn(gs)
         return gs
@@ -245,8 +245,8 @@ class RolloutExecutor:
         # Kyle wins with avg 3.2 cards and 5.2 pts/sell.
         # Cards compound value: specialist = +2pt/sell, doubler = x2, store = spirit bank
         card_value = 0.0
-        for cd in ps.cards:
-            ct = cd.get("card_type", "")
+        for card in ps.cards:
+            ct = card.card_type
             if ct == "specialist":
                 card_value += 6.0  # Enables +2pt per sell
             elif ct == "cup_doubler":
@@ -321,7 +321,9 @@ class MCTSSearch:
 
             # 1. Selection — traverse tree using UCB1
             node = root
-            sim_gs = _deep_copy_state(gs)
+            sim_gs = gs.copy_on_write()
+            # Determinize: each simulation gets its own draws, not the real game's.
+            sim_gs.reseed(random.getrandbits(64))
 
             # 2. Expansion — pick untried action (bias by policy if available)
             if node.untried_actions:
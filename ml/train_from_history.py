@@ -35,18 +35,14 @@ def fetch_json(url: str) -> dict:
 def fetch_ended_games(base_url: str, max_games: int = 100) -> list[dict]:
     """Fetch ended games from the public list endpoint."""
     games = []
-    page = 1
-    page_size = 100
+    url = f"{base_url}/v1/games?status=ENDED&page_size=100"
+    cursor = None
     while len(games) < max_games:
-        url = f"{base_url}/v1/games?status=ENDED&page={page}&page_size={page_size}"
-        data = fetch_json(url)
-        batch = data.get("games", [])
-        if not batch:
+        data = fetch_json(f"{url}&cursor={cursor}" if cursor else url)
+        games.extend(data.get("games", []))
+        cursor = data.get("next_cursor")
+        if not cursor:
             break
-        games.extend(batch)
-        if len(batch) < page_size or len(games) >= data.get("total", 0):
-            break
-        page += 1
     return games[:max_games]
 
 
@@ -24,10 +24,10 @@ from uuid import uuid4
 import numpy as np
 
 from app.GameState import GameState
-from app.actions import _advance_turn, _deep_copy_state
+from app.actions import _advance_turn
 
 from playtesting.strategy import Mastermind
-from playtesting.valid_actions import get_valid_actions
+from app.moves import legal_moves
 
 from ml.env import _encode_state
 from ml.mcts import MCTSNode, MCTSSearch, RolloutExecutor
@@ -87,7 +87,7 @@ class SelfPlayCollector:
             random.seed(seed)
 
         player_ids = [uuid4() for _ in range(num_players)]
-        gs = GameState.start_game(player_ids)
+        gs = GameState.start_game(player_ids, seed=seed)
 
         # All players use MCTS with experience collection
         search = MCTSSearch(num_simulations=self.num_simulations, rollout_depth=20)
@@ -109,13 +109,13 @@ class SelfPlayCollector:
 
             ps = gs.player_states.get(current)
             if ps is None or ps.is_eliminated:
-                gs = _deep_copy_state(gs)
+                gs = gs.copy_on_write()
                 gs.turn_number += 1
                 _advance_turn(gs)
                 continue
 
             # Get valid actions
-            all_acts = get_valid_actions(gs, current)
+            all_acts = legal_moves(gs, current)
             free_acts = [a for a in all_acts if a.is_free]
             turn_acts = [a for a in all_acts if not a.is_free]
 
@@ -132,7 +132,7 @@ class SelfPlayCollector:
                     break
                 if gs.winner is not None:
                     break
-                all_acts = get_valid_actions(gs, current)
+                all_acts = legal_moves(gs, current)
                 free_acts = [a for a in all_acts if a.is_free]
                 turn_acts = [a for a in all_acts if not a.is_free]
 
@@ -140,7 +140,7 @@ class SelfPlayCollector:
                 break
 
             if gs.main_action_taken_this_turn:
-                gs = _deep_copy_state(gs)
+                gs = gs.copy_on_write()
                 gs.turn_number += 1
                 _advance_turn(gs)
                 gs.main_action_taken_this_turn = False
@@ -152,7 +152,7 @@ class SelfPlayCollector:
                 continue
 
             if not turn_acts:
-                gs = _deep_copy_state(gs)
+                gs = gs.copy_on_write()
                 gs.turn_number += 1
                 _advance_turn(gs)
                 continue
@@ -160,11 +160,11 @@ class SelfPlayCollector:
             # MCTS search with data collection
             if len(turn_acts) > 2:
                 root = MCTSNode(untried_actions=list(turn_acts))
-                sim_gs_base = _deep_copy_state(gs)
+                sim_gs_base = gs.copy_on_write()
 
                 for _ in range(self.num_simulations):
                     node = root
-                    sim_gs = _deep_copy_state(sim_gs_base)
+                    sim_gs = sim_gs_base.copy_on_write()
 
                     if node.untried_actions:
                         action = random.choice(node.untried_actions)
@@ -223,7 +223,7 @@ class SelfPlayCollector:
             try:
                 gs = executor._exec(gs, current, chosen, fallback)
             except Exception:
-                gs = _deep_copy_state(gs)
+                gs = gs.copy_on_write()
                 gs.turn_number += 1
                 _advance_turn(gs)
 
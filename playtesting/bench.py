@@ -0,0 +1,402 @@
+"""Micro-benchmarks for the engine hot paths used by bots and search.
+
+Usage:
+    uv run python -m playtesting.bench clone
+    uv run python -m playtesting.bench view
+    uv run python -m playtesting.bench patch
+    uv run python -m playtesting.bench clone --players 4 --turns 24 --seed 7
+
+Every benchmark runs on a reproducible mid-game state built by letting
+Mastermind bots play ``--turns`` turns from a seeded start, so numbers from
+different runs (and different commits) are comparable.
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import random
+import time
+import tracemalloc
+from typing import Callable
+from uuid import UUID, uuid4
+
+from app import actions, cocktails, state_delta, state_patch
+from app.GameState import GameState
+from app.moves import legal_moves
+from playtesting.runner import GameRunner
+from playtesting.strategy import Mastermind
+from playtesting.valid_actions import get_valid_actions
+
+
+def mid_game_state(num_players: int = 4, turns: int = 24, seed: int = 7) -> GameState:
+    """Play ``turns`` turns of seeded Mastermind-vs-Mastermind and return the state."""
+    player_ids: list[UUID] = [uuid4() for _ in range(num_players)]
+    strategies = {pid: Mastermind() for pid in player_ids}
+    runner = GameRunner(strategies)
+    gs = GameState.start_game(player_ids, seed=seed)
+    while gs.winner is None and gs.turn_number < turns:
+        current = gs.player_turn
+        if current is None or gs.player_states[current].is_eliminated:
+            break
+        gs = runner._do_free_actions(gs, current, strategies[current], False)
+        if gs.winner is not None:
+            break
+        gs = runner._do_main_action(gs, current, strategies[current], False)
+    return gs
+
+
+def _rate(fn: Callable[[], object], seconds: float, batch: int = 100) -> float:
+    """Call ``fn`` repeatedly for roughly ``seconds`` and return calls/sec."""
+    calls = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        for _ in range(batch):
+            fn()
+        calls += batch
+        now = time.perf_counter()
+        if now >= deadline:
+            return calls / (now - start)
+
+
+def _json_round_trip_copy(gs: GameState) -> GameState:
+    """The original ``_deep_copy_state``: to_dict → deepcopy → from_dict."""
+    return GameState.from_dict(copy.deepcopy(gs.to_dict(include_rng=True)))
+
+
+def bench_clone(gs: GameState, seconds: float) -> None:
+    before = _rate(lambda: _json_round_trip_copy(gs), seconds)
+    after = _rate(gs.clone, seconds)
+    print(f"JSON round-trip copy : {before:>10,.0f} copies/sec")
+    print(f"GameState.clone()    : {after:>10,.0f} copies/sec")
+    print(f"Speed-up             : {after / before:>10.1f}x")
+
+
+def bench_bag(gs: GameState, seconds: float) -> None:
+    tokens = list(gs.bag_contents)
+    draws = min(5, len(tokens))
+    rng = random.Random(0)
+
+    def list_draws():
+        bag = list(tokens)
+        for _ in range(draws):
+            bag.remove(rng.choice(bag))
+
+    def counted_draws():
+        bag = gs.bag_contents.copy()
+        for _ in range(draws):
+            bag.draw(rng)
+
+    before = _rate(list_draws, seconds)
+    after = _rate(counted_draws, seconds)
+    print(f"list choice + remove : {before:>10,.0f} copies of {draws} draws/sec")
+    print(f"Bag.draw             : {after:>10,.0f} copies of {draws} draws/sec")
+    print(f"Speed-up             : {after / before:>10.1f}x")
+
+
+def bench_hash(gs: GameState, seconds: float) -> None:
+    def dict_hash():
+        encoded = json.dumps(gs.to_dict(), sort_keys=True).encode()
+        return hashlib.blake2b(encoded, digest_size=8).digest()
+
+    # What search does: hash a copy that has just changed one player.
+    player_id = gs.player_turn
+    gs.copy_on_write()  # marks gs's players shared, so their hashes are memoised
+
+    def child_hash():
+        child = gs.copy_on_write()
+        child.own_player(player_id).points += 1
+        return child.state_hash
+
+    before = _rate(dict_hash, seconds)
+    scratch = _rate(gs.recompute_state_hash, seconds)
+    after = _rate(lambda: gs.state_hash, seconds)
+    child = _rate(child_hash, seconds)
+    print(f"blake2b(to_dict JSON): {before:>10,.0f} hashes/sec")
+    print(f"recompute_state_hash : {scratch:>10,.0f} hashes/sec")
+    print(f"state_hash           : {after:>10,.0f} hashes/sec")
+    print(f"copy + 1 change + hash: {child:>9,.0f} hashes/sec")
+    print(f"Speed-up             : {after / before:>10.1f}x")
+
+
+def bench_scoring(gs: GameState, seconds: float) -> None:
+    # The sale queries valid_actions makes: each cup, bare and with each special.
+    queries = []
+    for ps in gs.player_states.values():
+        for cup in ps.cups:
+            queries.append((cup.ingredients, []))
+            queries.extend((cup.ingredients, [s]) for s in ps.special_ingredients)
+
+    def reference():
+        for cup, declared in queries:
+            cocktails._reference_drink_points(cup, declared)
+            cocktails._reference_is_cocktail(cup, declared)
+
+    def table():
+        for cup, declared in queries:
+            cocktails.drink_score(cup, declared)
+
+    before = _rate(reference, seconds)
+    after = _rate(table, seconds)
+    print(f"reference rules      : {before:>10,.0f} passes of {len(queries)} cups/sec")
+    print(f"drink_score table    : {after:>10,.0f} passes of {len(queries)} cups/sec")
+    print(f"Speed-up             : {after / before:>10.1f}x")
+
+
+def bench_moves(gs: GameState, seconds: float) -> None:
+    pid = gs.player_turn
+    before = _rate(lambda: get_valid_actions(gs, pid), seconds)
+    after = _rate(lambda: legal_moves(gs, pid), seconds)
+    count = len(legal_moves(gs, pid))
+    print(f"get_valid_actions    : {before:>10,.0f} calls/sec ({count} actions)")
+    print(f"legal_moves          : {after:>10,.0f} calls/sec")
+    print(f"Speed-up             : {after / before:>10.1f}x")
+
+
+_MOVE_ACTIONS = (
+    "draw_from_bag",
+    "take_ingredients",
+    "sell_cup",
+    "drink_cup",
+    "go_for_a_wee",
+    "claim_card",
+    "drink_stored_spirit",
+    "use_stored_spirit",
+    "reroll_specials",
+    "refresh_card_row",
+    "end_turn",
+)
+
+
+def _played_history(num_players: int, seed: int) -> list[tuple[dict, dict, list]]:
+    """(state before, state after, outcomes) of every move of a seeded
+    Mastermind game.
+
+    Moves are what the server records: each successful action, plus the
+    runner's forced turn advances (the server's skip_turn).
+    """
+    moves: list[tuple[dict, dict, list]] = []
+
+    def record(gs, new_gs):
+        moves.append(
+            (
+                gs.to_dict(include_rng=True),
+                new_gs.to_dict(include_rng=True),
+                list(new_gs.outcomes or []),
+            )
+        )
+
+    def recording(fn):
+        def wrapper(gs, *args, **kwargs):
+            new_gs, payload = fn(gs, *args, **kwargs)
+            record(gs, new_gs)
+            return new_gs, payload
+
+        return wrapper
+
+    def recording_advance(gs):
+        new_gs = advance(gs)
+        record(gs, new_gs)
+        return new_gs
+
+    originals = {name: getattr(actions, name) for name in _MOVE_ACTIONS}
+    advance = GameRunner._force_advance_turn
+    try:
+        for name, fn in originals.items():
+            setattr(actions, name, recording(fn))
+        GameRunner._force_advance_turn = staticmethod(recording_advance)
+        strategies = {uuid4(): Mastermind() for _ in range(num_players)}
+        GameRunner(strategies, seed=seed).run()
+    finally:
+        for name, fn in originals.items():
+            setattr(actions, name, fn)
+        GameRunner._force_advance_turn = staticmethod(advance)
+    return moves
+
+
+def bench_history(gs: GameState, seconds: float) -> None:
+    # Bytes per game and the cost of reading back one move's state_before,
+    # for full snapshots per move vs deltas with keyframes (app.state_delta).
+    moves = _played_history(len(gs.player_states), seed=1)
+    full_rows = [json.dumps(before) for before, _, _ in moves]
+    delta_rows = []
+    for seq, (before, after, outcomes) in enumerate(moves, start=1):
+        delta = json.dumps(
+            {
+                "state_delta": state_delta.move_delta(before, after, outcomes),
+                "outcomes": outcomes,
+            }
+        )
+        keyframe = json.dumps(before) if state_delta.is_keyframe(seq) else None
+        delta_rows.append((keyframe, delta))
+
+    full_bytes = sum(len(r) for r in full_rows)
+    delta_bytes = sum(len(k or "") + len(d) for k, d in delta_rows)
+
+    def read_full():
+        for row in full_rows:
+            json.loads(row)
+
+    def read_delta():
+        for seq in range(1, len(delta_rows) + 1):
+            start = seq
+            while delta_rows[start - 1][0] is None:
+                start -= 1
+            state_delta.rebuild_state(
+                json.loads(delta_rows[start - 1][0]),
+                (json.loads(d) for _, d in delta_rows[start - 1 : seq - 1]),
+            )
+
+    before = _rate(read_full, seconds, batch=1) * len(moves)
+    after = _rate(read_delta, seconds, batch=1) * len(moves)
+    print(f"Moves in game        : {len(moves):>10,}")
+    print(f"full snapshots       : {full_bytes / 1024:>10,.0f} KiB/game")
+    print(
+        f"deltas + keyframes   : {delta_bytes / 1024:>10,.0f} KiB/game "
+        f"(keyframe every {state_delta.KEYFRAME_EVERY})"
+    )
+    print(f"Size reduction       : {full_bytes / delta_bytes:>10.1f}x")
+    print(f"read full snapshot   : {before:>10,.0f} states/sec")
+    print(f"rebuild from deltas  : {after:>10,.0f} states/sec")
+
+
+def _allocated_per_call(fn: Callable[[], object], calls: int = 200) -> float:
+    """Bytes allocated (and kept alive) per call of ``fn``."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [fn() for _ in range(calls)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    del kept
+    return allocated / calls
+
+
+def bench_memory(gs: GameState, seconds: float) -> None:
+    print(
+        f"GameState.clone()      : {_allocated_per_call(gs.clone):>8,.0f} bytes/state"
+    )
+    print(
+        f"GameState.copy_on_write: "
+        f"{_allocated_per_call(gs.copy_on_write):>8,.0f} bytes/state"
+    )
+
+
+def bench_rollout(gs: GameState, seconds: float) -> None:
+    from ml.mcts import RolloutExecutor
+
+    executor = RolloutExecutor()
+    player_id = gs.player_turn
+    rate = _rate(
+        lambda: executor.rollout(gs, player_id, max_turns=30), seconds, batch=5
+    )
+    print(f"Mastermind rollouts  : {rate:>10,.1f} rollouts/sec (30 turns)")
+
+
+def bench_view(gs: GameState, seconds: float) -> None:
+    """Bytes of the game_state the API sends, before and after GameState.to_view."""
+    player, other = (
+        gs.player_turn,
+        next(p for p in gs.player_states if p != gs.player_turn),
+    )
+
+    def encoded(state: dict) -> bytes:
+        # As JSONResponse renders it.
+        return json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode()
+
+    full = len(encoded(gs.to_dict()))
+    print(f"to_dict                : {full:>7,} bytes")
+    for name, viewer in (("player to move", player), ("other player", other)):
+        view = len(encoded(gs.to_view(viewer)))
+        print(f"to_view, {name:<14}: {view:>7,} bytes ({view / full:.0%})")
+    before = _rate(lambda: encoded(gs.to_dict()), seconds)
+    after = _rate(lambda: encoded(gs.to_view(other)), seconds)
+    print(f"to_dict + json         : {before:>7,.0f} responses/sec")
+    print(f"to_view + json         : {after:>7,.0f} responses/sec")
+
+
+def bench_patch(gs: GameState, seconds: float) -> None:
+    """Action response bodies for the mover: the whole view vs a patch to it."""
+    moves: list[tuple[GameState, GameState]] = []
+
+    def recording(fn):
+        def wrapper(gs, *args, **kwargs):
+            new_gs, payload = fn(gs, *args, **kwargs)
+            moves.append((gs, new_gs))
+            return new_gs, payload
+
+        return wrapper
+
+    originals = {name: getattr(actions, name) for name in _MOVE_ACTIONS}
+    try:
+        for name, fn in originals.items():
+            setattr(actions, name, recording(fn))
+        strategies = {uuid4(): Mastermind() for _ in gs.player_states}
+        GameRunner(strategies, seed=1).run()
+    finally:
+        for name, fn in originals.items():
+            setattr(actions, name, fn)
+
+    def encoded(body) -> bytes:
+        return json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def views():
+        for _, after in moves:
+            encoded(after.to_view(after.player_turn))
+
+    def patches():
+        for before, after in moves:
+            encoded(state_patch.view_patch(before, after, before.player_turn))
+
+    full = sum(len(encoded(a.to_view(b.player_turn))) for b, a in moves)
+    patched = sum(
+        len(encoded(state_patch.view_patch(b, a, b.player_turn))) for b, a in moves
+    )
+    before = _rate(views, seconds, batch=1) * len(moves)
+    after = _rate(patches, seconds, batch=1) * len(moves)
+    print(f"Actions in game      : {len(moves):>10,}")
+    print(f"to_view              : {full / len(moves):>10,.0f} bytes/response")
+    print(
+        f"view_patch           : {patched / len(moves):>10,.0f} bytes/response "
+        f"({patched / full:.0%})"
+    )
+    print(f"to_view + json       : {before:>10,.0f} responses/sec")
+    print(f"view_patch + json    : {after:>10,.0f} responses/sec")
+
+
+BENCHMARKS: dict[str, Callable[[GameState, float], None]] = {
+    "bag": bench_bag,
+    "clone": bench_clone,
+    "hash": bench_hash,
+    "history": bench_history,
+    "memory": bench_memory,
+    "moves": bench_moves,
+    "patch": bench_patch,
+    "rollout": bench_rollout,
+    "scoring": bench_scoring,
+    "view": bench_view,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Engine micro-benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--turns", type=int, default=24)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--seconds", type=float, default=2.0, help="Time budget per measurement"
+    )
+    args = parser.parse_args()
+
+    gs = mid_game_state(args.players, args.turns, args.seed)
+    print(
+        f"State: {len(gs.player_states)} players, turn {gs.turn_number}, "
+        f"bag {len(gs.bag_contents)}, deck {len(gs._deck_dicts)}"
+    )
+    BENCHMARKS[args.benchmark](gs, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
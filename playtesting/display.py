@@ -5,7 +5,7 @@ from uuid import UUID
 from app.GameState import GameState
 from app.actions import _MIXERS, _SPIRITS
 
-from playtesting.valid_actions import Action
+from app.moves import Action
 
 
 def format_game_state(
@@ -82,10 +82,10 @@ def format_game_state(
         # Cards
         if ps.cards:
             card_strs = []
-            for cd in ps.cards:
-                ct = cd.get("card_type", "?")
-                name_str = cd.get("name", "?")
-                stored = cd.get("stored_spirits", [])
+            for card in ps.cards:
+                ct = card.card_type
+                name_str = card.name
+                stored = card.stored_spirits
                 if stored:
                     card_strs.append(f"{name_str}({ct}, {len(stored)} stored)")
                 else:
@@ -10,7 +10,7 @@ from app.game import GameException
 
 from playtesting.display import format_action, format_game_state
 from playtesting.strategy import Strategy
-from playtesting.valid_actions import Action, get_valid_actions
+from app.moves import Action, legal_moves
 
 MAX_TURNS = 500
 MAX_FREE_ACTIONS_PER_TURN = 20
@@ -48,11 +48,15 @@ class GameRunner:
         self.game_modes = list(game_modes) if game_modes else []
 
     def run(self, verbose: bool = False) -> GameResult:
+        # The game draws from its own stream (seeded below); strategies such
+        # as RandomStrategy still make their choices with the module random.
         if self.seed is not None:
             _random.seed(self.seed)
 
         player_ids = list(self.strategies.keys())
-        gs = GameState.start_game(player_ids, game_modes=self.game_modes)
+        gs = GameState.start_game(
+            player_ids, game_modes=self.game_modes, seed=self.seed
+        )
 
         if verbose:
             strategy_names = {pid: self.strategies[pid].name for pid in player_ids}
@@ -94,7 +98,7 @@ class GameRunner:
         verbose: bool,
     ) -> GameState:
         for _ in range(MAX_FREE_ACTIONS_PER_TURN):
-            all_actions = get_valid_actions(gs, player_id)
+            all_actions = legal_moves(gs, player_id)
             free_actions = [a for a in all_actions if a.is_free]
             if not free_actions:
                 break
@@ -128,7 +132,7 @@ class GameRunner:
         verbose: bool,
     ) -> GameState:
         for attempt in range(MAX_RETRIES):
-            all_actions = get_valid_actions(gs, player_id)
+            all_actions = legal_moves(gs, player_id)
             turn_actions = [a for a in all_actions if not a.is_free]
 
             if not turn_actions:
@@ -176,10 +180,9 @@ class GameRunner:
             _advance_turn,
             _check_last_player_standing,
             _check_last_round_complete,
-            _deep_copy_state,
         )
 
-        gs = _deep_copy_state(gs)
+        gs = gs.copy_on_write()
         gs.turn_number += 1
         _advance_turn(gs)
         _check_last_round_complete(gs)
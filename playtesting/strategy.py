@@ -39,7 +39,7 @@ from app.PlayerState import MAX_CUP_INGREDIENTS, PlayerState
 from app.actions import _MIXERS, _SPIRITS
 from app.cocktails import VALID_PAIRINGS, _RECIPES
 
-from playtesting.valid_actions import Action
+from app.moves import Action
 
 _SPIRIT_MAP: dict[str, Ingredient] = {
     "WHISKEY": Ingredient.WHISKEY,
@@ -254,11 +254,7 @@ class CupTracker:
 
 def _hot_mixer_types(ps: PlayerState) -> set[str]:
     """Return mixer type names covered by held refresher cards."""
-    return {
-        cd.get("mixer_type", "").upper()
-        for cd in ps.cards
-        if cd.get("card_type") == "refresher" and cd.get("mixer_type")
-    }
+    return set(ps.cards.refresher_mixers)
 
 
 def _projected_take_count(ps: PlayerState) -> int:
@@ -311,10 +307,10 @@ def _opponent_threats(gs: GameState, ps: PlayerState) -> dict[Ingredient, float]
             continue
 
         # 1. Cards held → ingredient ambitions
-        for cd in opp.cards:
-            ctype = cd.get("card_type")
-            st_name = (cd.get("spirit_type") or "").upper()
-            mt_name = (cd.get("mixer_type") or "").upper()
+        for card in opp.cards:
+            ctype = card.card_type
+            st_name = (card.spirit_type or "").upper()
+            mt_name = (card.mixer_type or "").upper()
             if ctype == "specialist":
                 # +2 pts per matching spirit when selling — they will hoard this spirit
                 bump(_SPIRIT_MAP.get(st_name), 0.6)
@@ -326,7 +322,7 @@ def _opponent_threats(gs: GameState, ps: PlayerState) -> dict[Ingredient, float]
             elif ctype == "refresher":
                 mixer = _MIXER_MAP.get(mt_name)
                 if mixer is not None:
-                    in_bladder = sum(1 for i in opp.bladder if i == mixer)
+                    in_bladder = opp.bladder.count(mixer)
                     # Only block while they still need more (cap at threshold of 2)
                     needed = max(0, 2 - in_bladder)
                     bump(mixer, 0.4 * needed)
@@ -357,7 +353,7 @@ def _opponent_threats(gs: GameState, ps: PlayerState) -> dict[Ingredient, float]
             spirit = _SPIRIT_MAP.get(spirit_name)
             if spirit is None:
                 continue
-            in_bladder = sum(1 for i in opp.bladder if i == spirit)
+            in_bladder = opp.bladder.count(spirit)
             if 1 <= in_bladder <= 2:
                 # Closer to 3 → stronger threat
                 bump(spirit, 0.4 * in_bladder)
@@ -716,7 +712,7 @@ def _safe_to_take(gs: GameState, ps: PlayerState, drunk_cap: int = 3) -> bool:
     they often sober — the bias is toward not taking when uncertain.
     """
     cup_slots = sum(MAX_CUP_INGREDIENTS - len(c.ingredients) for c in ps.cups)
-    specials_avail = sum(1 for ing in gs.open_display if ing == Ingredient.SPECIAL)
+    specials_avail = gs.open_display.count(Ingredient.SPECIAL)
 
     if ps.drunk_level >= drunk_cap:
         # At cap: only safe if every take can be absorbed with no drinks
@@ -974,7 +970,7 @@ class KaraokeRusher(Strategy):
             for t in targets:
                 ing = _SPIRIT_MAP.get(t)
                 if ing:
-                    have = sum(1 for i in ps.bladder if i == ing)
+                    have = ps.bladder.count(ing)
                     if 1 <= have < 3:
                         return _smart_take_assignments(
                             gs,
@@ -1001,7 +997,7 @@ class KaraokeRusher(Strategy):
             for t in targets:
                 ing = _SPIRIT_MAP.get(t)
                 if ing:
-                    have = sum(1 for i in ps.bladder if i == ing)
+                    have = ps.bladder.count(ing)
                     if 1 <= have < 3:
                         return _smart_pending_assignments(
                             ps,
@@ -1263,11 +1259,7 @@ class SpecialistBuilder(Strategy):
     name = "SpecialistBuilder"
 
     def _held_specialist_types(self, ps: PlayerState) -> set[str]:
-        return {
-            cd.get("spirit_type")
-            for cd in ps.cards
-            if cd.get("card_type") == "specialist" and cd.get("spirit_type")
-        }
+        return set(ps.cards.specialist_spirits)
 
     def _target_specialist_types(self, gs: GameState) -> list[str]:
         targets = []
@@ -1287,13 +1279,13 @@ class SpecialistBuilder(Strategy):
             for st in available:
                 ing = _SPIRIT_MAP.get(st)
                 if ing:
-                    c = sum(1 for i in ps.bladder if i == ing)
+                    c = ps.bladder.count(ing)
                     if c > best_count:
                         best, best_count = st, c
             return best
         best, best_count = None, 0
         for name, ing in _SPIRIT_MAP.items():
-            c = sum(1 for i in ps.bladder if i == ing)
+            c = ps.bladder.count(ing)
             if c > best_count:
                 best, best_count = name, c
         return best
@@ -1374,8 +1366,7 @@ class SpecialistBuilder(Strategy):
         use_actions = _find_actions(free_actions, "use_stored_spirit")
         for ua in use_actions:
             idx = ua.params["store_card_index"]
-            card_dict = ps.cards[idx]
-            spirit = card_dict.get("spirit_type", "")
+            spirit = ps.cards[idx].spirit_type or ""
             if spirit in held:
                 return ua
         return None
@@ -1403,7 +1394,7 @@ class SpecialistBuilder(Strategy):
             # Need spirits in bladder for specialist claim (2 required).
             # Only drink spirits when safe (drunk ≤ 1) and have 1 already.
             if focus_ing and ps.drunk_level <= 1:
-                have = sum(1 for i in ps.bladder if i == focus_ing)
+                have = ps.bladder.count(focus_ing)
                 if have == 1:
                     return _smart_take_assignments(
                         gs,
@@ -1438,7 +1429,7 @@ class SpecialistBuilder(Strategy):
 
         # If no specialist yet, safe, and close to claiming: drink spirits
         if not held and focus_ing and ps.drunk_level <= 1:
-            have = sum(1 for i in ps.bladder if i == focus_ing)
+            have = ps.bladder.count(focus_ing)
             if have == 1:
                 return _smart_pending_assignments(
                     ps, drawn, cups, spirit_to_cup=False, drunk_aware=False
@@ -1477,16 +1468,16 @@ class Mastermind(Strategy):
     def _focus_spirit(self, gs: GameState, ps: PlayerState) -> str:
         """Pick the best spirit type to build around."""
         for c in ps.cards:
-            if c.get("card_type") == "specialist" and c.get("spirit_type"):
-                return c["spirit_type"]
+            if c.card_type == "specialist" and c.spirit_type:
+                return c.spirit_type
 
         best, best_score = "VODKA", -1
         for name, ing in _SPIRIT_MAP.items():
             score = len(VALID_PAIRINGS.get(ing, set())) * 10
             for cup in ps.cups:
                 score += sum(12 for i in cup.ingredients if i == ing)
-            score += sum(5 for i in ps.bladder if i == ing)
-            score += sum(3 for i in gs.open_display if i == ing)
+            score += 5 * ps.bladder.count(ing)
+            score += 3 * gs.open_display.count(ing)
             for row in gs.card_rows:
                 for card in row.cards:
                     if card.card_type == "specialist" and card.spirit_type == name:
@@ -1502,10 +1493,7 @@ class Mastermind(Strategy):
     # ------------------------------------------------------------------
 
     def _has_specialist(self, ps: PlayerState, focus: str) -> bool:
-        return any(
-            c.get("card_type") == "specialist" and c.get("spirit_type") == focus
-            for c in ps.cards
-        )
+        return focus in ps.cards.specialist_spirits
 
     def _has_doubler(self, ps: PlayerState) -> bool:
         return any(cup.has_cup_doubler for cup in ps.cups)
@@ -1545,7 +1533,7 @@ class Mastermind(Strategy):
     ) -> float:
         """Value of having one more of this spirit in bladder for claims."""
         name = spirit_ing.name
-        current = sum(1 for i in ps.bladder if i == spirit_ing)
+        current = ps.bladder.count(spirit_ing)
         after = current + 1
         value = 0.0
         for row in gs.card_rows:
@@ -1911,7 +1899,7 @@ class Mastermind(Strategy):
                 ci = fa.params["cup_index"]
                 idx = fa.params["store_card_index"]
                 card = ps.cards[idx]
-                spirit_ing = _SPIRIT_MAP.get(card.get("spirit_type", ""))
+                spirit_ing = _SPIRIT_MAP.get(card.spirit_type or "")
                 if spirit_ing and cups._can_add_spirit(ci, spirit_ing):
                     score = 10.0
                     # 2nd spirit → enables 3-pt double-spirit sell
@@ -1935,11 +1923,11 @@ class Mastermind(Strategy):
                     continue  # Too risky
                 idx = fa.params["store_card_index"]
                 card = ps.cards[idx]
-                spirit_name = card.get("spirit_type", "")
+                spirit_name = card.spirit_type or ""
                 spirit_ing = _SPIRIT_MAP.get(spirit_name)
                 if not spirit_ing:
                     continue
-                cur = sum(1 for i in ps.bladder if i == spirit_ing)
+                cur = ps.bladder.count(spirit_ing)
                 after = cur + count
                 claim_val = self._claim_unlock_value(
                     gs, ps, spirit_name, cur, after, focus
@@ -1,18 +1,20 @@
 """Enumerate all legal actions for the current player given a GameState.
 
-Mirrors the validation logic in app/actions.py without calling it.
+Mirrors the validation logic in app/actions.py without calling it. Play goes
+through app.moves.legal_moves, which shares that logic with the actions; this
+standalone copy is kept as the reference it is tested against.
 """
 
-from dataclasses import dataclass, field
 from itertools import combinations
 from uuid import UUID
 
 from app.game_modes import GameMode
 from app.GameState import GameState
 from app.Ingredient import Ingredient
+from app.moves import Action
 from app.PlayerState import PlayerState
 from app.actions import MIN_DRUNK_TO_REFRESH, _SPIRITS
-from app.cocktails import drink_points, is_cocktail
+from app.cocktails import drink_score
 
 _SPIRIT_MAP: dict[str, Ingredient] = {
     "WHISKEY": Ingredient.WHISKEY,
@@ -28,48 +30,23 @@ _MIXER_MAP: dict[str, Ingredient] = {
     "CRANBERRY": Ingredient.CRANBERRY,
 }
 
-# Mirrors _FREE_ACTION_TYPE_MAP in app/actions.py. Held FreeActionCards turn
-# their spirit's matching action into a once-per-turn free action.
-_CARD_FREE_ACTION_MAP: dict[str, str] = {
-    "RUM": "take_ingredients",
-    "WHISKEY": "reroll_specials",
-    "VODKA": "sell_cup",
-    "GIN": "go_for_a_wee",
-}
-
-
-@dataclass
-class Action:
-    """Represents a legal action a player can take."""
-
-    action_type: str
-    params: dict = field(default_factory=dict)
-    is_free: bool = False
-    description: str = ""
-
 
 def _full_sell_points(
     ps: PlayerState, cup_idx: int, declared_specials: list[str]
 ) -> int | None:
     """Calculate full sell points including cup_doubler and specialist bonuses."""
     cup = ps.cups[cup_idx]
-    pts = drink_points(cup.ingredients, declared_specials)
+    pts, cocktail = drink_score(cup.ingredients, declared_specials)
     if pts is None:
         return None
 
-    cocktail = is_cocktail(cup.ingredients, declared_specials)
-
     # CupDoubler doubling (non-cocktails only)
     if cup.has_cup_doubler and not cocktail:
         pts *= 2
 
     # Specialist bonus: +2 per matching spirit type (non-cocktails only, after doubling)
     if not cocktail:
-        specialist_spirit_types = {
-            cd.get("spirit_type")
-            for cd in ps.cards
-            if cd.get("card_type") == "specialist" and cd.get("spirit_type")
-        }
+        specialist_spirit_types = ps.cards.specialist_spirits
         cup_spirit_types = {i.name for i in cup.ingredients if i in _SPIRITS}
         matching = specialist_spirit_types & cup_spirit_types
         pts += len(matching) * 2
@@ -85,7 +62,7 @@ def _bladder_spirits(ps: PlayerState, spirit_type: str) -> int:
     ing = _SPIRIT_MAP.get(spirit_type.upper())
     if ing is None:
         return 0
-    return sum(1 for i in ps.bladder if i == ing)
+    return ps.bladder.count(ing)
 
 
 def _available_spirits(ps: PlayerState, spirit_type: str) -> int:
@@ -93,7 +70,7 @@ def _available_spirits(ps: PlayerState, spirit_type: str) -> int:
     ing = _SPIRIT_MAP.get(spirit_type.upper())
     if ing is None:
         return 0
-    count = sum(1 for i in ps.bladder if i == ing)
+    count = ps.bladder.count(ing)
     return count
 
 
@@ -101,7 +78,7 @@ def _bladder_mixers(ps: PlayerState, mixer_type: str) -> int:
     ing = _MIXER_MAP.get(mixer_type.upper())
     if ing is None:
         return 0
-    return sum(1 for i in ps.bladder if i == ing)
+    return ps.bladder.count(ing)
 
 
 def get_valid_actions(gs: GameState, player_id: UUID) -> list[Action]:
@@ -159,14 +136,7 @@ def get_valid_actions(gs: GameState, player_id: UUID) -> list[Action]:
     # actions (RUM→take_ingredients, VODKA→sell_cup, WHISKEY→reroll_specials,
     # GIN→go_for_a_wee), once per turn. Mark them so callers — UI and bots —
     # can route them through the free-action slot before the main action.
-    card_free_types: set[str] = set()
-    for cd in ps.cards:
-        if cd.get("card_type") != "free_action":
-            continue
-        spirit = cd.get("spirit_type")
-        action_type = _CARD_FREE_ACTION_MAP.get(spirit) if spirit else None
-        if action_type and action_type not in used_free:
-            card_free_types.add(action_type)
+    card_free_types = ps.cards.free_action_types.difference(used_free)
     if card_free_types:
         for a in result:
             if a.action_type in card_free_types:
@@ -187,13 +157,12 @@ def _add_free_actions(
     gs: GameState, ps: PlayerState, player_id: UUID, result: list[Action]
 ):
     # drink_stored_spirit
-    for idx, card_dict in enumerate(ps.cards):
-        if card_dict.get("card_type") != "store":
-            continue
-        stored = card_dict.get("stored_spirits", [])
+    for idx in ps.cards.store_positions:
+        card = ps.cards[idx]
+        stored = card.stored_spirits
         if not stored:
             continue
-        spirit_type = card_dict.get("spirit_type", "")
+        spirit_type = card.spirit_type or ""
         for count in range(1, len(stored) + 1):
             result.append(
                 Action(
@@ -205,13 +174,12 @@ def _add_free_actions(
             )
 
     # use_stored_spirit
-    for idx, card_dict in enumerate(ps.cards):
-        if card_dict.get("card_type") != "store":
-            continue
-        stored = card_dict.get("stored_spirits", [])
+    for idx in ps.cards.store_positions:
+        card = ps.cards[idx]
+        stored = card.stored_spirits
         if not stored:
             continue
-        spirit_type = card_dict.get("spirit_type", "")
+        spirit_type = card.spirit_type or ""
         for cup_idx in (0, 1):
             if not ps.cups[cup_idx].is_full:
                 result.append(
@@ -443,7 +411,7 @@ def _add_claim_card(gs: GameState, ps: PlayerState, result: list[Action]):
             elif ct == "cup_doubler":
                 # Needs 3 of same spirit in bladder (not store)
                 for spirit_name, spirit_ing in _SPIRIT_MAP.items():
-                    bladder_count = sum(1 for i in ps.bladder if i == spirit_ing)
+                    bladder_count = ps.bladder.count(spirit_ing)
                     if bladder_count >= 3:
                         for cup_idx in (0, 1):
                             result.append(
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Move the history of long-finished games out of the hot tables.
+
+Run from the repo root, e.g. daily:
+
+    python -m scripts.archive_games
+    python -m scripts.archive_games --days 7 --limit 1000
+
+Archives every game that has been ENDED for longer than ``--days`` (default
+ARCHIVE_AFTER_DAYS, 30): its moves, keyframes and initial_state become one
+compressed blob in game_archives (see app/archive.py). History endpoints and
+replays keep working for archived games. Safe to run while the server is up
+and to re-run; a game that changes while it is being archived is skipped.
+Needs the same database environment as the server.
+"""
+
+import argparse
+from datetime import UTC, datetime, timedelta
+
+from app.archive import ARCHIVE_AFTER
+from app.db import db
+
+BATCH = 100
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=ARCHIVE_AFTER.days)
+    parser.add_argument("--limit", type=int, default=None, help="games at most")
+    args = parser.parse_args()
+
+    cutoff = (datetime.now(UTC) - timedelta(days=args.days)).isoformat()
+    archived = skipped = 0
+    seen: set = set()
+    while args.limit is None or archived + skipped < args.limit:
+        batch = BATCH if args.limit is None else args.limit - archived - skipped
+        game_ids = [
+            g
+            for g in db.get_archivable_games(cutoff, min(batch, BATCH))
+            if g not in seen
+        ]
+        if not game_ids:
+            break
+        for game_id in game_ids:
+            seen.add(game_id)
+            if db.archive_game(game_id):
+                archived += 1
+            else:
+                skipped += 1
+    print(f"{archived} games archived, {skipped} skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Measure how long a human's move takes when bots play next: inline vs queued.
+
+Run from the repo root; needs no database:
+
+    python -m scripts.bench_bot_turns
+    python -m scripts.bench_bot_turns --strategy mcts --players 4
+
+Builds a mid-game position (as playtesting.bench does), makes the player to
+move a human and everyone after them ``--strategy`` bots, and has the human
+go for a wee. For each app.bot_jobs backend it reports how long the human's
+call took, how long until the bots had all played, and the backend's
+latency stats: each bot turn, and how long the game waited for a worker.
+"""
+
+import argparse
+import os
+import time
+from unittest.mock import patch
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+
+from app.bot_jobs import InlineBotJobs, ThreadBotJobs
+from app.game import Game
+from app.gameManager import GameManager
+from app.Ingredient import Ingredient
+from app.sqlite_db import SqliteDb
+from app.user import User
+from playtesting.bench import mid_game_state
+
+
+def _game(db: SqliteDb, args) -> tuple[Game, User]:
+    """The mid-game position, on the human's turn: (game, human)."""
+    state = mid_game_state(args.players, args.turns, args.seed)
+    order = state.turn_order
+    first = order.index(state.player_turn)
+    users = []
+    for n, pid in enumerate(order[first:] + order[:first]):
+        user = User(f"player{n}", f"player{n}@example.com", "Password1")
+        user.id = pid
+        if n:
+            user.is_bot, user.bot_strategy = True, args.strategy
+        db.add_user(user)
+        users.append(user)
+    game = Game.new_game(users[0].id)
+    db.create_game(game)
+    for user in users[1:]:
+        db.add_player_to_game(game.id, user.id)
+    # A clean turn start with something to wee away.
+    state.own_player(users[0].id).bladder = [Ingredient.VODKA]
+    state.bag_draw_pending = []
+    state.ingredients_taken_this_turn = 0
+    state.main_action_taken_this_turn = False
+    db.start_game(game.id, state)
+    return db.get_game(game.id), users[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strategy", default="lookahead")
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--turns", type=int, default=24)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"1 human, {args.players - 1} {args.strategy} bots, turn {args.turns}")
+    print(
+        f"{'':>8}  {'move ms':>8}  {'bots done ms':>12}"
+        f"  {'turn p50 ms':>11}  {'turn max ms':>11}  {'wait ms':>7}"
+    )
+    for jobs in (InlineBotJobs(), ThreadBotJobs()):
+        db = SqliteDb()
+        game, human = _game(db, args)
+        with (
+            patch("app.gameManager.db", db),
+            patch("app.bot_player.db", db),
+            patch("app.gameManager.bot_jobs", jobs),
+            patch("app.bot_player.bot_jobs", jobs),
+        ):
+            start = time.perf_counter()
+            GameManager().go_for_a_wee(game, human.id)
+            moved = time.perf_counter()
+            jobs.drain()
+            done = time.perf_counter()
+        stats = jobs.stats()
+        wait = stats["wait"]["max_ms"]
+        print(
+            f"{jobs.name:>8}  {(moved - start) * 1000:>8.0f}"
+            f"  {(done - start) * 1000:>12.0f}"
+            f"  {stats['turn']['p50_ms']:>11}  {stats['turn']['max_ms']:>11}"
+            f"  {'-' if wait is None else wait:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
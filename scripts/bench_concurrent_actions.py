@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Load-test concurrent game actions against a local stand-in for PostgREST.
+
+Run from the repo root; needs no database:
+
+    python -m scripts.bench_concurrent_actions
+    python -m scripts.bench_concurrent_actions --clients 100 --latency-ms 30
+
+Starts an HTTP server on localhost that answers the PostgREST requests the API
+makes for a game action (users, games, the commit_game_move RPC, undo
+requests, push subscriptions), each after ``--latency-ms`` to stand in for
+the round trip to the database. Each client is the current player of its own
+game and POSTs go-for-a-wee ``--requests`` times in a row. The stand-in
+acknowledges every commit but keeps serving the game's original state, so
+every request is the same legal move.
+
+Throughput and latency are reported twice:
+
+    blocking — handlers call the synchronous Db on the event loop, as they did
+               before app.async_db
+    pooled   — handlers await app.async_db, as the server runs now
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import ClassVar
+from unittest.mock import patch
+from urllib.parse import parse_qsl, urlsplit
+from uuid import uuid4
+
+import httpx
+
+
+class _PostgrestStandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, as PostgREST
+    disable_nagle_algorithm = True
+    latency = 0.0
+    tables: ClassVar[dict[str, list[dict]]] = {}
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, body) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else None
+
+    @staticmethod
+    def _matches(row: dict, column: str, condition: str) -> bool:
+        op, _, value = condition.partition(".")
+        actual = row.get(column)
+        if op == "eq":
+            return str(actual).lower() == value.lower()
+        if op == "in":
+            return str(actual) in value.strip("()").split(",")
+        if op == "is":
+            return actual is None
+        return True
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        url = urlsplit(self.path)
+        table = url.path.rsplit("/", 1)[-1]
+        query = dict(parse_qsl(url.query))
+        columns = query.pop("select", "*").split(",")
+        query = {k: v for k, v in query.items() if k not in ("order", "limit")}
+        with self.lock:
+            rows = [
+                row
+                for row in self.tables.get(table, [])
+                if all(self._matches(row, c, v) for c, v in query.items())
+            ]
+            if columns != ["*"]:
+                rows = [{c: row.get(c) for c in columns} for row in rows]
+        self._reply(200, rows)
+
+    def do_POST(self):
+        time.sleep(self.latency)
+        body = self._body()
+        path = urlsplit(self.path).path
+        if path.endswith("/rpc/commit_game_move"):
+            with self.lock:
+                game = next(
+                    g for g in self.tables["games"] if g["id"] == body["game_id"]
+                )
+                # Acknowledge the move but keep the stored state, so the next
+                # request finds the same position (at a newer version).
+                game["state_version"] += 1
+                self._reply(200, {"state_version": game["state_version"]})
+                game["state_version"] -= 1
+            return
+        self._reply(201, [body] if isinstance(body, dict) else body)
+
+
+def _start_stand_in(latency_ms: float) -> ThreadingHTTPServer:
+    _PostgrestStandIn.latency = latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PostgrestStandIn)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _seed(clients: int) -> list[tuple[str, str]]:
+    """Create one game per client; return (game_id, token) pairs."""
+    from app.api import jwt_handler
+    from app.GameState import Ingredient
+    from playtesting.bench import mid_game_state
+
+    users, games, sessions = [], [], []
+    for i in range(clients):
+        state = mid_game_state(num_players=2, turns=4, seed=i)
+        player = state.player_turn
+        state.player_states[player].bladder = [Ingredient.VODKA]
+        game_id = str(uuid4())
+        for pid in state.player_states:
+            users.append(
+                {"id": str(pid), "username": f"bench{len(users)}", "status": "active"}
+            )
+        games.append(
+            {
+                "id": game_id,
+                "host": str(player),
+                "players": [str(p) for p in state.player_states],
+                "status": "STARTED",
+                "latest_state": state.to_dict(include_rng=True),
+                "created_at": "2026-01-01T00:00:00+00:00",
+                "state_version": 0,
+            }
+        )
+        token = jwt_handler.sign(SimpleNamespace(username=f"bench{i}", id=player))
+        sessions.append((game_id, token))
+    _PostgrestStandIn.tables.update(
+        users=users, games=games, undo_requests=[], push_subscriptions=[]
+    )
+    return sessions
+
+
+async def _run(sessions: list[tuple[str, str]], requests: int) -> dict:
+    from app.api import app
+
+    latencies: list[float] = []
+    errors = 0
+
+    async def client(game_id: str, token: str) -> None:
+        nonlocal errors
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://bench",
+            cookies={"userjwt": token},
+        ) as http:
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = await http.post(f"/v1/games/{game_id}/actions/go-for-a-wee")
+                latencies.append((time.perf_counter() - start) * 1000)
+                errors += response.status_code != 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(g, t) for g, t in sessions))
+    elapsed = time.perf_counter() - start
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": cuts[49],
+        "p95": cuts[94],
+        "errors": errors,
+    }
+
+
+async def _inline(fn, /, *args, **kwargs):
+    return fn(*args, **kwargs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=10, help="per client")
+    parser.add_argument("--latency-ms", type=float, default=15)
+    args = parser.parse_args()
+
+    server = _start_stand_in(args.latency_ms)
+    os.environ["SUPABASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ.setdefault("SUPABASE_KEY", "bench")
+    from app.async_db import adb
+
+    logging.disable(logging.INFO)
+    sessions = _seed(args.clients)
+
+    print(
+        f"{args.clients} clients x {args.requests} go-for-a-wee, "
+        f"{args.latency_ms:g} ms per database round trip"
+    )
+    print(f"{'':>9}  {'req/s':>8}  {'p50 ms':>8}  {'p95 ms':>8}  {'errors':>6}")
+    with patch.object(adb, "run", _inline):
+        blocking = asyncio.run(_run(sessions, args.requests))
+    pooled = asyncio.run(_run(sessions, args.requests))
+    for name, result in (("blocking", blocking), ("pooled", pooled)):
+        print(
+            f"{name:>9}  {result['rps']:>8.1f}  {result['p50']:>8.0f}"
+            f"  {result['p95']:>8.0f}  {result['errors']:>6}"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Measure what idle game pages cost the server: polling vs the event stream.
+
+Run from the repo root; needs no database:
+
+    python -m scripts.bench_game_watchers
+    python -m scripts.bench_game_watchers --watchers 100 --seconds 30
+
+Starts the server (uvicorn, in-memory storage) in a subprocess, sets up a
+two-player game and opens ``--watchers`` pages on it as the player waiting
+for their turn. For ``--seconds`` nobody moves, and the report gives the
+requests and response kilobytes per second the pages cause and the server
+CPU they cost:
+
+    polling — every page GETs /v1/games/{id} and /valid-actions every 3 s, as
+              static/game.js did before the event stream
+    etags   — the same polls, sending back the ETags of the last responses
+              (what game.js does when it has no stream), so they are 304s
+    stream  — every page holds /v1/games/{id}/events open
+
+Then the current player makes one move, and the stream's row also gives the
+time until every page has been told (each page then fetches the game once).
+Server CPU is read from /proc, so is only shown on Linux.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+POLL_SECONDS = 3.0  # static/game.js schedulePoll
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(port: int) -> subprocess.Popen:
+    env = dict(os.environ, STORAGE_BACKEND="memory", LOG_LEVEL="WARNING")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.api:app", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health")
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.kill()
+    raise SystemExit("The server did not start")
+
+
+def _cpu_seconds(pid: int) -> float | None:
+    """User + system CPU time of a process so far, or None off Linux."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def _setup(base_url: str) -> tuple[str, str, str]:
+    """A started two-player game: (game_id, mover's token, waiter's token)."""
+    tokens = []
+    with httpx.Client(base_url=base_url) as http:
+        for name in (f"host{time.time_ns()}", f"guest{time.time_ns()}"):
+            response = http.post(
+                "/register",
+                json={
+                    "username": name,
+                    "email": f"{name}@example.com",
+                    "password": "Password1",
+                },
+            )
+            tokens.append({"userjwt": response.cookies["userjwt"]})
+        http.cookies.clear()
+        game_id = http.post("/v1/games", cookies=tokens[0]).json()["id"]
+        http.post(f"/v1/games/{game_id}/join", cookies=tokens[1])
+        http.post(f"/v1/games/{game_id}/start", cookies=tokens[0])
+        game = http.get(f"/v1/games/{game_id}", cookies=tokens[0]).json()
+        me = http.get("/userDetails", cookies=tokens[0]).json()["id"]
+    if game["game_state"]["player_turn"] != me:
+        tokens.reverse()
+    return game_id, tokens[0]["userjwt"], tokens[1]["userjwt"]
+
+
+async def _polling(base_url, game_id, token, watchers, seconds, etags):
+    """(requests, bytes received) of ``watchers`` polling pages in ``seconds``."""
+    requests = received = 0
+    urls = [f"/v1/games/{game_id}", f"/v1/games/{game_id}/valid-actions"]
+
+    async def page(http: httpx.AsyncClient, offset: float) -> None:
+        nonlocal requests, received
+        kept: dict[str, str] = {}
+        await asyncio.sleep(offset)  # pages opened at different times
+        while True:
+            responses = await asyncio.gather(
+                *(
+                    http.get(url, headers={"If-None-Match": kept[url]})
+                    if url in kept
+                    else http.get(url)
+                    for url in urls
+                )
+            )
+            if etags:
+                kept = {url: r.headers["ETag"] for url, r in zip(urls, responses)}
+            requests += len(urls)
+            received += sum(len(r.content) for r in responses)
+            await asyncio.sleep(POLL_SECONDS)
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        cookies={"userjwt": token},
+        limits=httpx.Limits(max_connections=None),
+    ) as http:
+        tasks = [
+            asyncio.create_task(page(http, POLL_SECONDS * i / watchers))
+            for i in range(watchers)
+        ]
+        await asyncio.sleep(seconds)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return requests, received
+
+
+async def _streaming(base_url, game_id, token, mover, watchers, seconds, on_idle):
+    """(requests and bytes while idle, seconds until all pages heard of a move)."""
+    connected = asyncio.Barrier(watchers + 1)
+    sent: list[float] = []  # when each request was made
+    told: list[float] = []
+    lines: list[tuple[float, int]] = []  # when each line arrived, its size
+
+    async def page(http: httpx.AsyncClient) -> None:
+        sent.append(time.perf_counter())
+        async with http.stream("GET", f"/v1/games/{game_id}/events") as response:
+            events = 0
+            async for line in response.aiter_lines():
+                lines.append((time.perf_counter(), len(line) + 1))
+                if not line.startswith("event:"):
+                    continue
+                events += 1
+                if events == 1:
+                    await connected.wait()
+                else:
+                    told.append(time.perf_counter())
+                    sent.append(time.perf_counter())
+                    await http.get(f"/v1/games/{game_id}")
+                    return
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        cookies={"userjwt": token},
+        limits=httpx.Limits(max_connections=None),
+        timeout=None,
+    ) as http:
+        tasks = [asyncio.create_task(page(http)) for _ in range(watchers)]
+        await connected.wait()
+        on_idle()
+        idle = time.perf_counter()
+        await asyncio.sleep(seconds)
+        on_idle()
+        start = time.perf_counter()
+        await http.post(
+            f"/v1/games/{game_id}/actions/draw-from-bag",
+            json={"count": 1},
+            cookies={"userjwt": mover},
+        )
+        await asyncio.gather(*tasks)
+    return (
+        sum(idle <= t < start for t in sent),
+        sum(n for t, n in lines if idle <= t < start),
+        max(told) - start,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--watchers", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=15)
+    args = parser.parse_args()
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = _start_server(port)
+    try:
+        game_id, mover, waiter = _setup(base_url)
+        print(f"{args.watchers} idle pages on one game for {args.seconds:g} s")
+        print(
+            f"{'':>8}  {'req/s':>7}  {'KB/s':>7}  {'CPU ms/s':>8}  {'all told ms':>11}"
+        )
+
+        for name, etags in (("polling", False), ("etags", True)):
+            cpu = _cpu_seconds(server.pid)
+            requests, received = asyncio.run(
+                _polling(base_url, game_id, waiter, args.watchers, args.seconds, etags)
+            )
+            used = _cpu_seconds(server.pid)
+            polling_cpu = None if cpu is None else (used - cpu) / args.seconds
+            print(
+                f"{name:>8}  {requests / args.seconds:>7.1f}"
+                f"  {received / 1000 / args.seconds:>7.1f}"
+                f"  {_ms(polling_cpu):>8}  {'-':>11}"
+            )
+
+        marks = []
+        requests, received, told = asyncio.run(
+            _streaming(
+                base_url,
+                game_id,
+                waiter,
+                mover,
+                args.watchers,
+                args.seconds,
+                lambda: marks.append(_cpu_seconds(server.pid)),
+            )
+        )
+        stream_cpu = None if None in marks else (marks[1] - marks[0]) / args.seconds
+        print(
+            f"{'stream':>8}  {requests / args.seconds:>7.1f}"
+            f"  {received / 1000 / args.seconds:>7.1f}"
+            f"  {_ms(stream_cpu):>8}  {told * 1000:>11.0f}"
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def _ms(seconds: float | None) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.1f}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Benchmark GET /v1/games on a database seeded with many games.
+
+Run from the repo root against a local Supabase (``supabase start``), after
+registering at least one user:
+
+    python -m scripts.bench_list_games --seed 50000
+    python -m scripts.bench_list_games            # reuse already-seeded games
+
+Seeding inserts games whose latest_state is a real mid-game state (Mastermind
+bots, 2-4 players, various turns), hosted and played by existing users. The
+benchmark then reports, for list pages at increasing depth, the response size
+and median latency of:
+
+    full    — the old query: every game's whole latest_state, OFFSET, exact count
+    summary — /v1/games?page=N (summary column, OFFSET, exact count)
+    cursor  — /v1/games?cursor=... (summary column, keyset, no count)
+
+Needs the same SUPABASE_URL / SUPABASE_KEY environment as the server.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app.api import app
+from app.db import db
+from playtesting.bench import mid_game_state
+
+PAGE_SIZE = 100
+BATCH = 500
+
+
+def seed(count: int) -> None:
+    users = [
+        row["id"] for row in db.supabase.table("users").select("id").execute().data
+    ]
+    if not users:
+        raise SystemExit("Register at least one user before seeding")
+    states = [
+        mid_game_state(num_players=n, turns=t, seed=s).to_dict(include_rng=True)
+        for s, (n, t) in enumerate((n, t) for n in (2, 3, 4) for t in (4, 16, 32))
+    ]
+    start = datetime.now(UTC) - timedelta(days=365)
+    rng = random.Random(0)
+    for offset in range(0, count, BATCH):
+        rows = []
+        for i in range(offset, min(offset + BATCH, count)):
+            players = rng.sample(users, min(len(users), rng.randint(2, 4)))
+            rows.append(
+                {
+                    "id": str(uuid4()),
+                    "host": players[0],
+                    "players": players,
+                    "status": rng.choice(["NEW", "STARTED", "ENDED"]),
+                    "latest_state": rng.choice(states),
+                    "created_at": (start + timedelta(minutes=10 * i)).isoformat(),
+                }
+            )
+        db.supabase.table("games").insert(rows).execute()
+        print(f"seeded {offset + len(rows):,} / {count:,}", end="\r")
+    print()
+
+
+def _median_ms(fn, repeats: int) -> tuple[float, object]:
+    times, result = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def _full_page(page: int):
+    # What Db.get_games read before games.summary existed.
+    offset = (page - 1) * PAGE_SIZE
+    return (
+        db.supabase.table("games")
+        .select("id, host, players, status, latest_state, created_at", count="exact")
+        .order("created_at", desc=True)
+        .range(offset, offset + PAGE_SIZE - 1)
+        .execute()
+    )
+
+
+def bench(depths: list[int], repeats: int) -> None:
+    client = TestClient(app)
+    # Walk the cursor chain once to find the cursor that starts each depth.
+    cursors = {1: None}
+    cursor, page = None, 1
+    while page < max(depths):
+        url = f"/v1/games?page_size={PAGE_SIZE}" + (
+            f"&cursor={cursor}" if cursor else ""
+        )
+        cursor = client.get(url).json()["next_cursor"]
+        if cursor is None:
+            break
+        page += 1
+        cursors[page] = cursor
+
+    print(f"{'page':>6}  {'full':>20}  {'summary':>20}  {'cursor':>20}")
+    for depth in depths:
+        if depth not in cursors:
+            print(f"{depth:>6}  (only {page} pages seeded)")
+            continue
+        full_ms, full = _median_ms(lambda d=depth: _full_page(d), repeats)
+        summary_ms, summary = _median_ms(
+            lambda d=depth: client.get(f"/v1/games?page={d}&page_size={PAGE_SIZE}"),
+            repeats,
+        )
+        cursor_url = f"/v1/games?page_size={PAGE_SIZE}"
+        if cursors[depth]:
+            cursor_url += f"&cursor={cursors[depth]}"
+        cursor_ms, keyset = _median_ms(lambda u=cursor_url: client.get(u), repeats)
+        full_kib = len(json.dumps(full.data)) / 1024
+        print(
+            f"{depth:>6}  {full_kib:>8,.0f} KiB {full_ms:>6.0f} ms"
+            f"  {len(summary.content) / 1024:>8,.0f} KiB {summary_ms:>6.0f} ms"
+            f"  {len(keyset.content) / 1024:>8,.0f} KiB {cursor_ms:>6.0f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0, help="games to insert first")
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 10, 100, 400])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    if args.seed:
+        seed(args.seed)
+    bench(args.depths, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
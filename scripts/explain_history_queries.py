@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Check that the move-history queries use their indexes on a seeded database.
+
+Run from the repo root against a local Supabase (``supabase start``):
+
+    python -m scripts.explain_history_queries --seed 2000
+    python -m scripts.explain_history_queries            # reuse seeded games
+
+Seeding inserts ``--seed`` ended games of ``--moves`` moves each, hosted by a
+bench bot user, with the shape the server writes: a keyframe state_before
+every KEYFRAME_EVERY moves, a state delta and an action on every move, and a
+couple of settled undo requests per game. The states are real mid-game
+states, so row sizes (and TOAST) are realistic.
+
+Then every query Db makes against game_moves and undo_requests is run under
+EXPLAIN ANALYZE for a game in the middle of the table. Each must be an index
+scan of the expected index, never a sequential scan; the script prints the
+plans and exits non-zero if any query regressed.
+
+Talks to Postgres through ``psql``, at ``--db-url`` or the DB_URL that
+``supabase status`` reports.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from uuid import UUID
+
+from app.state_delta import KEYFRAME_EVERY, move_delta
+from playtesting.bench import mid_game_state
+from playtesting.runner import GameRunner
+from playtesting.strategy import Mastermind
+
+BENCH_USER = UUID(int=0xBE7C4)
+
+# (name, SQL, acceptable plan node types, index) — the SQL is what Db sends
+# through PostgREST, with :game, :turn, :seq and :keyframe (the keyframe at or
+# before :seq) standing for the values.
+QUERIES = [
+    (
+        "get_game_moves",
+        (
+            "SELECT id, turn_number, move_number, player_id, action, created_at"
+            " FROM game_moves WHERE game_id = :game"
+            " ORDER BY turn_number, move_number"
+        ),
+        {"Index Only Scan"},
+        "game_moves_unique_move",
+    ),
+    (
+        "get_state_before_turn",
+        (
+            "SELECT seq, state_before FROM game_moves"
+            " WHERE game_id = :game AND turn_number = :turn"
+            " ORDER BY move_number LIMIT 1"
+        ),
+        {"Index Scan"},
+        "game_moves_unique_move",
+    ),
+    (
+        "rebuild: keyframe",
+        (
+            "SELECT seq, state_before FROM game_moves"
+            " WHERE game_id = :game AND seq <= :seq AND state_before IS NOT NULL"
+            " ORDER BY seq DESC LIMIT 1"
+        ),
+        {"Index Scan"},
+        "idx_game_moves_keyframes",
+    ),
+    (
+        "rebuild: deltas",
+        (
+            "SELECT state_delta FROM game_moves"
+            " WHERE game_id = :game AND seq >= :keyframe AND seq < :seq"
+            " ORDER BY seq"
+        ),
+        {"Index Scan"},
+        "game_moves_unique_seq",
+    ),
+    (
+        "get_max_turn_number",
+        (
+            "SELECT turn_number FROM game_moves WHERE game_id = :game"
+            " ORDER BY turn_number DESC LIMIT 1"
+        ),
+        {"Index Only Scan"},
+        "game_moves_unique_move",
+    ),
+    (
+        "commit: next move_number",
+        (
+            "SELECT COALESCE(MAX(move_number), 0) + 1 FROM game_moves"
+            " WHERE game_id = :game AND turn_number = :turn"
+        ),
+        {"Index Only Scan"},
+        "game_moves_unique_move",
+    ),
+    (
+        "commit: last seq",
+        (
+            "SELECT seq, state_version FROM game_moves WHERE game_id = :game"
+            " ORDER BY seq DESC LIMIT 1"
+        ),
+        {"Index Scan"},
+        "game_moves_unique_seq",
+    ),
+    (
+        "get_replay_data",
+        (
+            "SELECT seq, turn_number, player_id, action, params, outcomes,"
+            " state_delta FROM game_moves WHERE game_id = :game ORDER BY seq"
+        ),
+        {"Index Scan"},
+        "game_moves_unique_seq",
+    ),
+    (
+        "get_pending_undo",
+        "SELECT * FROM undo_requests WHERE game_id = :game AND status = 'pending'",
+        {"Index Scan"},
+        "idx_undo_requests_one_pending",
+    ),
+]
+
+
+def psql(db_url: str, sql: str) -> str:
+    result = subprocess.run(
+        ["psql", db_url, "-X", "-q", "-t", "-A", "-v", "ON_ERROR_STOP=1"],
+        input=sql,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise SystemExit(result.stderr.strip())
+    return result.stdout.strip()
+
+
+def default_db_url() -> str | None:
+    try:
+        result = subprocess.run(
+            ["supabase", "status", "-o", "json"],
+            capture_output=True,
+            text=True,
+            timeout=15,
+            check=True,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return json.loads(result.stdout).get("DB_URL")
+
+
+def _literal(value) -> str:
+    return "'" + json.dumps(value).replace("'", "''") + "'::jsonb"
+
+
+def seed(db_url: str, games: int, moves: int) -> None:
+    before = mid_game_state(num_players=4, turns=16, seed=0)
+    state = before.to_dict(include_rng=True)
+    bot = Mastermind()
+    after = GameRunner(dict.fromkeys(before.player_states, bot))._do_main_action(
+        before, before.player_turn, bot, False
+    )
+    outcomes = after.outcomes or []
+    delta = move_delta(state, after.to_dict(include_rng=True), outcomes)
+    action = {
+        "type": "take-ingredients",
+        "ingredients": ["VODKA", "GIN", "COLA", "TONIC"],
+        "drawn": ["VODKA", "RUM", "GIN", "SODA", "COLA", "TONIC", "WHISKEY"],
+    }
+    psql(
+        db_url,
+        f"""
+        BEGIN;
+        INSERT INTO users (id, username, email, status, is_bot, bot_strategy)
+        VALUES ('{BENCH_USER}', 'explain-bench', NULL, 'active', true, 'random')
+        ON CONFLICT (id) DO NOTHING;
+
+        CREATE TEMP TABLE bench_game ON COMMIT DROP AS
+        SELECT gen_random_uuid() AS id, g
+        FROM generate_series(1, {games}) g;
+
+        INSERT INTO games (id, host, players, status, latest_state, initial_state,
+                           created_at)
+        SELECT b.id, '{BENCH_USER}', ARRAY['{BENCH_USER}']::uuid[], 'ENDED',
+               {_literal(state)}, {_literal(state)},
+               now() - b.g * interval '1 minute'
+        FROM bench_game b;
+
+        INSERT INTO game_moves (game_id, turn_number, move_number, seq, player_id,
+                                action, params, outcomes, state_before,
+                                state_delta, state_version)
+        SELECT b.id, (n - 1) / 3 + 1, (n - 1) % 3 + 1, n, '{BENCH_USER}',
+               {_literal(action)}, '{{}}', {_literal(outcomes)},
+               CASE WHEN (n - 1) % {KEYFRAME_EVERY} = 0
+                    THEN {_literal(state)} END,
+               {_literal(delta)}, n
+        FROM bench_game b, generate_series(1, {moves}) n;
+
+        INSERT INTO undo_requests (game_id, target_turn_number, proposed_by,
+                                   votes, status)
+        SELECT b.id, t, '{BENCH_USER}', '{{}}',
+               CASE WHEN t % 2 = 0 THEN 'approved' ELSE 'rejected' END
+        FROM bench_game b, generate_series(1, 2) t;
+        COMMIT;
+        """,
+    )
+
+
+def explain(db_url: str, sql: str) -> dict:
+    out = psql(db_url, f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")
+    return json.loads(out)[0]
+
+
+def nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from nodes(child)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-url", default=None)
+    parser.add_argument("--seed", type=int, default=0, help="games to insert")
+    parser.add_argument("--moves", type=int, default=100, help="per seeded game")
+    args = parser.parse_args()
+
+    db_url = args.db_url or default_db_url()
+    if not db_url:
+        raise SystemExit("No database: start Supabase or pass --db-url")
+    if args.seed:
+        seed(db_url, args.seed, args.moves)
+    # Index-only scans need the visibility map, which autovacuum keeps up to
+    # date in a running server.
+    psql(db_url, "VACUUM (ANALYZE) game_moves, undo_requests;")
+
+    row = psql(
+        db_url,
+        f"""
+        SELECT g.id, max(m.turn_number) / 2, max(m.seq) / 2 + 7
+        FROM (SELECT id FROM games WHERE host = '{BENCH_USER}'
+              ORDER BY created_at OFFSET (SELECT count(*) / 2 FROM games
+                                          WHERE host = '{BENCH_USER}')
+              LIMIT 1) g
+        JOIN game_moves m ON m.game_id = g.id
+        GROUP BY g.id;
+        """,
+    )
+    if not row:
+        raise SystemExit("No seeded games: run with --seed N first")
+    game_id, turn, seq = row.split("|")
+    keyframe = (int(seq) - 1) // KEYFRAME_EVERY * KEYFRAME_EVERY + 1
+    total = psql(db_url, "SELECT count(*) FROM game_moves;")
+    print(f"game_moves: {total} rows; probing game {game_id}")
+    print(f"{'query':<26}  {'plan':<26}  {'index':<30}  {'ms':>7}  {'pages':>5}")
+
+    failures = []
+    for name, sql, node_types, index in QUERIES:
+        sql = (
+            sql.replace(":game", f"'{game_id}'")
+            .replace(":turn", turn)
+            .replace(":seq", seq)
+            .replace(":keyframe", str(keyframe))
+        )
+        result = explain(db_url, sql)
+        scans = [n for n in nodes(result["Plan"]) if n.get("Relation Name") is not None]
+        used = next((n for n in scans if n.get("Index Name") == index), None)
+        if used is None or used["Node Type"] not in node_types:
+            failures.append(name)
+        shown = used or (scans[0] if scans else result["Plan"])
+        pages = shown.get("Shared Hit Blocks", 0) + shown.get("Shared Read Blocks", 0)
+        print(
+            f"{name:<26}  {shown['Node Type']:<26}"
+            f"  {shown.get('Index Name', '-'):<30}"
+            f"  {result['Execution Time']:>7.3f}  {pages:>5}"
+        )
+
+    if failures:
+        print(f"\nNot using the expected index: {', '.join(failures)}")
+        sys.exit(1)
+    print("\nAll history queries use their indexes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Check that stored game histories replay to the states that were saved.
+
+Run from the repo root with: python -m scripts.verify_replays [game_id ...]
+
+With no arguments, checks every started or ended game. For each game, re-runs
+its moves from initial_state (see app/replay.py) and prints any move whose
+replayed state differs from the stored one. Exits non-zero if any game fails.
+Needs the same SUPABASE_URL / SUPABASE_KEY environment as the server.
+"""
+
+import sys
+from uuid import UUID
+
+from app.db import db
+from app.game import GameException
+from app.gameManager import GameManager
+
+PAGE_SIZE = 100
+
+
+def game_ids():
+    after = None
+    while True:
+        games, _, has_more = db.get_games(
+            page_size=PAGE_SIZE, status=["STARTED", "ENDED"], after=after
+        )
+        for game in games:
+            yield game.id
+        if not has_more:
+            return
+        after = (str(games[-1].created), str(games[-1].id))
+
+
+def main(argv: list[str]) -> int:
+    manager = GameManager()
+    ids = [UUID(a) for a in argv] if argv else game_ids()
+    checked = failed = 0
+    for game_id in ids:
+        checked += 1
+        try:
+            mismatches = manager.verify_history(game_id)
+        except GameException as e:
+            failed += 1
+            print(f"{game_id}: {e}")
+            continue
+        if mismatches:
+            failed += 1
+            for m in mismatches:
+                where = f"move {m['seq']}" if m["seq"] is not None else "latest_state"
+                print(f"{game_id}: {where} differs in {', '.join(m['keys'])}")
+    print(f"{checked} games checked, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
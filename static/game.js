@@ -43,7 +43,7 @@ async function subscribeToPush() {
 }
 
 // ─────────────────────────────────────────────────────────────
-// Initial load + polling
+// Initial load + live updates (event stream, polling as fallback)
 // ─────────────────────────────────────────────────────────────
 async function load() {
     const sp = new URLSearchParams(window.location.search);
@@ -99,6 +99,7 @@ async function load() {
     });
 
     await refreshGame();
+    if (S.game && S.game.status !== 'ENDED') openGameStream();
     await refreshHistory();
     refreshNotificationBell();
 
@@ -111,22 +112,40 @@ async function load() {
     }
 }
 
+// The game, valid-actions and history endpoints tag their responses with an
+// ETag. We keep the last body per URL and send its tag back, so a read that
+// finds nothing new costs the server an empty 304 instead of a full response.
+const _conditional = new Map();  // url → { etag, data }
+
+async function fetchConditional(url) {
+    const kept = _conditional.get(url);
+    const resp = await fetch(url, kept ? { headers: { 'If-None-Match': kept.etag } } : {});
+    if (resp.status === 304 && kept) {
+        return { ok: true, status: 200, data: kept.data, changed: false };
+    }
+    if (!resp.ok) return { ok: false, status: resp.status, data: null, changed: true };
+    const data = await resp.json();
+    const etag = resp.headers.get('ETag');
+    if (etag) _conditional.set(url, { etag, data });
+    else _conditional.delete(url);
+    return { ok: true, status: resp.status, data, changed: true };
+}
+
 async function fetchValidActions() {
-    if (!S.gameId) return null;
+    if (!S.gameId) return { data: null, changed: true };
     try {
-        const resp = await fetch(`/v1/games/${S.gameId}/valid-actions`);
-        if (!resp.ok) return null;
-        return await resp.json();
+        const result = await fetchConditional(`/v1/games/${S.gameId}/valid-actions`);
+        return { data: result.ok ? result.data : null, changed: result.changed };
     } catch {
-        return null;
+        return { data: null, changed: true };
     }
 }
 
 async function refreshGame(quiet = false) {
     if (!quiet) clearError();
     try {
-        const [resp, validActions] = await Promise.all([
-            fetch(`/v1/games/${S.gameId}`),
+        const [resp, actions] = await Promise.all([
+            fetchConditional(`/v1/games/${S.gameId}`),
             fetchValidActions(),
         ]);
         if (resp.status === 401 || resp.status === 403) {
@@ -137,7 +156,13 @@ async function refreshGame(quiet = false) {
             showError('Failed to load game. Please refresh.');
             return;
         }
-        const game = await resp.json();
+        // Nothing new since the last render: leave the board as it is.
+        if (quiet && S.game && !resp.changed && !actions.changed) {
+            schedulePoll(S.game);
+            return;
+        }
+        const game = resp.data;
+        const validActions = actions.data;
         await resolvePlayerNames(game.players);
         S.game = game;
         S.validActions = validActions;
@@ -156,6 +181,7 @@ async function refreshGame(quiet = false) {
         }
         renderAll(game);
         schedulePoll(game);
+        if (game.status === 'ENDED') closeGameStream();
     } catch (e) {
         if (!quiet) showError('Network error loading game. Retrying…');
         console.error(e);
@@ -254,8 +280,9 @@ function schedulePoll(game) {
     if (!game || game.status !== 'STARTED') return;
     const gs = game.game_state || {};
     const myTurn = S.me && gs.player_turn === S.me.id;
-    // Poll when it's not our turn, or when an undo vote is pending (any player needs updates)
-    if (!myTurn || S.pendingUndo) {
+    // Poll when it's not our turn, or when an undo vote is pending (any player
+    // needs updates) — unless the event stream is telling us about changes.
+    if ((!myTurn || S.pendingUndo) && !S.streamLive) {
         S.pollTimer = setTimeout(() => refreshGame(true), 3000);
     }
 
@@ -268,6 +295,54 @@ function schedulePoll(game) {
     }
 }
 
+// The server sends a `game` event, carrying the game's state_version, when
+// the stream opens and whenever the game changes (moves, undo votes, players
+// joining...). We refetch only then; while the stream is down, EventSource
+// reconnects by itself and schedulePoll polls in the meantime.
+function openGameStream() {
+    if (S.stream || typeof EventSource === 'undefined') return;
+    const stream = new EventSource(`/v1/games/${S.gameId}/events`);
+    S.stream = stream;
+    stream.addEventListener('game', (ev) => {
+        if (!S.streamLive) {
+            S.streamLive = true;
+            if (S.pollTimer) clearTimeout(S.pollTimer);
+        }
+        let version = null;
+        try { version = JSON.parse(ev.data).state_version; } catch { /* refetch */ }
+        if (S.replayMode) return;  // exitReplay refetches
+        if (version !== null && S.game && version === S.game.state_version) return;
+        refreshFromStream();
+    });
+    stream.onerror = () => {
+        S.streamLive = false;
+        // CLOSED means the server refused the stream (e.g. logged out); poll from now on.
+        if (stream.readyState === EventSource.CLOSED) S.stream = null;
+        if (S.game) schedulePoll(S.game);
+    };
+}
+
+function closeGameStream() {
+    if (S.stream) S.stream.close();
+    S.stream = null;
+    S.streamLive = false;
+}
+
+// Bot turns arrive as a burst of events; fetch once for each burst rather
+// than once per event.
+async function refreshFromStream() {
+    if (S.refreshing) {
+        S.refreshAgain = true;
+        return;
+    }
+    do {
+        S.refreshAgain = false;
+        S.refreshing = refreshGame(true);
+        await S.refreshing;
+    } while (S.refreshAgain);
+    S.refreshing = null;
+}
+
 // ─────────────────────────────────────────────────────────────
 // Master render — dispatches to sub-renderers
 // ─────────────────────────────────────────────────────────────
@@ -827,6 +902,7 @@ async function joinGame() {
 
 function schedulePollLobby() {
     if (S.pollTimer) clearTimeout(S.pollTimer);
+    if (S.streamLive) return;
     S.pollTimer = setTimeout(() => refreshGame(true), 3000);
 }
 
@@ -970,9 +1046,9 @@ function renderBoard(game, gs, isReplay) {
     }
 
     // Bag visual + count
-    const bagContents = gs.bag_contents || [];
-    renderBagVisual(bagContents.length, isMyTurn, myState, gs);
-    el('gbBagCount').textContent = `Bag: ${bagContents.length}`;
+    const bagSize = gs.bag_size || 0;
+    renderBagVisual(bagSize, isMyTurn, myState, gs);
+    el('gbBagCount').textContent = `Bag: ${bagSize}`;
 
     // Deck sidebar count (face-down cards next to rows)
     const deckCount = el('gbDeckCount');
@@ -2178,9 +2254,9 @@ function renderUndoSection(game, isReplay) {
 async function refreshHistory() {
     if (!S.gameId) return;
     try {
-        const resp = await fetch(`/v1/games/${S.gameId}/history`);
-        if (!resp.ok) return;
-        const data = await resp.json();
+        const resp = await fetchConditional(`/v1/games/${S.gameId}/history`);
+        if (!resp.ok || !resp.changed) return;
+        const data = resp.data;
         S.historyMoves = data.moves || [];
         renderHistoryLog(S.historyMoves);
         buildReplayTurns(S.historyMoves);
@@ -2484,6 +2560,7 @@ function exitReplay() {
     if (S.game) {
         renderAll(S.game);
         schedulePoll(S.game);
+        if (S.streamLive) refreshGame(true);  // catch up on changes made while replaying
     }
 }
 
@@ -2585,14 +2662,69 @@ async function gameAction(action, body = null) {
         headers: body ? { 'Content-Type': 'application/json' } : {},
     };
     if (body) opts.body = JSON.stringify(body);
-    const resp = await fetch(`/v1/games/${S.gameId}/actions/${action}`, opts);
+    // Name the version we're showing, so the response can be a patch to it.
+    const base = S.game;
+    const since = base && base.state_version != null ? `?since=${base.state_version}` : '';
+    const resp = await fetch(`/v1/games/${S.gameId}/actions/${action}${since}`, opts);
     if (resp.status === 401 || resp.status === 403) {
         window.location.href = '/';
         throw new Error('Unauthorized');
     }
+    if (resp.ok && base) {
+        try {
+            adoptActionState(base, await resp.clone().json());
+        } catch (e) {
+            console.error(e);  // the caller's refreshGame fetches the game instead
+        }
+    }
     return resp;
 }
 
+// An action's response carries the state it produced: a JSON patch (RFC 6902)
+// to the version we sent, or the whole state if the server couldn't patch
+// from it. With the patch come the game's new ETag and pending undo, so the
+// patched game is kept as the body for the next conditional GET, which then
+// costs the server a 304. Nothing is kept if another refresh replaced the game
+// while the action was in flight.
+function adoptActionState(base, data) {
+    if (S.game !== base || data.state_version == null) return;
+    let gs;
+    if (data.game_state_patch) gs = applyPatch(base.game_state, data.game_state_patch);
+    else if (data.game_state) gs = data.game_state;
+    else return;
+    const game = { ...base, game_state: gs, state_version: data.state_version };
+    if ('pending_undo' in data) game.pending_undo = data.pending_undo;
+    S.game = game;
+    if (data.game_etag) {
+        _conditional.set(`/v1/games/${S.gameId}`, { etag: data.game_etag, data: game });
+    }
+}
+
+/** Return `doc` with the add/remove/replace operations of `patch` applied. */
+function applyPatch(doc, patch) {
+    const out = structuredClone(doc);
+    for (const op of patch) {
+        const tokens = op.path.split('/').slice(1)
+            .map(t => t.replace(/~1/g, '/').replace(/~0/g, '~'));
+        const last = tokens.pop();
+        let target = out;
+        for (const t of tokens) target = target[Array.isArray(target) ? Number(t) : t];
+        const key = Array.isArray(target) && last !== '-' ? Number(last) : last;
+        if (op.op === 'remove') {
+            if (Array.isArray(target)) target.splice(key, 1);
+            else delete target[key];
+        } else if (op.op === 'add' && Array.isArray(target)) {
+            if (key === '-') target.push(structuredClone(op.value));
+            else target.splice(key, 0, structuredClone(op.value));
+        } else if (op.op === 'add' || op.op === 'replace') {
+            target[key] = structuredClone(op.value);
+        } else {
+            throw new Error(`Unsupported patch operation ${op.op}`);
+        }
+    }
+    return out;
+}
+
 async function doWee(tile) {
     if (tile) tile.classList.add('is-busy');
     clearError();
@@ -3902,7 +4034,7 @@ function computeFallbackAvailableTypes(gs, myState) {
     const specSpiritTypes = (myState.cards || [])
         .filter(c => c.card_type === 'specialist' && c.spirit_type)
         .map(c => c.spirit_type);
-    const bagCount = (gs.bag_contents || []).length;
+    const bagCount = gs.bag_size || 0;
     const displayCount = (gs.open_display || []).length;
     const totalAvail = bagCount + displayCount;
     const takeCount = myState.take_count || 3;
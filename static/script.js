@@ -34,10 +34,6 @@ let myTurnCount = 0;
 let myGamesStatusFilter = 'NEW,STARTED';
 
 const PAGE_SIZE = 20;
-let myGamesPage = 1;
-let myGamesTotal = 0;
-let joinGamesPage = 1;
-let joinGamesTotal = 0;
 
 async function setUserHeader() {
     const response = await fetch('/userDetails')
@@ -219,14 +215,17 @@ function setMyGamesFilter(status) {
         btn.classList.toggle('active', isActive);
         btn.setAttribute('aria-selected', isActive);
     });
-    myGamesPage = 1;
-    loadMyGames(1, false);
+    loadMyGames(null, false);
 }
 
-async function loadMyGames(page, append = false) {
+// `cursor` is the previous page's next_cursor (null for the first page).
+async function loadMyGames(cursor, append = false) {
     if (!user) return;
     const list = document.getElementById('myGameList');
-    let url = `/v1/games?player_id=${encodeURIComponent(user.id)}&page=${page}&page_size=${PAGE_SIZE}`;
+    let url = `/v1/games?player_id=${encodeURIComponent(user.id)}&page_size=${PAGE_SIZE}`;
+    if (cursor) {
+        url += `&cursor=${encodeURIComponent(cursor)}`;
+    }
     if (myGamesStatusFilter) {
         url += `&status=${encodeURIComponent(myGamesStatusFilter)}`;
     }
@@ -236,8 +235,6 @@ async function loadMyGames(page, append = false) {
         return;
     }
     const data = await resp.json();
-    myGamesPage = page;
-    myGamesTotal = data.total;
 
     if (!append) {
         list.innerHTML = '';
@@ -255,24 +252,24 @@ async function loadMyGames(page, append = false) {
         });
     }
 
-    if (page * PAGE_SIZE < myGamesTotal) {
-        list.appendChild(_loadMoreItem(() => loadMyGames(page + 1, true)));
+    if (data.next_cursor) {
+        list.appendChild(_loadMoreItem(() => loadMyGames(data.next_cursor, true)));
     }
     updateNotificationBell();
 }
 
-async function loadJoinableGames(page, append = false) {
+async function loadJoinableGames(cursor, append = false) {
     const list = document.getElementById('joinGameList');
-    const resp = await fetch(
-        `/v1/games?status=NEW&page=${page}&page_size=${PAGE_SIZE}`
-    );
+    let url = `/v1/games?status=NEW&page_size=${PAGE_SIZE}`;
+    if (cursor) {
+        url += `&cursor=${encodeURIComponent(cursor)}`;
+    }
+    const resp = await fetch(url);
     if (!resp.ok) {
         showGameListError('Failed to load joinable games. Please refresh.');
         return;
     }
     const data = await resp.json();
-    joinGamesPage = page;
-    joinGamesTotal = data.total;
 
     if (!append) list.innerHTML = '';
     const existingMore = list.querySelector('.load-more-item');
@@ -289,8 +286,8 @@ async function loadJoinableGames(page, append = false) {
         joinable.forEach(g => list.appendChild(buildGameItem(g)));
     }
 
-    if (page * PAGE_SIZE < joinGamesTotal) {
-        list.appendChild(_loadMoreItem(() => loadJoinableGames(page + 1, true)));
+    if (data.next_cursor) {
+        list.appendChild(_loadMoreItem(() => loadJoinableGames(data.next_cursor, true)));
     }
 }
 
@@ -354,9 +351,6 @@ async function listGames() {
     listGamesInProgress = true;
     clearGameListError();
 
-    myGamesPage = 1;
-    joinGamesPage = 1;
-
     const mySection = document.getElementById('myGamesSection');
     const myList = document.getElementById('myGameList');
     const joinList = document.getElementById('joinGameList');
@@ -374,9 +368,9 @@ async function listGames() {
             mySection.classList.add('hidden');
         } else {
             mySection.classList.remove('hidden');
-            await loadMyGames(1, false);
+            await loadMyGames(null, false);
         }
-        await loadJoinableGames(1, false);
+        await loadJoinableGames(null, false);
         initialLoadDone = true;
     } catch (e) {
         console.error(e);
@@ -9,6 +9,10 @@ const state = {
     me:            null,   // current user {id, username}
     players:       {},     // map pid → {id, username}
     pollTimer:     null,
+    stream:        null,   // EventSource on /events while the game can change
+    streamLive:    false,  // stream connected, so no need to poll
+    refreshing:    null,   // in-flight refreshGame from a stream event
+    refreshAgain:  false,  // another event arrived while refreshing
     replayMode:    false,
     replayTurns:   [],     // list of turn numbers from history
     replayCursor:  -1,     // index into _replayTurns (-1 = live)
@@ -0,0 +1,60 @@
+-- Commit a game action in one round trip.
+--
+-- Previously GameManager._apply_action made three sequential calls: read the
+-- highest move_number for the turn, insert the game_moves row, then overwrite
+-- games.latest_state. Two concurrent actions could read the same move_number
+-- (one insert then fails on game_moves_unique_move) or interleave their
+-- latest_state writes.
+--
+-- commit_game_move does all three in one transaction. Locking the games row
+-- first serialises concurrent commits for the same game, so move_number
+-- allocation is race-free. Returns the inserted move record (the same columns
+-- get_game_moves selects), or NULL if the game does not exist.
+
+CREATE OR REPLACE FUNCTION commit_game_move(
+  game_id      uuid,
+  turn_number  integer,
+  player_id    uuid,
+  action       jsonb,
+  state_before jsonb,
+  latest_state jsonb,
+  ended        boolean
+) RETURNS jsonb LANGUAGE plpgsql SECURITY INVOKER AS $$
+DECLARE
+  next_move integer;
+  move      game_moves%ROWTYPE;
+BEGIN
+  PERFORM 1 FROM games g WHERE g.id = commit_game_move.game_id FOR UPDATE;
+  IF NOT FOUND THEN RETURN NULL; END IF;
+
+  SELECT COALESCE(MAX(m.move_number), 0) + 1 INTO next_move
+  FROM game_moves m
+  WHERE m.game_id = commit_game_move.game_id
+    AND m.turn_number = commit_game_move.turn_number;
+
+  INSERT INTO game_moves (game_id, turn_number, move_number, player_id, action, state_before)
+  VALUES (
+    commit_game_move.game_id,
+    commit_game_move.turn_number,
+    next_move,
+    commit_game_move.player_id,
+    commit_game_move.action,
+    commit_game_move.state_before
+  )
+  RETURNING * INTO move;
+
+  UPDATE games g SET
+    latest_state = commit_game_move.latest_state,
+    status       = CASE WHEN commit_game_move.ended THEN 'ENDED'::game_status ELSE g.status END
+  WHERE g.id = commit_game_move.game_id;
+
+  RETURN jsonb_build_object(
+    'id',          move.id,
+    'turn_number', move.turn_number,
+    'move_number', move.move_number,
+    'player_id',   move.player_id,
+    'action',      move.action,
+    'created_at',  move.created_at
+  );
+END;
+$$;
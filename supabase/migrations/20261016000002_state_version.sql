@@ -0,0 +1,87 @@
+-- Optimistic concurrency for games.latest_state.
+--
+-- state_version increases by one on every write to latest_state (enforced by
+-- a trigger, so every writer — the Python client, add/remove player RPCs,
+-- commit_game_move — bumps it). A writer that computed its new state from
+-- version N only succeeds while the row is still at version N; otherwise it
+-- gets a conflict instead of silently overwriting a concurrent move. This
+-- makes writes safe across several workers and instances, where the
+-- in-process GameManager._bot_processing guard cannot help.
+
+ALTER TABLE games ADD COLUMN IF NOT EXISTS state_version bigint NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION bump_state_version()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  NEW.state_version := OLD.state_version + 1;
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS games_bump_state_version ON games;
+CREATE TRIGGER games_bump_state_version
+  BEFORE UPDATE OF latest_state ON games
+  FOR EACH ROW EXECUTE FUNCTION bump_state_version();
+
+-- commit_game_move gains expected_version. On a version mismatch nothing is
+-- written and it returns {"conflict": true, "state_version": <current>};
+-- on success the returned move record carries the new state_version.
+DROP FUNCTION IF EXISTS commit_game_move(uuid, integer, uuid, jsonb, jsonb, jsonb, boolean);
+
+CREATE FUNCTION commit_game_move(
+  game_id          uuid,
+  turn_number      integer,
+  player_id        uuid,
+  action           jsonb,
+  state_before     jsonb,
+  latest_state     jsonb,
+  ended            boolean,
+  expected_version bigint
+) RETURNS jsonb LANGUAGE plpgsql SECURITY INVOKER AS $$
+DECLARE
+  current_version bigint;
+  new_version     bigint;
+  next_move       integer;
+  move            game_moves%ROWTYPE;
+BEGIN
+  SELECT g.state_version INTO current_version
+  FROM games g WHERE g.id = commit_game_move.game_id FOR UPDATE;
+  IF NOT FOUND THEN RETURN NULL; END IF;
+
+  IF current_version <> expected_version THEN
+    RETURN jsonb_build_object('conflict', true, 'state_version', current_version);
+  END IF;
+
+  SELECT COALESCE(MAX(m.move_number), 0) + 1 INTO next_move
+  FROM game_moves m
+  WHERE m.game_id = commit_game_move.game_id
+    AND m.turn_number = commit_game_move.turn_number;
+
+  INSERT INTO game_moves (game_id, turn_number, move_number, player_id, action, state_before)
+  VALUES (
+    commit_game_move.game_id,
+    commit_game_move.turn_number,
+    next_move,
+    commit_game_move.player_id,
+    commit_game_move.action,
+    commit_game_move.state_before
+  )
+  RETURNING * INTO move;
+
+  UPDATE games g SET
+    latest_state = commit_game_move.latest_state,
+    status       = CASE WHEN commit_game_move.ended THEN 'ENDED'::game_status ELSE g.status END
+  WHERE g.id = commit_game_move.game_id
+  RETURNING g.state_version INTO new_version;
+
+  RETURN jsonb_build_object(
+    'id',            move.id,
+    'turn_number',   move.turn_number,
+    'move_number',   move.move_number,
+    'player_id',     move.player_id,
+    'action',        move.action,
+    'created_at',    move.created_at,
+    'state_version', new_version
+  );
+END;
+$$;
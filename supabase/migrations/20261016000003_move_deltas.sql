@@ -0,0 +1,159 @@
+-- Delta-encoded move history with periodic keyframes.
+--
+-- Every game_moves row used to hold a complete state_before snapshot (deck,
+-- bag, every player's cards), so a long game stored hundreds of near-identical
+-- multi-KB documents. Now each row stores state_delta — the change its move
+-- made to the state (see app/state_delta.py for the format) — and only every
+-- KEYFRAME_EVERY-th row of a game (seq = 1, 21, 41, ...) keeps state_before.
+-- The state before any move is rebuilt from the nearest keyframe at or before
+-- it by applying the deltas of the rows in between.
+--
+-- seq numbers a game's moves 1, 2, 3, ... in (turn_number, move_number)
+-- order, so "rows between" is a simple range.
+
+ALTER TABLE game_moves ADD COLUMN IF NOT EXISTS seq integer;
+ALTER TABLE game_moves ADD COLUMN IF NOT EXISTS state_delta jsonb;
+ALTER TABLE game_moves ALTER COLUMN state_before DROP NOT NULL;
+
+UPDATE game_moves m SET seq = numbered.seq
+FROM (
+  SELECT id, row_number() OVER (
+    PARTITION BY game_id ORDER BY turn_number, move_number
+  ) AS seq
+  FROM game_moves
+) numbered
+WHERE m.id = numbered.id;
+
+ALTER TABLE game_moves ALTER COLUMN seq SET NOT NULL;
+ALTER TABLE game_moves
+    ADD CONSTRAINT game_moves_unique_seq UNIQUE (game_id, seq);
+
+-- ─── jsonb_state_diff ────────────────────────────────────────────────────────
+-- SQL twin of app.state_delta.diff_states, used to convert existing history.
+
+CREATE OR REPLACE FUNCTION jsonb_state_diff(old jsonb, new jsonb)
+RETURNS jsonb LANGUAGE plpgsql IMMUTABLE AS $$
+DECLARE
+  k      text;
+  sets   jsonb := '{}';
+  dels   jsonb := '[]';
+  subs   jsonb := '{}';
+  result jsonb := '{}';
+BEGIN
+  FOR k IN SELECT jsonb_object_keys(new) LOOP
+    IF NOT old ? k THEN
+      sets := sets || jsonb_build_object(k, new -> k);
+    ELSIF (old -> k) IS DISTINCT FROM (new -> k) THEN
+      IF jsonb_typeof(old -> k) = 'object' AND jsonb_typeof(new -> k) = 'object' THEN
+        subs := subs || jsonb_build_object(k, jsonb_state_diff(old -> k, new -> k));
+      ELSE
+        sets := sets || jsonb_build_object(k, new -> k);
+      END IF;
+    END IF;
+  END LOOP;
+  FOR k IN SELECT jsonb_object_keys(old) LOOP
+    IF NOT new ? k THEN
+      dels := dels || to_jsonb(k);
+    END IF;
+  END LOOP;
+
+  IF sets <> '{}' THEN result := result || jsonb_build_object('set', sets); END IF;
+  IF dels <> '[]' THEN result := result || jsonb_build_object('del', dels); END IF;
+  IF subs <> '{}' THEN result := result || jsonb_build_object('sub', subs); END IF;
+  RETURN result;
+END;
+$$;
+
+-- ─── Convert existing history ────────────────────────────────────────────────
+-- A move's effect is the difference between its state_before and the next
+-- move's (or, for a game's last move, the game's latest_state).
+
+UPDATE game_moves m SET state_delta = jsonb_state_diff(m.state_before, nxt.state_after)
+FROM (
+  SELECT gm.id, COALESCE(
+    lead(gm.state_before) OVER (PARTITION BY gm.game_id ORDER BY gm.seq),
+    g.latest_state
+  ) AS state_after
+  FROM game_moves gm JOIN games g ON g.id = gm.game_id
+) nxt
+WHERE m.id = nxt.id;
+
+UPDATE game_moves SET state_before = NULL WHERE (seq - 1) % 20 <> 0;
+
+ALTER TABLE game_moves ALTER COLUMN state_delta SET NOT NULL;
+
+-- ─── commit_game_move ────────────────────────────────────────────────────────
+-- Now takes the move's state_delta and the keyframe interval; state_before is
+-- only stored when the new row is a keyframe.
+
+DROP FUNCTION IF EXISTS commit_game_move(uuid, integer, uuid, jsonb, jsonb, jsonb, boolean, bigint);
+
+CREATE FUNCTION commit_game_move(
+  game_id          uuid,
+  turn_number      integer,
+  player_id        uuid,
+  action           jsonb,
+  state_before     jsonb,
+  state_delta      jsonb,
+  latest_state     jsonb,
+  ended            boolean,
+  expected_version bigint,
+  keyframe_every   integer
+) RETURNS jsonb LANGUAGE plpgsql SECURITY INVOKER AS $$
+DECLARE
+  current_version bigint;
+  new_version     bigint;
+  next_move       integer;
+  next_seq        integer;
+  move            game_moves%ROWTYPE;
+BEGIN
+  SELECT g.state_version INTO current_version
+  FROM games g WHERE g.id = commit_game_move.game_id FOR UPDATE;
+  IF NOT FOUND THEN RETURN NULL; END IF;
+
+  IF current_version <> expected_version THEN
+    RETURN jsonb_build_object('conflict', true, 'state_version', current_version);
+  END IF;
+
+  SELECT COALESCE(MAX(m.move_number), 0) + 1 INTO next_move
+  FROM game_moves m
+  WHERE m.game_id = commit_game_move.game_id
+    AND m.turn_number = commit_game_move.turn_number;
+
+  SELECT COALESCE(MAX(m.seq), 0) + 1 INTO next_seq
+  FROM game_moves m
+  WHERE m.game_id = commit_game_move.game_id;
+
+  INSERT INTO game_moves (
+    game_id, turn_number, move_number, seq, player_id, action, state_before, state_delta
+  )
+  VALUES (
+    commit_game_move.game_id,
+    commit_game_move.turn_number,
+    next_move,
+    next_seq,
+    commit_game_move.player_id,
+    commit_game_move.action,
+    CASE WHEN (next_seq - 1) % keyframe_every = 0 THEN commit_game_move.state_before END,
+    commit_game_move.state_delta
+  )
+  RETURNING * INTO move;
+
+  UPDATE games g SET
+    latest_state = commit_game_move.latest_state,
+    status       = CASE WHEN commit_game_move.ended THEN 'ENDED'::game_status ELSE g.status END
+  WHERE g.id = commit_game_move.game_id
+  RETURNING g.state_version INTO new_version;
+
+  RETURN jsonb_build_object(
+    'id',            move.id,
+    'turn_number',   move.turn_number,
+    'move_number',   move.move_number,
+    'seq',           move.seq,
+    'player_id',     move.player_id,
+    'action',        move.action,
+    'created_at',    move.created_at,
+    'state_version', new_version
+  );
+END;
+$$;
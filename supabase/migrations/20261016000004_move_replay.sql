@@ -0,0 +1,97 @@
+-- Replayable move history.
+--
+-- Each game_moves row now also records what is needed to re-run its move from
+-- the state before it (see app/replay.py):
+--
+--   params   — the arguments the action was called with, e.g. {"count": 2}
+--   outcomes — the random outcomes the move consumed, in order, as
+--              [kind, value] pairs: ["ingredient", "GIN"], ["special", "bitters"],
+--              ["card", "<card id>"]
+--
+-- A game's history is then its starting state (the first move's state_before)
+-- plus a short list of (params, outcomes) per move. Rows written before this
+-- migration have NULL in both columns and cannot be replayed; their deltas
+-- and keyframes still serve history as before.
+
+ALTER TABLE game_moves ADD COLUMN IF NOT EXISTS params jsonb;
+ALTER TABLE game_moves ADD COLUMN IF NOT EXISTS outcomes jsonb;
+
+-- ─── commit_game_move ────────────────────────────────────────────────────────
+-- Gains params and outcomes; otherwise unchanged.
+
+DROP FUNCTION IF EXISTS commit_game_move(uuid, integer, uuid, jsonb, jsonb, jsonb, jsonb, boolean, bigint, integer);
+
+CREATE FUNCTION commit_game_move(
+  game_id          uuid,
+  turn_number      integer,
+  player_id        uuid,
+  action           jsonb,
+  params           jsonb,
+  outcomes         jsonb,
+  state_before     jsonb,
+  state_delta      jsonb,
+  latest_state     jsonb,
+  ended            boolean,
+  expected_version bigint,
+  keyframe_every   integer
+) RETURNS jsonb LANGUAGE plpgsql SECURITY INVOKER AS $$
+DECLARE
+  current_version bigint;
+  new_version     bigint;
+  next_move       integer;
+  next_seq        integer;
+  move            game_moves%ROWTYPE;
+BEGIN
+  SELECT g.state_version INTO current_version
+  FROM games g WHERE g.id = commit_game_move.game_id FOR UPDATE;
+  IF NOT FOUND THEN RETURN NULL; END IF;
+
+  IF current_version <> expected_version THEN
+    RETURN jsonb_build_object('conflict', true, 'state_version', current_version);
+  END IF;
+
+  SELECT COALESCE(MAX(m.move_number), 0) + 1 INTO next_move
+  FROM game_moves m
+  WHERE m.game_id = commit_game_move.game_id
+    AND m.turn_number = commit_game_move.turn_number;
+
+  SELECT COALESCE(MAX(m.seq), 0) + 1 INTO next_seq
+  FROM game_moves m
+  WHERE m.game_id = commit_game_move.game_id;
+
+  INSERT INTO game_moves (
+    game_id, turn_number, move_number, seq, player_id, action, params, outcomes,
+    state_before, state_delta
+  )
+  VALUES (
+    commit_game_move.game_id,
+    commit_game_move.turn_number,
+    next_move,
+    next_seq,
+    commit_game_move.player_id,
+    commit_game_move.action,
+    commit_game_move.params,
+    commit_game_move.outcomes,
+    CASE WHEN (next_seq - 1) % keyframe_every = 0 THEN commit_game_move.state_before END,
+    commit_game_move.state_delta
+  )
+  RETURNING * INTO move;
+
+  UPDATE games g SET
+    latest_state = commit_game_move.latest_state,
+    status       = CASE WHEN commit_game_move.ended THEN 'ENDED'::game_status ELSE g.status END
+  WHERE g.id = commit_game_move.game_id
+  RETURNING g.state_version INTO new_version;
+
+  RETURN jsonb_build_object(
+    'id',            move.id,
+    'turn_number',   move.turn_number,
+    'move_number',   move.move_number,
+    'seq',           move.seq,
+    'player_id',     move.player_id,
+    'action',        move.action,
+    'created_at',    move.created_at,
+    'state_version', new_version
+  );
+END;
+$$;
@@ -0,0 +1,50 @@
+-- Lightweight game summaries for the lobby lists.
+--
+-- /v1/games only needs a few fields from each game's state, but used to read
+-- the whole latest_state (deck, bag, every player's cups and cards) for every
+-- game on a page. games.summary holds just those fields and is kept in step
+-- with latest_state by a trigger, so every writer maintains it:
+--
+--   {"turn_number": 12, "player_turn": "<uuid>", "winner": null,
+--    "points": {"<uuid>": 17, ...}, "game_modes": [...]}
+--
+-- The keys match the corresponding latest_state keys (app.game.game_summary
+-- is the Python twin).
+--
+-- The list is ordered newest first on (created_at, id); the index below lets
+-- a page after a given (created_at, id) cursor start with an index seek
+-- rather than an OFFSET scan over every earlier row.
+
+CREATE OR REPLACE FUNCTION game_summary(state jsonb)
+RETURNS jsonb LANGUAGE sql IMMUTABLE AS $$
+  SELECT jsonb_build_object(
+    'turn_number', state -> 'turn_number',
+    'player_turn', state -> 'player_turn',
+    'winner',      state -> 'winner',
+    'points',      COALESCE(
+      (SELECT jsonb_object_agg(p.key, p.value -> 'points')
+       FROM jsonb_each(state -> 'player_states') p),
+      '{}'::jsonb
+    ),
+    'game_modes',  COALESCE(state -> 'game_modes', '[]'::jsonb)
+  );
+$$;
+
+ALTER TABLE games ADD COLUMN IF NOT EXISTS summary jsonb;
+UPDATE games SET summary = game_summary(latest_state);
+ALTER TABLE games ALTER COLUMN summary SET NOT NULL;
+
+CREATE OR REPLACE FUNCTION set_game_summary()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  NEW.summary := game_summary(NEW.latest_state);
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS games_set_summary ON games;
+CREATE TRIGGER games_set_summary
+  BEFORE INSERT OR UPDATE OF latest_state ON games
+  FOR EACH ROW EXECUTE FUNCTION set_game_summary();
+
+CREATE INDEX IF NOT EXISTS idx_games_created_at_id ON games (created_at DESC, id DESC);
@@ -0,0 +1,12 @@
+-- Bump state_version when a game's players or status change too.
+--
+-- Each server process caches the games it has loaded and trusts an entry only
+-- while its state_version matches the row's (see app/game_cache.py). Joining
+-- and leaving a NEW game change players without touching latest_state, so
+-- until now they left the version alone and other processes kept serving the
+-- old player list. The version now tracks every column a cached game holds.
+
+DROP TRIGGER IF EXISTS games_bump_state_version ON games;
+CREATE TRIGGER games_bump_state_version
+  BEFORE UPDATE OF latest_state, players, status ON games
+  FOR EACH ROW EXECUTE FUNCTION bump_state_version();
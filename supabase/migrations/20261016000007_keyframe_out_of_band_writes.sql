@@ -0,0 +1,102 @@
+-- Keyframe the first move after a write of latest_state that was not a move.
+--
+-- Between keyframes a move's state_before is rebuilt by applying the deltas
+-- of the moves before it (see app/state_delta.py). That only holds while every
+-- write of latest_state is a move. When something else writes it between two
+-- moves (removing a player, tests setting up a position), the rebuild
+-- silently drops that write.
+--
+-- Each move now records the state_version it left the game at. If the game
+-- has been written since, the next move stores its state_before in full, so
+-- the chain restarts from what the game actually was. Rows from before this
+-- migration have no version, so each game's next move is a keyframe.
+
+ALTER TABLE game_moves ADD COLUMN IF NOT EXISTS state_version bigint;
+
+-- ─── commit_game_move ────────────────────────────────────────────────────────
+-- Same signature and result; writes the game first so the move can record
+-- the version it produced.
+
+CREATE OR REPLACE FUNCTION commit_game_move(
+  game_id          uuid,
+  turn_number      integer,
+  player_id        uuid,
+  action           jsonb,
+  params           jsonb,
+  outcomes         jsonb,
+  state_before     jsonb,
+  state_delta      jsonb,
+  latest_state     jsonb,
+  ended            boolean,
+  expected_version bigint,
+  keyframe_every   integer
+) RETURNS jsonb LANGUAGE plpgsql SECURITY INVOKER AS $$
+DECLARE
+  current_version bigint;
+  last_version    bigint;
+  new_version     bigint;
+  next_move       integer;
+  next_seq        integer;
+  move            game_moves%ROWTYPE;
+BEGIN
+  SELECT g.state_version INTO current_version
+  FROM games g WHERE g.id = commit_game_move.game_id FOR UPDATE;
+  IF NOT FOUND THEN RETURN NULL; END IF;
+
+  IF current_version <> expected_version THEN
+    RETURN jsonb_build_object('conflict', true, 'state_version', current_version);
+  END IF;
+
+  SELECT COALESCE(MAX(m.move_number), 0) + 1 INTO next_move
+  FROM game_moves m
+  WHERE m.game_id = commit_game_move.game_id
+    AND m.turn_number = commit_game_move.turn_number;
+
+  SELECT m.seq, m.state_version INTO next_seq, last_version
+  FROM game_moves m
+  WHERE m.game_id = commit_game_move.game_id
+  ORDER BY m.seq DESC
+  LIMIT 1;
+  next_seq := COALESCE(next_seq, 0) + 1;
+
+  UPDATE games g SET
+    latest_state = commit_game_move.latest_state,
+    status       = CASE WHEN commit_game_move.ended THEN 'ENDED'::game_status ELSE g.status END
+  WHERE g.id = commit_game_move.game_id
+  RETURNING g.state_version INTO new_version;
+
+  INSERT INTO game_moves (
+    game_id, turn_number, move_number, seq, player_id, action, params, outcomes,
+    state_before, state_delta, state_version
+  )
+  VALUES (
+    commit_game_move.game_id,
+    commit_game_move.turn_number,
+    next_move,
+    next_seq,
+    commit_game_move.player_id,
+    commit_game_move.action,
+    commit_game_move.params,
+    commit_game_move.outcomes,
+    CASE
+      WHEN (next_seq - 1) % keyframe_every = 0
+        OR last_version IS DISTINCT FROM current_version
+      THEN commit_game_move.state_before
+    END,
+    commit_game_move.state_delta,
+    new_version
+  )
+  RETURNING * INTO move;
+
+  RETURN jsonb_build_object(
+    'id',            move.id,
+    'turn_number',   move.turn_number,
+    'move_number',   move.move_number,
+    'seq',           move.seq,
+    'player_id',     move.player_id,
+    'action',        move.action,
+    'created_at',    move.created_at,
+    'state_version', new_version
+  );
+END;
+$$;
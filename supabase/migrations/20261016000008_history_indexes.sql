@@ -0,0 +1,36 @@
+-- Composite and covering indexes for the move-history queries.
+--
+-- Every history query filters game_moves by game_id and then by turn or seq:
+--
+--   get_game_moves         (game_id) ORDER BY turn_number, move_number
+--   get_state_before_turn  (game_id, turn_number) ORDER BY move_number LIMIT 1
+--   get_max_turn_number    (game_id) ORDER BY turn_number DESC LIMIT 1
+--   commit_game_move       MAX(move_number) for (game_id, turn_number);
+--                          the last seq for (game_id)
+--   _rebuild_state_before  the nearest keyframe at or before a seq, then the
+--                          deltas in a seq range
+--
+-- The unique constraints on (game_id, turn_number, move_number) and
+-- (game_id, seq) already order them. This migration:
+--
+-- * makes game_moves_unique_move covering for get_game_moves, so listing a
+--   game's history is an index-only scan that never visits the heap rows
+--   holding state_before and state_delta. action is at most about half a KB
+--   (the btree limit is ~2.7 KB per entry);
+-- * adds a partial index of keyframes, so finding the nearest one reads one
+--   entry instead of walking back over up to KEYFRAME_EVERY rows;
+-- * drops idx_game_moves_game_id, whose lookups both composite indexes serve.
+--
+-- scripts/explain_history_queries.py checks the plans against a seeded
+-- database.
+
+ALTER TABLE game_moves DROP CONSTRAINT IF EXISTS game_moves_unique_move;
+ALTER TABLE game_moves
+    ADD CONSTRAINT game_moves_unique_move UNIQUE (game_id, turn_number, move_number)
+    INCLUDE (id, player_id, action, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_game_moves_keyframes
+    ON game_moves (game_id, seq)
+    WHERE state_before IS NOT NULL;
+
+DROP INDEX IF EXISTS idx_game_moves_game_id;
@@ -0,0 +1,85 @@
+-- Cold archive for the history of finished games.
+--
+-- A finished game kept its initial_state and every game_moves row (deltas,
+-- keyframes, params, outcomes) forever, so the hot tables grew with every game
+-- ever played. Once a game has been ENDED for the retention window
+-- (ARCHIVE_AFTER_DAYS), the archival job (scripts/archive_games.py) packs
+-- that history into one zlib-compressed blob in game_archives and deletes the
+-- rows. The history endpoints read archived games from the blob (see
+-- app/archive.py). The games row stays, with latest_state and summary.
+--
+--   games.ended_at    — when the game became ENDED, set by a trigger
+--   games.archived_at — when its history moved to game_archives
+
+ALTER TABLE games ADD COLUMN IF NOT EXISTS ended_at timestamptz;
+ALTER TABLE games ADD COLUMN IF NOT EXISTS archived_at timestamptz;
+
+-- Games that ended before this migration: their last move, or their creation.
+UPDATE games g SET ended_at = COALESCE(
+  (SELECT max(m.created_at) FROM game_moves m WHERE m.game_id = g.id),
+  g.created_at
+)
+WHERE g.status = 'ENDED' AND g.ended_at IS NULL;
+
+CREATE OR REPLACE FUNCTION set_game_ended_at() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  IF NEW.status = 'ENDED' AND OLD.status IS DISTINCT FROM 'ENDED' THEN
+    NEW.ended_at := now();
+  END IF;
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS games_set_ended_at ON games;
+CREATE TRIGGER games_set_ended_at
+  BEFORE UPDATE OF status ON games
+  FOR EACH ROW EXECUTE FUNCTION set_game_ended_at();
+
+-- What the archival job looks for; stays small, since archived games leave it.
+CREATE INDEX IF NOT EXISTS idx_games_archivable
+  ON games (ended_at)
+  WHERE status = 'ENDED' AND archived_at IS NULL;
+
+CREATE TABLE IF NOT EXISTS game_archives (
+  game_id     uuid        PRIMARY KEY REFERENCES games(id) ON DELETE CASCADE,
+  history     bytea       NOT NULL,
+  move_count  integer     NOT NULL,
+  archived_at timestamptz NOT NULL DEFAULT now()
+);
+
+-- The blob is already compressed.
+ALTER TABLE game_archives ALTER COLUMN history SET STORAGE EXTERNAL;
+
+-- ─── archive_game ────────────────────────────────────────────────────────────
+-- Swaps a game's hot history for its archive blob in one transaction. Returns
+-- false, changing nothing, unless the game is still ENDED and unarchived and
+-- has exactly move_count moves (the ones the caller packed).
+
+CREATE OR REPLACE FUNCTION archive_game(
+  game_id    uuid,
+  history    bytea,
+  move_count integer
+) RETURNS boolean LANGUAGE plpgsql SECURITY INVOKER AS $$
+DECLARE
+  game games%ROWTYPE;
+BEGIN
+  SELECT * INTO game FROM games g WHERE g.id = archive_game.game_id FOR UPDATE;
+  IF NOT FOUND OR game.status <> 'ENDED' OR game.archived_at IS NOT NULL THEN
+    RETURN false;
+  END IF;
+  IF (SELECT count(*) FROM game_moves m WHERE m.game_id = archive_game.game_id)
+     <> archive_game.move_count THEN
+    RETURN false;
+  END IF;
+
+  INSERT INTO game_archives (game_id, history, move_count)
+  VALUES (archive_game.game_id, archive_game.history, archive_game.move_count);
+  DELETE FROM game_moves m WHERE m.game_id = archive_game.game_id;
+  DELETE FROM undo_requests u WHERE u.game_id = archive_game.game_id;
+  -- Neither column bumps state_version, so cached copies of the game stay valid.
+  UPDATE games g SET initial_state = NULL, archived_at = now()
+  WHERE g.id = archive_game.game_id;
+  RETURN true;
+END;
+$$;
@@ -1,33 +1,29 @@
 """Shared pytest configuration for all tests.
 
-Test files are split into two groups:
+Test files are split into three groups:
 
 * **Pure** tests that exercise game logic only — they pass without Supabase.
-* **Supabase-dependent** tests that import modules which talk to the database
-  at import time (e.g. ``app.api`` initialises ``JWTHandler``, which registers
-  a signing key) or that exercise the API/UI end-to-end.
+* **Database** tests that import modules which talk to the database at import
+  time (e.g. ``app.api`` initialises ``JWTHandler``, which registers a signing
+  key) or that exercise the API end-to-end through ``app.db.db``.
+* **Supabase-only** tests that reach past the storage interface into the
+  Supabase client, or drive the UI against a running stack.
 
-When Supabase is running locally, all tests collect and run as before. When
-it isn't, the Supabase-dependent files are skipped at collection time so
-``pytest`` still gives fast feedback on the rest. CI starts Supabase before
-running tests, so coverage there is unchanged.
+When Supabase is running locally, all tests collect and run against it. When
+it isn't, the database tests run against the in-memory storage backend
+(``STORAGE_BACKEND=memory``, see app.sqlite_db) and only the Supabase-only
+files are skipped at collection time. CI starts Supabase before running
+tests, so coverage there is unchanged.
 """
 
 import json
 import os
 import subprocess
 
-# Files that require a live Supabase to even import or instantiate. These are
-# skipped when Supabase isn't reachable from this environment.
-_SUPABASE_DEPENDENT_FILES = {
-    "test_api.py",
-    "test_push_api.py",
-    "test_user_management.py",
-    "test_user_manager.py",
-    "test_jwt_handler.py",
-    "test_theme_bdd.py",
-    "test_game_manager.py",
-    "test_game_actions_bdd.py",
+# Files that need a live Supabase itself, not just a storage backend. These
+# are skipped when Supabase isn't reachable from this environment.
+_SUPABASE_ONLY_FILES = {
+    "test_user_management.py",  # grants admin through db.supabase
 }
 
 SUPABASE_AVAILABLE = False
@@ -36,6 +32,9 @@ SUPABASE_AVAILABLE = False
 def pytest_configure(config):
     """Detect Supabase and populate env vars; never raise."""
     global SUPABASE_AVAILABLE
+    # Bots play inside the call that hands them the turn, so tests can check
+    # their moves as soon as it returns (see app.bot_jobs).
+    os.environ.setdefault("BOT_JOBS", "inline")
     config.addinivalue_line(
         "markers",
         "requires_supabase: test needs a running Supabase stack",
@@ -57,22 +56,23 @@ def pytest_configure(config):
         os.environ["SUPABASE_KEY"] = status["SECRET_KEY"]
         SUPABASE_AVAILABLE = True
     except Exception:
-        # No Supabase available: set placeholders so module imports that
-        # construct supabase.Client at module scope don't error out, and let
-        # pytest_ignore_collect skip the dependent files.
+        # No Supabase available: keep everything in memory, set placeholders
+        # in case a test constructs a supabase.Client itself, and let
+        # pytest_ignore_collect skip the Supabase-only files.
+        os.environ.setdefault("STORAGE_BACKEND", "memory")
         os.environ.setdefault("SUPABASE_URL", "http://placeholder.invalid")
         os.environ.setdefault("SUPABASE_KEY", "placeholder")
         SUPABASE_AVAILABLE = False
 
 
 def pytest_ignore_collect(collection_path, config):
-    """Skip Supabase-dependent files when Supabase isn't available."""
+    """Skip Supabase-only files when Supabase isn't available."""
     if SUPABASE_AVAILABLE:
         return False
     parts = collection_path.parts
     if "ui" in parts:
         return True
-    return collection_path.name in _SUPABASE_DEPENDENT_FILES
+    return collection_path.name in _SUPABASE_ONLY_FILES
 
 
 def pytest_collection_modifyitems(config, items):
@@ -92,6 +92,7 @@ def pytest_report_header(config):
     if SUPABASE_AVAILABLE:
         return "supabase: available — all tests will run"
     return (
-        "supabase: NOT available — Supabase-dependent files skipped "
+        "supabase: NOT available — database tests use the in-memory backend, "
+        "Supabase-only files skipped "
         "(start it with `supabase start` to run the full suite)"
     )
@@ -4,6 +4,9 @@ import sys
 import os
 import unittest
 import time
+import base64
+import json
+import uuid
 
 # Add the app directory to the path so we can import the modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
@@ -119,6 +122,64 @@ class TestAPI(unittest.TestCase):
         player_ids_in_results = [pid for g in data["games"] for pid in g["players"]]
         self.assertIn(user_id, player_ids_in_results)
 
+    def test_list_games_cursor_pages(self):
+        """next_cursor continues the list where the previous page ended."""
+        for _ in range(3):
+            self._register_and_create_game()
+        first = self.client.get("/v1/games?page_size=2").json()
+        self.assertIsNotNone(first["next_cursor"])
+        second = self.client.get(
+            f"/v1/games?page_size=2&cursor={first['next_cursor']}"
+        ).json()
+        self.assertIsNone(second["total"])
+        first_ids = {g["id"] for g in first["games"]}
+        self.assertFalse(first_ids & {g["id"] for g in second["games"]})
+        both = self.client.get("/v1/games?page_size=4").json()
+        self.assertEqual(
+            [g["id"] for g in both["games"]],
+            [g["id"] for g in first["games"] + second["games"]][:4],
+        )
+
+    def test_list_games_returns_summaries(self):
+        """Listed games carry a state summary, not the full state."""
+        self._register_and_create_game()
+        data = self.client.get("/v1/games?page_size=1").json()
+        summary = data["games"][0]["game_state"]
+        self.assertEqual(
+            set(summary),
+            {"turn_number", "player_turn", "winner", "points", "game_modes"},
+        )
+
+    def test_list_games_invalid_cursor(self):
+        """A malformed cursor returns 400."""
+        response = self.client.get("/v1/games?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("error", response.json())
+
+    def test_list_games_cursor_with_a_filter_in_its_timestamp(self):
+        """A cursor whose created_at isn't a timestamp returns 400."""
+        created_at = (
+            '2026-01-01",id.gt.00000000-0000-0000-0000-000000000000,and(id.eq."1'
+        )
+        raw = json.dumps([created_at, str(uuid.uuid4())])
+        cursor = base64.urlsafe_b64encode(raw.encode()).decode()
+        response = self.client.get(f"/v1/games?cursor={cursor}")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "Invalid cursor"})
+
+    def _register_and_create_game(self):
+        timestamp = int(time.time() * 1000000)
+        user_data = {
+            "username": f"listuser{timestamp}",
+            "email": f"listuser{timestamp}@example.com",
+            "password": "password123",
+        }
+        reg = self.client.post("/register", json=user_data)
+        self.assertEqual(reg.status_code, 201)
+        token = reg.cookies.get("userjwt")
+        resp = self.client.post("/v1/games", cookies={"userjwt": token})
+        self.assertEqual(resp.status_code, 200)
+
     def test_create_game_requires_auth(self):
         """Test creating a game requires authentication."""
         response = self.client.post("/v1/games")
@@ -0,0 +1,107 @@
+"""Tests for archiving finished games' history (app.archive).
+
+Bots play real games against the in-memory SQLite backend; the history read
+back after archiving must match what was served from the hot tables. Pure
+game-logic tests — no Supabase required.
+"""
+
+import random
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+from uuid import UUID
+
+from app.bot_jobs import InlineBotJobs
+from app.game import Game
+from app.gameManager import GameManager
+from app.GameState import GameState
+from app.sqlite_db import SqliteDb
+from app.user import User
+
+
+def _ended_bot_game(db: SqliteDb, seed: int = 1) -> UUID:
+    random.seed(seed)
+    players = []
+    for i, strategy in enumerate(["mastermind", "random"]):
+        bot = User(f"bot{seed}x{i}", f"bot{seed}x{i}@example.com", "Password1")
+        bot.is_bot, bot.bot_strategy = True, strategy
+        db.add_user(bot)
+        players.append(bot.id)
+    game = Game.new_game(players[0])
+    db.create_game(game)
+    db.add_player_to_game(game.id, players[1])
+    db.start_game(game.id, GameState.start_game(players, seed=seed))
+    with (
+        patch("app.gameManager.db", db),
+        patch("app.bot_player.db", db),
+        patch("app.gameManager.bot_jobs", InlineBotJobs()),
+    ):
+        for _ in range(60):
+            if db.get_game(game.id).game_state.winner is not None:
+                break
+            GameManager()._schedule_bot_turns(game.id)
+    assert db.get_game(game.id).game_state.winner is not None
+    return game.id
+
+
+def _history(db: SqliteDb, game_id: UUID) -> dict:
+    turns = db.get_game(game_id).game_state.turn_number
+    return {
+        "moves": db.get_game_moves(game_id),
+        "states": [db.get_state_at_turn(game_id, t) for t in range(turns + 2)],
+        "replay": db.get_replay_data(game_id),
+    }
+
+
+def _later() -> str:
+    return (datetime.now(UTC) + timedelta(seconds=1)).isoformat()
+
+
+def test_archived_history_reads_back_the_same():
+    db = SqliteDb()
+    game_id = _ended_bot_game(db)
+    before = _history(db, game_id)
+
+    assert db.get_archivable_games(_later()) == [game_id]
+    assert db.archive_game(game_id)
+
+    assert db._all("SELECT id FROM game_moves") == []
+    assert db._one("SELECT initial_state FROM games")["initial_state"] is None
+    assert _history(db, game_id) == before
+    with patch("app.gameManager.db", db):
+        assert GameManager().verify_history(game_id) == []
+
+
+def test_archive_is_smaller_than_the_rows_it_replaces():
+    db = SqliteDb()
+    game_id = _ended_bot_game(db)
+    hot = db._one(
+        "SELECT SUM(LENGTH(state_before)) + SUM(LENGTH(state_delta))"
+        " + SUM(LENGTH(action)) AS n FROM game_moves"
+    )["n"]
+
+    db.archive_game(game_id)
+
+    assert len(db.get_archived_history(game_id)) < hot / 4
+
+
+def test_only_games_ended_before_the_cutoff_are_archived():
+    db = SqliteDb()
+    game_id = _ended_bot_game(db)
+    earlier = (datetime.now(UTC) - timedelta(days=1)).isoformat()
+
+    assert db.get_archivable_games(earlier) == []
+    assert db.archive_game(game_id)
+    assert db.get_archivable_games(_later()) == []
+    assert not db.archive_game(game_id)
+
+
+def test_games_still_in_play_are_not_archived():
+    db = SqliteDb()
+    host = User("alice", "alice@example.com", "Password1")
+    db.add_user(host)
+    game = Game.new_game(host.id)
+    db.create_game(game)
+
+    assert db.get_archivable_games(_later()) == []
+    assert not db.archive_game(game.id)
+    assert db.get_archived_history(game.id) is None
@@ -0,0 +1,54 @@
+"""Tests for awaiting Db calls from async handlers (app.async_db).
+
+AsyncDb wraps a stand-in for Db whose calls block like network round trips.
+Pure game-logic tests — no Supabase required.
+"""
+
+import asyncio
+import threading
+import time
+
+from app.async_db import AsyncDb
+
+
+class _SlowDb:
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.threads: set[str] = set()
+
+    def get_game(self, game_id, validate=True):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.seconds)
+        return {"id": game_id, "validate": validate}
+
+
+def test_methods_become_awaitable_and_run_off_the_event_loop():
+    slow = _SlowDb(0)
+    adb = AsyncDb(slow, workers=2)
+
+    async def main():
+        return await adb.get_game("g1", validate=False)
+
+    assert asyncio.run(main()) == {"id": "g1", "validate": False}
+    assert slow.threads and threading.current_thread().name not in slow.threads
+
+
+def test_blocking_calls_overlap_up_to_the_pool_size():
+    adb = AsyncDb(_SlowDb(0.2), workers=4)
+
+    async def main():
+        start = time.perf_counter()
+        await asyncio.gather(*(adb.get_game(i) for i in range(4)))
+        return time.perf_counter() - start
+
+    # Four 0.2 s calls one after another would take 0.8 s.
+    assert asyncio.run(main()) < 0.6
+
+
+def test_run_takes_any_callable():
+    adb = AsyncDb(_SlowDb(0))
+
+    async def main():
+        return await adb.run(sorted, [3, 1, 2], reverse=True)
+
+    assert asyncio.run(main()) == [3, 2, 1]
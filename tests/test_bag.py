@@ -0,0 +1,117 @@
+"""Tests for the counted ingredient bag.
+
+Pure game-logic tests — no Supabase required.
+"""
+
+import random
+from collections import Counter
+from uuid import uuid4
+
+import pytest
+
+from app.bag import Bag
+from app.GameState import GameState
+from app.Ingredient import Ingredient
+
+# Chi-square critical values at p = 0.001, keyed by degrees of freedom.
+_CHI2_CRITICAL = {2: 13.82, 3: 16.27}
+
+
+def _chi_square(observed: Counter, expected: dict, trials: int) -> float:
+    return sum(
+        (observed[k] - p * trials) ** 2 / (p * trials) for k, p in expected.items()
+    )
+
+
+def test_single_draw_matches_choice_on_the_equivalent_list():
+    tokens = (
+        [Ingredient.GIN]
+        + [Ingredient.RUM] * 3
+        + [Ingredient.SPECIAL] * 6
+        + [Ingredient.COLA] * 10
+    )
+    bag = Bag(tokens)
+    expected = {ing: n / len(tokens) for ing, n in Counter(tokens).items()}
+
+    rng = random.Random(1234)
+    trials = 20_000
+    observed = Counter(bag.copy().draw(rng) for _ in range(trials))
+
+    assert set(observed) == set(expected)
+    assert _chi_square(observed, expected, trials) < _CHI2_CRITICAL[3]
+
+
+def test_draws_without_replacement_match_sequential_choice():
+    # Ordered pairs from {GIN, RUM, RUM}: each of GR, RG, RR has probability 1/3.
+    rng = random.Random(99)
+    trials = 15_000
+    observed = Counter()
+    for _ in range(trials):
+        bag = Bag([Ingredient.GIN, Ingredient.RUM, Ingredient.RUM])
+        observed[(bag.draw(rng), bag.draw(rng))] += 1
+    expected = {
+        (Ingredient.GIN, Ingredient.RUM): 1 / 3,
+        (Ingredient.RUM, Ingredient.GIN): 1 / 3,
+        (Ingredient.RUM, Ingredient.RUM): 1 / 3,
+    }
+
+    assert set(observed) == set(expected)
+    assert _chi_square(observed, expected, trials) < _CHI2_CRITICAL[2]
+
+
+def test_list_like_operations():
+    bag = Bag([Ingredient.VODKA, Ingredient.GIN, Ingredient.VODKA])
+    bag.append(Ingredient.SODA)
+    bag.extend([Ingredient.GIN])
+    bag.remove(Ingredient.VODKA)
+
+    assert len(bag) == 4
+    assert bag.count(Ingredient.GIN) == 2
+    assert Ingredient.SODA in bag and Ingredient.RUM not in bag
+    assert bag == [Ingredient.SODA, Ingredient.GIN, Ingredient.VODKA, Ingredient.GIN]
+    assert list(bag) == [
+        Ingredient.GIN,
+        Ingredient.GIN,
+        Ingredient.VODKA,
+        Ingredient.SODA,
+    ]
+    with pytest.raises(ValueError):
+        bag.remove(Ingredient.RUM)
+
+    rng = random.Random(0)
+    drawn = [bag.draw(rng) for _ in range(4)]
+    assert Counter(drawn) == {
+        Ingredient.GIN: 2,
+        Ingredient.VODKA: 1,
+        Ingredient.SODA: 1,
+    }
+    assert not bag
+    with pytest.raises(IndexError):
+        bag.draw(rng)
+
+
+def test_bag_serialises_as_a_list_of_names():
+    gs = GameState.start_game([uuid4(), uuid4()])
+    data = gs.to_dict()
+
+    assert len(data["bag_contents"]) == 50 - 5
+    assert all(isinstance(name, str) for name in data["bag_contents"])
+    assert GameState.from_dict(data).bag_contents == gs.bag_contents
+
+    legacy = dict(data, bag_contents=["RUM", "GIN", "RUM"])
+    assert GameState.from_dict(legacy).bag_contents.count(Ingredient.RUM) == 2
+
+
+def test_only_the_bag_is_counted_display_and_bladder_keep_their_order():
+    gs = GameState.start_game([uuid4(), uuid4()], seed=4)
+    ps = gs.player_states[gs.player_turn]
+
+    gs.open_display = [Ingredient.SODA, Ingredient.GIN, Ingredient.SODA]
+    ps.bladder = [Ingredient.RUM, Ingredient.GIN, Ingredient.RUM]
+    restored = GameState.from_dict(gs.to_dict())
+
+    assert isinstance(gs.bag_contents, Bag)
+    assert gs.to_dict()["open_display"] == ["SODA", "GIN", "SODA"]
+    assert restored.open_display == gs.open_display
+    assert restored.player_states[ps.player_id].bladder == ps.bladder
+    assert not hasattr(gs, "__dict__") and not hasattr(ps, "__dict__")
@@ -0,0 +1,179 @@
+"""Tests for playing bot turns in the background (app.bot_jobs).
+
+Pure game-logic tests — no Supabase required.
+"""
+
+import threading
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app import bot_player
+from app.bot_jobs import BotJobs, InlineBotJobs, ThreadBotJobs
+from app.game import Game
+from app.gameManager import GameManager
+from app.GameState import GameState
+from app.Ingredient import Ingredient
+from app.sqlite_db import SqliteDb
+from app.user import User
+
+WAIT = 5  # seconds; only reached if something is broken
+
+
+def test_a_games_jobs_run_one_at_a_time_and_coalesce():
+    jobs = ThreadBotJobs(workers=2)
+    slow, fast = uuid4(), uuid4()
+    release = threading.Event()
+    runs = []
+
+    def blocked():
+        runs.append("slow")
+        release.wait(WAIT)
+
+    jobs.submit(slow, blocked)
+    jobs.submit(fast, lambda: runs.append("fast"))
+    while len(runs) < 2:  # the other game isn't held up
+        threading.Event().wait(0.01)
+    for _ in range(3):
+        jobs.submit(slow, lambda: runs.append("again"))
+    assert jobs.stats()["running"] == 1
+    release.set()
+
+    assert jobs.drain(WAIT)
+    assert sorted(runs) == ["again", "fast", "slow"]
+    stats = jobs.stats()
+    assert (stats["queued"], stats["running"], stats["wait"]["count"]) == (0, 0, 2)
+
+
+def test_a_jobs_own_submissions_are_ignored():
+    jobs = ThreadBotJobs(workers=1)
+    game_id = uuid4()
+    runs = []
+
+    def job():
+        runs.append(1)
+        jobs.submit(game_id, job)  # as a bot's own move does
+
+    jobs.submit(game_id, job)
+    assert jobs.drain(WAIT)
+    assert runs == [1]
+
+
+def test_a_full_queue_drops_the_job_until_the_game_is_submitted_again(caplog):
+    jobs = ThreadBotJobs(workers=1, depth=1)
+    release = threading.Event()
+    started = threading.Event()
+    queued, dropped = uuid4(), uuid4()
+    runs = []
+
+    jobs.submit(uuid4(), lambda: (started.set(), release.wait(WAIT)))
+    started.wait(WAIT)
+    jobs.submit(queued, lambda: runs.append("queued"))
+    jobs.submit(dropped, lambda: runs.append("dropped"))
+
+    assert runs == [] and "Bot queue full" in caplog.text
+    assert jobs.was_dropped(dropped) and not jobs.was_dropped(queued)
+    assert jobs.stats()["dropped"] == 1
+    release.set()
+    assert jobs.drain(WAIT)
+    assert runs == ["queued"]
+
+    jobs.submit(dropped, lambda: runs.append("dropped"))
+    assert jobs.drain(WAIT)
+    assert runs == ["queued", "dropped"] and not jobs.was_dropped(dropped)
+
+
+def test_a_backend_must_implement_submit():
+    class Incomplete(BotJobs):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_inline_jobs_run_before_submit_returns_and_log_failures(caplog):
+    jobs = InlineBotJobs()
+    game_id = uuid4()
+    runs = []
+
+    def job():
+        runs.append(1)
+        jobs.submit(game_id, job)
+        raise RuntimeError("boom")
+
+    jobs.submit(game_id, job)
+    assert runs == [1]
+    assert "Error processing bot turns" in caplog.text
+
+
+def _human_then_bot(db: SqliteDb) -> tuple[Game, User, User]:
+    """A game on the human's turn, who can go for a wee; the bot is next."""
+    human = User("human", "human@example.com", "Password1")
+    bot = User("bot", "bot@example.com", "Password1")
+    bot.is_bot, bot.bot_strategy = True, "random"
+    for user in (human, bot):
+        db.add_user(user)
+    game = Game.new_game(human.id)
+    db.create_game(game)
+    db.add_player_to_game(game.id, bot.id)
+    state = GameState.start_game([human.id, bot.id], seed=2)
+    state.turn_order = [human.id, bot.id]
+    state.player_turn = human.id
+    state.player_states[human.id].bladder = [Ingredient.VODKA]
+    db.start_game(game.id, state)
+    return db.get_game(game.id), human, bot
+
+
+def test_a_human_move_returns_before_the_bot_plays():
+    db = SqliteDb()
+    game, human, bot = _human_then_bot(db)
+    jobs = ThreadBotJobs(workers=1)
+    release = threading.Event()
+    play = bot_player.process_bot_turns
+
+    def held(manager, game_id):
+        release.wait(WAIT)
+        play(manager, game_id)
+
+    with (
+        patch("app.gameManager.db", db),
+        patch("app.bot_player.db", db),
+        patch("app.gameManager.bot_jobs", jobs),
+        patch("app.bot_player.bot_jobs", jobs),
+        patch("app.gameManager.process_bot_turns", held),
+    ):
+        manager = GameManager()
+        state, _ = manager.go_for_a_wee(game, human.id)
+        assert state.player_turn == bot.id
+        assert db.get_game(game.id).game_state.player_turn == bot.id
+        release.set()
+        assert jobs.drain(WAIT)
+
+    assert db.get_game(game.id).game_state.player_turn == human.id
+    stats = jobs.stats()
+    assert stats["wait"]["count"] == 1 and stats["turn"]["count"] == 1
+
+
+def test_a_dropped_game_is_resubmitted_when_read():
+    db = SqliteDb()
+    game, human, bot = _human_then_bot(db)
+    jobs = ThreadBotJobs(workers=1, depth=0)  # every job is dropped
+
+    with (
+        patch("app.gameManager.db", db),
+        patch("app.bot_player.db", db),
+        patch("app.gameManager.bot_jobs", jobs),
+        patch("app.bot_player.bot_jobs", jobs),
+    ):
+        manager = GameManager()
+        manager.go_for_a_wee(game, human.id)
+        assert jobs.drain(WAIT) and jobs.was_dropped(game.id)
+        assert db.get_game(game.id).game_state.player_turn == bot.id
+
+        jobs.depth = 1
+        manager.get_game_by_id(game.id)
+        assert jobs.drain(WAIT)
+
+    assert db.get_game(game.id).game_state.player_turn == human.id
+    assert not jobs.was_dropped(game.id)
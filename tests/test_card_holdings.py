@@ -0,0 +1,89 @@
+"""Tests for the typed, indexed card holdings on PlayerState.
+
+Pure game-logic tests — no Supabase required.
+"""
+
+from uuid import uuid4
+
+from app import actions
+from app.card import Card, CardHoldings, CardRow
+from app.GameState import GameState
+from app.Ingredient import Ingredient
+
+
+def _card(card_type: str, **kwargs) -> Card:
+    return Card(id=str(uuid4()), card_type=card_type, **kwargs)
+
+
+def _holdings() -> CardHoldings:
+    return CardHoldings(
+        [
+            _card("refresher", name="Cola Refresher", mixer_type="COLA"),
+            _card("store", name="Gin Store", spirit_type="GIN", stored_spirits=["GIN"]),
+            _card("specialist", name="Rum Specialist", spirit_type="RUM"),
+            _card("free_action", name="Entrepreneur", spirit_type="VODKA"),
+            _card("karaoke", name="Sea Shanty", spirit_type="RUM"),
+            _card("store", name="Rum Store", spirit_type="RUM"),
+        ]
+    )
+
+
+def test_indexes_follow_appended_cards():
+    holdings = _holdings()
+
+    assert holdings.refresher_mixers == {"COLA"}
+    assert holdings.specialist_spirits == {"RUM"}
+    assert holdings.free_action_types == {"sell_cup"}
+    assert holdings.store_positions == (1, 5)
+    assert [c.name for c in holdings.store_cards()] == ["Gin Store", "Rum Store"]
+
+    holdings.append({"id": "r2", "card_type": "refresher", "mixer_type": "tonic"})
+    assert holdings.refresher_mixers == {"COLA", "TONIC"}
+    assert isinstance(holdings[-1], Card)
+
+
+def test_wire_format_is_unchanged():
+    holdings = _holdings()
+    gs = GameState.start_game([uuid4(), uuid4()], seed=2)
+    ps = gs.player_states[gs.player_turn]
+    ps.cards = list(holdings)
+
+    data = gs.to_dict()
+    assert data["player_states"][str(ps.player_id)]["cards"] == [
+        c.to_dict() for c in holdings
+    ]
+
+    restored = GameState.from_dict(data).player_states[ps.player_id]
+    assert restored.cards.to_dict() == holdings.to_dict()
+    assert restored.cards.store_positions == holdings.store_positions
+    assert restored.cards.specialist_spirits == holdings.specialist_spirits
+
+
+def test_clone_copies_only_store_cards():
+    holdings = _holdings()
+    copy = holdings.clone()
+
+    copy[1].stored_spirits.append("GIN")
+    copy.append(_card("specialist", name="Gin Specialist", spirit_type="GIN"))
+
+    assert holdings[1].stored_spirits == ["GIN"]
+    assert holdings.specialist_spirits == {"RUM"}
+    assert len(holdings) == 6
+    assert copy[0] is holdings[0]
+
+
+def test_claiming_a_store_card_leaves_the_input_state_untouched():
+    gs = GameState.start_game([uuid4(), uuid4()], seed=5)
+    pid = gs.player_turn
+    store = _card("store", name="Gin Store", spirit_type="GIN")
+    gs.card_rows[1] = CardRow(position=2, cards=[store])
+    gs.player_states[pid].bladder = [Ingredient.GIN, Ingredient.GIN]
+    before = gs.to_dict()
+
+    after, _ = actions.claim_card(gs, pid, store.id)
+
+    assert gs.to_dict() == before
+    assert store.stored_spirits == []
+    claimed = after.player_states[pid].cards
+    assert claimed.store_positions == (0,)
+    assert claimed[0].stored_spirits == ["GIN", "GIN"]
@@ -0,0 +1,51 @@
+"""Tests for GameState.clone and the per-object clone helpers.
+
+Pure game-logic tests — no Supabase required.
+"""
+
+from app.GameState import GameState
+from app.Ingredient import Ingredient
+from playtesting.bench import mid_game_state
+
+
+def _state_with_store_card() -> GameState:
+    gs = mid_game_state(num_players=4, turns=12, seed=3)
+    ps = gs.player_states[gs.turn_order[0]]
+    ps.cards.append(
+        {
+            "id": "store-1",
+            "card_type": "store",
+            "name": "Gin Store",
+            "spirit_type": "GIN",
+            "stored_spirits": ["GIN", "GIN"],
+        }
+    )
+    return gs
+
+
+def test_clone_matches_json_round_trip():
+    gs = _state_with_store_card()
+    expected = GameState.from_dict(gs.to_dict(include_rng=True))
+    assert gs.clone().to_dict(include_rng=True) == expected.to_dict(include_rng=True)
+
+
+def test_clone_is_independent_of_the_original():
+    gs = _state_with_store_card()
+    before = gs.to_dict(include_rng=True)
+    c = gs.clone()
+    pid = c.turn_order[0]
+    ps = c.player_states[pid]
+
+    c.bag_contents.append(Ingredient.GIN)
+    c.open_display.clear()
+    c.card_rows[1].cards.clear()
+    c._deck_dicts.pop()
+    c.turn_order.reverse()
+    ps.bladder.append(Ingredient.RUM)
+    ps.cups[0].ingredients.append(Ingredient.COLA)
+    ps.special_ingredients.append("lemon")
+    ps.cards[-1].stored_spirits.pop()
+    ps.points += 10
+    c.rng.random()
+
+    assert gs.to_dict(include_rng=True) == before
@@ -0,0 +1,81 @@
+"""Tests for the memoised drink-scoring table in app.cocktails.
+
+Pure game-logic tests — no Supabase required.
+"""
+
+import random
+from itertools import combinations_with_replacement
+
+from app.cocktails import (
+    _reference_drink_points,
+    _reference_is_cocktail,
+    drink_points,
+    drink_score,
+    is_cocktail,
+)
+from app.Ingredient import Ingredient, SpecialType
+
+_REAL_SPECIALS = [st.value for st in SpecialType if st is not SpecialType.NOTHING]
+
+
+def _all_cups():
+    for size in range(6):
+        yield from combinations_with_replacement(Ingredient, size)
+
+
+def _all_declarations():
+    # Every recipe declares at most two specials, so all pairs of real specials
+    # cover them; "nothing" and unknown strings are checked alone and paired.
+    yield ()
+    for special in _REAL_SPECIALS + ["nothing", "not-a-special"]:
+        yield (special,)
+    yield from combinations_with_replacement(_REAL_SPECIALS, 2)
+    yield ("nothing", "lemon")
+    yield ("lemon", "not-a-special")
+
+
+def test_table_matches_reference_for_every_cup_and_declaration():
+    mismatches = []
+    for cup in _all_cups():
+        cup = list(cup)
+        for declared in _all_declarations():
+            declared = list(declared)
+            expected = (
+                _reference_drink_points(cup, declared),
+                _reference_is_cocktail(cup, declared),
+            )
+            # Asked twice: the first call may fill the table, the second reads it.
+            for _ in range(2):
+                got = drink_score(cup, declared)
+                if got != expected:
+                    mismatches.append((cup, declared, got, expected))
+    assert not mismatches, mismatches[:5]
+
+
+def test_lookup_ignores_ingredient_and_special_order():
+    rng = random.Random(5)
+    cup = [Ingredient.VODKA, Ingredient.CRANBERRY]
+    declared = ["lemon", "cointreau"]
+    for _ in range(5):
+        rng.shuffle(cup)
+        rng.shuffle(declared)
+        assert drink_points(cup, declared) == 10
+        assert is_cocktail(cup, declared)
+
+
+def test_full_recipe_with_three_specials_is_scored():
+    cup = [
+        Ingredient.GIN,
+        Ingredient.VODKA,
+        Ingredient.TEQUILA,
+        Ingredient.RUM,
+        Ingredient.COLA,
+    ]
+    assert drink_score(cup, ["sugar", "lemon"]) == (15, True)
+    assert drink_score(cup, ["sugar", "lemon", "nothing"]) == (15, True)
+    assert drink_score(cup, ["sugar", "lemon", "bitters"]) == (None, False)
+
+
+def test_oversized_inputs_fall_back_to_the_reference():
+    cup = [Ingredient.VODKA] + [Ingredient.COLA] * 16
+    assert drink_score(cup, []) == (1, False)
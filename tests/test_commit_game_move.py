@@ -0,0 +1,132 @@
+"""GameManager persists each action with a single commit_game_move call.
+
+The move number, move record and latest_state are written by one database
+function in one transaction, conditional on the game's state_version; these
+tests pin that the manager makes exactly that one call per action (and per
+undo) and turns a version conflict into a 409. Pure game-logic tests — no
+Supabase required.
+"""
+
+from datetime import datetime
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app import actions
+from app.game import Game, GameException, Status
+from app.gameManager import GameManager
+from app.GameState import GameState
+
+
+def _started_game() -> Game:
+    players = [uuid4(), uuid4()]
+    return Game(
+        id=uuid4(),
+        host=players[0],
+        players=set(players),
+        status=Status.STARTED,
+        game_state=GameState.start_game(players, seed=4),
+        created=datetime.now(),
+        state_version=5,
+    )
+
+
+def test_action_is_committed_in_one_call():
+    game = _started_game()
+    gs = game.game_state
+    pid = gs.player_turn
+    new_state, payload = actions.draw_from_bag(gs, pid, 1)
+
+    with (
+        patch("app.gameManager.db") as mock_db,
+        patch.object(GameManager, "_schedule_bot_turns"),
+    ):
+        mock_db.commit_game_move.return_value = {"move_number": 1, "state_version": 6}
+        GameManager()._apply_action(
+            game, pid, "draw_from_bag", new_state, payload, {"count": 1}
+        )
+
+    assert [c[0] for c in mock_db.mock_calls] == ["commit_game_move"]
+    args = mock_db.commit_game_move.call_args.args
+    assert args == (
+        game.id,
+        gs.turn_number,
+        pid,
+        "draw_from_bag",
+        {"count": 1},
+        payload,
+        gs.to_dict(include_rng=True),
+        new_state,
+        5,
+    )
+    assert game.state_version == 6
+    assert game.game_state is new_state
+
+
+def test_stale_version_is_409_and_leaves_the_game_alone():
+    game = _started_game()
+    gs = game.game_state
+    pid = gs.player_turn
+    new_state, payload = actions.draw_from_bag(gs, pid, 1)
+
+    with patch("app.gameManager.db") as mock_db:
+        mock_db.commit_game_move.return_value = {"conflict": True, "state_version": 7}
+        with pytest.raises(GameException) as exc:
+            GameManager()._apply_action(
+                game, pid, "draw_from_bag", new_state, payload, {"count": 1}
+            )
+    assert exc.value.status_code == 409
+    assert game.state_version == 5
+    assert game.game_state is gs
+
+
+def test_set_game_modes_is_conditional_on_the_version():
+    game = _started_game()
+    game.status = Status.NEW
+    with patch("app.gameManager.db") as mock_db:
+        mock_db.get_game.return_value = game
+        mock_db.update_game_state.return_value = False
+        with pytest.raises(GameException) as exc:
+            GameManager().set_game_modes(game.host, game.id, [])
+    assert exc.value.status_code == 409
+    assert mock_db.update_game_state.call_args.kwargs == {"expected_version": 5}
+
+
+def test_commit_for_missing_game_is_404():
+    game = _started_game()
+    gs = game.game_state
+    pid = gs.player_turn
+    new_state, payload = actions.draw_from_bag(gs, pid, 1)
+
+    with patch("app.gameManager.db") as mock_db:
+        mock_db.commit_game_move.return_value = None
+        with pytest.raises(GameException) as exc:
+            GameManager()._apply_action(
+                game, pid, "draw_from_bag", new_state, payload, {"count": 1}
+            )
+    assert exc.value.status_code == 404
+
+
+def test_undo_restore_is_committed_with_its_move():
+    game = _started_game()
+    current = game.game_state.to_dict(include_rng=True)
+    proposer = game.game_state.player_turn
+    snapshot = GameState.start_game([proposer, uuid4()], seed=5).to_dict(
+        include_rng=True
+    )
+
+    with patch("app.gameManager.db") as mock_db:
+        mock_db.commit_game_move.return_value = {"move_number": 1, "state_version": 6}
+        mock_db.get_state_before_turn.return_value = snapshot
+        mock_db.get_max_turn_number.return_value = 6
+        GameManager()._execute_undo(game, 3, proposer)
+
+    mock_db.update_game_state.assert_not_called()
+    args = mock_db.commit_game_move.call_args.args
+    target = {"target_turn_number": 3}
+    # state_before is the state being undone, so the move's delta chains on
+    # from the previous move's latest_state.
+    assert args[1:7] == (7, proposer, "undo", target, target, current)
+    assert args[7].to_dict(include_rng=True) == {**snapshot, "turn_number": 8}
+    assert args[8] == 5
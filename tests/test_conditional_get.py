@@ -0,0 +1,142 @@
+"""Tests for ETags and 304s on the game, valid-actions and history endpoints.
+
+Pure game-logic tests — no Supabase required.
+"""
+
+import time
+from unittest.mock import patch
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+
+from app.api import app
+from app.db import db
+
+
+def _register(client: TestClient) -> dict:
+    name = f"etag_{time.time_ns()}"
+    response = client.post(
+        "/register",
+        json={
+            "username": name,
+            "email": f"{name}@example.com",
+            "password": "Password1",
+        },
+    )
+    client.cookies.clear()
+    return {"userjwt": response.cookies.get("userjwt")}
+
+
+def _started_game(client: TestClient) -> tuple[str, dict, dict]:
+    """(game_id, current player's cookies, other player's cookies)."""
+    host, guest = _register(client), _register(client)
+    game_id = client.post("/v1/games", cookies=host).json()["id"]
+    client.post(f"/v1/games/{game_id}/join", cookies=guest)
+    client.post(f"/v1/games/{game_id}/start", cookies=host)
+    turn = client.get(f"/v1/games/{game_id}", cookies=host).json()["game_state"][
+        "player_turn"
+    ]
+    if client.get("/userDetails", cookies=host).json()["id"] != turn:
+        host, guest = guest, host
+    return game_id, host, guest
+
+
+def _get(client: TestClient, url: str, cookies: dict, etag: str | None = None):
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.get(url, cookies=cookies, headers=headers)
+
+
+def test_unchanged_game_is_a_304_without_loading_the_game():
+    client = TestClient(app)
+    game_id, player, _ = _started_game(client)
+    url = f"/v1/games/{game_id}"
+    first = _get(client, url, player)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    with patch("app.api.gameManager.get_game_by_id", side_effect=AssertionError):
+        again = _get(client, url, player, etag)
+        weak_or_listed = _get(client, url, player, f'"other", W/{etag}')
+    assert (again.status_code, again.content) == (304, b"")
+    assert again.headers["ETag"] == etag
+    assert weak_or_listed.status_code == 304
+    assert _get(client, url, player, '"other"').status_code == 200
+
+
+def test_a_conditional_get_unsticks_an_eliminated_bots_turn():
+    client = TestClient(app)
+    host = _register(client)
+    game_id = client.post("/v1/games", cookies=host).json()["id"]
+    bot_id = client.post(
+        f"/v1/games/{game_id}/add-bot", json={"strategy": "random"}, cookies=host
+    ).json()["bot_id"]
+    client.post(f"/v1/games/{game_id}/start", cookies=host)
+    # The stuck state get_game_by_id recovers from: an eliminated bot to move.
+    game = db.get_game(UUID(game_id))
+    state = game.game_state.copy_on_write()
+    state.player_turn = UUID(bot_id)
+    state.player_states[UUID(bot_id)].status = "hospitalised"
+    db.update_game_state(game.id, state)
+    url = f"/v1/games/{game_id}"
+    with patch("app.api.gameManager._heal_stuck_turn", return_value=False):
+        stuck = _get(client, url, host)
+    assert stuck.json()["game_state"]["player_turn"] == bot_id
+
+    polled = _get(client, url, host, stuck.headers["ETag"])
+
+    assert polled.status_code == 200
+    assert polled.json()["game_state"]["player_turn"] != bot_id
+
+
+def test_a_move_changes_every_tag():
+    client = TestClient(app)
+    game_id, player, other = _started_game(client)
+    urls = [
+        f"/v1/games/{game_id}",
+        f"/v1/games/{game_id}/valid-actions",
+        f"/v1/games/{game_id}/history",
+    ]
+    tags = {url: _get(client, url, player).headers["ETag"] for url in urls}
+    assert all(_get(client, u, player, t).status_code == 304 for u, t in tags.items())
+
+    client.post(
+        f"/v1/games/{game_id}/actions/draw-from-bag", json={"count": 1}, cookies=player
+    )
+
+    for url, etag in tags.items():
+        response = _get(client, url, player, etag)
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+    moves = _get(client, urls[2], player).json()["moves"]
+    assert [m["action"]["type"] for m in moves] == ["draw_from_bag"]
+    # The other player's valid actions are tagged separately.
+    theirs = _get(client, urls[1], other, tags[urls[1]])
+    assert theirs.status_code == 200
+    assert theirs.json()["actions"] == []
+
+
+def test_undo_votes_change_the_game_tag():
+    client = TestClient(app)
+    game_id, player, other = _started_game(client)
+    client.post(
+        f"/v1/games/{game_id}/actions/draw-from-bag", json={"count": 1}, cookies=player
+    )
+    url = f"/v1/games/{game_id}"
+    etag = _get(client, url, other).headers["ETag"]
+
+    client.post(f"/v1/games/{game_id}/undo", cookies=other)
+
+    response = _get(client, url, other, etag)
+    assert response.status_code == 200
+    assert response.json()["pending_undo"]["status"] == "pending"
+
+
+def test_non_members_get_no_tags_for_started_games():
+    client = TestClient(app)
+    game_id, _, _ = _started_game(client)
+    stranger = _register(client)
+
+    response = _get(client, f"/v1/games/{game_id}", stranger, "*")
+    assert response.status_code == 403
+    assert "ETag" not in response.headers
@@ -0,0 +1,89 @@
+"""Tests for copy-on-write GameState and the pure-function contract of actions.
+
+Pure game-logic tests — no Supabase required.
+"""
+
+import functools
+from uuid import uuid4
+
+import pytest
+
+from app import actions
+from app.game_modes import VALID_GAME_MODES
+from app.GameState import GameState
+from app.Ingredient import Ingredient
+from playtesting.runner import GameRunner
+from playtesting.strategy import Mastermind
+
+_ACTIONS = [
+    "draw_from_bag",
+    "take_ingredients",
+    "sell_cup",
+    "drink_cup",
+    "go_for_a_wee",
+    "claim_card",
+    "drink_stored_spirit",
+    "use_stored_spirit",
+    "reroll_specials",
+    "refresh_card_row",
+    "quit_game",
+    "end_turn",
+]
+
+
+def _checked(fn, calls: list[str]):
+    """Wrap an action: the input must be untouched and the result must match
+    running the same action on a fully independent deep copy."""
+
+    @functools.wraps(fn)
+    def wrapper(gs, *args, **kwargs):
+        before = gs.to_dict(include_rng=True)
+        try:
+            expected = fn(gs.clone(), *args, **kwargs)
+        except Exception as e:
+            expected = e
+        try:
+            result = fn(gs, *args, **kwargs)
+        finally:
+            assert gs.to_dict(include_rng=True) == before, (
+                f"{fn.__name__} mutated its input"
+            )
+        assert not isinstance(expected, Exception)
+        assert result[0].to_dict(include_rng=True) == expected[0].to_dict(
+            include_rng=True
+        )
+        assert result[1] == expected[1]
+        calls.append(fn.__name__)
+        return result
+
+    return wrapper
+
+
+@pytest.mark.parametrize(
+    "num_players,modes", [(2, []), (4, []), (3, sorted(VALID_GAME_MODES))]
+)
+def test_actions_never_mutate_their_input(monkeypatch, num_players, modes):
+    calls: list[str] = []
+    for name in _ACTIONS:
+        monkeypatch.setattr(actions, name, _checked(getattr(actions, name), calls))
+
+    for seed in range(3):
+        strategies = {uuid4(): Mastermind() for _ in range(num_players)}
+        GameRunner(strategies, seed=seed, game_modes=modes).run()
+
+    assert {"take_ingredients", "draw_from_bag", "sell_cup"} <= set(calls)
+
+
+def test_own_player_copies_only_the_touched_player():
+    p1, p2 = uuid4(), uuid4()
+    gs = GameState.start_game([p1, p2])
+    cow = gs.copy_on_write()
+
+    cow.own_player(p1).bladder.append(Ingredient.GIN)
+    cow.own_bag().append(Ingredient.RUM)
+
+    assert cow.player_states[p1] is not gs.player_states[p1]
+    assert cow.player_states[p2] is gs.player_states[p2]
+    assert cow.card_rows is gs.card_rows
+    assert gs.player_states[p1].bladder == []
+    assert len(cow.bag_contents) == len(gs.bag_contents) + 1
@@ -130,7 +130,9 @@ class TestProcessBotTurnsForceAdvancesEliminated:
 
         captured = {}
 
-        def fake_apply_action(_game, _player_id, action_type, new_state, payload):
+        def fake_apply_action(
+            _game, _player_id, action_type, new_state, payload, _params
+        ):
             captured["action_type"] = action_type
             captured["new_state"] = new_state
             # Mutate the game so the second loop iteration sees the advance.
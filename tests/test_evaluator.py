@@ -71,7 +71,7 @@ def test_double_spirit_drink_is_three_points():
 
 def test_specialist_adds_bonus():
     cup = Cup([Ingredient.VODKA, Ingredient.COLA])
-    cards = [{"card_type": "specialist", "spirit_type": "VODKA"}]
+    cards = [{"id": "spec-1", "card_type": "specialist", "spirit_type": "VODKA"}]
     # 1 (base) + 2 (specialist) = 3
     assert _best_cup_sale(_ps_with_cup(cup, cards), cup) == 3
 
@@ -9,7 +9,8 @@ from uuid import uuid4
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
 
 
-from app.game import Game
+from app.game import Game, game_summary
+from app.GameState import GameState
 
 
 class TestGame(unittest.TestCase):
@@ -20,6 +21,26 @@ class TestGame(unittest.TestCase):
 
         game = Game.new_game(host)
         self.assertSetEqual(game.players, players)
-        self.assertListEqual(game.game_state.bag_contents, [])
+        self.assertListEqual(list(game.game_state.bag_contents), [])
         self.assertEqual(len(game.game_state.player_states), 1)
         self.assertEqual(game.game_state.player_states[host].player_id, host)
+
+    def test_game_summary(self):
+        players = [uuid4(), uuid4()]
+        gs = GameState.start_game(players, seed=1, game_modes=["sell_both_cups"])
+        gs.player_states[players[1]].points = 7
+        state = gs.to_dict(include_rng=True)
+
+        summary = game_summary(state)
+        self.assertEqual(
+            summary,
+            {
+                "turn_number": 0,
+                "player_turn": state["player_turn"],
+                "winner": None,
+                "points": {str(players[0]): 0, str(players[1]): 7},
+                "game_modes": ["sell_both_cups"],
+            },
+        )
+        for key in ("turn_number", "player_turn", "winner", "game_modes"):
+            self.assertEqual(summary[key], state[key])
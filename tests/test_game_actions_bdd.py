@@ -617,8 +617,8 @@ def _draw_and_assign(
 def player_take_n_to_cup(ctx, n, count, cup_index):
     token, _ = _player(ctx, n)
     game = _get_game(token, ctx["game_id"])
-    bag = game["game_state"]["bag_contents"]
-    assert len(bag) >= count, f"Not enough in bag (need {count}, have {len(bag)})"
+    bag_size = game["game_state"]["bag_size"]
+    assert bag_size >= count, f"Not enough in bag (need {count}, have {bag_size})"
     _, resp = _draw_and_assign(
         token, ctx["game_id"], count, disposition="cup", cup_index=cup_index
     )
@@ -682,8 +682,8 @@ def player_take_from_bag(ctx, n, count):
     n, count = int(n), int(count)
     token, _ = _player(ctx, n)
     game = _get_game(token, ctx["game_id"])
-    bag = game["game_state"]["bag_contents"]
-    assert len(bag) >= count, f"Not enough in bag (need {count}, have {len(bag)})"
+    bag_size = game["game_state"]["bag_size"]
+    assert bag_size >= count, f"Not enough in bag (need {count}, have {bag_size})"
     _, resp = _draw_and_assign(token, ctx["game_id"], count)
     assert resp.status_code == 200, f"Take failed: {resp.text}"
     ctx["last_resp"] = resp
@@ -694,8 +694,7 @@ def player_take_from_bag(ctx, n, count):
 def player_place_in_cup(ctx, n, cup_index):
     token, _ = _player(ctx, n)
     game = _get_game(token, ctx["game_id"])
-    bag = game["game_state"]["bag_contents"]
-    if not bag:
+    if not game["game_state"]["bag_size"]:
         pytest.skip("Bag is empty")
     # Draw 1 from bag first (succeeds), then try to assign to the (full) cup
     draw_resp = _client.post(
@@ -1518,7 +1517,7 @@ def player_reroll_specials(ctx, n, chosen, results):
 
     # Record bag size before the action for later assertion
     game = _get_game(token, ctx["game_id"])
-    ctx["bag_size_before"] = len(game["game_state"].get("bag_contents", []))
+    ctx["bag_size_before"] = game["game_state"]["bag_size"]
 
     # Map result strings to SpecialType enums for the mock
     roll_returns = [SpecialType[r.upper()] for r in result_list]
@@ -1574,7 +1573,7 @@ def player_mat_empty(ctx, n):
 @then("the bag size should be unchanged")
 def bag_size_unchanged(ctx):
     game = _get_game(ctx["p1_token"], ctx["game_id"])
-    bag_size_after = len(game["game_state"].get("bag_contents", []))
+    bag_size_after = game["game_state"]["bag_size"]
     assert bag_size_after == ctx["bag_size_before"], (
         f"Bag size changed: was {ctx['bag_size_before']}, now {bag_size_after}"
     )
@@ -1583,14 +1582,14 @@ def bag_size_unchanged(ctx):
 @given("the current bag size is recorded")
 def record_bag_size(ctx):
     game = _get_game(ctx["p1_token"], ctx["game_id"])
-    ctx["bag_size_before"] = len(game["game_state"].get("bag_contents", []))
+    ctx["bag_size_before"] = game["game_state"]["bag_size"]
 
 
 @then(parsers.parse("the bag should contain {delta:d} more ingredient than before"))
 @then(parsers.parse("the bag should contain {delta:d} more ingredients than before"))
 def bag_grew_by(ctx, delta):
     game = _get_game(ctx["p1_token"], ctx["game_id"])
-    bag_size_after = len(game["game_state"].get("bag_contents", []))
+    bag_size_after = game["game_state"]["bag_size"]
     expected = ctx["bag_size_before"] + delta
     assert bag_size_after == expected, (
         f"Expected bag size {expected} (before={ctx['bag_size_before']} + {delta}), "
@@ -2070,12 +2069,13 @@ def reroll_recorded_as_main(ctx):
 
 @then("the deck should not contain the Cocktail Shaker card")
 def deck_excludes_cocktail_shaker(ctx):
-    game = _get_game(ctx["p1_token"], ctx["game_id"])
-    deck = game["game_state"].get("deck", []) or []
-    rows = game["game_state"].get("card_rows", []) or []
-    all_cards = list(deck)
-    for r in rows:
-        all_cards.extend(r.get("cards", []))
+    from app.db import db
+
+    # The API only shows the deck's size, so read the stored state.
+    state = db.get_game(UUID(ctx["game_id"])).game_state.to_dict()
+    all_cards = list(state["deck"])
+    for r in state["card_rows"]:
+        all_cards.extend(r["cards"])
     names = [c.get("name") for c in all_cards]
     assert "Cocktail Shaker" not in names, (
         f"Cocktail Shaker should be removed; deck/rows contain: {names}"
@@ -0,0 +1,269 @@
+"""Tests for the in-process game cache behind Db.get_game (app.game_cache).
+
+Db runs against an in-memory stand-in for the Supabase client that keeps a
+single games row and counts the requests made to it. Pure game-logic tests —
+no Supabase required.
+"""
+
+import random
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import UUID, uuid4
+
+from app.bot_jobs import InlineBotJobs
+from app.db import Db
+from app.game import Game, Status
+from app.game_cache import GameCache
+from app.gameManager import GameManager
+from app.GameState import GameState
+
+
+class _Request:
+    def __init__(self, client, table: str):
+        self.client = client
+        self.table = table
+        self.columns: tuple[str, ...] = ()
+        self.filters: dict[str, object] = {}
+        self.data: dict | None = None
+
+    def select(self, *columns):
+        self.columns = columns
+        return self
+
+    def update(self, data: dict):
+        self.data = data
+        return self
+
+    def eq(self, column: str, value):
+        self.filters[column] = value
+        return self
+
+    def execute(self):
+        assert self.table == "games"
+        row = self.client.row
+        matched = all(row[c] == v for c, v in self.filters.items())
+        if self.data is not None:
+            self.client.requests["update"] += 1
+            if not matched:
+                return SimpleNamespace(data=[])
+            self.client.write(self.data)
+            return SimpleNamespace(data=[dict(row)])
+        kind = "load" if "latest_state" in self.columns else "version"
+        self.client.requests[kind] += 1
+        data = [{c: row[c] for c in self.columns}] if matched else []
+        return SimpleNamespace(data=data)
+
+
+class _Rpc:
+    def __init__(self, client, name: str, params: dict):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def execute(self):
+        assert self.name == "commit_game_move"
+        self.client.requests["commit"] += 1
+        row, params = self.client.row, self.params
+        if params["expected_version"] != row["state_version"]:
+            return SimpleNamespace(
+                data={"conflict": True, "state_version": row["state_version"]}
+            )
+        data = {"latest_state": params["latest_state"]}
+        if params["ended"]:
+            data["status"] = "ENDED"
+        self.client.write(data)
+        return SimpleNamespace(data={"state_version": row["state_version"]})
+
+
+class _FakeSupabase:
+    """One games row, with the state_version trigger's behaviour."""
+
+    def __init__(self, game: Game):
+        self.row = {
+            "id": str(game.id),
+            "host": str(game.host),
+            "players": [str(p) for p in game.players],
+            "status": game.status.name,
+            "latest_state": game.game_state.to_dict(include_rng=True),
+            "created_at": game.created.isoformat(),
+            "state_version": 0,
+        }
+        self.requests: Counter[str] = Counter()
+
+    def write(self, data: dict) -> None:
+        self.row.update(data)
+        if {"latest_state", "players", "status"} & data.keys():
+            self.row["state_version"] += 1
+
+    def table(self, name: str) -> _Request:
+        return _Request(self, name)
+
+    def rpc(self, name: str, params: dict) -> _Rpc:
+        return _Rpc(self, name, params)
+
+
+def _new_game(players: list[UUID] | None = None, seed: int = 1) -> Game:
+    players = players or [uuid4(), uuid4()]
+    return Game(
+        id=uuid4(),
+        host=players[0],
+        players=set(players),
+        status=Status.STARTED,
+        game_state=GameState.start_game(players, seed=seed),
+        created=datetime.now(),
+    )
+
+
+def _db(game: Game, maxsize: int = 512) -> tuple[Db, _FakeSupabase]:
+    client = _FakeSupabase(game)
+    db = Db()
+    db.supabase = client
+    db.game_cache = GameCache(maxsize)
+    return db, client
+
+
+def _play_bots(maxsize: int) -> tuple[Counter[str], int]:
+    """Bots play a whole game; returns the requests made and the turns taken."""
+    random.seed(1)
+    players = [UUID(int=1), UUID(int=2)]
+    game = _new_game(players)
+    db, client = _db(game, maxsize)
+    strategies = dict(zip(players, ["mastermind", "random"]))
+
+    def get_bot_users_by_ids(ids: set[UUID]):
+        client.requests["bots"] += 1
+        return [SimpleNamespace(id=i, bot_strategy=strategies[i]) for i in ids]
+
+    db.get_bot_users_by_ids = get_bot_users_by_ids
+    with (
+        patch("app.gameManager.db", db),
+        patch("app.bot_player.db", db),
+        patch("app.gameManager.bot_jobs", InlineBotJobs()),
+    ):
+        for _ in range(30):
+            if client.row["status"] == "ENDED":
+                break
+            GameManager()._schedule_bot_turns(game.id)
+    final = GameState.from_dict(client.row["latest_state"])
+    assert final.winner is not None
+    return client.requests, final.turn_number
+
+
+def test_a_bot_turn_loads_the_game_once():
+    uncached, turns = _play_bots(maxsize=0)
+    cached, cached_turns = _play_bots(maxsize=512)
+    assert cached_turns == turns
+    assert cached["commit"] == uncached["commit"]
+
+    # Without the cache every re-fetch within a turn loads and deserialises
+    # the whole game; with it the game is loaded once, and each turn costs a
+    # one-column version check.
+    assert uncached["load"] > 3 * turns
+    assert cached["load"] == 1
+    assert cached["version"] <= turns + 1
+    assert sum(cached.values()) < sum(uncached.values()) / 2
+
+
+def test_get_game_reloads_after_another_writer():
+    game = _new_game()
+    db, client = _db(game)
+    first = db.get_game(game.id)
+    assert db.get_game(game.id).game_state is first.game_state
+    assert client.requests == {"load": 1, "version": 1}
+
+    # Another process saves a new state: the versions no longer match.
+    other = first.game_state.copy_on_write()
+    other.turn_number += 5
+    client.write({"latest_state": other.to_dict(include_rng=True)})
+
+    # Trusting the cache skips the check and serves the stale copy...
+    assert db.get_game(game.id, validate=False).state_version == 0
+    # ...while a validated read notices and reloads.
+    reloaded = db.get_game(game.id)
+    assert reloaded.state_version == 1
+    assert reloaded.game_state.turn_number == first.game_state.turn_number + 5
+    assert client.requests == {"load": 2, "version": 2}
+
+
+def test_player_changes_invalidate_the_cache():
+    game = _new_game()
+    db, client = _db(game)
+    db.get_game(game.id)
+    joined = uuid4()
+    client.write({"players": client.row["players"] + [str(joined)]})
+    assert joined in db.get_game(game.id).players
+
+
+def test_writes_refresh_the_cached_game():
+    game = _new_game()
+    db, client = _db(game)
+    loaded = db.get_game(game.id)
+    new_state = loaded.game_state.copy_on_write()
+    new_state.turn_number += 1
+
+    assert db.update_game_state(game.id, new_state, expected_version=0)
+    cached = db.get_game(game.id)
+    assert cached.game_state is new_state
+    assert cached.state_version == 1
+    assert client.requests["load"] == 1
+
+
+def test_a_lost_version_race_drops_the_cached_game():
+    game = _new_game()
+    db, client = _db(game)
+    loaded = db.get_game(game.id)
+    client.write({"latest_state": client.row["latest_state"]})
+
+    move = db.commit_game_move(
+        game.id,
+        loaded.game_state.turn_number,
+        game.host,
+        "skip_turn",
+        {},
+        {},
+        loaded.game_state.to_dict(include_rng=True),
+        loaded.game_state,
+        loaded.state_version,
+    )
+    assert move["conflict"]
+    assert len(db.game_cache) == 0
+    assert db.get_game(game.id, validate=False).state_version == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = GameCache(maxsize=2)
+    games = [_new_game() for _ in range(3)]
+    cache.put(games[0])
+    cache.put(games[1])
+    cache.get(games[0].id)
+    cache.put(games[2])
+    assert cache.version(games[1].id) is None
+    assert cache.get(games[0].id) is not None
+    assert cache.get(games[2].id) is not None
+
+
+def test_cache_is_safe_to_share_between_threads():
+    cache = GameCache(maxsize=2)
+    games = [_new_game() for _ in range(4)]
+
+    def use(n):
+        game = games[n % 4]
+        cache.put(game)
+        cache.get(games[(n + 1) % 4].id)
+        cache.update(game.id, game.game_state, n)
+        cache.discard(games[(n + 2) % 4].id)
+        cached = cache.get(game.id)
+        assert cached is None or cached.id == game.id
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # interleave the threads as often as possible
+    try:
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(use, range(20_000)))
+    finally:
+        sys.setswitchinterval(interval)
+    assert len(cache) <= 2
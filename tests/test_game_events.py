@@ -0,0 +1,133 @@
+"""Tests for pushing game changes to watching pages (app.game_events).
+
+Covers the hub, the server-sent event stream, GameManager publishing on its
+writes and the /v1/games/{id}/events endpoint. Pure game-logic tests — no
+Supabase required.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app import game_events as game_events_module
+from app.api import app
+from app.game import Game
+from app.game_events import GameEvents
+from app.gameManager import GameManager
+from app.GameState import GameState
+from app.sqlite_db import SqliteDb
+from app.user import User
+
+
+def test_publishing_from_another_thread_keeps_only_the_newest_notice():
+    events = GameEvents()
+    game_id = uuid4()
+
+    async def main():
+        subscription = events.subscribe(game_id)
+        other = events.subscribe(uuid4())
+        thread = threading.Thread(
+            target=lambda: [events.publish(game_id, v) for v in (3, 4, 5)]
+        )
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0)
+        return subscription.queue.get_nowait(), subscription.queue.empty(), other
+
+    newest, drained, other = asyncio.run(main())
+    assert (newest, drained) == (5, True)
+    assert other.queue.empty()
+
+
+def test_stream_starts_at_the_current_version_and_unsubscribes_when_closed():
+    events = GameEvents()
+    game_id = uuid4()
+
+    async def main():
+        stream = events.stream(events.subscribe(game_id), 7)
+        chunks = [await anext(stream)]
+        events.publish(game_id, 8)
+        chunks.append(await anext(stream))
+        with patch.object(game_events_module, "KEEPALIVE_SECONDS", 0.01):
+            chunks.append(await anext(stream))
+        watching = events.watchers(game_id)
+        await stream.aclose()
+        return chunks, watching
+
+    chunks, watching = asyncio.run(main())
+    assert chunks == [
+        'retry: 3000\nevent: game\ndata: {"state_version": 7}\n\n',
+        'event: game\ndata: {"state_version": 8}\n\n',
+        ": keep-alive\n\n",
+    ]
+    assert watching == 1
+    assert events.watchers(game_id) == 0
+
+
+def test_game_manager_publishes_moves_and_joins():
+    db = SqliteDb()
+    players = []
+    for name in ("alice", "bob"):
+        user = User(name, f"{name}@example.com", "Password1")
+        db.add_user(user)
+        players.append(user.id)
+    game = Game.new_game(players[0])
+    db.create_game(game)
+    published = []
+
+    with (
+        patch("app.gameManager.db", db),
+        patch("app.gameManager.game_events.publish", lambda *a: published.append(a)),
+    ):
+        manager = GameManager()
+        manager.add_player(players[1], game.id)
+        db.start_game(game.id, GameState.start_game(players, seed=1))
+        game = db.get_game(game.id)
+        after = game.game_state.copy_on_write()
+        after.turn_number += 1
+        manager._apply_action(game, game.host, "go-for-a-wee", after, {}, {})
+
+    assert published == [(game.id,), (game.id, game.state_version)]
+    assert db.get_game_version(game.id) == game.state_version
+
+
+def _register(client: TestClient) -> dict:
+    name = f"watcher_{time.time_ns()}"
+    response = client.post(
+        "/register",
+        json={
+            "username": name,
+            "email": f"{name}@example.com",
+            "password": "Password1",
+        },
+    )
+    return {"userjwt": response.cookies.get("userjwt")}
+
+
+def test_events_endpoint_streams_the_game_version_to_those_who_may_see_it():
+    client = TestClient(app)
+    host, stranger = _register(client), _register(client)
+    client.cookies.clear()
+    game_id = client.post("/v1/games", cookies=host).json()["id"]
+    version = client.get(f"/v1/games/{game_id}", cookies=host).json()["state_version"]
+
+    with patch.object(game_events_module, "STREAM_SECONDS", 0.05):
+        response = client.get(f"/v1/games/{game_id}/events", cookies=host)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith(
+        f'retry: 3000\nevent: game\ndata: {{"state_version": {version}}}\n\n'
+    )
+
+    assert client.get(f"/v1/games/{uuid4()}/events", cookies=host).status_code == 404
+    assert client.get(f"/v1/games/{game_id}/events").status_code == 401
+    guest = _register(client)
+    client.cookies.clear()
+    client.post(f"/v1/games/{game_id}/join", cookies=guest)
+    client.post(f"/v1/games/{game_id}/start", cookies=host)
+    response = client.get(f"/v1/games/{game_id}/events", cookies=stranger)
+    assert response.status_code == 403
@@ -320,7 +320,7 @@ class TestStartGame(GameManagerTestCase):
         )
         state = game_resp.json()["game_state"]
         self.assertEqual(len(state["open_display"]), 5)
-        self.assertEqual(len(state["bag_contents"]), 45)  # 50 - 5 open
+        self.assertEqual(state["bag_size"], 45)  # 50 - 5 open
         self.assertIn(host_id, state["player_states"])
         self.assertIn(player_id, state["player_states"])
         self.assertIsNotNone(state["player_turn"])
@@ -336,7 +336,7 @@ class TestStartGame(GameManagerTestCase):
         )
         state = game_resp.json()["game_state"]
         self.assertEqual(len(state["open_display"]), 5)
-        self.assertEqual(len(state["bag_contents"]), 65)  # 70 - 5 open
+        self.assertEqual(state["bag_size"], 65)  # 70 - 5 open
         self.assertIn(host_id, state["player_states"])
         self.assertIn(player_id, state["player_states"])
         self.assertIn(player_id3, state["player_states"])
@@ -0,0 +1,105 @@
+"""Tests for the per-game random stream (GameState.rng).
+
+Pure game-logic tests — no Supabase required.
+"""
+
+import base64
+import random
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from app import actions
+from app.GameState import GameRandom, GameState, decode_rng, encode_rng
+from playtesting.runner import GameRunner
+from playtesting.strategy import Mastermind, RandomStrategy
+
+
+def _play(seed: int, strategy=Mastermind) -> tuple:
+    """Play a seeded game; return a seat-ordered outcome summary."""
+    seats = [uuid4() for _ in range(3)]
+    result = GameRunner({pid: strategy() for pid in seats}, seed=seed).run()
+    return (
+        result.reason,
+        result.turn_count,
+        [result.player_results[pid].points for pid in seats],
+    )
+
+
+def test_seeded_games_are_reproducible_across_threads():
+    seeds = [11, 12, 13, 14]
+    sequential = [_play(seed) for seed in seeds]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        parallel = list(pool.map(_play, seeds))
+    assert parallel == sequential
+
+
+def test_a_seed_also_fixes_the_strategies_choices():
+    first = _play(42, RandomStrategy)
+    assert all(_play(42, RandomStrategy) == first for _ in range(2))
+
+
+def test_engine_never_touches_the_global_random_module():
+    gs = GameState.start_game([uuid4(), uuid4()], seed=3)
+    before = random.getstate()
+    actions.draw_from_bag(gs, gs.player_turn, 3)
+    assert random.getstate() == before
+
+
+def test_rng_survives_serialisation():
+    gs = GameState.start_game([uuid4(), uuid4()], seed=21)
+    gs.rng.random()
+    restored = GameState.from_dict(gs.to_dict(include_rng=True))
+
+    pid = gs.player_turn
+    _, expected = actions.draw_from_bag(gs, pid, 3)
+    _, payload = actions.draw_from_bag(restored, pid, 3)
+    assert payload == expected
+
+
+def test_a_stream_is_stored_as_its_seed_and_position():
+    rng = GameRandom(0xBA7)
+    rng.random()
+    rng.shuffle(list(range(40)))
+    rng.choice("abcdef")
+    rng.getrandbits(100)
+
+    encoded = encode_rng(rng)
+    assert encoded == f"ba7:{rng.words}"
+    restored = decode_rng(encoded)
+    assert [restored.random() for _ in range(5)] == [rng.random() for _ in range(5)]
+
+
+def test_streams_stored_as_generator_state_still_load():
+    old = random.Random(5)
+    old.random()
+    version, internal, _ = old.getstate()
+    packed = struct.pack(f"<B{len(internal)}I", version, *internal)
+    encoded = base64.b64encode(packed).decode("ascii")
+
+    first, second = decode_rng(encoded), decode_rng(encoded)
+    assert isinstance(first, GameRandom) and ":" in encode_rng(first)
+    assert first.random() == second.random()
+
+
+def test_rng_is_not_in_the_default_serialisation():
+    gs = GameState.start_game([uuid4(), uuid4()], seed=1)
+    assert "rng" not in gs.to_dict()
+    assert "rng" in gs.to_dict(include_rng=True)
+
+
+def test_reseeded_copies_draw_independently_of_the_real_game():
+    gs = GameState.start_game([uuid4(), uuid4()], seed=8)
+    pid = gs.player_turn
+    _, real = actions.draw_from_bag(gs, pid, 3)
+
+    samples = set()
+    for i in range(10):
+        sim = gs.copy_on_write()
+        sim.reseed(i)
+        _, payload = actions.draw_from_bag(sim, pid, 3)
+        samples.add(tuple(payload["drawn"]))
+
+    assert len(samples) > 1
+    _, again = actions.draw_from_bag(gs, pid, 3)
+    assert again == real
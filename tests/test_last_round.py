@@ -327,7 +327,9 @@ class TestLastRoundWithFreeActionModes:
             def __init__(self):
                 self.last_state = None
 
-            def _apply_action(self, _game, _player_id, _action_type, gs, _payload):
+            def _apply_action(
+                self, _game, _player_id, _action_type, gs, _payload, _params
+            ):
                 self.last_state = gs
 
         fake_game = _FakeGame(gs)
@@ -0,0 +1,102 @@
+"""Tests for app.moves.legal_moves against the reference get_valid_actions.
+
+Pure game-logic tests — no Supabase required.
+"""
+
+import random
+from uuid import uuid4
+
+import pytest
+
+from app import moves
+from app.card import build_deck
+from app.game_modes import VALID_GAME_MODES
+from app.GameState import GameState
+from app.Ingredient import Ingredient, SpecialType
+from app.moves import legal_moves
+from playtesting import runner
+from playtesting.runner import GameRunner
+from playtesting.strategy import Mastermind
+from playtesting.valid_actions import get_valid_actions
+
+_SPECIALS = [st.value for st in SpecialType if st is not SpecialType.NOTHING]
+_TOKENS = [i for i in Ingredient if i is not Ingredient.SPECIAL]
+_DECK = build_deck(sorted(VALID_GAME_MODES))
+
+
+def _summary(actions):
+    return [(a.action_type, a.params, a.is_free, a.description) for a in actions]
+
+
+def _assert_agree(gs: GameState):
+    for pid in gs.player_states:
+        assert _summary(legal_moves(gs, pid)) == _summary(get_valid_actions(gs, pid))
+
+
+def _perturb(gs: GameState, rng: random.Random) -> GameState:
+    """A copy of ``gs`` with the current player's holdings and turn flags shuffled."""
+    gs = gs.clone()
+    gs.player_turn = rng.choice(list(gs.player_states))
+    ps = gs.player_states[gs.player_turn]
+    for _ in range(rng.randrange(8)):
+        ps.bladder.append(rng.choice(_TOKENS))
+    for cup in ps.cups:
+        if rng.random() < 0.5:
+            cup.ingredients = rng.choices(_TOKENS, k=rng.randrange(6))
+            cup.has_cup_doubler = rng.random() < 0.3
+    if rng.random() < 0.5:
+        ps.special_ingredients = rng.choices(_SPECIALS, k=rng.randrange(5))
+    for _ in range(rng.randrange(4)):
+        card = rng.choice(_DECK).copy()
+        card.id = str(uuid4())
+        if card.card_type == "store":
+            card.stored_spirits = [card.spirit_type] * rng.randrange(3)
+        ps.cards.append(card)
+    ps.drunk_level = rng.randrange(6)
+    gs.main_action_taken_this_turn = rng.random() < 0.3
+    gs.free_actions_used_this_turn = rng.sample(
+        ["claim_card", "reroll_specials", "take_ingredients", "sell_cup"],
+        rng.randrange(3),
+    )
+    gs.game_modes = rng.sample(sorted(VALID_GAME_MODES), rng.randrange(3))
+    if rng.random() < 0.1:
+        gs.ingredients_taken_this_turn = rng.randrange(1, 3)
+    return gs
+
+
+@pytest.mark.parametrize(
+    "num_players,modes", [(2, []), (4, []), (3, sorted(VALID_GAME_MODES))]
+)
+def test_legal_moves_match_reference_on_fuzzed_states(monkeypatch, num_players, modes):
+    rng = random.Random(num_players)
+    checked = 0
+
+    def checking(gs, player_id):
+        nonlocal checked
+        _assert_agree(gs)
+        for _ in range(2):
+            _assert_agree(_perturb(gs, rng))
+        checked += 1
+        return legal_moves(gs, player_id)
+
+    monkeypatch.setattr(runner, "legal_moves", checking)
+    strategies = {uuid4(): Mastermind() for _ in range(num_players)}
+    GameRunner(strategies, seed=num_players, game_modes=modes).run()
+    assert checked > 20
+
+
+def test_sell_options_follow_the_cup_not_the_cache():
+    gs = GameState.start_game([uuid4(), uuid4()], seed=3)
+    ps = gs.player_states[gs.player_turn]
+    ps.cups[0].ingredients = [Ingredient.VODKA, Ingredient.CRANBERRY]
+    ps.special_ingredients = ["lemon", "cointreau"]
+    before = moves.cup_sell_options(ps, 0)
+
+    ps.cups[0].has_cup_doubler = True
+    doubled = moves.cup_sell_options(ps, 0)
+    ps.cups[0].ingredients.append(Ingredient.VODKA)
+    changed = moves.cup_sell_options(ps, 0)
+
+    assert doubled != before
+    assert changed != doubled
+    _assert_agree(gs)
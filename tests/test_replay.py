@@ -0,0 +1,236 @@
+"""Tests for rebuilding game history by replaying moves (app.replay).
+
+Bots play whole games through GameManager against an in-memory stand-in for
+the database, which keeps each move as commit_game_move would store it. The
+recorded params and outcomes must replay to exactly the saved states. Pure
+game-logic tests — no Supabase required.
+"""
+
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import UUID, uuid4
+
+import pytest
+
+from app import replay
+from app.bot_jobs import InlineBotJobs
+from app.game import Game, GameException, Status
+from app.gameManager import GameManager
+from app.GameState import GameState
+from app.replay import SNAPSHOT_EVERY, GameReplay
+from app.state_delta import diff_states, move_delta
+
+
+class _FakeDb:
+    """Just enough of Db for bots to play one game through GameManager."""
+
+    def __init__(self, game: Game, strategies: dict[UUID, str]):
+        self.game = game
+        self.strategies = strategies
+        self.initial_state = game.game_state.to_dict(include_rng=True)
+        self.moves: list[dict] = []
+        self.states_before: list[dict] = []
+
+    def get_game(self, game_id, validate=True):
+        return self.game
+
+    def get_bot_users_by_ids(self, player_ids):
+        return [
+            SimpleNamespace(id=pid, bot_strategy=self.strategies[pid])
+            for pid in player_ids
+        ]
+
+    def commit_game_move(
+        self,
+        game_id,
+        turn_number,
+        player_id,
+        action_type,
+        action_params,
+        action_payload,
+        state_before,
+        game_state,
+        expected_version,
+    ):
+        latest_state = game_state.to_dict(include_rng=True)
+        self.states_before.append(state_before)
+        self.moves.append(
+            {
+                "seq": len(self.moves) + 1,
+                "turn_number": turn_number,
+                "player_id": str(player_id),
+                "action": {"type": action_type, **action_payload},
+                "params": action_params,
+                "outcomes": game_state.outcomes or [],
+                "state_delta": move_delta(
+                    state_before, latest_state, game_state.outcomes or []
+                ),
+            }
+        )
+        self.game.state_version += 1
+        return {"state_version": self.game.state_version}
+
+    def get_state_before_turn(self, game_id, turn_number):
+        for move, before in zip(self.moves, self.states_before):
+            if move["turn_number"] == turn_number:
+                return before
+        return None
+
+    def get_max_turn_number(self, game_id):
+        return max(m["turn_number"] for m in self.moves)
+
+    def get_replay_data(self, game_id):
+        return {
+            "initial_state": self.initial_state,
+            "latest_state": self.game.game_state.to_dict(include_rng=True),
+            "moves": self.moves,
+        }
+
+
+def _play(seed: int, num_players: int, undo_at: int | None = None) -> _FakeDb:
+    random.seed(seed)
+    players = [uuid4() for _ in range(num_players)]
+    game = Game(
+        id=uuid4(),
+        host=players[0],
+        players=set(players),
+        status=Status.STARTED,
+        game_state=GameState.start_game(players, seed=seed),
+        created=datetime.now(),
+    )
+    names = ["mastermind", "random", "specialist", "aggressive"]
+    fake = _FakeDb(game, dict(zip(players, names)))
+    manager = GameManager()
+    with (
+        patch("app.gameManager.db", fake),
+        patch("app.bot_player.db", fake),
+        patch("app.gameManager.bot_jobs", InlineBotJobs()),
+    ):
+        for _ in range(30):
+            if game.game_state.winner is not None:
+                break
+            manager._schedule_bot_turns(game.id)
+            if undo_at is not None and len(fake.moves) >= undo_at:
+                target = fake.moves[undo_at // 2]["turn_number"]
+                manager._execute_undo(game, target, game.game_state.player_turn)
+                undo_at = None
+    return fake
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    replay.clear_cache()
+    yield
+    replay.clear_cache()
+
+
+@pytest.mark.parametrize("seed,num_players", [(1, 2), (2, 3), (3, 4)])
+def test_replay_reproduces_every_stored_state(seed, num_players):
+    fake = _play(seed, num_players)
+    assert fake.game.game_state.winner is not None
+    assert any(m["outcomes"] for m in fake.moves)
+
+    game_replay = GameReplay(fake.game.id, fake.initial_state, fake.moves)
+    for seq, before in enumerate(fake.states_before, start=1):
+        assert game_replay.state_after(seq - 1).to_dict(include_rng=True) == before
+    final = game_replay.state_after(len(fake.moves))
+    assert final.to_dict(include_rng=True) == fake.game.game_state.to_dict(
+        include_rng=True
+    )
+
+
+def test_replay_through_an_undo():
+    fake = _play(4, 3, undo_at=40)
+    assert "undo" in [m["action"]["type"] for m in fake.moves]
+    with patch("app.gameManager.db", fake):
+        assert GameManager().verify_history(fake.game.id) == []
+
+
+def test_outcomes_not_the_rng_decide_the_draws():
+    fake = _play(5, 2)
+    # A different random stream still replays to the recorded game: every
+    # draw, replacement card and roll comes from the recorded outcomes.
+    reseeded = GameState.from_dict(fake.initial_state)
+    reseeded.reseed(99)
+    initial = reseeded.to_dict(include_rng=True)
+    game_replay = GameReplay(fake.game.id, initial, fake.moves)
+
+    expected = fake.game.game_state.to_dict()
+    assert game_replay.state_after(len(fake.moves)).to_dict() == expected
+
+
+def test_verify_reports_where_history_diverges():
+    fake = _play(6, 2)
+    last = fake.moves[-1]
+    delta = last["state_delta"]
+    delta["set"] = {**delta.get("set", {}), "turn_number": 10_000}
+
+    with patch("app.gameManager.db", fake):
+        mismatches = GameManager().verify_history(fake.game.id)
+    assert mismatches == [
+        {"seq": last["seq"], "keys": ["turn_number"]},
+        {"seq": None, "keys": ["turn_number"]},
+    ]
+
+
+def test_legacy_moves_replay_from_their_delta():
+    fake = _play(7, 2)
+    before = fake.states_before
+    for n, move in enumerate(fake.moves[: len(fake.moves) // 2]):
+        # Moves from before outcomes were recorded store the stream in full.
+        move["params"] = None
+        move["outcomes"] = None
+        move["state_delta"] = diff_states(before[n], before[n + 1])
+    with patch("app.gameManager.db", fake):
+        assert GameManager().verify_history(fake.game.id) == []
+
+
+def test_replay_rejects_outcomes_that_do_not_match():
+    fake = _play(8, 2)
+    move = next(m for m in fake.moves if m["outcomes"])
+    move["outcomes"] = [["card", "no-such-card"]] + move["outcomes"]
+    game_replay = GameReplay(fake.game.id, fake.initial_state, fake.moves)
+    with pytest.raises(GameException) as exc:
+        game_replay.state_after(move["seq"])
+    assert "Replay diverged" in str(exc.value)
+
+
+def test_concurrent_replays_share_the_cache(monkeypatch):
+    monkeypatch.setattr(replay, "CACHED_GAMES", 1)  # every other game evicts
+    fake = _play(9, 2)
+    replays = [
+        GameReplay(game_id, fake.initial_state, fake.moves[:3])
+        for game_id in (fake.game.id, uuid4(), uuid4())
+    ]
+    expected = [GameState.from_dict(state).to_dict() for state in fake.states_before]
+
+    def state(n):
+        return replays[n % 3].state_after(n % 4).to_dict()
+
+    # Replays that all start from one cached snapshot, through a move that
+    # draws: each needs its own outcomes scripted.
+    game_replay = GameReplay(fake.game.id, fake.initial_state, fake.moves)
+    seq = next(m["seq"] for m in fake.moves[SNAPSHOT_EVERY:] if m["outcomes"])
+
+    def race(_):
+        return game_replay.state_after(seq).to_dict()
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # interleave the threads as often as possible
+    try:
+        with ThreadPoolExecutor(8) as pool:
+            states = list(pool.map(state, range(2000)))
+            raced = []
+            for _ in range(300):
+                replay.clear_cache()
+                game_replay.state_after(seq - 1)
+                raced += pool.map(race, range(8))
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert states == [expected[n % 4] for n in range(2000)]
+    assert raced == [expected[seq]] * len(raced)
@@ -0,0 +1,255 @@
+"""Tests for the SQLite storage backend (app.sqlite_db).
+
+Checks that SqliteDb keeps the contract the rest of the app relies on from
+the Supabase-backed Db: RPC result codes, state_version bumps, move keyframes
+and game paging. Pure game-logic tests — no Supabase required.
+"""
+
+from unittest.mock import patch
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.game import Game, Status
+from app.gameManager import GameManager
+from app.GameState import GameState
+from app.sqlite_db import SqliteDb
+from app.state_delta import KEYFRAME_EVERY
+from app.user import User
+
+
+def _user(db: SqliteDb, name: str) -> UUID:
+    user = User(name, f"{name}@example.com", "Password1")
+    db.add_user(user)
+    return user.id
+
+
+def _new_game(db: SqliteDb, host: UUID) -> UUID:
+    game = Game.new_game(host)
+    db.create_game(game)
+    return game.id
+
+
+def _started_game(db: SqliteDb) -> tuple[UUID, list[UUID]]:
+    players = [_user(db, "alice"), _user(db, "bob")]
+    game_id = _new_game(db, players[0])
+    assert db.add_player_to_game(game_id, players[1]) == "ok"
+    assert db.start_game(game_id, GameState.start_game(players, seed=1)) == "ok"
+    return game_id, players
+
+
+def _move(db: SqliteDb, game_id: UUID, turn_number: int) -> dict:
+    """Commit a move that scores a point and advances the turn counter."""
+    game = db.get_game(game_id)
+    before = game.game_state.to_dict(include_rng=True)
+    after = GameState.from_dict(before)
+    after.own_player(after.player_turn).points += 1
+    after.turn_number += 1
+    return db.commit_game_move(
+        game_id,
+        turn_number,
+        game.game_state.player_turn,
+        "go-for-a-wee",
+        {},
+        {},
+        before,
+        after,
+        game.state_version,
+    )
+
+
+def test_users_round_trip_and_duplicates_raise_like_postgres():
+    db = SqliteDb()
+    user_id = _user(db, "alice")
+
+    user = db.get_user_by_username("alice")
+    assert user.id == user_id
+    assert user.verify_secret("Password1", user._password_hash)
+    assert user.is_admin is False
+    assert user.theme == "taverna"
+    with pytest.raises(Exception, match="duplicate key"):
+        _user(db, "alice")
+
+    assert db.update_theme(user_id, "noir")
+    assert db.delete_user(user_id)
+    assert db.get_user_by_id(user_id).status == "deleted"
+    assert db.get_users() == []
+
+
+def test_join_and_leave_return_the_rpc_codes():
+    db = SqliteDb()
+    host, guest = _user(db, "alice"), _user(db, "bob")
+    game_id = _new_game(db, host)
+
+    assert db.add_player_to_game(uuid4(), guest) == "not_found"
+    assert db.add_player_to_game(game_id, guest) == "ok"
+    assert db.add_player_to_game(game_id, guest) == "duplicate"
+    for name in ("carol", "dave"):
+        assert db.add_player_to_game(game_id, _user(db, name)) == "ok"
+    assert db.add_player_to_game(game_id, _user(db, "erin")) == "full"
+
+    assert db.remove_player_from_game(game_id, guest, host) == "not_host"
+    assert db.remove_player_from_game(game_id, host, uuid4()) == "not_in_game"
+    assert db.remove_player_from_game(game_id, host, host) == "is_host"
+    assert db.remove_player_from_game(game_id, host, guest) == "ok"
+    assert guest not in db.get_game(game_id).players
+
+    assert db.start_game(game_id, GameState.start_game([host], seed=1)) == "ok"
+    assert db.start_game(game_id, GameState.start_game([host], seed=1)) == "not_new"
+    assert db.add_player_to_game(game_id, guest) == "not_new"
+
+
+def test_writes_bump_state_version_and_stale_writes_are_refused():
+    db = SqliteDb()
+    host = _user(db, "alice")
+    game_id = _new_game(db, host)
+    assert db.get_game_version(game_id) == 0
+
+    bob = _user(db, "bob")
+    db.add_player_to_game(game_id, bob)
+    assert db.get_game_version(game_id) == 1
+    assert db.get_game_header(game_id) == {
+        "host": str(host),
+        "players": [str(host), str(bob)],
+        "status": "NEW",
+        "state_version": 1,
+    }
+
+    game = db.get_game(game_id)
+    assert db.update_game_state(game_id, game.game_state, expected_version=1)
+    assert db.get_game_version(game_id) == 2
+    assert not db.update_game_state(game_id, game.game_state, expected_version=1)
+    assert db.get_game_version(game_id) == 2
+
+
+def test_moves_store_keyframes_and_rebuild_state_from_deltas():
+    db = SqliteDb()
+    game_id, _ = _started_game(db)
+    states = []
+    for turn in range(1, KEYFRAME_EVERY + 3):
+        states.append(db.get_game(game_id).game_state.to_dict(include_rng=True))
+        move = _move(db, game_id, turn)
+        assert (move["seq"], move["move_number"]) == (turn, 1)
+        assert move["state_version"] == db.get_game_version(game_id)
+
+    keyframes = db._all(
+        "SELECT seq FROM game_moves WHERE state_before IS NOT NULL ORDER BY seq"
+    )
+    assert [row["seq"] for row in keyframes] == [1, KEYFRAME_EVERY + 1]
+    for turn in (2, KEYFRAME_EVERY, KEYFRAME_EVERY + 2):
+        assert db.get_state_before_turn(game_id, turn) == states[turn - 1]
+    assert db.get_max_turn_number(game_id) == KEYFRAME_EVERY + 2
+
+
+def test_moves_after_an_undo_mid_chain_rebuild_from_deltas():
+    db = SqliteDb()
+    game_id, players = _started_game(db)
+    for turn in (1, 2, 3):
+        _move(db, game_id, turn)
+    with patch("app.gameManager.db", db):
+        GameManager()._execute_undo(db.get_game(game_id), 2, players[0])
+    states = {}
+    for turn in (5, 6):
+        states[turn] = db.get_game(game_id).game_state.to_dict(include_rng=True)
+        _move(db, game_id, turn)
+
+    # Only the first move is a keyframe: both rebuilds run through the undo.
+    keyframes = db._all("SELECT seq FROM game_moves WHERE state_before IS NOT NULL")
+    assert [row["seq"] for row in keyframes] == [1]
+    assert states[5] == {**db.get_state_before_turn(game_id, 2), "turn_number": 5}
+    for turn, state in states.items():
+        assert db.get_state_before_turn(game_id, turn) == state
+
+
+def test_a_move_after_an_out_of_band_write_is_a_keyframe():
+    db = SqliteDb()
+    game_id, _ = _started_game(db)
+    _move(db, game_id, 1)
+    game = db.get_game(game_id)
+    patched = game.game_state.copy_on_write()
+    patched.turn_number += 10
+    db.update_game_state(game_id, patched, expected_version=game.state_version)
+
+    _move(db, game_id, 2)
+
+    state = db.get_state_before_turn(game_id, 2)
+    assert state["turn_number"] == patched.turn_number
+
+
+def test_commit_game_move_reports_missing_games_and_conflicts():
+    db = SqliteDb()
+    game_id, _ = _started_game(db)
+    game = db.get_game(game_id)
+    args = ("go-for-a-wee", {}, {}, {}, game.game_state)
+
+    assert db.commit_game_move(uuid4(), 1, game.host, *args, 0) is None
+    conflict = db.commit_game_move(game_id, 1, game.host, *args, 99)
+    assert conflict == {"conflict": True, "state_version": game.state_version}
+    assert db.get_game_moves(game_id) == []
+
+
+def test_games_are_listed_newest_first_with_filters_and_cursor():
+    db = SqliteDb()
+    host, guest = _user(db, "alice"), _user(db, "bob")
+    game_ids = [_new_game(db, host) for _ in range(5)]
+    db.add_player_to_game(game_ids[0], guest)
+    db.end_game(game_ids[1], db.get_game(game_ids[1]).game_state)
+
+    page, total, has_more = db.get_games(page=1, page_size=3)
+    assert [g.id for g in page] == game_ids[:1:-1]
+    assert (total, has_more) == (5, True)
+
+    cursor = (str(page[-1].created), str(page[-1].id))
+    rest, total, has_more = db.get_games(page_size=3, after=cursor)
+    assert [g.id for g in rest] == game_ids[1::-1]
+    assert (total, has_more) == (None, False)
+
+    ended, _, _ = db.get_games(status=["ENDED"])
+    assert [(g.id, g.status) for g in ended] == [(game_ids[1], Status.ENDED)]
+    joined, total, _ = db.get_games(player_id=guest)
+    assert [g.id for g in joined] == [game_ids[0]]
+    assert total == 1
+    assert joined[0].summary == page[0].summary
+
+
+def test_a_file_database_survives_reopening(tmp_path):
+    path = str(tmp_path / "bartenders.db")
+    db = SqliteDb(path)
+    game_id, players = _started_game(db)
+    _move(db, game_id, 1)
+    db.save_bot_policy({"games_played": 3})
+    db.save_push_subscription(players[0], "https://push.example/1", "key", "auth")
+
+    reopened = SqliteDb(path)
+    assert reopened.get_game(game_id).players == set(players)
+    assert len(reopened.get_game_moves(game_id)) == 1
+    assert reopened.get_bot_policy() == {"games_played": 3}
+    assert reopened.get_push_subscriptions(players[0]) == [
+        {"endpoint": "https://push.example/1", "p256dh": "key", "auth": "auth"}
+    ]
+
+
+def test_history_queries_search_their_indexes():
+    db = SqliteDb()
+    game_id, _ = _started_game(db)
+    for turn in range(1, KEYFRAME_EVERY + 5):
+        _move(db, game_id, turn)
+    statements = []
+    db._conn.set_trace_callback(statements.append)
+    db.get_game_moves(game_id)
+    db.get_state_before_turn(game_id, KEYFRAME_EVERY + 3)
+    db.get_max_turn_number(game_id)
+    db.get_replay_data(game_id)
+    db.get_pending_undo(game_id)
+    _move(db, game_id, KEYFRAME_EVERY + 5)
+    db._conn.set_trace_callback(None)
+
+    plans = []
+    for sql in statements:
+        if sql.startswith("SELECT") and ("game_moves" in sql or "undo_" in sql):
+            rows = db._conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+            plans.extend(row["detail"] for row in rows)
+    scans = [p for p in plans if p.startswith(("SCAN game_moves", "SCAN undo"))]
+    assert scans == []
+    assert any("idx_game_moves_keyframes" in p for p in plans)
+    assert any("idx_undo_requests_one_pending" in p for p in plans)
@@ -0,0 +1,163 @@
+"""Tests for the delta-encoded move history in app.state_delta.
+
+Pure game-logic tests — no Supabase required.
+"""
+
+import functools
+import json
+from uuid import uuid4
+
+import pytest
+
+from app import actions
+from app.game_modes import VALID_GAME_MODES
+from app.GameState import GameState
+from app.state_delta import (
+    KEYFRAME_EVERY,
+    apply_delta,
+    apply_move_delta,
+    diff_states,
+    is_keyframe,
+    move_delta,
+    rebuild_state,
+)
+from playtesting.runner import GameRunner
+from playtesting.strategy import Mastermind
+from tests.test_state_hash import _ACTIONS
+
+
+def test_diff_and_apply_round_trip():
+    old = {
+        "a": 1,
+        "gone": "x",
+        "winner": "p1",
+        "nested": {"keep": [1, 2], "change": {"deep": 1}, "drop": 0},
+        "list": [1, 2, 3],
+    }
+    new = {
+        "a": 1,
+        "winner": None,
+        "nested": {"keep": [1, 2], "change": {"deep": 2}, "added": {"x": 1}},
+        "list": [1, 2],
+    }
+    delta = diff_states(old, new)
+
+    assert delta == {
+        "set": {"winner": None, "list": [1, 2]},
+        "del": ["gone"],
+        "sub": {
+            "nested": {
+                "set": {"added": {"x": 1}},
+                "del": ["drop"],
+                "sub": {"change": {"set": {"deep": 2}}},
+            }
+        },
+    }
+    snapshot = json.dumps(old, sort_keys=True)
+    assert apply_delta(old, delta) == new
+    assert json.dumps(old, sort_keys=True) == snapshot
+    assert diff_states(new, new) == {}
+
+
+def _record(moves: list[tuple[dict, dict, list]], gs, new_gs) -> None:
+    moves.append(
+        (
+            gs.to_dict(include_rng=True),
+            new_gs.to_dict(include_rng=True),
+            list(new_gs.outcomes or []),
+        )
+    )
+
+
+def _recording(fn, moves: list[tuple[dict, dict, list]]):
+    @functools.wraps(fn)
+    def wrapper(gs, *args, **kwargs):
+        new_gs, payload = fn(gs, *args, **kwargs)
+        _record(moves, gs, new_gs)
+        return new_gs, payload
+
+    return wrapper
+
+
+def _recording_skip(fn, moves: list[tuple[dict, dict, list]]):
+    # The runner's forced turn advance is a "skip_turn" move on the server.
+    def wrapper(gs):
+        new_gs = fn(gs)
+        _record(moves, gs, new_gs)
+        return new_gs
+
+    return staticmethod(wrapper)
+
+
+@pytest.mark.parametrize("num_players,modes", [(4, []), (3, sorted(VALID_GAME_MODES))])
+def test_history_rebuilds_every_state_before(monkeypatch, num_players, modes):
+    moves: list[tuple[dict, dict, list]] = []
+    with monkeypatch.context() as m:
+        for name in _ACTIONS:
+            m.setattr(actions, name, _recording(getattr(actions, name), moves))
+        m.setattr(
+            GameRunner,
+            "_force_advance_turn",
+            _recording_skip(GameRunner._force_advance_turn, moves),
+        )
+        strategies = {uuid4(): Mastermind() for _ in range(num_players)}
+        GameRunner(strategies, seed=num_players, game_modes=modes).run()
+    assert len(moves) > 2 * KEYFRAME_EVERY
+
+    # What commit_game_move stores: a delta per move, state_before on keyframes.
+    rows = []
+    for seq, (before, after, outcomes) in enumerate(moves, start=1):
+        # Each move starts from the latest_state the previous one stored.
+        if seq > 1:
+            assert before == moves[seq - 2][1]
+        assert GameState.from_dict(after).to_dict(include_rng=True) == after
+        rows.append(
+            {
+                "seq": seq,
+                "state_before": before if is_keyframe(seq) else None,
+                "state_delta": move_delta(before, after, outcomes),
+                "outcomes": outcomes,
+            }
+        )
+    # The stream's position follows from the outcomes, so no delta carries it.
+    assert any(r["outcomes"] for r in rows)
+    assert not any("rng" in r["state_delta"].get("set", {}) for r in rows)
+
+    for seq, (before, _, _) in enumerate(moves, start=1):
+        start = max(r["seq"] for r in rows[:seq] if r["state_before"] is not None)
+        keyframe = rows[start - 1]["state_before"]
+        chain = rows[start - 1 : seq - 1]
+        assert len(chain) < KEYFRAME_EVERY
+        assert rebuild_state(keyframe, chain) == before
+
+    full = sum(len(json.dumps(before)) for before, _, _ in moves)
+    stored = sum(
+        len(json.dumps(r["state_delta"])) + len(json.dumps(r["state_before"] or ""))
+        for r in rows
+    )
+    assert stored < full / 3
+
+
+def test_move_delta_keeps_a_stream_the_outcomes_do_not_explain():
+    gs = GameState.start_game([uuid4(), uuid4()], seed=5)
+    before = gs.to_dict(include_rng=True)
+    gs.own_rng().random()
+    drew_one = gs.to_dict(include_rng=True)
+    # An undo puts back an earlier stream; it has no outcomes.
+    undo = move_delta(drew_one, before, [])
+    assert undo == {"set": {"rng": before["rng"]}}
+    assert apply_move_delta(drew_one, undo, []) == before
+
+    assert move_delta(before, drew_one, [["special", "NOTHING"]]) == {}
+    assert apply_move_delta(before, {}, [["special", "NOTHING"]]) == drew_one
+    # A draw the outcomes do not account for is stored.
+    assert move_delta(before, drew_one, []) == {"set": {"rng": drew_one["rng"]}}
+
+
+def test_deltas_stored_with_the_stream_still_apply():
+    gs = GameState.start_game([uuid4(), uuid4()], seed=5)
+    before = gs.to_dict(include_rng=True)
+    gs.own_rng().random()
+    after = gs.to_dict(include_rng=True)
+
+    assert apply_move_delta(before, diff_states(before, after), None) == after
@@ -0,0 +1,112 @@
+"""Tests for GameState.state_hash (incremental Zobrist hashing).
+
+Pure game-logic tests — no Supabase required.
+"""
+
+import functools
+import json
+import os
+import subprocess
+import sys
+from uuid import uuid4
+
+import pytest
+
+from app import actions
+from app.game_modes import VALID_GAME_MODES
+from app.GameState import GameState
+from app.Ingredient import Ingredient
+from playtesting.runner import GameRunner
+from playtesting.strategy import Mastermind
+
+_ACTIONS = [
+    "draw_from_bag",
+    "take_ingredients",
+    "sell_cup",
+    "drink_cup",
+    "go_for_a_wee",
+    "claim_card",
+    "drink_stored_spirit",
+    "use_stored_spirit",
+    "reroll_specials",
+    "refresh_card_row",
+    "end_turn",
+]
+
+
+def _checking(fn, seen: dict[int, str]):
+    @functools.wraps(fn)
+    def wrapper(gs, *args, **kwargs):
+        before = gs.state_hash
+        new_gs, payload = fn(gs, *args, **kwargs)
+        assert gs.state_hash == before, f"{fn.__name__} changed its input"
+        assert new_gs.state_hash == new_gs.recompute_state_hash()
+        position = json.dumps(new_gs.to_dict(), sort_keys=True)
+        assert seen.setdefault(new_gs.state_hash, position) == position
+        return new_gs, payload
+
+    return wrapper
+
+
+@pytest.mark.parametrize(
+    "num_players,modes", [(2, []), (4, []), (3, sorted(VALID_GAME_MODES))]
+)
+def test_incremental_hash_matches_recompute_through_a_game(
+    monkeypatch, num_players, modes
+):
+    seen: dict[int, str] = {}
+    with monkeypatch.context() as m:
+        for name in _ACTIONS:
+            m.setattr(actions, name, _checking(getattr(actions, name), seen))
+        strategies = {uuid4(): Mastermind() for _ in range(num_players)}
+        GameRunner(strategies, seed=num_players, game_modes=modes).run()
+    assert len(seen) > 20
+
+
+def test_equal_positions_hash_equal():
+    gs = GameState.start_game([uuid4(), uuid4(), uuid4()], seed=6)
+    restored = GameState.from_dict(gs.to_dict())
+
+    assert gs.clone().state_hash == gs.state_hash
+    assert gs.copy_on_write().state_hash == gs.state_hash
+    assert restored.state_hash == gs.state_hash
+    restored.reseed(1)
+    assert restored.state_hash == gs.state_hash
+
+
+def test_moving_a_token_changes_the_hash():
+    gs = GameState.start_game([uuid4(), uuid4()], seed=6)
+    before = gs.state_hash
+    ps = gs.player_states[gs.player_turn]
+
+    gs.bag_contents.remove(Ingredient.GIN)
+    ps.bladder.append(Ingredient.GIN)
+    moved = gs.state_hash
+    assert moved != before
+    assert moved == gs.recompute_state_hash()
+
+    ps.bladder.remove(Ingredient.GIN)
+    gs.bag_contents.append(Ingredient.GIN)
+    assert gs.state_hash == before
+
+
+def test_hash_is_the_same_in_every_process():
+    gs = GameState.start_game([uuid4(), uuid4()], seed=9)
+    script = (
+        "import json, sys\n"
+        "from app.GameState import GameState\n"
+        "print(GameState.from_dict(json.load(sys.stdin)).state_hash)\n"
+    )
+    hashes = set()
+    for hash_seed in ("1", "2"):
+        out = subprocess.run(
+            [sys.executable, "-c", script],
+            input=json.dumps(gs.to_dict()),
+            env=dict(os.environ, PYTHONHASHSEED=hash_seed),
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+        hashes.add(int(out.stdout))
+    assert hashes == {gs.state_hash}
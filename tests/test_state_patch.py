@@ -0,0 +1,101 @@
+"""Tests for JSON-patch action responses (app.state_patch).
+
+Pure game-logic tests — no Supabase required.
+"""
+
+import functools
+import json
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import actions
+from app.api import app
+from app.game_modes import VALID_GAME_MODES
+from app.state_patch import apply_patch, view_patch
+from playtesting.runner import GameRunner
+from playtesting.strategy import Mastermind
+from tests.test_conditional_get import _get, _started_game
+from tests.test_state_hash import _ACTIONS
+
+
+def _checking(fn, sizes: list[tuple[int, int]]):
+    @functools.wraps(fn)
+    def wrapper(gs, *args, **kwargs):
+        new_gs, payload = fn(gs, *args, **kwargs)
+        for viewer in [None, *gs.player_states]:
+            before, after = gs.to_view(viewer), new_gs.to_view(viewer)
+            patch = view_patch(gs, new_gs, viewer)
+            assert apply_patch(before, patch) == after, fn.__name__
+            assert gs.to_view(viewer) == before  # neither input is modified
+            sizes.append((len(json.dumps(patch)), len(json.dumps(after))))
+        return new_gs, payload
+
+    return wrapper
+
+
+@pytest.mark.parametrize("num_players,modes", [(4, []), (3, sorted(VALID_GAME_MODES))])
+def test_patches_turn_each_view_into_the_next(monkeypatch, num_players, modes):
+    sizes: list[tuple[int, int]] = []
+    with monkeypatch.context() as m:
+        for name in _ACTIONS + ["quit_game"]:
+            m.setattr(actions, name, _checking(getattr(actions, name), sizes))
+        strategies = {uuid4(): Mastermind() for _ in range(num_players)}
+        GameRunner(strategies, seed=num_players, game_modes=modes).run()
+
+    assert len(sizes) > 100
+    assert sum(p for p, _ in sizes) < sum(f for _, f in sizes) / 5
+
+
+def test_apply_patch_handles_escaped_paths_and_lists():
+    doc = {"a/b": {"~x": [1, 2]}, "gone": 1}
+    patch = [
+        {"op": "add", "path": "/a~1b/~0x/-", "value": 3},
+        {"op": "add", "path": "/a~1b/~0x/0", "value": 0},
+        {"op": "replace", "path": "/a~1b/~0x/1", "value": 9},
+        {"op": "remove", "path": "/gone"},
+    ]
+
+    assert apply_patch(doc, patch) == {"a/b": {"~x": [0, 9, 2, 3]}}
+    assert doc == {"a/b": {"~x": [1, 2]}, "gone": 1}
+
+
+def test_actions_answer_with_a_patch_from_the_version_given():
+    client = TestClient(app)
+    game_id, player, _ = _started_game(client)
+    url = f"/v1/games/{game_id}"
+    game = _get(client, url, player).json()
+    move = f"{url}/actions/draw-from-bag"
+
+    response = client.post(
+        f"{move}?since={game['state_version']}", json={"count": 1}, cookies=player
+    ).json()
+
+    assert "game_state" not in response and len(response["drawn"]) == 1
+    assert response["state_version"] > game["state_version"]
+    fetched = _get(client, url, player)
+    assert (
+        apply_patch(game["game_state"], response["game_state_patch"])
+        == (fetched.json()["game_state"])
+    )
+    # The tag lets the page keep the patched game without fetching it again.
+    assert response["game_etag"] == fetched.headers["ETag"]
+    assert response["pending_undo"] is None
+
+
+@pytest.mark.parametrize("since", ["", "?since={stale}", "?since=latest"])
+def test_actions_answer_in_full_without_a_usable_version(since):
+    client = TestClient(app)
+    game_id, player, _ = _started_game(client)
+    url = f"/v1/games/{game_id}"
+    version = _get(client, url, player).json()["state_version"]
+    move = f"{url}/actions/draw-from-bag" + since.format(stale=version - 1)
+
+    response = client.post(move, json={"count": 1}, cookies=player)
+
+    body = response.json()
+    assert response.status_code == 200, body
+    assert "game_state_patch" not in body and "game_etag" not in body
+    assert body["state_version"] > version
+    assert body["game_state"] == _get(client, url, player).json()["game_state"]
@@ -0,0 +1,48 @@
+"""Tests for the per-viewer projection of game state (GameState.to_view).
+
+Pure game-logic tests — no Supabase required.
+"""
+
+from uuid import uuid4
+
+from app.GameState import GameState, state_view
+from app.Ingredient import Ingredient
+
+
+def _state() -> GameState:
+    gs = GameState.start_game([uuid4(), uuid4()], seed=3)
+    gs.discard = [dict(card) for card in gs._deck_dicts[:3]]
+    gs.drunk_ingredients_this_turn = [Ingredient.VODKA]
+    return gs
+
+
+def test_view_summarises_the_bag_deck_and_discard():
+    gs = _state()
+    view = gs.to_view(gs.player_turn)
+
+    assert "bag_contents" not in view and "deck" not in view and "rng" not in view
+    assert view["bag_size"] == len(gs.bag_contents) == sum(view["bag_counts"].values())
+    assert view["bag_counts"]["VODKA"] == gs.bag_contents.count(Ingredient.VODKA)
+    assert view["deck_size"] == len(gs._deck_dicts)
+    assert "discard" not in view
+    assert view["discard_summary"]["size"] == 3
+    assert sum(view["discard_summary"]["by_type"].values()) == 3
+    assert view["player_states"] == gs.to_dict()["player_states"]
+
+
+def test_turn_scratch_is_only_for_the_player_to_move():
+    gs = _state()
+    other = next(p for p in gs.player_states if p != gs.player_turn)
+
+    assert gs.to_view(gs.player_turn)["drunk_ingredients_this_turn"] == ["VODKA"]
+    assert "drunk_ingredients_this_turn" not in gs.to_view(other)
+    assert "taken_records_this_turn" not in gs.to_view(None)
+    assert gs.to_view(other)["bag_draw_pending"] == []
+
+
+def test_stored_snapshots_project_the_same_way():
+    gs = _state()
+    stored = gs.to_dict(include_rng=True)
+
+    assert state_view(stored, gs.player_turn) == gs.to_view(gs.player_turn)
+    assert "rng" in stored